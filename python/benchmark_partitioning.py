@@ -0,0 +1,34 @@
+"""
+Example script on how to benchmark the rectilinear partitioning algorithm that is used to partition the plate into
+cells for structured meshing.
+
+:Usage:
+    1. Specify the layout types, sizes and seeds of the cut-out layouts to benchmark.
+    2. Run the script. The results are saved to 'baseline_file_path' if this file does not exist yet, otherwise
+       they are compared against the baseline and any regressions are printed.
+"""
+import os
+
+from guwlib.functions_utility.partitioning_benchmark import *
+
+# define the benchmark cases here -----------------------------------------------------------+
+layout_types = ('random', 'clustered', 'ring')
+sizes = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+seeds = (0, 1, 2)
+time_limit = 120.0
+baseline_file_path = 'results/benchmarks/partitioning_baseline.json'
+
+# run the benchmark --------------------------------------------------------------------------+
+results = run_partitioning_benchmark(layout_types=layout_types, sizes=sizes, seeds=seeds,
+                                     time_limit=time_limit)
+
+# save as baseline or compare against an existing baseline -----------------------------------+
+if not os.path.exists(baseline_file_path):
+    save_benchmark_results(results, baseline_file_path)
+    print("Saved baseline to {}.".format(baseline_file_path))
+else:
+    regressions = compare_benchmark_results(load_benchmark_results(baseline_file_path), results)
+    for regression in regressions:
+        print("REGRESSION: {}".format(regression))
+    if not regressions:
+        print("No regressions compared to {}.".format(baseline_file_path))
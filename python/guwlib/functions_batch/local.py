@@ -1,8 +1,14 @@
 import subprocess
 import os
 
+from guwlib.functions_cae.build_session import run_build_session
+from guwlib.functions_utility.deduplication import deduplicate_input_files, link_deduplicated_results
+from guwlib.functions_utility.geometry_validation import validate_model_files
+from guwlib.functions_utility.model_spec import get_model_names, is_model_spec_file
+from guwlib.functions_utility.symmetry import mirror_symmetry_reduced_history
 
-def build_and_solve(model_file_paths, n_threads):
+
+def build_and_solve(model_file_paths, n_threads, single_cae_session=True, deduplicate_load_cases=True):
     """
     Wrapper to automize the process of building ABAQUS FE model (.INP) files from guwlib model files (.PY) and
     submitting them to the ABAQUS solver on this machine. Results are written to the 'results' directory.
@@ -10,22 +16,44 @@ def build_and_solve(model_file_paths, n_threads):
     Subprocess is used to call ABAQUS/CAE and ABAQUS analysis via CLI. Make sure ABAQUS is available (check with
     abaqus information=release).
 
-    :param list[str] model_file_paths: File paths to the guwlib model files (.PY).
+    :param list[str] model_file_paths: File paths to the guwlib model files (.PY) or model specifications (.JSON /
+        .YAML, see ``guwlib.functions_utility.model_spec``).
     :param int n_threads:  Number of CPUs (physical / virtual) to use for parallel solving in ABAQUS.
+    :param bool single_cae_session: If True, all model files are built in one ABAQUS/CAE session (see
+        ``guwlib.functions_cae.build_session``), otherwise ABAQUS/CAE is started once per model file (model files
+        (.PY) only). In a single session, the reused .INP files of unchanged models (see
+        ``guwlib.functions_utility.build_cache``) are only solved again if their .ODB files are missing or older.
+    :param bool deduplicate_load_cases: If True, load cases with identical .INP files (e.g. the pristine baselines of
+        several models with the same plate and transducers) are solved only once (see
+        ``guwlib.functions_utility.deduplication``), their results are linked to the duplicates at export.
+    :raises ValueError: If model specifications are built without ``single_cae_session``, or if the geometry of a
+        model is invalid (all models are validated before ABAQUS/CAE is started, see
+        ``guwlib.functions_utility.geometry_validation``).
     """
+    if not single_cae_session and any(is_model_spec_file(model_file_path) for model_file_path in model_file_paths):
+        raise ValueError("Model specifications can only be built in a single ABAQUS/CAE session.")
+    validate_model_files(model_file_paths)
 
     # run ABAQUS/CAE on the model.PY files
     print("Running preprocessing stage (writing .INP files ...)")
-    for model_file in model_file_paths:
-        print(f"Writing .INP files for {model_file}")
-        command = f"abaqus cae noGUI={model_file}"
-        proc = subprocess.Popen(command, shell=True)
-        proc.wait()
+    build_status = {}
+    if single_cae_session:
+        status_file_path = os.path.join('results', 'build_session_status.json')
+        if os.path.exists(status_file_path):
+            os.remove(status_file_path)
+        build_status = run_build_session(model_file_paths=model_file_paths, status_file_path=status_file_path)
+    else:
+        for model_file in model_file_paths:
+            print(f"Writing .INP files for {model_file}")
+            command = f"abaqus cae noGUI={model_file}"
+            proc = subprocess.Popen(command, shell=True)
+            proc.wait()
 
     # find the .INP files and add their file names and paths to a list
     print("Scanning the 'results' directory for the created .INP files ...")
-    model_file_names = [os.path.splitext(os.path.basename(model_file_path))[0] for model_file_path in model_file_paths]
-    directories_to_search = [os.path.join('results', model_file_name) for model_file_name in model_file_names]
+    model_names = [model_name for model_file_path in model_file_paths
+                   for model_name in get_model_names(model_file_path)]
+    directories_to_search = [os.path.join('results', model_name) for model_name in model_names]
     inp_files = []
 
     for directory_to_search in directories_to_search:
@@ -36,6 +64,22 @@ def build_and_solve(model_file_paths, n_threads):
                                       file_name))
     print(f"Found .INP files: {', '.join([inp_file_path[1] for inp_file_path in inp_files])}")
 
+    # solve identical load cases of different models only once
+    if deduplicate_load_cases:
+        input_file_paths = deduplicate_input_files([os.path.join(root, file_name) for root, file_name in inp_files])
+        inp_files = [(os.path.dirname(input_file_path), os.path.basename(input_file_path))
+                     for input_file_path in input_file_paths]
+
+    # don't solve the reused .INP files of unchanged models again if their .ODB files are up to date
+    reused_directories = [os.path.abspath(os.path.join('results', model_name)) for model_file_path in model_file_paths
+                          if build_status.get(model_file_path, {}).get('reused')
+                          for model_name in get_model_names(model_file_path)]
+    solved_inp_files = [inp_file for inp_file in inp_files
+                        if __is_in_directories(inp_file[0], reused_directories) and __has_up_to_date_odb(*inp_file)]
+    if solved_inp_files:
+        print(f"Skipped {len(solved_inp_files)} .INP file(s) of unchanged models, their .ODB files are up to date.")
+        inp_files = [inp_file for inp_file in inp_files if inp_file not in solved_inp_files]
+
     # run ABAQUS on each of the .inp files
     for inp_file in inp_files:
         job_name = os.path.splitext(inp_file[1])[0]
@@ -46,14 +90,18 @@ def build_and_solve(model_file_paths, n_threads):
         proc.wait()
 
 
-def extract_results(directories_to_scan=('results', ), data_to_extract='history'):
+def extract_results(directories_to_scan=('results', ), data_to_extract='history', history_time_interval=None):
     """
     Handles automatic batch postprocessing of .ODB files, i.e. extraction of history or field output to NumPy binary
     files (.NPZ) or Pickle files (.PKL, only fallback). The function scans the specified directories for unprocessed
-    .ODB files and calls the field / history export helper in ABAQUS/CAE to process the file.
+    .ODB files and calls the field / history export helper in ABAQUS/CAE to process the file. The exported results of
+    deduplicated load cases are linked to their duplicates, and the history output of symmetry-reduced models is
+    mirrored back to the full transducer set afterwards.
 
     :param tuple[str] directories_to_scan: directories (including subdirectories) to browse for unprocessed .ODB files
     :param str data_to_extract: type of data to extract ('field' or 'history')
+    :param float history_time_interval: if set, the history output is low-pass filtered (anti-aliasing) and resampled
+        to this time interval at export
     """
     # find all unprocessed .ODB files in the specified directories
     odb_files = []
@@ -79,10 +127,13 @@ def extract_results(directories_to_scan=('results', ), data_to_extract='history'
     for odb_file in odb_files:
         odb_file_path = odb_file[0]
         odb_file_name = odb_file[1]
+        helper_script_arguments = odb_file_name
 
         if data_to_extract == 'history':
             print(f"Extracting the history data for {odb_file_name} ...")
             helper_script_name = os.path.abspath('guwlib/functions_odb/history_export_helper.py')
+            if history_time_interval is not None:
+                helper_script_arguments = f'--time-interval={history_time_interval} {odb_file_name}'
 
         elif data_to_extract == 'field':
             print(f"Extracting the history data for {odb_file_name} ...")
@@ -91,7 +142,7 @@ def extract_results(directories_to_scan=('results', ), data_to_extract='history'
         else:
             raise ValueError('Specify which data to extract. Possible values are: "field" or "history".')
 
-        command = f'cd {odb_file_path} & abaqus cae noGUI={helper_script_name} -- {odb_file_name}'
+        command = f'cd {odb_file_path} & abaqus cae noGUI={helper_script_name} -- {helper_script_arguments}'
         proc = subprocess.Popen(command, shell=True)
         proc.wait()
         npz_file = os.path.join(odb_file_path, os.path.splitext(odb_file_name)[0] + '_' + data_to_extract + '.npz')
@@ -106,3 +157,25 @@ def extract_results(directories_to_scan=('results', ), data_to_extract='history'
         print("Done. The processed files are here:")
         print(br.join(processed_files))
 
+    # link the results of load cases that were solved once for several models to the duplicates
+    link_deduplicated_results(directories_to_scan=directories_to_scan)
+
+    # assemble the signals of the full transducer set of symmetry-reduced models
+    if data_to_extract == 'history':
+        mirror_symmetry_reduced_history(directories_to_scan=directories_to_scan)
+
+
+def __is_in_directories(path, directories):
+    """
+    (Helper) Checks if an (absolute) path lies in one of the directories or their subdirectories.
+    """
+    return any(path == directory or path.startswith(directory + os.sep) for directory in directories)
+
+
+def __has_up_to_date_odb(job_path, inp_file_name):
+    """
+    (Helper) Checks if the .ODB file of a job exists and is newer than its .INP file.
+    """
+    odb_file_path = os.path.join(job_path, os.path.splitext(inp_file_name)[0] + '.odb')
+    return (os.path.exists(odb_file_path) and
+            os.path.getmtime(odb_file_path) > os.path.getmtime(os.path.join(job_path, inp_file_name)))
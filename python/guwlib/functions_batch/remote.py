@@ -2,6 +2,8 @@ import os
 
 from guwlib.functions_cluster.slurm import *
 from guwlib.functions_cluster.ssh import *
+from guwlib.functions_utility.geometry_validation import validate_model_files
+from guwlib.functions_utility.model_spec import is_model_spec_file, load_model_spec
 
 
 def build_and_solve(model_files_local, remote_guwlib_path, cae_slurm_settings, solver_slurm_settings,
@@ -14,14 +16,21 @@ def build_and_solve(model_files_local, remote_guwlib_path, cae_slurm_settings, s
     to the ``cluster_pre.py`` script. The host (e.g. Phoenix Cluster) is expected to have SLURM resource manager
     installed, has to be available via SSH, and guwlib python modules have to be available at ``remote_guwlib_path``.
 
-    :param list[str] model_files_local: List of the model (.PY) files to upload and process on the cluster.
+    :param list[str] model_files_local: List of the model (.PY) files or model specifications (.JSON / .YAML) to
+        upload and process on the cluster. The template of a model specification (see
+        ``guwlib.functions_utility.model_spec``) is uploaded too, it has to be in the same directory as the
+        specification.
     :param str remote_guwlib_path: Path to the directory that contains the guwlib module on the remote machine.
     :param dict cae_slurm_settings: SLURM settings for the generation of ABAQUS .INP files.
     :param dict solver_slurm_settings: SLURM settings for the ABAQUS solver.
     :param str hostname: Name of the SSH host.
     :param int port: Port of the SSH host.
     :return: None
+    :raises ValueError: If the geometry of a model is invalid (all models are validated before they are uploaded, see
+        ``guwlib.functions_utility.geometry_validation``).
     """
+    validate_model_files(model_files_local)
+
     # decompose dicts
     solver_n_nodes = solver_slurm_settings["n_nodes"]
     solver_n_tasks_per_node = solver_slurm_settings["n_tasks_per_node"]
@@ -36,8 +45,14 @@ def build_and_solve(model_files_local, remote_guwlib_path, cae_slurm_settings, s
     # retrieve the SSH username and password
     ssh_username, ssh_password = get_ssh_credentials(hostname)
 
-    # copy the model files to the cluster
+    # copy the model files (and the templates of model specifications) to the cluster
+    files_to_copy = list(model_files_local)
     for model_file in model_files_local:
+        if is_model_spec_file(model_file):
+            template = load_model_spec(model_file).get('template')
+            if template is not None:
+                files_to_copy.append(os.path.join(os.path.dirname(model_file), template))
+    for model_file in files_to_copy:
         file_name = os.path.basename(model_file)
         remote_path = f'{remote_guwlib_path}/models/{file_name}'
         copy_file_to_remote(model_file, remote_path, ssh_username, ssh_password, hostname, port)
@@ -0,0 +1,297 @@
+"""
+Recording stand-in for the ABAQUS scripting interface (``abaqus``, ``abaqusConstants``, ``mesh``, ``regionToolset`` and
+all other modules imported by the CAE helper functions). It allows to run the build functions in
+``guwlib.functions_cae`` with a plain Python interpreter, without an ABAQUS installation or licence, e.g. to profile the
+pure-Python parts of the model build (partitioning, snapping, ...) or to test the build logic.
+
+The stand-in does not model any geometry: every attribute access, item access or call on ``mdb`` (and on the objects
+returned by it) returns another stand-in object, and every call is recorded with its arguments. Lookups like
+``findAt`` therefore never find anything, and iterating over a stand-in yields no items. The recorded calls and their
+counts can be used to assert the number of CAE operations of a build, e.g. the number of ``PartitionCellByExtrudeEdge``
+calls per transducer.
+
+Example usage::
+
+    from guwlib.functions_cae.abaqus_stand_in import run_model_file_with_stand_in
+
+    recorder = run_model_file_with_stand_in('models/examples/tutorial.py')
+    print(recorder.summary())
+    assert recorder.counts['PartitionCellByExtrudeEdge'] <= 40
+
+The model is built in GUI mode, so that no output directory and no .INP files are written.
+"""
+import collections
+import json
+import runpy
+import sys
+import types
+
+# modules imported by the CAE helper functions (besides 'abaqus' and 'abaqusConstants')
+STUBBED_MODULES = ('section', 'regionToolset', 'displayGroupMdbToolset', 'part', 'material', 'assembly',
+                   'interaction', 'load', 'mesh', 'optimization', 'job', 'sketch', 'visualization', 'xyPlot',
+                   'displayGroupOdbToolset', 'connectorBehavior', 'step', 'odbAccess')
+
+# symbolic constants of abaqusConstants used by the CAE helper functions
+SYMBOLIC_CONSTANTS = ('ADVANCING_FRONT', 'ALL', 'ANALYSIS', 'ANTIALIASING', 'AXISYM', 'AXISYMMETRIC', 'C3D4', 'C3D6',
+                      'C3D8R', 'CARTESIAN', 'CAX3', 'CAX4R', 'COPLANAR_EDGES', 'CPE3', 'CPE4R', 'CYLINDRICAL',
+                      'DEFAULT', 'DEFORMABLE_BODY', 'DIFFERENCE', 'DOUBLE', 'EVERY_TIME_INCREMENT', 'EXCLUDE',
+                      'EXPLICIT', 'FREE', 'FROM_SECTION', 'HEX', 'HEX_DOMINATED', 'INTERSECTION', 'MEDIAL_AXIS',
+                      'MIDDLE_SURFACE', 'NONE', 'NO_IDEALIZATION', 'ODB', 'OFF', 'ON', 'PERCENTAGE', 'QUAD',
+                      'QUAD_DOMINATED', 'REVERSE', 'RIGHT', 'S3R', 'S4R', 'SC6R', 'SC8R', 'SIDE1', 'SIDE2', 'SIMPSON',
+                      'SINGLE', 'SOLVER_DEFAULT', 'STANDARD', 'STEP', 'STRUCTURED', 'SWEEP', 'THREE_D', 'TOTAL',
+                      'TWO_D_PLANAR', 'UNIFORM', 'UNION', 'UNSET', 'WEDGE', 'XYPLANE', 'XZPLANE', 'YZPLANE')
+
+
+class CaeCall(object):
+    """
+    A single recorded call of the ABAQUS scripting interface.
+    """
+
+    def __init__(self, name, path, args, kwargs):
+        """
+        :param str name: Name of the called method or function, e.g. ``'findAt'``.
+        :param str path: Full path of the called object, e.g. ``"mdb.models['guw_model'].parts['plate'].findAt"``.
+        :param tuple args: Positional arguments of the call.
+        :param dict kwargs: Keyword arguments of the call.
+        """
+        self.name = name
+        self.path = path
+        self.args = args
+        self.kwargs = kwargs
+
+    def __repr__(self):
+        arguments = [repr(arg) for arg in self.args] + ['{}={!r}'.format(k, v) for k, v in sorted(self.kwargs.items())]
+        return "{}({})".format(self.path, ', '.join(arguments))
+
+
+class CaeCallRecorder(object):
+    """
+    Records all calls on the ABAQUS stand-in objects.
+    """
+
+    def __init__(self):
+        """
+        :ivar list[CaeCall] calls: All recorded calls, in order of their occurrence.
+        :ivar collections.Counter counts: Number of calls per method or function name.
+        """
+        self.calls = []
+        self.counts = collections.Counter()
+
+    def record(self, name, path, args, kwargs):
+        """
+        Records a call.
+
+        :param str name: Name of the called method or function.
+        :param str path: Full path of the called object.
+        :param tuple args: Positional arguments of the call.
+        :param dict kwargs: Keyword arguments of the call.
+        """
+        self.calls.append(CaeCall(name, path, args, kwargs))
+        self.counts[name] += 1
+
+    def get_calls(self, name):
+        """
+        Returns all recorded calls of a method or function.
+
+        :param str name: Name of the method or function, e.g. ``'PartitionFaceBySketch'``.
+        :rtype: list[CaeCall]
+        """
+        return [call for call in self.calls if call.name == name]
+
+    def reset(self):
+        """
+        Deletes all recorded calls.
+        """
+        self.calls = []
+        self.counts = collections.Counter()
+
+    def summary(self):
+        """
+        Returns a table of the call counts, sorted by frequency.
+
+        :rtype: str
+        """
+        lines = ["{:>8d}  {}".format(count, name) for name, count in self.counts.most_common()]
+        lines.append("{:>8d}  (total)".format(len(self.calls)))
+        return '\n'.join(lines)
+
+    def save(self, file_path):
+        """
+        Saves the call counts and the complete call log to a .JSON file.
+
+        :param str file_path: Path to the .JSON file.
+        """
+        data = {'counts': dict(self.counts),
+                'calls': [repr(call) for call in self.calls]}
+        with open(file_path, 'w') as file:
+            json.dump(data, file, indent=2)
+
+
+class CaeStandIn(object):
+    """
+    Stand-in for any object of the ABAQUS scripting interface (``mdb``, parts, sets, geometry sequences, ...).
+    """
+
+    def __init__(self, recorder, path):
+        """
+        :param CaeCallRecorder recorder: Recorder for the calls on this object (and its children).
+        :param str path: Path of this object, used for logging.
+        """
+        object.__setattr__(self, '_recorder', recorder)
+        object.__setattr__(self, '_path', path)
+        object.__setattr__(self, '_attributes', {})
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        attributes = object.__getattribute__(self, '_attributes')
+        if name in attributes:
+            return attributes[name]
+        return CaeStandIn(self._recorder, '{}.{}'.format(self._path, name))
+
+    def __setattr__(self, name, value):
+        self._attributes[name] = value
+
+    def __call__(self, *args, **kwargs):
+        name = self._path.split('.')[-1]
+        self._recorder.record(name, self._path, args, kwargs)
+        return CaeStandIn(self._recorder, '{}()'.format(name))
+
+    def __getitem__(self, key):
+        return CaeStandIn(self._recorder, '{}[{!r}]'.format(self._path, key))
+
+    def __setitem__(self, key, value):
+        self._recorder.record('__setitem__', '{}[{!r}]'.format(self._path, key), (value, ), {})
+
+    def __delitem__(self, key):
+        self._recorder.record('__delitem__', '{}[{!r}]'.format(self._path, key), (), {})
+
+    def __iter__(self):
+        return iter(())
+
+    def __reversed__(self):
+        return iter(())
+
+    def __len__(self):
+        return 0
+
+    def __contains__(self, item):
+        return False
+
+    def __bool__(self):
+        return True
+
+    __nonzero__ = __bool__
+
+    def __add__(self, other):
+        return self
+
+    __radd__ = __add__
+
+    def __int__(self):
+        return 0
+
+    __index__ = __int__
+
+    def __float__(self):
+        return 0.0
+
+    def __format__(self, format_spec):
+        return format(0, format_spec) if format_spec else repr(self)
+
+    def __repr__(self):
+        return '<stand-in {}>'.format(self._path)
+
+
+class SymbolicConstant(object):
+    """
+    Stand-in for the symbolic constants of ``abaqusConstants``.
+    """
+
+    def __init__(self, name):
+        self.name = name
+
+    def __repr__(self):
+        return self.name
+
+
+def install_abaqus_stand_in(recorder=None):
+    """
+    Installs the stand-in modules in ``sys.modules``, so that ``from abaqus import *`` and the other ABAQUS imports
+    succeed. Already imported CAE helper and build modules of guwlib are unloaded, so that they are imported again with
+    the stand-in.
+
+    :param CaeCallRecorder recorder: Recorder for the calls, a new one is created if None.
+    :return: The recorder.
+    :rtype: CaeCallRecorder
+    """
+    if recorder is None:
+        recorder = CaeCallRecorder()
+
+    abaqus = types.ModuleType('abaqus')
+    for name in ('mdb', 'session', 'Mdb', 'openMdb'):
+        setattr(abaqus, name, CaeStandIn(recorder, name))
+    abaqus.__all__ = ['mdb', 'session', 'Mdb', 'openMdb']
+    sys.modules['abaqus'] = abaqus
+
+    abaqus_constants = types.ModuleType('abaqusConstants')
+    for name in SYMBOLIC_CONSTANTS:
+        setattr(abaqus_constants, name, SymbolicConstant(name))
+    abaqus_constants.__all__ = list(SYMBOLIC_CONSTANTS)
+    sys.modules['abaqusConstants'] = abaqus_constants
+
+    for module_name in STUBBED_MODULES:
+        module = types.ModuleType(module_name)
+        module.__getattr__ = __module_attribute_getter(recorder, module_name)
+        sys.modules[module_name] = module
+
+    __unload_cae_modules()
+    return recorder
+
+
+def uninstall_abaqus_stand_in():
+    """
+    Removes the stand-in modules from ``sys.modules`` and unloads the CAE helper and build modules of guwlib, which
+    were imported with the stand-in.
+    """
+    for module_name in ('abaqus', 'abaqusConstants') + STUBBED_MODULES:
+        sys.modules.pop(module_name, None)
+    __unload_cae_modules()
+
+
+def run_model_file_with_stand_in(model_file_path, recorder=None):
+    """
+    Builds a GUWlib model file (.PY) with the ABAQUS stand-in and records all calls of the ABAQUS scripting interface.
+    The model file is run as ``__main__`` (GUI mode, no .INP files are written).
+
+    :param str model_file_path: Path to the GUWlib model file (.PY).
+    :param CaeCallRecorder recorder: Recorder for the calls, a new one is created if None.
+    :return: The recorder.
+    :rtype: CaeCallRecorder
+    """
+    recorder = install_abaqus_stand_in(recorder)
+    try:
+        runpy.run_path(model_file_path, run_name='__main__')
+    finally:
+        uninstall_abaqus_stand_in()
+    return recorder
+
+
+def __module_attribute_getter(recorder, module_name):
+    """
+    (Helper) Returns a module-level ``__getattr__`` that returns stand-in objects for all attributes of a module.
+    """
+    def module_getattr(name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return CaeStandIn(recorder, '{}.{}'.format(module_name, name))
+    return module_getattr
+
+
+def __unload_cae_modules():
+    """
+    (Helper) Unloads all modules of ``guwlib.functions_cae`` (except for this one) from ``sys.modules``.
+    """
+    for module_name in list(sys.modules):
+        if module_name.startswith('guwlib.functions_cae.') and module_name != __name__:
+            del sys.modules[module_name]
@@ -1,34 +1,70 @@
+import copy
+
 from guwlib import *
-from guwlib.functions_utility.rectilinear_partitioning import partition_rectangle_with_rectilinear_cutouts
+from guwlib.functions_utility.rectilinear_partitioning import (partition_rectangle_with_rectilinear_cutouts,
+                                                               partition_rectangle_with_rectilinear_cutouts_multi_start,
+                                                               get_partition_lines)
 from guwlib.functions_utility.console_output import *
+from guwlib.functions_utility.build_telemetry import BuildTelemetry
+from guwlib.functions_utility.build_checkpoint import BuildCheckpoint
+from guwlib.functions_utility.geometry_validation import PIN_FORCE_BOUNDING_BOX_SCALE
+from guwlib.functions_utility.point_force_model import (get_field_output_node_set_definitions,
+                                                        get_field_output_size_estimate, check_field_output_interval)
+from guwlib.functions_utility.symmetry import (get_symmetry_reduction, get_component_label, write_symmetry_mapping,
+                                               SYMMETRY_MAPPING_FILE_SUFFIX)
 from guwlib.functions_cae.helper_functions_point_force import *
 
+# element type of the plate for each model approach that is built by this script
+ELEMENT_TYPES = {'point_force': 'C3D8R', 'pin_force': 'C3D8R', 'continuum_shell': 'SC8R', 'shell': 'S4R'}
+
 
 def build_abaqus_model_point_force(model):
     """
-    Performs the modelling of the FE model in ABAQUS/CAE. Transducers are modelled as point forces (single nodes). The
-    resulting ABAQUS simulation is purely explicit (ABAQUS/EXPLICIT).
+    Performs the modelling of the FE model in ABAQUS/CAE. Transducers are modelled as point forces (single nodes), or as
+    radial pin forces along their circumference for the ``'pin_force'`` model approach. The resulting ABAQUS simulation
+    is purely explicit (ABAQUS/EXPLICIT). Also used for the ``'continuum_shell'`` and ``'shell'`` model approaches,
+    which only differ in the meshing of the plate.
 
     The modelling process is divided into the following steps:
 
-    - Create two identical plates with the desired size as parts. Mesh the 2nd plate directly and use the resulting
-      structured mesh as a reference mesh when creating partitions around defects and transducers in the 1st plate.
+    - Create the plate with the desired size as a part. Snap the partitions around defects and transducers to the
+      (analytically computed) nodes of a structured mesh of the pristine plate.
     - Add all defects and transducers to the plate by modifying the plates' geometry. Create rectangular partitions
       around the defects and store relevant geometry features in ABAQUS sets.
     - Generate a rectilinear partitioning pattern to subdivide the remaining plate (around defects) into purely
       rectangular (cuboid) cells to allow structured meshing.
+    - Optionally, cut the plate to a half or quarter model at its symmetry planes (see below).
     - Create and assign the plates' material.
-    - Mesh the plate with the desired elements per wavelength / thickness. Remove the reference plate.
+    - Mesh the plate with the desired elements per wavelength / thickness (C3D8R), with a single layer of continuum
+      shell elements (SC8R), or with conventional shell elements (S4R) on the plates' mid-surface.
     - Assemble the model by instantiating the plate part in a new assembly.
     - Assign seams (node-separation) at the cracks locations in ABAQUS' interaction module.
-    - Create dynamic/explicit steps, amplitudes, concentrated forces and output requests for each defined load case.
-    - Trigger .INP file generation, if the script is run in noGUI mode.
+    - Optionally, save a checkpoint (model database and manifest) of the meshed and assembled model. If a valid
+      checkpoint exists, all previous steps are skipped and the build resumes from the checkpoint.
+    - Create dynamic/explicit steps, amplitudes, concentrated forces (or pin forces) and output requests for each
+      defined load case.
+    - Trigger .INP file generation, if the script is run in noGUI mode. Load cases that were already written before
+      the checkpointed build was interrupted are skipped. Optionally, the model data (mesh, sets, materials) is
+      written only once to a shared include file, which is referenced by the load case .INP files.
+
+    If ``model.symmetry_reduction`` is set and the geometry is symmetric with respect to the x- and / or y-mid-plane of
+    the plate, only the region ``x <= width / 2`` and / or ``y <= length / 2`` is modelled. Each load case is decomposed
+    into its symmetric and antisymmetric components, which are modelled as separate load cases with the corresponding
+    symmetry boundary conditions. A mapping file (``<model_name>_symmetry.json``) is written to the output directory,
+    which allows the history export to assemble the signals of all transducers of the full model for the original load
+    cases.
+
+    Timing and peak memory of each of these phases, as well as some counters (partitions, nodes, amplitude points,
+    .INP file size), are written to ``<model_name>_build_telemetry.json`` in the output directory (noGUI mode only).
 
     :param FEModel model: The FEModel instance to set up in ABAQUS/CAE.
     :return: None
     """
 
+    telemetry = BuildTelemetry(model.model_name)
+
     # TIME AND SPACE DISCRETIZATION ------------------------------------------------------------------------------------
+    telemetry.start_phase('discretization')
     element_size_in_plane = model.get_element_size_in_plane()
     element_size_thickness = model.get_element_size_thickness()
     max_time_increment = model.get_max_time_increment()
@@ -40,19 +76,205 @@ def build_abaqus_model_point_force(model):
                        element_size_thickness, model.elements_in_thickness_direction,
                        max_time_increment, model.courant_number))
 
+    # set the identifiers (ABAQUS set names) of all defects and transducers
+    for i, defect in enumerate(model.defects):
+        defect.set_identifiers(unique_id=i + 1)
+    for i, transducer in enumerate(model.transducers):
+        if isinstance(transducer, CircularTransducer):
+            transducer.set_identifiers(unique_id=i + 1)
+            if model.model_approach == 'pin_force':
+                # the circumference of the transducer has to lie inside its bounding box
+                transducer.bounding_box_scale = max(transducer.bounding_box_scale, PIN_FORCE_BOUNDING_BOX_SCALE)
+        else:
+            raise NotImplementedError("Transducer of type {} not implemented.".format(type(transducer)))
+
+    # SYMMETRY REDUCTION -----------------------------------------------------------------------------------------------
+    reduction = None
+    if model.symmetry_reduction:
+        reduction = get_symmetry_reduction(plate=model.plate, defects=model.defects, transducers=model.transducers,
+                                           load_cases=model.load_cases)
+        if reduction is None:
+            log_warning("The model is not symmetric with respect to the mid-planes of the plate, the full model is "
+                        "built.")
+        else:
+            # the reduced model is built from a copy, the definition of the full model is left unchanged
+            all_transducers, original_load_cases = model.transducers, model.load_cases
+            model = copy.copy(model)
+            model.defects, model.transducers, model.load_cases = (reduction.defects, reduction.transducers,
+                                                                  reduction.load_cases)
+            log_info("Symmetry reduction at the {} mid-plane(s): {} transducer(s) modelled, {} load case(s) "
+                     "decomposed into {} symmetry component(s).".format(' and '.join(reduction.planes),
+                                                                        len(model.transducers),
+                                                                        len(original_load_cases),
+                                                                        len(model.load_cases)))
+            if model.no_gui_mode:
+                mapping_file_path = os.path.join(model.output_directory,
+                                                 model.model_name + SYMMETRY_MAPPING_FILE_SUFFIX)
+                write_symmetry_mapping(file_path=mapping_file_path, model_name=model.model_name, plate=model.plate,
+                                       reduction=reduction, all_transducers=all_transducers,
+                                       original_load_cases=original_load_cases)
+
+    # GEOMETRY, MESH AND ASSEMBLY (OR RESUME FROM CHECKPOINT) ----------------------------------------------------------
+    checkpoint = None
+    if model.no_gui_mode and model.build_checkpoint:
+        checkpoint = BuildCheckpoint(output_directory=model.output_directory, model_name=model.model_name,
+                                     fingerprint=model.get_fingerprint())
+
+    if checkpoint is not None and checkpoint.is_valid():
+        telemetry.start_phase('resume_checkpoint')
+        open_model_database(checkpoint.cae_file_path)
+        for name, value in checkpoint.counters.items():
+            telemetry.set_counter(name, value)
+        log_info("Resumed the build from the checkpoint {} (meshed and assembled model). {} of {} load case(s) "
+                 "already written.".format(checkpoint.cae_file_path, len(checkpoint.completed_load_cases),
+                                           len(model.load_cases)))
+    else:
+        __build_plate_mesh_and_assembly(model=model, element_size_in_plane=element_size_in_plane,
+                                        element_size_thickness=element_size_thickness, telemetry=telemetry,
+                                        symmetry_planes=reduction.planes if reduction is not None else [])
+        if checkpoint is not None:
+            telemetry.start_phase('save_checkpoint')
+            save_model_database(checkpoint.cae_file_path)
+            checkpoint.counters = dict(telemetry.counters)
+            checkpoint.write_manifest()
+            log_info("Saved a checkpoint of the meshed and assembled model ({}).".format(checkpoint.cae_file_path))
+
+    # FIELD OUTPUT NODE SETS -------------------------------------------------------------------------------------------
+    field_output_set_names = __create_field_output_node_sets(model=model, telemetry=telemetry)
+
+    # STEP / LOAD / JOB MODULE -----------------------------------------------------------------------------------------
+    for i, step in enumerate(model.load_cases):
+
+        # skip load cases whose .INP file was written before the build was interrupted
+        step_name = 'lc_{}_{}'.format(i, step.name)
+        output_directory = os.path.join(model.output_directory, step_name)
+        job_name = '{}_{}'.format(model.model_name, step_name)
+        if checkpoint is not None and checkpoint.is_load_case_completed(
+                step_name, os.path.join(output_directory, job_name + '.inp')):
+            log_info("Skipped load case {}, its .INP file was already written.".format(step_name))
+            continue
+
+        # delete all steps except initial
+        telemetry.start_phase('{}/step_and_loads'.format(step_name))
+        remove_all_steps()
+
+        # create new explicit step
+        create_step_dynamic_explicit(step_name=step_name,
+                                     time_period=step.duration,
+                                     max_increment=max_time_increment,
+                                     previous_step_name='Initial')
+
+        # create all amplitudes and loads
+        if len(step.transducer_signals) != len(model.transducers):
+            log_warning("In loadcase {}, the number of specified transducer "
+                        "signals ({:d}) does not match the number of transducers ({:d}). "
+                        "Aborting.".format(step_name, len(step.transducer_signals), len(model.transducers)))
+            raise ValueError("Wrong size of loadcase transducer signals.")
+
+        for j, transducer_signal in enumerate(step.transducer_signals):
+            if transducer_signal is not None:
+                if model.model_approach == 'pin_force':
+                    n_amplitude_points = add_transducer_pin_force(step_name=step_name,
+                                                                  transducer=model.transducers[j],
+                                                                  signal=transducer_signal,
+                                                                  max_time_increment=max_time_increment)
+                else:
+                    n_amplitude_points = add_transducer_concentrated_force(step_name=step_name,
+                                                                           transducer=model.transducers[j],
+                                                                           signal=transducer_signal,
+                                                                           max_time_increment=max_time_increment)
+                telemetry.count('amplitude_points', n_amplitude_points)
+
+        # create the boundary conditions of the symmetry component on the symmetry planes
+        if reduction is not None:
+            add_symmetry_boundary_conditions(step_name=step_name, component=reduction.components[i])
+            log_info("Load case {} is a {} symmetry component.".format(step_name,
+                                                                      get_component_label(reduction.components[i])))
+
+        # create output request for piezo node sets
+        remove_standard_field_output_request()
+        history_output_interval = model.get_history_output_interval(step)
+        n_history_node_sets = add_history_output_request_transducer_signals(
+            transducers=model.transducers, create_step_name=step_name, variables=step.history_output_variables,
+            time_interval=history_output_interval, all_surfaces=step.history_output_all_surfaces)
+        telemetry.count('history_node_sets', n_history_node_sets)
+        if history_output_interval is not None:
+            log_info("History output of {} ({} node sets) every {:.2e} s.".format(
+                ', '.join(step.history_output_variables), n_history_node_sets, history_output_interval))
+
+        if step.output_request == 'history':
+            log_info("Created load case {} with history output requested.".format(step_name))
+
+        if step.output_request == 'field':
+            field_output_interval = model.get_field_output_interval(step)
+            num_field_output_nodes = add_field_output_request_plate_surface(
+                plate=model.plate, create_step_name=step_name, time_interval=field_output_interval,
+                node_set_name=field_output_set_names[i])
+            field_output_size = get_field_output_size_estimate(num_nodes=num_field_output_nodes,
+                                                               duration=step.duration,
+                                                               time_interval=field_output_interval)
+            telemetry.count('field_output_bytes_estimate', field_output_size)
+            log_info("Created load case {} with history and field output requested. Field output of {} nodes every "
+                     "{:.2e} s, estimated .ODB size: {:.1f} MB.".format(step_name, num_field_output_nodes,
+                                                                        field_output_interval, field_output_size / 1e6))
+            check_field_output_interval(step_name=step_name, time_interval=field_output_interval,
+                                        max_frequency=model.max_frequency)
+
+        # write ABAQUS input (.INP) file for this load case
+        if model.no_gui_mode:
+            telemetry.start_phase('{}/write_input'.format(step_name))
+            if model.shared_mesh_include:
+                include_file_path = os.path.join(model.output_directory, '{}_mesh.inc'.format(model.model_name))
+                write_input_file_with_shared_include(job_name=job_name, output_directory=output_directory,
+                                                     include_file_path=include_file_path)
+            else:
+                write_input_file(job_name=job_name, output_directory=output_directory)
+            telemetry.count('inp_files')
+            telemetry.count('inp_bytes', os.path.getsize(os.path.join(output_directory, job_name + '.inp')))
+            if checkpoint is not None:
+                checkpoint.mark_load_case_completed(step_name)
+            log_info("Created an ABAQUS job definition (.INP) file for "
+                     "the current load case ({}.inp).".format(step_name))
+        else:
+            log_info("Automatic .INP-file generation is omitted when ABAQUS is run in GUI-mode. You can "
+                     "create a job for the last load case manually using the ABAQUS GUI or rerun this script "
+                     "with noGUI flag.")
+
+    # TELEMETRY --------------------------------------------------------------------------------------------------------
+    telemetry.end_phase()
+    if model.no_gui_mode:
+        include_file_path = os.path.join(model.output_directory, '{}_mesh.inc'.format(model.model_name))
+        if model.shared_mesh_include and os.path.exists(include_file_path):
+            telemetry.count('inp_bytes', os.path.getsize(include_file_path))
+        telemetry_file_path = telemetry.save(model.output_directory)
+        log_info("Build telemetry written to {}. Slowest phases: {}".format(
+            telemetry_file_path, ', '.join(['{} ({:.1f} s)'.format(name, wall_time)
+                                            for name, wall_time in telemetry.get_slowest_phases()])))
+
+
+def __build_plate_mesh_and_assembly(model, element_size_in_plane, element_size_thickness, telemetry, symmetry_planes):
+    """
+    (Helper) Creates the plate geometry with all defects and transducers, partitions and meshes the plate (cut at the
+    symmetry planes), assembles the model and assigns seams to the cracks.
+
+    :param FEModel model: The FEModel instance to set up in ABAQUS/CAE.
+    :param float element_size_in_plane: Element size (in-plane).
+    :param float element_size_thickness: Element size (through-thickness).
+    :param BuildTelemetry telemetry: Telemetry of the build.
+    :param list[str] symmetry_planes: Symmetry planes at which the plate is cut (empty list for the full model).
+    :return: None
+    """
     # PART MODULE ------------------------------------------------------------------------------------------------------
     # create the plate as a part in abaqus
+    telemetry.start_phase('plate')
     create_isotropic_rectangular_plate_part(model.plate)
     log_info("Created plate geometry: {}".format(model.plate.description))
 
-    # create a pristine plate w/o defects or piezo-elements, and obtain a structured mesh for better partitioning
-    create_reference_mesh_plate_part(plate=model.plate, element_size=element_size_in_plane)
-
     # create the defects geometry
+    telemetry.start_phase('defects_and_transducers')
     bounding_box_list = []
-    for i, defect in enumerate(model.defects):
-        defect.set_identifiers(unique_id=i + 1)
-        if isinstance(defect, Hole):
+    for defect in model.defects:
+        if isinstance(defect, Hole) and not model.batched_geometry:
             bounding_box = create_circular_hole_in_plate(plate=model.plate,
                                                          hole=defect,
                                                          element_size=element_size_in_plane)
@@ -63,58 +285,110 @@ def build_abaqus_model_point_force(model):
                                                  element_size=element_size_in_plane)
             bounding_box_list.append(bounding_box)
 
-    log_txt = ', '.join([type(defect).__name__ for defect in model.defects])
-    log_info("Added {} defect(s):\n{}".format(len(model.defects), log_txt))
-
     # create the transducer geometry
-    for i, transducer in enumerate(model.transducers):
-        if isinstance(transducer, CircularTransducer):
-            transducer.set_identifiers(unique_id=i + 1)
+    for transducer in model.transducers:
+        if not model.batched_geometry:
             bounding_box = create_transducer_as_vertex_on_plate(plate=model.plate, transducer=transducer,
-                                                                element_size=element_size_in_plane)
+                                                                element_size=element_size_in_plane,
+                                                                circumference=model.model_approach == 'pin_force')
             bounding_box_list.append(bounding_box)
-        else:
-            raise NotImplementedError("Transducer of type {} not implemented.".format(type(transducer)))
+
+    # (batched) create the geometry of all holes and transducers at once
+    if model.batched_geometry:
+        holes = [defect for defect in model.defects if isinstance(defect, Hole)]
+        bounding_box_list.extend(create_holes_and_transducers_in_plate(plate=model.plate,
+                                                                       holes=holes,
+                                                                       transducers=model.transducers,
+                                                                       element_size=element_size_in_plane,
+                                                                       circumference=model.model_approach ==
+                                                                       'pin_force'))
+
+    log_txt = ', '.join([type(defect).__name__ for defect in model.defects])
+    log_info("Added {} defect(s):\n{}".format(len(model.defects), log_txt))
 
     log_info("Added " + str(len(model.transducers)) + " nodes, representing the piezoelectric transducers.")
+    telemetry.set_counter('defects', len(model.defects))
+    telemetry.set_counter('transducers', len(model.transducers))
 
     # partition the plate into partitions that are suitable for structured meshing
     log_info("Generating a rectilinear partitioning strategy for the plate. This might take some time...")
-    cells = partition_rectangle_with_rectilinear_cutouts(rectangle_width=model.plate.width,
-                                                         rectangle_length=model.plate.length,
-                                                         cut_outs=bounding_box_list)
+    telemetry.start_phase('partitioning_strategy')
+    if model.partitioning_starts > 1:
+        # the pool workers are forked from the CAE kernel process, which is not possible on Windows
+        n_processes = 1 if os.name == 'nt' else None
+        cells = partition_rectangle_with_rectilinear_cutouts_multi_start(rectangle_width=model.plate.width,
+                                                                         rectangle_length=model.plate.length,
+                                                                         cut_outs=bounding_box_list,
+                                                                         n_starts=model.partitioning_starts,
+                                                                         time_budget=model.partitioning_time_budget,
+                                                                         n_processes=n_processes)
+    else:
+        cells = partition_rectangle_with_rectilinear_cutouts(rectangle_width=model.plate.width,
+                                                             rectangle_length=model.plate.length,
+                                                             cut_outs=bounding_box_list)
     log_info("Done. Starting to create {:d} rectangular partitions on the plate part.".format(len(cells)))
-    err_count = 0
-    for i, cell in enumerate(cells[:-1]):
-        left, bottom, right, top = (cell[0], cell[1], cell[2], cell[3])
-        status, warning = add_rectangular_cell_partition_to_plate(model.plate,
-                                                                  (left, bottom),
-                                                                  (right, top))
-        err_count += status
-    if err_count > 0:
-        log_warning("{} partitions could not be created. Probably the target region"
-                    " was already rectangular.".format(err_count))
+    telemetry.set_counter('partitions', len(cells))
+    telemetry.start_phase('partitioning')
+    if model.batched_partitioning:
+        partition_lines = get_partition_lines(rectangle_width=model.plate.width,
+                                              rectangle_length=model.plate.length,
+                                              cells=cells)
+        err_count, warning = add_rectangular_cell_partitions_to_plate(model.plate, partition_lines)
+        if err_count > 0:
+            log_warning("{} of {} partition lines could not be created. {}".format(err_count, len(partition_lines),
+                                                                                  warning))
+    else:
+        err_count = 0
+        for i, cell in enumerate(cells[:-1]):
+            left, bottom, right, top = (cell[0], cell[1], cell[2], cell[3])
+            status, warning = add_rectangular_cell_partition_to_plate(model.plate,
+                                                                      (left, bottom),
+                                                                      (right, top))
+            err_count += status
+        if err_count > 0:
+            log_warning("{} partitions could not be created. Probably the target region"
+                        " was already rectangular.".format(err_count))
+
+    # only model the region on one side of the symmetry planes
+    if symmetry_planes:
+        telemetry.start_phase('symmetry_cut')
+        cut_plate_to_symmetry_region(plate=model.plate, planes=symmetry_planes)
+        log_info("Cut the plate at the symmetry plane(s) {}.".format(' and '.join(symmetry_planes)))
+
+    # conventional shells are meshed on the mid-surface of the partitioned plate
+    if model.model_approach == 'shell':
+        telemetry.start_phase('mid_surface')
+        convert_plate_to_mid_surface(plate=model.plate, transducers=model.transducers, defects=model.defects)
+        log_info("Converted the plate to its mid-surface for meshing with conventional shell elements.")
 
     # PROPERTY MODULE --------------------------------------------------------------------------------------------------
+    telemetry.start_phase('material')
     create_isotropic_material(model.plate.material)
-    assign_material(set_name=model.plate.material_cell_set_name, material=model.plate.material)
+    shell_thickness = model.plate.thickness if model.model_approach in ('continuum_shell', 'shell') else None
+    assign_material(set_name=model.plate.material_cell_set_name, material=model.plate.material,
+                    shell_thickness=shell_thickness)
 
     # MESH MODULE ------------------------------------------------------------------------------------------------------
+    telemetry.start_phase('mesh')
+    element_type = ELEMENT_TYPES[model.model_approach]
     num_nodes = mesh_part(element_size_in_plane=element_size_in_plane,
                           element_size_thickness=element_size_thickness,
                           plate=model.plate,
                           transducers=model.transducers,
-                          defects=model.defects)
+                          defects=model.defects,
+                          element_type=element_type,
+                          circumference=model.model_approach == 'pin_force')
+    log_info("Meshed the plate with {} elements.".format(element_type))
     log_info("The FE model has {} nodes.".format('{:,d}'.format(num_nodes).replace(',', ' ')))
-
-    # delete the reference mesh plate
-    remove_reference_mesh_plate_part()
+    telemetry.set_counter('nodes', num_nodes)
 
     # ASSEMBLY MODULE --------------------------------------------------------------------------------------------------
+    telemetry.start_phase('assembly')
     assemble()
     log_info("Plate instantiated in new assembly.")
 
     # INTERACTION MODULE -----------------------------------------------------------------------------------------------
+    telemetry.start_phase('seams')
     seam_count = 0
     for defect in model.defects:
         if isinstance(defect, Crack):
@@ -122,54 +396,22 @@ def build_abaqus_model_point_force(model):
             seam_count += 1
     log_info("Assigned seams to {:d} cracks.".format(seam_count))
 
-    # STEP / LOAD / JOB MODULE -----------------------------------------------------------------------------------------
-    for i, step in enumerate(model.load_cases):
-
-        # delete all steps except initial
-        remove_all_steps()
-
-        # create new explicit step
-        step_name = 'lc_{}_{}'.format(i, step.name)
-        create_step_dynamic_explicit(step_name=step_name,
-                                     time_period=step.duration,
-                                     max_increment=max_time_increment,
-                                     previous_step_name='Initial')
-
-        # create all amplitudes and loads
-        if len(step.transducer_signals) != len(model.transducers):
-            log_warning("In loadcase {}, the number of specified transducer "
-                        "signals ({:d}) does not match the number of transducers ({:d}). "
-                        "Aborting.".format(step_name, len(step.transducer_signals), len(model.transducers)))
-            raise ValueError("Wrong size of loadcase transducer signals.")
-
-        for j, transducer_signal in enumerate(step.transducer_signals):
-            if transducer_signal is not None:
-                add_transducer_concentrated_force(step_name=step_name,
-                                                  transducer=model.transducers[j],
-                                                  signal=transducer_signal,
-                                                  max_time_increment=max_time_increment)
 
-        # create output request for piezo node sets
-        remove_standard_field_output_request()
-        if step.output_request == 'history':
-            add_history_output_request_transducer_signals(transducers=model.transducers,
-                                                          create_step_name=step_name)
-            log_info("Created load case {} with history output requested.".format(step_name))
-
-        if step.output_request == 'field':
-            add_history_output_request_transducer_signals(transducers=model.transducers,
-                                                          create_step_name=step_name)
-            add_field_output_request_plate_surface(plate=model.plate, create_step_name=step_name,
-                                                   time_interval=max_time_increment * 10)
-            log_info("Created load case {} with history and field output requested.".format(step_name))
+def __create_field_output_node_sets(model, telemetry):
+    """
+    (Helper) Creates the node sets for all load cases whose field output is restricted to a subset of the plate surface
+    nodes (see :class:`LoadCase`). Load cases with the same restriction share one set. The sets are part of the model
+    data, so they are created before the first .INP file is written.
 
-        # write ABAQUS input (.INP) file for this load case
-        if model.no_gui_mode:
-            output_directory = os.path.join(model.output_directory, step_name)
-            write_input_file(job_name='{}_{}'.format(model.model_name, step_name), output_directory=output_directory)
-            log_info("Created an ABAQUS job definition (.INP) file for "
-                     "the current load case ({}.inp).".format(step_name))
-        else:
-            log_info("Automatic .INP-file generation is omitted when ABAQUS is run in GUI-mode. You can "
-                     "create a job for the last load case manually using the ABAQUS GUI or rerun this script "
-                     "with noGUI flag.")
+    :param FEModel model: The FEModel instance to set up in ABAQUS/CAE.
+    :param BuildTelemetry telemetry: Telemetry of the build.
+    :return: Name of the field output node set of each load case (None for all plate surface nodes).
+    :rtype: list[str]
+    """
+    set_names, set_definitions = get_field_output_node_set_definitions(model)
+    for set_name, node_spacing, regions in set_definitions:
+        telemetry.start_phase('field_output_sets')
+        num_nodes = create_field_output_node_set(plate=model.plate, set_name=set_name, node_spacing=node_spacing,
+                                                 regions=regions)
+        log_info("Created the field output node set {} with {} nodes.".format(set_name, num_nodes))
+    return set_names
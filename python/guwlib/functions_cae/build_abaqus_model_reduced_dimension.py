@@ -0,0 +1,177 @@
+from guwlib import *
+from guwlib.functions_utility.console_output import *
+from guwlib.functions_utility.build_telemetry import BuildTelemetry
+from guwlib.functions_utility.reduced_dimension import (get_transmitter_index, get_axisymmetric_section,
+                                                        get_plane_strain_section, write_reduced_dimension_mapping,
+                                                        REDUCED_DIMENSION_MAPPING_FILE_SUFFIX)
+from guwlib.functions_cae.helper_functions_reduced_dimension import *
+
+
+def build_abaqus_model_reduced_dimension(model):
+    """
+    Performs the modelling of a two-dimensional FE model in ABAQUS/CAE from the (three-dimensional) model definition,
+    either as an axisymmetric model with the transmitter on the axis of symmetry (``model_approach='axisymmetric'``) or
+    as a plane strain cross-section through the transmitter and a receiver (``model_approach='plane_strain'``).
+    Transducers are modelled as point forces (single nodes), the resulting ABAQUS simulation is purely explicit
+    (ABAQUS/EXPLICIT).
+
+    The modelling process is divided into the following steps:
+
+    - Find the transmitter (the only excited transducer) and map the transducers to positions along the cross-section.
+    - Create the cross-section of the plate as a part, partitioned at the transducer positions.
+    - Create and assign the plates' material.
+    - Mesh the cross-section with the desired elements per wavelength / thickness (CAX4R or CPE4R).
+    - Assemble the model by instantiating the plate part in a new assembly.
+    - Create dynamic/explicit steps, amplitudes, concentrated forces and output requests for each defined load case.
+    - Trigger .INP file generation, if the script is run in noGUI mode. A mapping file is written next to each .INP
+      file, which allows the history export to write the results in the same layout as for the 3D model.
+
+    Only pristine plates are supported. Concentrated forces of axisymmetric models are total forces over the
+    circumference, so the excitation is equivalent to a point force in the 3D model. Concentrated forces of plane
+    strain models are line forces (per unit length normal to the section).
+
+    :param FEModel model: The FEModel instance to set up in ABAQUS/CAE.
+    :return: None
+    """
+
+    telemetry = BuildTelemetry(model.model_name)
+    axisymmetric = model.model_approach == 'axisymmetric'
+
+    # TIME AND SPACE DISCRETIZATION ------------------------------------------------------------------------------------
+    telemetry.start_phase('discretization')
+    element_size_in_plane = model.get_element_size_in_plane()
+    element_size_thickness = model.get_element_size_thickness()
+    max_time_increment = model.get_max_time_increment()
+
+    log_info("Element size, in-plane:          {:.2e} m (for {:.0f} elements per wavelength)\n"
+             "Element size, through-thickness: {:.2e} m (for {:.0f} elements per thickness)\n"
+             "Max. time increment:             {:.2e} s (for a Courant number of {:.2f})"
+             "".format(element_size_in_plane, model.elements_per_wavelength,
+                       element_size_thickness, model.elements_in_thickness_direction,
+                       max_time_increment, model.courant_number))
+
+    # CROSS-SECTION ----------------------------------------------------------------------------------------------------
+    for i, transducer in enumerate(model.transducers):
+        transducer.set_identifiers(unique_id=i + 1)
+
+    transmitter_index = get_transmitter_index(model.load_cases)
+    if axisymmetric:
+        section_length, positions = get_axisymmetric_section(plate=model.plate, transducers=model.transducers,
+                                                             transmitter_index=transmitter_index)
+        directions = [angle for _, angle in positions]
+        positions = [radius for radius, _ in positions]
+        log_info("Axisymmetric model with transducer {} on the axis, radius {:.3f} m."
+                 "".format(transmitter_index + 1, section_length))
+    else:
+        section_length, section_direction, positions = \
+            get_plane_strain_section(plate=model.plate, transducers=model.transducers,
+                                     transmitter_index=transmitter_index,
+                                     receiver_index=model.plane_strain_receiver_index)
+        directions = [section_direction] * len(positions)
+        log_info("Plane strain cross-section through transducer {}, length {:.3f} m, direction {:.1f} deg."
+                 "".format(transmitter_index + 1, section_length, math.degrees(section_direction)))
+
+    section_transducers = [transducer if position is not None else None
+                           for transducer, position in zip(model.transducers, positions)]
+    transducer_positions = [(transducer, position) for transducer, position in zip(model.transducers, positions)
+                            if position is not None]
+    skipped = len(model.transducers) - len(transducer_positions)
+    if skipped > 0:
+        log_warning("{} transducer(s) are not on the cross-section and are omitted.".format(skipped))
+
+    # PART MODULE ------------------------------------------------------------------------------------------------------
+    telemetry.start_phase('plate')
+    create_reduced_dimension_plate_part(plate=model.plate, section_length=section_length,
+                                        transducer_positions=transducer_positions, axisymmetric=axisymmetric)
+    log_info("Created the cross-section of the plate: {}".format(model.plate.description))
+    telemetry.set_counter('transducers', len(transducer_positions))
+
+    # PROPERTY MODULE --------------------------------------------------------------------------------------------------
+    telemetry.start_phase('material')
+    create_isotropic_material(model.plate.material)
+    assign_material(set_name=model.plate.material_cell_set_name, material=model.plate.material)
+
+    # MESH MODULE ------------------------------------------------------------------------------------------------------
+    telemetry.start_phase('mesh')
+    num_nodes = mesh_reduced_dimension_part(element_size_in_plane=element_size_in_plane,
+                                            element_size_thickness=element_size_thickness,
+                                            axisymmetric=axisymmetric)
+    log_info("The FE model has {} nodes.".format('{:,d}'.format(num_nodes).replace(',', ' ')))
+    telemetry.set_counter('nodes', num_nodes)
+
+    # ASSEMBLY MODULE --------------------------------------------------------------------------------------------------
+    telemetry.start_phase('assembly')
+    assemble()
+    log_info("Plate instantiated in new assembly.")
+
+    # STEP / LOAD / JOB MODULE -----------------------------------------------------------------------------------------
+    for i, step in enumerate(model.load_cases):
+        step_name = 'lc_{}_{}'.format(i, step.name)
+        output_directory = os.path.join(model.output_directory, step_name)
+        job_name = '{}_{}'.format(model.model_name, step_name)
+
+        # delete all steps except initial
+        telemetry.start_phase('{}/step_and_loads'.format(step_name))
+        remove_all_steps()
+
+        # create new explicit step
+        create_step_dynamic_explicit(step_name=step_name,
+                                     time_period=step.duration,
+                                     max_increment=max_time_increment,
+                                     previous_step_name='Initial')
+
+        # create the amplitude and load of the transmitter
+        transducer_signal = step.transducer_signals[transmitter_index]
+        n_amplitude_points = add_transducer_concentrated_force(step_name=step_name,
+                                                               transducer=model.transducers[transmitter_index],
+                                                               signal=transducer_signal,
+                                                               max_time_increment=max_time_increment,
+                                                               force_component=2)
+        telemetry.count('amplitude_points', n_amplitude_points)
+
+        # create output request for piezo node sets
+        remove_standard_field_output_request()
+        # U1 / U2 of the 3D model correspond to U1 (radial / in-section), U3 to U2 (through-thickness) of the 2D model
+        history_output_variables = tuple(sorted(set('U2' if variable == 'U3' else 'U1'
+                                                    for variable in step.history_output_variables)))
+        n_history_node_sets = add_history_output_request_transducer_signals(
+            transducers=section_transducers, create_step_name=step_name, variables=history_output_variables,
+            time_interval=model.get_history_output_interval(step), all_surfaces=step.history_output_all_surfaces)
+        telemetry.count('history_node_sets', n_history_node_sets)
+        if step.output_request == 'field':
+            if step.has_reduced_field_output():
+                log_warning("Field output node spacing and regions are ignored for models with reduced dimension.")
+            field_output_interval = model.get_field_output_interval(step)
+            num_field_output_nodes = add_field_output_request_plate_surface(plate=model.plate,
+                                                                            create_step_name=step_name,
+                                                                            time_interval=field_output_interval)
+            telemetry.count('field_output_bytes_estimate', get_field_output_size_estimate(
+                num_nodes=num_field_output_nodes, duration=step.duration, time_interval=field_output_interval))
+        log_info("Created load case {} with {} output requested.".format(step_name, step.output_request))
+
+        # write ABAQUS input (.INP) file and the 2D mapping file for this load case
+        if model.no_gui_mode:
+            telemetry.start_phase('{}/write_input'.format(step_name))
+            write_input_file(job_name=job_name, output_directory=output_directory)
+            node_set_directions = {}
+            for transducer, direction in zip(section_transducers, directions):
+                if transducer is not None:
+                    node_set_directions[transducer.on_plate_top_set_name] = direction
+                    node_set_directions[transducer.on_plate_bottom_set_name] = direction
+            write_reduced_dimension_mapping(
+                file_path=os.path.join(output_directory, job_name + REDUCED_DIMENSION_MAPPING_FILE_SUFFIX),
+                model_approach=model.model_approach, node_set_directions=node_set_directions)
+            telemetry.count('inp_files')
+            telemetry.count('inp_bytes', os.path.getsize(os.path.join(output_directory, job_name + '.inp')))
+            log_info("Created an ABAQUS job definition (.INP) file for "
+                     "the current load case ({}.inp).".format(step_name))
+        else:
+            log_info("Automatic .INP-file generation is omitted when ABAQUS is run in GUI-mode. You can "
+                     "create a job for the last load case manually using the ABAQUS GUI or rerun this script "
+                     "with noGUI flag.")
+
+    # TELEMETRY --------------------------------------------------------------------------------------------------------
+    telemetry.end_phase()
+    if model.no_gui_mode:
+        telemetry_file_path = telemetry.save(model.output_directory)
+        log_info("Build telemetry written to {}.".format(telemetry_file_path))
@@ -0,0 +1,222 @@
+"""
+Builds several GUWlib model files (.PY) or model specifications (.JSON / .YAML, see
+``guwlib.functions_utility.model_spec``) in a single ABAQUS/CAE session, so that the CAE startup and the licence
+checkout are paid only once for the whole batch instead of once per model file.
+
+The driver (this script, run inside ABAQUS/CAE) runs each model file as ``__main__`` against a fresh model database
+(``Mdb()``), and builds each variant of a model specification against a fresh model database. Exceptions of a model
+file are caught and reported, so that the remaining model files are still built. The status of each model file
+(``'running'``, ``'done'`` or ``'failed'``, with wall time and error message) is written to a JSON status file after
+every change. If the CAE process itself crashes, the model file that was being built remains ``'running'``:
+:func:`run_build_session` (run with a plain python interpreter) marks it as ``'crashed'`` and restarts the driver in a
+new CAE session for the remaining model files.
+
+Call this script from the root directory of guwlib, with the path to the status file and the model files:
+
+    ``abaqus cae noGUI=guwlib/functions_cae/build_session.py -- results/build_session.json models/a.py models/b.py``
+
+Model files that are already ``'done'``, ``'failed'`` or ``'crashed'`` in the status file are skipped. Before a session
+is started, :func:`run_build_session` marks model files whose .INP files can be reused (unchanged fingerprint, see
+``guwlib.functions_utility.build_cache``) as ``'done'``, so ABAQUS/CAE is not started for unchanged models.
+"""
+from __future__ import print_function
+
+import json
+import os
+import runpy
+import subprocess
+import sys
+import time
+import traceback
+
+STATUS_RUNNING = 'running'
+STATUS_DONE = 'done'
+STATUS_FAILED = 'failed'
+STATUS_CRASHED = 'crashed'
+FINISHED_STATUSES = (STATUS_DONE, STATUS_FAILED, STATUS_CRASHED)
+
+# default path of the status file (relative to the root directory of guwlib)
+DEFAULT_STATUS_FILE_PATH = os.path.join('results', 'build_session_status.json')
+
+
+def build_model_files(model_file_paths, status_file_path):
+    """
+    Builds the model files one after another in the current ABAQUS/CAE session (has to be called from the ABAQUS python
+    interpreter). A failing model file is reported and skipped.
+
+    :param list[str] model_file_paths: Paths to the GUWlib model files (.PY).
+    :param str status_file_path: Path to the JSON status file.
+    :return: Status of all model files in the status file.
+    :rtype: dict
+    """
+    status = read_build_session_status(status_file_path)
+    for model_file_path in model_file_paths:
+        if status.get(model_file_path, {}).get('status') in FINISHED_STATUSES:
+            print("Skipped {} ({}).".format(model_file_path, status[model_file_path]['status']), file=sys.__stdout__)
+            continue
+
+        status[model_file_path] = {'status': STATUS_RUNNING}
+        write_build_session_status(status_file_path, status)
+        print("Building {} ...".format(model_file_path), file=sys.__stdout__)
+
+        start_time = time.time()
+        working_directory = os.getcwd()
+        try:
+            __build_model_file(model_file_path)
+            status[model_file_path] = {'status': STATUS_DONE, 'wall_time': time.time() - start_time}
+        except (Exception, SystemExit) as e:
+            traceback.print_exc(file=sys.__stdout__)
+            status[model_file_path] = {'status': STATUS_FAILED, 'wall_time': time.time() - start_time,
+                                       'error': '{}: {}'.format(type(e).__name__, e)}
+        finally:
+            os.chdir(working_directory)
+        write_build_session_status(status_file_path, status)
+        print("{}: {} ({:.1f} s)".format(model_file_path, status[model_file_path]['status'],
+                                         status[model_file_path]['wall_time']), file=sys.__stdout__)
+    return status
+
+
+def run_build_session(model_file_paths, status_file_path=DEFAULT_STATUS_FILE_PATH, max_sessions=None):
+    """
+    Builds the model files with the driver in as few ABAQUS/CAE sessions as possible (to be called with a plain python
+    interpreter from the root directory of guwlib). If a session crashes, the model file that was being built is marked
+    as ``'crashed'`` and a new session is started for the remaining model files.
+
+    :param list[str] model_file_paths: Paths to the GUWlib model files (.PY).
+    :param str status_file_path: Path to the JSON status file. Model files that are finished according to an existing
+        status file are not built again; delete the file to rebuild all model files.
+    :param int max_sessions: Maximum number of CAE sessions to start. If None, at most one session per model file.
+    :return: Status of all model files in the status file.
+    :rtype: dict
+    """
+    max_sessions = len(model_file_paths) if max_sessions is None else max_sessions
+    driver_script_path = os.path.abspath(__file__)
+    if driver_script_path.endswith('.pyc'):
+        driver_script_path = driver_script_path[:-1]
+
+    status = read_build_session_status(status_file_path)
+    status = __mark_unchanged_model_files(model_file_paths, status, status_file_path)
+    for _ in range(max_sessions):
+        remaining_model_file_paths = [model_file_path for model_file_path in model_file_paths
+                                      if status.get(model_file_path, {}).get('status') not in FINISHED_STATUSES]
+        if not remaining_model_file_paths:
+            break
+
+        print("Starting an ABAQUS/CAE session for {} model file(s) ...".format(len(remaining_model_file_paths)))
+        command = 'abaqus cae noGUI={} -- {} {}'.format(driver_script_path, status_file_path,
+                                                          ' '.join(remaining_model_file_paths))
+        subprocess.Popen(command, shell=True).wait()
+
+        # a model file that is still running has crashed the session
+        status = read_build_session_status(status_file_path)
+        if not any(model_file_path in status for model_file_path in remaining_model_file_paths):
+            print("The ABAQUS/CAE session did not start any model file, aborting.")
+            break
+        for model_file_path in remaining_model_file_paths:
+            if status.get(model_file_path, {}).get('status') == STATUS_RUNNING:
+                status[model_file_path] = {'status': STATUS_CRASHED,
+                                           'error': 'The ABAQUS/CAE session terminated while building this file.'}
+                print("{} crashed the ABAQUS/CAE session.".format(model_file_path))
+        write_build_session_status(status_file_path, status)
+
+    for model_file_path in model_file_paths:
+        print("{}: {}".format(model_file_path, status.get(model_file_path, {}).get('status', 'not built')))
+    return status
+
+
+def read_build_session_status(status_file_path):
+    """
+    :param str status_file_path: Path to the JSON status file.
+    :return: Status of all model files in the status file (empty if the file does not exist).
+    :rtype: dict
+    """
+    if not os.path.exists(status_file_path):
+        return {}
+    with open(status_file_path, 'r') as file:
+        return json.load(file)
+
+
+def write_build_session_status(status_file_path, status):
+    """
+    Writes the status file (atomically, so that a crash never leaves a truncated file).
+
+    :param str status_file_path: Path to the JSON status file.
+    :param dict status: Status of all model files.
+    :return: None
+    """
+    directory = os.path.dirname(status_file_path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    temporary_file_path = status_file_path + '.tmp'
+    with open(temporary_file_path, 'w') as file:
+        json.dump(status, file, indent=2, sort_keys=True)
+    if os.path.exists(status_file_path):
+        os.remove(status_file_path)
+    os.rename(temporary_file_path, status_file_path)
+
+
+def __mark_unchanged_model_files(model_file_paths, status, status_file_path):
+    """
+    (Helper) Marks the model files that are unchanged since their last build (see
+    ``guwlib.functions_utility.build_cache.is_build_up_to_date``) as done, so that their .INP files are reused.
+
+    :return: Updated status of all model files.
+    :rtype: dict
+    """
+    from guwlib.functions_utility.build_cache import is_build_up_to_date
+
+    for model_file_path in model_file_paths:
+        if status.get(model_file_path, {}).get('status') in FINISHED_STATUSES:
+            continue
+        if is_build_up_to_date(model_file_path):
+            status[model_file_path] = {'status': STATUS_DONE, 'wall_time': 0.0, 'reused': True}
+            print("{} is unchanged since its last build, reusing its .INP files.".format(model_file_path))
+    write_build_session_status(status_file_path, status)
+    return status
+
+
+def __build_model_file(model_file_path):
+    """
+    (Helper) Runs a model file as ``__main__`` against a fresh model database. The variants of a model specification
+    are built one after another, each against a fresh model database; a failing variant doesn't stop the remaining
+    ones, but fails the specification.
+    """
+    from guwlib.functions_utility.model_spec import is_model_spec_file, create_models_from_file
+
+    if not is_model_spec_file(model_file_path):
+        __reset_model_database()
+        runpy.run_path(model_file_path, run_name='__main__')
+        return
+
+    failed_models = []
+    for model in create_models_from_file(model_file_path):
+        print("Building variant {} ...".format(model.model_name), file=sys.__stdout__)
+        __reset_model_database()
+        try:
+            model.setup_in_abaqus()
+        except Exception:
+            traceback.print_exc(file=sys.__stdout__)
+            failed_models.append(model.model_name)
+    if failed_models:
+        raise RuntimeError("The variant(s) {} failed.".format(', '.join(failed_models)))
+
+
+def __reset_model_database():
+    """
+    (Helper) Creates a fresh model database.
+    """
+    from abaqus import Mdb
+    Mdb()
+
+    # the CAE helper modules bind the model database at import, they are imported again for the new one
+    for module_name in list(sys.modules):
+        if module_name.startswith('guwlib.functions_cae.') and module_name != __name__:
+            del sys.modules[module_name]
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+if __name__ == "__main__":
+    arguments = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else sys.argv[1:]
+    if os.getcwd() not in sys.path:
+        sys.path.insert(0, os.getcwd())
+    build_model_files(model_file_paths=arguments[1:], status_file_path=arguments[0])
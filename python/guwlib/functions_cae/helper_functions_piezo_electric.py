@@ -528,10 +528,11 @@ def add_amplitude(name, signal, max_time_increment):
         # nonzero for the very first Abaqus/Explicit increment
         time_data_table = [(0, signal.magnitude), (max_time_increment * 1e-2, 0)]
     else:
-        # all other signals besides impulses can be sampled from the signal definition in their method 'get_value_at'
+        # all other signals besides impulses can be sampled from the signal definition in their method 'get_value_at',
+        # scaled by the signal magnitude
         time_data_table = []
         for t in np.arange(start=signal.dt, stop=signal.dt + signal.get_duration() * 1.01, step=max_time_increment / 2):
-            time_data_table.append((t, signal.get_value_at(t=t)))
+            time_data_table.append((t, signal.magnitude * signal.get_value_at(t=t)))
 
     # create amplitude in Abaqus
     mdb.models[STD_MODEL_NAME].TabularAmplitude(name=name,
@@ -9,6 +9,12 @@ import numpy as np
 
 from guwlib import *
 import guwlib.functions_utility.console_output
+from guwlib.functions_utility.console_output import log_warning
+from guwlib.functions_utility.amplitudes import get_amplitude_table
+from guwlib.functions_utility.grid_snapping import get_snapped_bounding_box_coordinates
+from guwlib.functions_utility.point_force_model import get_concentrated_forces, get_field_output_size_estimate
+from guwlib.functions_utility.input_file_splitting import (split_input_file, split_input_file_lines,
+                                                           write_load_case_input_file)
 
 from abaqus import *
 from abaqusConstants import *
@@ -34,7 +40,6 @@ import step
 # constant names used throughout all functions
 MODEL_NAME = 'guw_model'
 PLATE_PART_NAME = 'plate'
-REFERENCE_PLATE_PART_NAME = 'reference_plate'
 
 
 # PART MODULE HELPER FUNCTIONS -----------------------------------------------------------------------------------------
@@ -67,36 +72,6 @@ def create_isotropic_rectangular_plate_part(plate):
     p.Set(faces=p.faces.getByBoundingBox(zMin=plate.thickness / 2), name=plate.field_output_face_set_name)
 
 
-def create_reference_mesh_plate_part(plate, element_size):
-    """
-    Creates and meshes a temporary reference plate without any defects or transducers. The reference mesh
-    is used to create suitable partitions on the actual plate part for a better mesh quality.
-
-    :param IsotropicRectangular plate: Plate instance for which to create the reference part in ABAQUS.
-    :param float element_size: Desired element size (in-plane) used for meshing.
-    :return: None
-    """
-    # create an extrusion from two-dimensional shape
-    s = mdb.models[MODEL_NAME].ConstrainedSketch(name='__profile__', sheetSize=2.0)
-    s.rectangle(point1=(0, 0), point2=(plate.width, plate.length))
-    p = mdb.models[MODEL_NAME].Part(name=REFERENCE_PLATE_PART_NAME, dimensionality=TWO_D_PLANAR, type=DEFORMABLE_BODY)
-    p.BaseShell(sketch=s)
-    del s
-
-    # seed and mesh part with desired element size using structured meshing
-    p.setMeshControls(regions=p.cells, technique=STRUCTURED)
-    p.seedPart(size=element_size, deviationFactor=0.1, minSizeFactor=0.1)
-    p.generateMesh()
-
-
-def remove_reference_mesh_plate_part():
-    """
-    Removes the temporary reference plate part.
-    :return: None
-    """
-    del mdb.models[MODEL_NAME].parts[REFERENCE_PLATE_PART_NAME]
-
-
 def create_circular_hole_in_plate(plate, hole, element_size):
     """
     Adds a cut extrude hole to an existing plate part in ABAQUS.
@@ -115,9 +90,6 @@ def create_circular_hole_in_plate(plate, hole, element_size):
     circle_pos_y = hole.position_y
     circle_radius = hole.radius
 
-    # bounding box scaling TODO: make this an instance variable of Hole
-    boundbox_scale = 2.5
-
     # add a sketch of the circle on the plate top surface and cut extrude through the plate
     p = mdb.models[MODEL_NAME].parts[PLATE_PART_NAME]
     sketch_plane_id = plate.datum_xy_plane_id
@@ -133,11 +105,11 @@ def create_circular_hole_in_plate(plate, hole, element_size):
 
     # the area around the circular hole needs to be a separate partition, otherwise ABAQUS cannot mesh the part
     # create a rectangular partition (bounding box) around the hole and adjust the corner coordinates so that they lie
-    # on the nodes of a reference structured mesh
-    boundbox_radius = boundbox_scale * circle_radius
+    # on the nodes of the structured mesh
+    boundbox_radius = hole.bounding_box_scale * circle_radius
     x_left, x_right, y_lower, y_upper, x_center, y_center = (
-        __get_bounding_box_coordinates_from_reference_mesh(circle_pos_x, circle_pos_y, boundbox_radius,
-                                                           element_size))
+        get_snapped_bounding_box_coordinates(circle_pos_x, circle_pos_y, boundbox_radius, plate.width, plate.length,
+                                             element_size))
     lower_left_coord = (x_left, y_lower)
     upper_right_coord = (x_right, y_upper)
     __add_rectangular_cell_partition_to_plate(plate, lower_left_coord, upper_right_coord,
@@ -200,15 +172,13 @@ def create_crack_in_plate(plate, crack, element_size):
     # retrieve part
     p = mdb.models[MODEL_NAME].parts[PLATE_PART_NAME]
 
-    # bounding box scaling and name TODO
-    boundbox_scale = 1.5
-
     # the area around the crack needs to be a separate partition, otherwise ABAQUS can't mesh the part
     # create a rectangular partition (bounding box) around the crack and adjust the corner coordinates so that they lie
-    # on the nodes of a reference structured mesh
-    boundbox_radius = boundbox_scale * crack_length * 0.5
+    # on the nodes of the structured mesh
+    boundbox_radius = crack.bounding_box_scale * crack_length * 0.5
     x_left, x_right, y_lower, y_upper, x_center, y_center = (
-        __get_bounding_box_coordinates_from_reference_mesh(crack_pos_x, crack_pos_y, boundbox_radius, element_size))
+        get_snapped_bounding_box_coordinates(crack_pos_x, crack_pos_y, boundbox_radius, plate.width, plate.length,
+                                             element_size))
     lower_left_coord = (x_left, y_lower)
     upper_right_coord = (x_right, y_upper)
     __add_rectangular_cell_partition_to_plate(plate, lower_left_coord, upper_right_coord,
@@ -270,16 +240,19 @@ def create_crack_in_plate(plate, crack, element_size):
     return [x_left, y_lower, x_right, y_upper]
 
 
-def create_transducer_as_vertex_on_plate(plate, transducer, element_size):
+def create_transducer_as_vertex_on_plate(plate, transducer, element_size, circumference=False):
     """
     Creates the geometry for a point-force representation of a (piezo-electric) transducer.
 
     The plate area around the transducer is partitioned so that a line-intersection at the transducers location is
-    generated. This ensures that a node is placed at the exact position of the piezo element during meshing.
+    generated. This ensures that a node is placed at the exact position of the piezo element during meshing. Optionally,
+    the circumference of the transducer is partitioned as well (for the pin-force representation).
 
     :param IsotropicRectangularPlate plate: Plate to which to add the transducer.
     :param CircularTransducer transducer: Transducer to add to the plate.
     :param float element_size: Desired element size (in-plane) of the mesh. Value is needed for partitioning.
+    :param bool circumference: If True, the circumference of the transducer is added to the top and bottom surface,
+        and stored in the transducers' circumference sets.
     :return: Bounding box coordinates.
     :rtype: list[float, float, float, float]
     """
@@ -288,18 +261,16 @@ def create_transducer_as_vertex_on_plate(plate, transducer, element_size):
     piezo_pos_y = transducer.position_y
     piezo_radius = transducer.radius
 
-    # constants
-    boundbox_scale = 1.0
-
     # retrieve ABAQUS part and datums
     p = mdb.models[MODEL_NAME].parts[PLATE_PART_NAME]
     sketch_plane_id = plate.datum_xy_plane_id
     sketch_up_edge_id = plate.datum_y_axis_id
 
     # partition the plate to get a rectangular bounding box around the piezo element position
-    boundbox_radius = piezo_radius * boundbox_scale
+    boundbox_radius = piezo_radius * transducer.bounding_box_scale
     x_left, x_right, y_lower, y_upper, x_center, y_center = \
-        (__get_bounding_box_coordinates_from_reference_mesh(piezo_pos_x, piezo_pos_y, boundbox_radius, element_size))
+        (get_snapped_bounding_box_coordinates(piezo_pos_x, piezo_pos_y, boundbox_radius, plate.width, plate.length,
+                                              element_size))
 
     lower_left_coord = (x_left, y_lower)
     upper_right_coord = (x_right, y_upper)
@@ -315,6 +286,8 @@ def create_transducer_as_vertex_on_plate(plate, transducer, element_size):
     s.Line(point1=(piezo_pos_x, piezo_pos_y), point2=(x_right, y_center))
     s.Line(point1=(x_center, y_lower), point2=(piezo_pos_x, piezo_pos_y))
     s.Line(point1=(piezo_pos_x, piezo_pos_y), point2=(x_center, y_upper))
+    if circumference:
+        s.CircleByCenterPerimeter(center=(piezo_pos_x, piezo_pos_y), point1=(piezo_pos_x + piezo_radius, piezo_pos_y))
 
     # partition the face
     sketch_face = p.faces.findAt(((piezo_pos_x, piezo_pos_y, 0),),
@@ -330,9 +303,135 @@ def create_transducer_as_vertex_on_plate(plate, transducer, element_size):
     intersection_point = p.vertices.findAt(((piezo_pos_x, piezo_pos_y, 0),))
     p.Set(name=transducer.on_plate_bottom_set_name, vertices=intersection_point)
 
+    if circumference:
+        __add_transducer_circumference_sets(plate, transducer)
+
     return [x_left, y_lower, x_right, y_upper]
 
 
+def create_holes_and_transducers_in_plate(plate, holes, transducers, element_size, circumference=False):
+    """
+    Batched alternative to create_circular_hole_in_plate and create_transducer_as_vertex_on_plate. Adds all holes and
+    transducers to the plate with a fixed number of geometry features, independent of the number of objects:
+
+    - one cut extrude for all holes,
+    - one face and one cell partition for all rectangular bounding boxes,
+    - one face and one cell partition for the radial lines inside all hole bounding boxes,
+    - one face partition (through the thickness) for the line intersections at all transducer positions.
+
+    The holes and transducers must not intersect each other or other geometry features already added to the plate.
+    Their identifiers have to be set beforehand.
+
+    :param IsotropicRectangularPlate plate: Plate to which the holes and transducers are added.
+    :param list[Hole] holes: Holes to add.
+    :param list[CircularTransducer] transducers: Transducers to add.
+    :param float element_size: Desired element size (in-plane) of the mesh. Value is needed for partitioning.
+    :param bool circumference: If True, the circumferences of the transducers are added to the top and bottom surface
+        (in the same face partition), and stored in the transducers' circumference sets.
+    :return: Bounding box coordinates of all holes and transducers.
+    :rtype: list[list[float, float, float, float]]
+    """
+    # retrieve ABAQUS part and datums
+    p = mdb.models[MODEL_NAME].parts[PLATE_PART_NAME]
+    sketch_plane_id = plate.datum_xy_plane_id
+    sketch_up_edge_id = plate.datum_y_axis_id
+    tol = 1e-6 * max(plate.width, plate.length)
+
+    # compute the bounding boxes (snapped to the nodes of the structured mesh)
+    hole_boxes = [get_snapped_bounding_box_coordinates(h.position_x, h.position_y, h.bounding_box_scale * h.radius,
+                                                       plate.width, plate.length, element_size) for h in holes]
+    transducer_boxes = [get_snapped_bounding_box_coordinates(t.position_x, t.position_y,
+                                                             t.bounding_box_scale * t.radius, plate.width,
+                                                             plate.length, element_size) for t in transducers]
+
+    # cut all holes with a single extrusion
+    if holes:
+        s = __make_top_surface_sketch(plate)
+        for hole in holes:
+            s.CircleByCenterPerimeter(center=(hole.position_x, hole.position_y),
+                                      point1=(hole.position_x + hole.radius, hole.position_y))
+        p.CutExtrude(sketchPlane=p.datums[sketch_plane_id], sketchUpEdge=p.datums[sketch_up_edge_id],
+                     sketchPlaneSide=SIDE1, sketchOrientation=RIGHT, sketch=s, flipExtrudeDirection=OFF)
+        del mdb.models[MODEL_NAME].sketches['__profile__']
+
+    # create all rectangular bounding box partitions at once
+    bounding_boxes = [[x_left, y_lower, x_right, y_upper]
+                      for x_left, x_right, y_lower, y_upper, _, _ in hole_boxes + transducer_boxes]
+    set_names = [obj.bounding_box_cell_set_name for obj in list(holes) + list(transducers)]
+    __add_rectangular_cell_partitions_around_objects(plate, bounding_boxes, set_names)
+
+    # add four radial lines between each hole and its bounding box, and extrude them through the thickness
+    if holes:
+        radial_lines = []
+        for hole, (x_left, x_right, y_lower, y_upper, x_center, y_center) in zip(holes, hole_boxes):
+            x, y, r = hole.position_x, hole.position_y, hole.radius
+            radial_lines.append([[x_left, y_center, x - r, y], [x + r, y, x_right, y_center],
+                                 [x_center, y_lower, x, y - r], [x, y + r, x_center, y_upper]])
+        s = __make_top_surface_sketch(plate)
+        for lines in radial_lines:
+            for x1, y1, x2, y2 in lines:
+                s.Line(point1=(x1, y1), point2=(x2, y2))
+        p.PartitionFaceBySketch(sketchUpEdge=p.datums[sketch_up_edge_id],
+                                faces=p.faces.getByBoundingBox(zMin=plate.thickness - tol), sketch=s)
+        del mdb.models[MODEL_NAME].sketches['__profile__']
+
+        edges = [edge for lines in radial_lines for line in lines
+                 for edge in __get_top_surface_edges_on_line(plate, line)]
+        try:
+            p.PartitionCellByExtrudeEdge(cells=p.cells, line=p.datums[plate.datum_z_axis_id], edges=edges,
+                                         sense=REVERSE)
+        except Exception as e:
+            # fallback: partition the bounding boxes one by one
+            log_warning("Extruding the radial partitions of all holes at once failed ({}: {}), the bounding boxes are "
+                        "partitioned one by one.".format(type(e).__name__, e))
+            for hole, lines in zip(holes, radial_lines):
+                edges = [edge for line in lines for edge in __get_top_surface_edges_on_line(plate, line)]
+                p.PartitionCellByExtrudeEdge(cells=p.sets[hole.bounding_box_cell_set_name].cells,
+                                             line=p.datums[plate.datum_z_axis_id], edges=edges, sense=REVERSE)
+
+    # add line intersections at all transducer positions on the top and bottom surface
+    if transducers:
+        s = __make_top_surface_sketch(plate)
+        for transducer, (x_left, x_right, y_lower, y_upper, x_center, y_center) in zip(transducers,
+                                                                                       transducer_boxes):
+            x, y = transducer.position_x, transducer.position_y
+            s.Line(point1=(x_left, y_center), point2=(x, y))
+            s.Line(point1=(x, y), point2=(x_right, y_center))
+            s.Line(point1=(x_center, y_lower), point2=(x, y))
+            s.Line(point1=(x, y), point2=(x_center, y_upper))
+            if circumference:
+                s.CircleByCenterPerimeter(center=(x, y), point1=(x + transducer.radius, y))
+        faces = p.faces.getByBoundingBox(zMin=plate.thickness - tol) + p.faces.getByBoundingBox(zMax=tol)
+        p.PartitionFaceBySketchThruAll(faces=faces, sketchPlane=p.datums[sketch_plane_id],
+                                       sketchUpEdge=p.datums[sketch_up_edge_id], sketchPlaneSide=SIDE1, sketch=s)
+        del mdb.models[MODEL_NAME].sketches['__profile__']
+
+        for transducer in transducers:
+            x, y = transducer.position_x, transducer.position_y
+            p.Set(name=transducer.on_plate_top_set_name, vertices=p.vertices.findAt(((x, y, plate.thickness),)))
+            p.Set(name=transducer.on_plate_bottom_set_name, vertices=p.vertices.findAt(((x, y, 0),)))
+            if circumference:
+                __add_transducer_circumference_sets(plate, transducer)
+
+    return bounding_boxes
+
+
+def __add_transducer_circumference_sets(plate, transducer):
+    """
+    (Helper) Stores the circumference of a transducer on the top and bottom surface of the plate in the transducers'
+    circumference sets. The circumference is split into four arcs by the line intersection at the transducers'
+    location, the arcs are found by their midpoints.
+    """
+    p = mdb.models[MODEL_NAME].parts[PLATE_PART_NAME]
+    arc_midpoints = [(transducer.position_x + transducer.radius * math.cos(angle),
+                      transducer.position_y + transducer.radius * math.sin(angle))
+                     for angle in (math.pi / 4, 3 * math.pi / 4, 5 * math.pi / 4, 7 * math.pi / 4)]
+    for set_name, z in [(transducer.circumference_top_set_name, plate.thickness),
+                        (transducer.circumference_bottom_set_name, 0)]:
+        edges = p.edges.findAt(*[((x, y, z),) for x, y in arc_midpoints])
+        p.Set(name=set_name, edges=edges)
+
+
 def add_rectangular_cell_partition_to_plate(plate, lower_left_coord, upper_right_coord):
     """
     Creates a rectangular cell partition in the plate with diagonal corners lower_left_coord and upper_right_coord.
@@ -398,6 +497,86 @@ def add_rectangular_cell_partition_to_plate(plate, lower_left_coord, upper_right
     return status, warning
 
 
+def add_rectangular_cell_partitions_to_plate(plate, partition_lines):
+    """
+    Creates all rectangular cell partitions of the plate at once (batched alternative to calling
+    add_rectangular_cell_partition_to_plate for each partition). All partition lines are drawn in a single sketch, the
+    top surface is partitioned once, and the resulting edges are extruded through the thickness in a single cell
+    partition operation. If the single extrusion fails, the partition lines are extruded one by one instead.
+
+    The sets of the plate do not need to be updated, since ABAQUS passes set membership on to the partitioned cells and
+    faces.
+
+    :param IsotropicRectangularPlate plate: Plate to which to add the rectangular cell partitions.
+    :param list[list[float, float, float, float]] partition_lines: Lines separating the partitions ([x1, y1, x2, y2]),
+        e.g. as returned by get_partition_lines.
+    :return: Number of partition lines that could not be created, and exception message
+    :rtype: tuple[int, str]
+    """
+    if not partition_lines:
+        return 0, ""
+
+    # retrieve ABAQUS part and datums
+    p = mdb.models[MODEL_NAME].parts[PLATE_PART_NAME]
+    sketch_plane_id = plate.datum_xy_plane_id
+    sketch_up_edge_id = plate.datum_y_axis_id
+
+    # draw all partition lines in one sketch and partition the plates top surface
+    t = p.MakeSketchTransform(sketchPlane=p.datums[sketch_plane_id], sketchUpEdge=p.datums[sketch_up_edge_id],
+                              sketchPlaneSide=SIDE1, sketchOrientation=RIGHT, origin=(0.0, 0.0, 0.0))
+    s = mdb.models[MODEL_NAME].ConstrainedSketch(name='__profile__', sheetSize=3.25, gridSpacing=0.08, transform=t)
+    for x1, y1, x2, y2 in partition_lines:
+        s.Line(point1=(x1, y1), point2=(x2, y2))
+    try:
+        p.PartitionFaceBySketch(faces=p.sets[plate.top_surf_face_set_name].faces, sketch=s)
+    except Exception as e:
+        warning = "Face partition could not be created: {}.".format(e)
+        return len(partition_lines), warning
+    finally:
+        del mdb.models[MODEL_NAME].sketches['__profile__']
+
+    # extrude the edges of all partition lines at once
+    edges = []
+    for line in partition_lines:
+        edges.extend(__get_top_surface_edges_on_line(plate, line))
+    try:
+        p.PartitionCellByExtrudeEdge(cells=p.sets[plate.cell_set_name].cells, line=p.datums[plate.datum_z_axis_id],
+                                     edges=edges, sense=REVERSE)
+        return 0, ""
+    except Exception as e:
+        warning = "Batched cell partition could not be created: {}.".format(e)
+
+    # fallback: extrude line by line (edges need to be looked up again, since each partition changes the geometry)
+    err_count = 0
+    for line in partition_lines:
+        try:
+            p.PartitionCellByExtrudeEdge(cells=p.sets[plate.cell_set_name].cells,
+                                         line=p.datums[plate.datum_z_axis_id],
+                                         edges=__get_top_surface_edges_on_line(plate, line), sense=REVERSE)
+        except Exception as e:
+            warning = "Cell partition could not be created: {}.".format(e)
+            err_count += 1
+
+    return err_count, warning
+
+
+def __get_top_surface_edges_on_line(plate, line):
+    """
+    (Helper) Returns the edges on the plates top surface that lie on a straight partition line.
+
+    :param IsotropicRectangularPlate plate: Plate instance.
+    :param list[float, float, float, float] line: Start and end point of the line ([x1, y1, x2, y2]).
+    :return: Edges on the line.
+    :rtype: list[Edge]
+    """
+    p = mdb.models[MODEL_NAME].parts[PLATE_PART_NAME]
+    tol = 1e-6 * max(plate.width, plate.length)
+    x1, y1, x2, y2 = line
+    return [edge for edge in p.edges.getByBoundingBox(xMin=min(x1, x2) - tol, xMax=max(x1, x2) + tol,
+                                                      yMin=min(y1, y2) - tol, yMax=max(y1, y2) + tol,
+                                                      zMin=plate.thickness - tol, zMax=plate.thickness + tol)]
+
+
 def __add_rectangular_cell_partition_to_plate(plate, lower_left_coord, upper_right_coord, cell_set_name):
     """
     (Helper) Creates a rectangular cell partition around a defect or piezoelectric transducer and adds it to a set.
@@ -441,75 +620,149 @@ def __add_rectangular_cell_partition_to_plate(plate, lower_left_coord, upper_rig
                    name=plate.cell_set_name)
 
 
-def __get_bounding_box_coordinates_from_reference_mesh(x, y, bounding_box_radius, element_size):
+def __add_rectangular_cell_partitions_around_objects(plate, bounding_boxes, cell_set_names):
+    """
+    (Helper) Creates rectangular cell partitions around several defects or transducers at once and adds each of them to
+    a set. Batched alternative to __add_rectangular_cell_partition_to_plate.
+
+    :param IsotropicRectangularPlate plate: Plate to which to add the rectangular cell partitions.
+    :param list[list[float, float, float, float]] bounding_boxes: Bounding boxes ([left, bottom, right, top]).
+    :param list[str] cell_set_names: Names of the sets which are created for the rectangular cells.
+    :return: None
+    """
+    if not bounding_boxes:
+        return
+
+    # retrieve ABAQUS part
+    p = mdb.models[MODEL_NAME].parts[PLATE_PART_NAME]
+    tol = 1e-6 * max(plate.width, plate.length)
+
+    # draw all rectangles in one sketch and partition the plates top surface
+    s = __make_top_surface_sketch(plate)
+    for left, bottom, right, top in bounding_boxes:
+        s.rectangle(point1=(left, bottom), point2=(right, top))
+    p.PartitionFaceBySketch(faces=p.sets[plate.top_surf_face_set_name].faces, sketch=s)
+    del mdb.models[MODEL_NAME].sketches['__profile__']
+
+    # extrude all rectangle sides (except for those on the plate boundary) through the thickness at once
+    edges = []
+    for left, bottom, right, top in bounding_boxes:
+        sides = [[left, bottom, right, bottom], [right, bottom, right, top],
+                 [left, top, right, top], [left, bottom, left, top]]
+        for x1, y1, x2, y2 in sides:
+            on_vertical_boundary = x1 == x2 and min(abs(x1), abs(x1 - plate.width)) < tol
+            on_horizontal_boundary = y1 == y2 and min(abs(y1), abs(y1 - plate.length)) < tol
+            if on_vertical_boundary or on_horizontal_boundary:
+                continue
+            edges.extend(__get_top_surface_edges_on_line(plate, [x1, y1, x2, y2]))
+    p.PartitionCellByExtrudeEdge(cells=p.sets[plate.cell_set_name].cells, line=p.datums[plate.datum_z_axis_id],
+                                 edges=edges, sense=REVERSE)
+
+    # update sets for bounding boxes, plate cell and plate top surface once
+    box_top_faces = None
+    for (left, bottom, right, top), cell_set_name in zip(bounding_boxes, cell_set_names):
+        p.Set(cells=p.cells.getByBoundingBox(xMin=left - tol, yMin=bottom - tol, zMin=-tol,
+                                             xMax=right + tol, yMax=top + tol, zMax=plate.thickness + tol),
+              name=cell_set_name)
+        faces = p.faces.getByBoundingBox(xMin=left - tol, yMin=bottom - tol, zMin=plate.thickness - tol,
+                                         xMax=right + tol, yMax=top + tol, zMax=plate.thickness + tol)
+        box_top_faces = faces if box_top_faces is None else box_top_faces + faces
+    p.SetByBoolean(operation=DIFFERENCE,
+                   sets=[p.sets[plate.cell_set_name]] + [p.sets[name] for name in cell_set_names],
+                   name=plate.cell_set_name)
+    p.Set(faces=box_top_faces, name='__bounding_box_top_faces')
+    p.SetByBoolean(operation=DIFFERENCE,
+                   sets=[p.sets[plate.top_surf_face_set_name], p.sets['__bounding_box_top_faces']],
+                   name=plate.top_surf_face_set_name)
+    del p.sets['__bounding_box_top_faces']
+
+
+def __make_top_surface_sketch(plate):
     """
-    (Helper) Returns corner- and edge-center-coordinates that snap to the nearest node of a reference mesh. Comes down
-    to a closest-match search of the desired bounding box coordinates on the reference mesh.
+    (Helper) Creates a sketch ('__profile__') on the plates top surface. The caller has to delete the sketch after use.
+
+    :param IsotropicRectangularPlate plate: Plate instance.
+    :return: The sketch.
+    :rtype: ConstrainedSketch
+    """
+    p = mdb.models[MODEL_NAME].parts[PLATE_PART_NAME]
+    t = p.MakeSketchTransform(sketchPlane=p.datums[plate.datum_xy_plane_id],
+                              sketchUpEdge=p.datums[plate.datum_y_axis_id],
+                              sketchPlaneSide=SIDE1, sketchOrientation=RIGHT, origin=(0.0, 0.0, 0.0))
+    return mdb.models[MODEL_NAME].ConstrainedSketch(name='__profile__', sheetSize=3.25, gridSpacing=0.08, transform=t)
 
-    :param float x: X-coordinate of the center of the bounding box.
-    :param float y: X-coordinate of the center of the bounding box.
-    :param float bounding_box_radius: Radius (length and width) of the bounding box.
-    :param float element_size: Desired element size (in-plane) of the mesh. Needed to limit the search range.
 
-    :return: Corner- and edge-center-coordinates that snap to the nearest nodes of the reference mesh.
-    :rtype: tuple[float, float, float, float, float, float]
+def cut_plate_to_symmetry_region(plate, planes):
     """
-    p = mdb.models[MODEL_NAME].parts[REFERENCE_PLATE_PART_NAME]
+    Removes the mirrored part(s) of the (partitioned) plate for a symmetry-reduced model, so that only the region
+    ``x <= width / 2`` (plane ``'x'``) and / or ``y <= length / 2`` (plane ``'y'``) remains. The faces on the symmetry
+    planes are stored in the sets ``'symmetry_plane_x'`` and ``'symmetry_plane_y'``.
 
-    # lower left corner
-    lower_left_corner = p.nodes.getClosest((x - bounding_box_radius, y - bounding_box_radius), numToFind=1,
-                                           searchTolerance=element_size * 3)
-    if lower_left_corner:
-        x_left = lower_left_corner.coordinates[0]
-        y_lower = lower_left_corner.coordinates[1]
-    else:
-        x_left = x - bounding_box_radius
-        y_lower = y - bounding_box_radius
-
-    # upper right corner
-    upper_right_corner = p.nodes.getClosest((x + bounding_box_radius, y + bounding_box_radius), numToFind=1,
-                                            searchTolerance=element_size * 2)
-    if upper_right_corner:
-        x_right = upper_right_corner.coordinates[0]
-        y_upper = upper_right_corner.coordinates[1]
-    else:
-        x_right = x + bounding_box_radius
-        y_upper = y + bounding_box_radius
-
-    # center coordinates
-    center_node = p.nodes.getClosest((x, y), numToFind=1,
-                                     searchTolerance=element_size * 3)
-    if center_node:
-        x_center = center_node.coordinates[0]
-        y_center = center_node.coordinates[1]
-    else:
-        x_center = x + bounding_box_radius
-        y_center = y + bounding_box_radius
+    :param IsotropicRectangularPlate plate: Plate instance.
+    :param list[str] planes: Symmetry planes (``'x'`` and / or ``'y'``).
+    :return: None
+    """
+    p = mdb.models[MODEL_NAME].parts[PLATE_PART_NAME]
+    tol = 1e-6 * max(plate.width, plate.length)
+
+    # cut the mirrored part(s) with a single extrusion (the sketch extends beyond the plate edges)
+    s = __make_top_surface_sketch(plate)
+    margin = max(plate.width, plate.length)
+    if 'x' in planes:
+        s.rectangle(point1=(plate.width / 2, -margin), point2=(plate.width + margin, plate.length + margin))
+    if 'y' in planes:
+        s.rectangle(point1=(-margin, plate.length / 2), point2=(plate.width / 2 if 'x' in planes else plate.width +
+                                                                 margin, plate.length + margin))
+    p.CutExtrude(sketchPlane=p.datums[plate.datum_xy_plane_id], sketchUpEdge=p.datums[plate.datum_y_axis_id],
+                 sketchPlaneSide=SIDE1, sketchOrientation=RIGHT, sketch=s, flipExtrudeDirection=OFF)
+    del mdb.models[MODEL_NAME].sketches['__profile__']
 
-    return x_left, x_right, y_lower, y_upper, x_center, y_center
+    # store the faces on the symmetry planes
+    if 'x' in planes:
+        p.Set(faces=p.faces.getByBoundingBox(xMin=plate.width / 2 - tol, xMax=plate.width / 2 + tol),
+              name='symmetry_plane_x')
+    if 'y' in planes:
+        p.Set(faces=p.faces.getByBoundingBox(yMin=plate.length / 2 - tol, yMax=plate.length / 2 + tol),
+              name='symmetry_plane_y')
 
 
 # MESH MODULE HELPER FUNCTIONS -----------------------------------------------------------------------------------------
-def mesh_part(element_size_in_plane, element_size_thickness, plate, transducers, defects):
+def mesh_part(element_size_in_plane, element_size_thickness, plate, transducers, defects, element_type='C3D8R',
+              circumference=False):
     """
     Sets the meshing algorithm for different partitions of the plate. Seeds the plate with desired through-thickness
-    and in-plane element size. Sets the element type to C3D8R for the whole model. Generates the mesh.
+    and in-plane element size. Sets the element type to C3D8R (or to SC8R / S4R) for the whole model. Generates the
+    mesh.
 
     :param float element_size_in_plane: Desired element size (in-plane).
     :param float element_size_thickness: Desired element size (through-thickness).
     :param IsotropicRectangular plate: Plate to be meshed.
     :param list[Transducer] transducers: List of applied transducers.
     :param list[Defect] defects: List of plate defects.
+    :param str element_type: Element type, either ``'C3D8R'`` (solid), ``'SC8R'`` (continuum shell) or ``'S4R'``
+        (conventional shell, the plate has to be converted to its mid-surface with
+        :func:`convert_plate_to_mid_surface` first).
+    :param bool circumference: If True, the transducer bounding boxes contain the circumferences of the transducers
+        (see :func:`create_transducer_as_vertex_on_plate`) and are meshed by sweeping through the thickness.
     :return: Number of nodes of the generated mesh.
     :rtype: int
     """
+    if element_type == 'S4R':
+        return __mesh_mid_surface(element_size_in_plane, plate, transducers, defects)
+
     # set meshing algorithm for plate
     p = mdb.models[MODEL_NAME].parts[PLATE_PART_NAME]
     p.setMeshControls(regions=p.sets[plate.cell_set_name].cells, technique=STRUCTURED)
 
-    # set meshing algorithm for transducer bounding boxes
+    # set meshing algorithm for transducer bounding boxes, the faces inside the circumference of a transducer can't be
+    # meshed structured, so the bounding box is swept through the thickness (like the bounding box of a hole) instead of
+    # being meshed freely, which keeps hexahedral elements with through-thickness edges below the pin forces
     for transducer in transducers:
-        p.setMeshControls(regions=p.sets[transducer.bounding_box_cell_set_name].cells, algorithm=MEDIAL_AXIS)
+        if circumference:
+            p.setMeshControls(regions=p.sets[transducer.bounding_box_cell_set_name].cells, technique=SWEEP,
+                              algorithm=MEDIAL_AXIS)
+        else:
+            p.setMeshControls(regions=p.sets[transducer.bounding_box_cell_set_name].cells, algorithm=MEDIAL_AXIS)
 
     for defect in defects:
         if isinstance(defect, Crack):
@@ -535,11 +788,19 @@ def mesh_part(element_size_in_plane, element_size_thickness, plate, transducers,
         p.seedEdgeBySize(edges=[p.edges[i] for i in vertical_edge_indices], size=element_size_thickness)
 
     # set the element type for the whole model
-    elemType1 = mesh.ElemType(elemCode=C3D8R, elemLibrary=EXPLICIT,
-                              secondOrderAccuracy=OFF, distortionControl=DEFAULT)
-    elemType2 = mesh.ElemType(elemCode=C3D6, elemLibrary=EXPLICIT)
-    elemType3 = mesh.ElemType(elemCode=C3D4, elemLibrary=EXPLICIT)
-    p.setElementType(regions=(p.cells,), elemTypes=(elemType1, elemType2, elemType3))
+    if element_type == 'SC8R':
+        # continuum shells need a consistent stack direction (through-thickness, pointing to the top surface)
+        p.assignStackDirection(referenceRegion=p.sets[plate.top_surf_face_set_name].faces[0], cells=p.cells)
+        elemType1 = mesh.ElemType(elemCode=SC8R, elemLibrary=EXPLICIT,
+                                  secondOrderAccuracy=OFF, hourglassControl=DEFAULT)
+        elemType2 = mesh.ElemType(elemCode=SC6R, elemLibrary=EXPLICIT)
+        p.setElementType(regions=(p.cells,), elemTypes=(elemType1, elemType2))
+    else:
+        elemType1 = mesh.ElemType(elemCode=C3D8R, elemLibrary=EXPLICIT,
+                                  secondOrderAccuracy=OFF, distortionControl=DEFAULT)
+        elemType2 = mesh.ElemType(elemCode=C3D6, elemLibrary=EXPLICIT)
+        elemType3 = mesh.ElemType(elemCode=C3D4, elemLibrary=EXPLICIT)
+        p.setElementType(regions=(p.cells,), elemTypes=(elemType1, elemType2, elemType3))
 
     # generate the mesh
     p.generateMesh()
@@ -547,6 +808,84 @@ def mesh_part(element_size_in_plane, element_size_thickness, plate, transducers,
     return mesh_stats.numNodes
 
 
+def convert_plate_to_mid_surface(plate, transducers, defects):
+    """
+    Converts the (partitioned) solid plate to its mid-surface, so that it can be meshed with conventional shell
+    elements. The plate, material and field output sets are redefined on the mid-surface faces. The transducer sets
+    (top and bottom) are both redefined on the transducers' vertex on the mid-surface, so that the point forces and
+    history output requests of the solid model apply to the shell nodes without changes. The vertices are found at the
+    transducer positions on the mid-surface, which requires that the line intersections at the transducer positions are
+    face partitions through the thickness (as created by :func:`create_transducer_as_vertex_on_plate` and
+    :func:`create_holes_and_transducers_in_plate`).
+
+    :param IsotropicRectangularPlate plate: Plate to convert.
+    :param list[Transducer] transducers: List of applied transducers.
+    :param list[Defect] defects: List of plate defects.
+    :return: None
+    :raises ValueError: If the mid-surface has no vertex at the position of a transducer.
+    """
+    p = mdb.models[MODEL_NAME].parts[PLATE_PART_NAME]
+    z_mid = plate.thickness / 2
+    tolerance = plate.thickness / 100
+
+    # faces of the bounding boxes of the defects and transducers, on the mid-surface
+    bounding_box_face_indices = {}
+    for item in list(defects) + list(transducers):
+        face_indices = set()
+        for cell in p.sets[item.bounding_box_cell_set_name].cells:
+            face_indices.update(cell.getFaces())
+        bounding_box_face_indices[item.bounding_box_cell_set_name] = face_indices
+
+    # replace the cells by the mid-surface (the faces at the mid-surface are created by ABAQUS)
+    p.AssignMidsurfaceRegion(cellList=p.cells[:])
+    mid_surface_faces = p.faces.getByBoundingBox(zMin=z_mid - tolerance, zMax=z_mid + tolerance)
+    mid_surface_face_indices = set(face.index for face in mid_surface_faces)
+
+    p.Set(faces=mid_surface_faces, name=plate.material_cell_set_name)
+    p.Set(faces=mid_surface_faces, name=plate.field_output_face_set_name)
+    all_bounding_box_face_indices = set()
+    for set_name, face_indices in bounding_box_face_indices.items():
+        face_indices = sorted(face_indices & mid_surface_face_indices)
+        all_bounding_box_face_indices.update(face_indices)
+        p.Set(faces=[p.faces[i] for i in face_indices], name=set_name)
+    plate_face_indices = sorted(mid_surface_face_indices - all_bounding_box_face_indices)
+    p.Set(faces=[p.faces[i] for i in plate_face_indices], name=plate.cell_set_name)
+
+    for transducer in transducers:
+        mid_surface_vertex = p.vertices.findAt(((transducer.position_x, transducer.position_y, z_mid),))
+        if not mid_surface_vertex:
+            raise ValueError("The mid-surface has no vertex at the position of transducer {}. The plate must only be "
+                             "partitioned by face partitions through the thickness at the transducer positions."
+                             "".format(transducer.name))
+        p.Set(name=transducer.on_plate_top_set_name, vertices=mid_surface_vertex)
+        p.Set(name=transducer.on_plate_bottom_set_name, vertices=mid_surface_vertex)
+
+
+def __mesh_mid_surface(element_size_in_plane, plate, transducers, defects):
+    """
+    (Helper) Meshes the mid-surface of the plate (see :func:`convert_plate_to_mid_surface`) with conventional shell
+    elements (S4R).
+
+    :return: Number of nodes of the generated mesh.
+    :rtype: int
+    """
+    p = mdb.models[MODEL_NAME].parts[PLATE_PART_NAME]
+    p.setMeshControls(regions=p.sets[plate.cell_set_name].faces, elemShape=QUAD, technique=STRUCTURED)
+    for item in list(transducers) + list(defects):
+        p.setMeshControls(regions=p.sets[item.bounding_box_cell_set_name].faces, elemShape=QUAD_DOMINATED,
+                          technique=FREE, algorithm=MEDIAL_AXIS)
+
+    p.seedPart(size=element_size_in_plane, deviationFactor=0.1, minSizeFactor=0.1)
+
+    elemType1 = mesh.ElemType(elemCode=S4R, elemLibrary=EXPLICIT, secondOrderAccuracy=OFF, hourglassControl=DEFAULT)
+    elemType2 = mesh.ElemType(elemCode=S3R, elemLibrary=EXPLICIT)
+    p.setElementType(regions=(p.sets[plate.material_cell_set_name].faces,), elemTypes=(elemType1, elemType2))
+
+    p.generateMesh()
+    mesh_stats = p.getMeshStats()
+    return mesh_stats.numNodes
+
+
 # PROPERTY MODULE HELPER FUNCTIONS -------------------------------------------------------------------------------------
 def create_isotropic_material(material):
     """
@@ -564,17 +903,26 @@ def create_isotropic_material(material):
         raise ValueError('Material is not isotropic.')
 
 
-def assign_material(set_name, material):
+def assign_material(set_name, material, shell_thickness=None):
     """
-    Assigns the material to the desired set. A new homogeneous solid section will be created.
+    Assigns the material to the desired set. A new homogeneous solid section will be created, or a homogeneous shell
+    section if a shell thickness is given (for continuum shell and conventional shell elements).
 
     :param str set_name: Name of the ABAQUS set that the material is assigned to.
     :param Material material: Material that is assigned to the set.
+    :param float shell_thickness: Thickness of the shell section. If None, a solid section is created.
     :return: None
     """
-    # create new homogenous continuum section
+    # create new homogenous continuum or shell section
     section_name = set_name + '_section_homogenous_' + material.name
-    mdb.models[MODEL_NAME].HomogeneousSolidSection(name=section_name, material=material.name, thickness=None)
+    if shell_thickness is None:
+        mdb.models[MODEL_NAME].HomogeneousSolidSection(name=section_name, material=material.name, thickness=None)
+    else:
+        mdb.models[MODEL_NAME].HomogeneousShellSection(name=section_name, material=material.name,
+                                                       thicknessType=UNIFORM, thickness=shell_thickness,
+                                                       preIntegrate=OFF, idealization=NO_IDEALIZATION,
+                                                       poissonDefinition=DEFAULT, integrationRule=SIMPSON,
+                                                       numIntPts=5)
 
     # create new set containing all cells and assign section to set
     p = mdb.models[MODEL_NAME].parts[PLATE_PART_NAME]
@@ -637,32 +985,53 @@ def remove_standard_field_output_request():
             del mdb.models[MODEL_NAME].fieldOutputRequests['F-Output-1']
 
 
-def add_history_output_request_transducer_signals(transducers, create_step_name):
+def add_history_output_request_transducer_signals(transducers, create_step_name, variables=('U1', 'U2', 'U3'),
+                                                  time_interval=None, all_surfaces=True):
     """
     Adds history output requests for the translational DOFs of the provided list of transducers for the desired step.
 
     This output request causes ABAQUS to write translational nodal displacements of all transducers to the .ODB file
-    for every EXPLICIT increment.
+    for every EXPLICIT increment, or in fixed time intervals (with ABAQUS' anti-aliasing filter).
 
-    :param list[Transducer] transducers: List of transducers for which to request history output.
+    :param list[Transducer] transducers: List of transducers for which to request history output. Transducers without
+        node sets in the model (None) are skipped.
     :param str create_step_name: Name of the step in which to create the history output request.
-    :return: None
+    :param tuple[str] variables: Output variables to request (U1 and U2 only for two-dimensional models).
+    :param float time_interval: Time interval in which output should be written. If None, output is written for every
+        increment.
+    :param bool all_surfaces: If False, output is only requested for the node sets on the plate surface(s) on which the
+        transducer is placed (depending on ``position_z``).
+    :return: Number of requested node sets.
+    :rtype: int
     """
+    if time_interval is None:
+        sampling_options = {'frequency': 1}
+    else:
+        sampling_options = {'timeInterval': time_interval, 'filter': ANTIALIASING}
+
+    num_node_sets = 0
     for i, transducer in enumerate(transducers):
+        if transducer is None:
+            continue
         a = mdb.models[MODEL_NAME].rootAssembly
         for set_name, description in zip([transducer.on_plate_top_set_name, transducer.on_plate_bottom_set_name],
                                          ['top', 'bottom']):
+            if not all_surfaces and transducer.position_z in ('top', 'bottom') and \
+                    description != transducer.position_z:
+                continue
             region_def = a.instances[PLATE_PART_NAME].sets[set_name]
             mdb.models[MODEL_NAME].HistoryOutputRequest(name='history_transducer_{}_{}'.format(i+1, description),
                                                         createStepName=create_step_name,
-                                                        variables=('U1', 'U2', 'U3'),
-                                                        frequency=1,
+                                                        variables=variables,
                                                         region=region_def,
                                                         sectionPoints=DEFAULT,
-                                                        rebar=EXCLUDE)
+                                                        rebar=EXCLUDE,
+                                                        **sampling_options)
+            num_node_sets += 1
+    return num_node_sets
 
 
-def add_field_output_request_plate_surface(plate, create_step_name, time_interval):
+def add_field_output_request_plate_surface(plate, create_step_name, time_interval, node_set_name=None):
     """
     Adds a field output request for the translational DOFs of all nodes on the plates' surface for the desired step.
 
@@ -672,12 +1041,61 @@ def add_field_output_request_plate_surface(plate, create_step_name, time_interva
     :param IsotropicRectangular plate: Plate instance.
     :param str create_step_name: Name of the step in which to create the history output request.
     :param float time_interval: Time interval in which output should be written.
-    :return: None
+    :param str node_set_name: Name of an assembly node set (see :func:`create_field_output_node_set`) to restrict the
+        output to. If None, output is written for all nodes on the plate surface.
+    :return: Number of nodes with field output.
+    :rtype: int
     """
-    region = mdb.models[MODEL_NAME].rootAssembly.allInstances[PLATE_PART_NAME].sets[plate.field_output_face_set_name]
+    if node_set_name is None:
+        region = mdb.models[MODEL_NAME].rootAssembly.allInstances[PLATE_PART_NAME].sets[
+            plate.field_output_face_set_name]
+    else:
+        region = mdb.models[MODEL_NAME].rootAssembly.sets[node_set_name]
     mdb.models[MODEL_NAME].FieldOutputRequest(name='full_field_{}'.format(create_step_name),
                                               createStepName=create_step_name, variables=('UT',),
                                               timeInterval=time_interval, region=region, sectionPoints=DEFAULT)
+    return len(region.nodes)
+
+
+def create_field_output_node_set(plate, set_name, node_spacing=None, regions=None):
+    """
+    Creates an assembly node set with a subset of the nodes on the plates' surface to restrict the field output to. The
+    set contains the nodes inside the given rectangles and, if a node spacing is given, only the node closest to each
+    point of a square grid with this spacing. Has to be called after meshing and assembly, and before the first .INP
+    file is written, so that the set is part of the (shared) model data.
+
+    :param IsotropicRectangularPlate plate: Plate instance.
+    :param str set_name: Name of the node set.
+    :param float node_spacing: Spacing of the grid of output nodes. If None, all nodes (in the regions) are used.
+    :param list[tuple[float, float, float, float]] regions: Rectangles (x_min, y_min, x_max, y_max) to which the nodes
+        are restricted. If None, the whole plate surface is used.
+    :return: Number of nodes in the set.
+    :rtype: int
+    :raises ValueError: If the set would be empty.
+    """
+    a = mdb.models[MODEL_NAME].rootAssembly
+    nodes = a.instances[PLATE_PART_NAME].sets[plate.field_output_face_set_name].nodes
+
+    # for each grid point, keep the closest node (label, distance)
+    selected_nodes = {}
+    for node in nodes:
+        x, y = node.coordinates[0], node.coordinates[1]
+        if regions is not None and not any(x_min <= x <= x_max and y_min <= y <= y_max
+                                           for x_min, y_min, x_max, y_max in regions):
+            continue
+        if node_spacing is None:
+            selected_nodes[node.label] = (node.label, 0.0)
+            continue
+        grid_point = (int(round(x / node_spacing)), int(round(y / node_spacing)))
+        distance = math.hypot(x - grid_point[0] * node_spacing, y - grid_point[1] * node_spacing)
+        if grid_point not in selected_nodes or distance < selected_nodes[grid_point][1]:
+            selected_nodes[grid_point] = (node.label, distance)
+
+    node_labels = sorted(set(label for label, _ in selected_nodes.values()))
+    if not node_labels:
+        raise ValueError("No nodes of the plate surface are selected for the field output set {}.".format(set_name))
+    a.SetFromNodeLabels(name=set_name, nodeLabels=((PLATE_PART_NAME, node_labels),))
+    return len(node_labels)
 
 
 def __add_amplitude(name, signal, max_time_increment):
@@ -688,26 +1106,18 @@ def __add_amplitude(name, signal, max_time_increment):
     :param Signal signal: Signal to be added as an amplitude.
     :param float max_time_increment: Maximum time increment of the time integration scheme. Needed to ensure that the
     amplitude data is written with sufficient sampling frequency.
-    :return: None
+    :return: Number of data points of the amplitude.
+    :rtype: int
     """
-    # generate time data
-    if isinstance(signal, DiracImpulse):
-        # impulses are handled differently than other signals to ensure that the impulse is only
-        # nonzero for the very first ABAQUS/Explicit increment
-        time_data_table = [(0, signal.magnitude), (max_time_increment * 1e-2, 0)]
-    else:
-        # all other signals besides impulses can be sampled from the signal definition in their method 'get_value_at'
-        time_data_table = []
-        for t in np.arange(start=signal.delta_t, stop=signal.delta_t + signal.get_duration() * 1.01,
-                           step=max_time_increment / 2):
-            time_data_table.append((t, signal.get_value_at(t=t)))
+    time_data_table = get_amplitude_table(signal, max_time_increment)
 
     # create amplitude in ABAQUS
     mdb.models[MODEL_NAME].TabularAmplitude(name=name, timeSpan=STEP, smooth=SOLVER_DEFAULT,
                                             data=tuple(time_data_table))
+    return len(time_data_table)
 
 
-def add_transducer_concentrated_force(step_name, transducer, signal, max_time_increment):
+def add_transducer_concentrated_force(step_name, transducer, signal, max_time_increment, force_component=3):
     """
     Creates loads (concentrated forces) at the transducers' location, depending on whether the transducer is in top,
     bottom, symmetric or asymmetric excitation mode. The magnitude of the load is linked to the supplied signal
@@ -718,33 +1128,104 @@ def add_transducer_concentrated_force(step_name, transducer, signal, max_time_in
     :param Signal signal: Signal that drives the load amplitude.
     :param float max_time_increment: Maximum time increment of the time integration scheme. Needed to ensure that the
     amplitude data is written with sufficient sampling frequency.
-    :return: None
+    :param int force_component: Component of the force normal to the plate surface (3 for 3D models, 2 for
+        two-dimensional models).
+    :return: Number of data points of the load amplitude.
+    :rtype: int
+    """
+
+    amplitude_name = 'transducer_{}_{}'.format(transducer.name, signal.__class__.__name__)
+    n_amplitude_points = __add_amplitude(amplitude_name, signal, max_time_increment)
+
+    for set_name, concentrated_force_z_amplitude in get_concentrated_forces(transducer):
+        region = mdb.models[MODEL_NAME].rootAssembly.instances[PLATE_PART_NAME].sets[set_name]
+        load_name = '{}_{}'.format(set_name, signal.__class__.__name__)
+        force = {'cf{:d}'.format(force_component): concentrated_force_z_amplitude}
+        mdb.models[MODEL_NAME].ConcentratedForce(name=load_name, createStepName=step_name, region=region,
+                                                 amplitude=amplitude_name, distributionType=UNIFORM,
+                                                 field='', localCsys=None, **force)
+
+    return n_amplitude_points
+
+
+def add_transducer_pin_force(step_name, transducer, signal, max_time_increment):
     """
+    Creates radial loads (pin forces) along the transducers' circumference, depending on whether the transducer is in
+    top, bottom, symmetric or asymmetric excitation mode. The loads are applied as concentrated forces on all nodes of
+    the circumference in a cylindrical coordinate system centered at the transducer, scaled so that their magnitudes
+    add up to 1 on each surface. A positive amplitude corresponds to an outward force (expansion of the transducer).
+    The magnitude of the load is linked to the supplied signal definition.
 
+    In symmetric mode, the forces on the top and bottom surface point in the same direction (in-plane excitation),
+    in asymmetric mode in opposite directions (bending excitation).
+
+    :param str step_name: Name of the step in which to create the load.
+    :param CircularTransducer transducer: Transducer for which to add the load.
+    :param Signal signal: Signal that drives the load amplitude.
+    :param float max_time_increment: Maximum time increment of the time integration scheme. Needed to ensure that the
+    amplitude data is written with sufficient sampling frequency.
+    :return: Number of data points of the load amplitude.
+    :rtype: int
+    """
     amplitude_name = 'transducer_{}_{}'.format(transducer.name, signal.__class__.__name__)
-    __add_amplitude(amplitude_name, signal, max_time_increment)
+    n_amplitude_points = __add_amplitude(amplitude_name, signal, max_time_increment)
 
-    set_names, concentrated_force_z_amplitudes = (None, None)
+    set_names, radial_force_amplitudes = (None, None)
     if transducer.position_z == 'top':
-        set_names = [transducer.on_plate_top_set_name]
-        concentrated_force_z_amplitudes = [1.0]
+        set_names = [transducer.circumference_top_set_name]
+        radial_force_amplitudes = [1.0]
     if transducer.position_z == 'bottom':
-        set_names = [transducer.on_plate_bottom_set_name]
-        concentrated_force_z_amplitudes = [-1.0]
+        set_names = [transducer.circumference_bottom_set_name]
+        radial_force_amplitudes = [1.0]
     if transducer.position_z == 'symmetric':
-        set_names = [transducer.on_plate_top_set_name, transducer.on_plate_bottom_set_name]
-        concentrated_force_z_amplitudes = [1.0, -1.0]
+        set_names = [transducer.circumference_top_set_name, transducer.circumference_bottom_set_name]
+        radial_force_amplitudes = [1.0, 1.0]
     if transducer.position_z == 'asymmetric':
-        set_names = [transducer.on_plate_top_set_name, transducer.on_plate_bottom_set_name]
-        concentrated_force_z_amplitudes = [1.0, 1.0]
+        set_names = [transducer.circumference_top_set_name, transducer.circumference_bottom_set_name]
+        radial_force_amplitudes = [1.0, -1.0]
 
-    for set_name, concentrated_force_z_amplitude in zip(set_names, concentrated_force_z_amplitudes):
-        region = mdb.models[MODEL_NAME].rootAssembly.instances[PLATE_PART_NAME].sets[set_name]
+    # cylindrical coordinate system at the transducers' location (radial direction: 1)
+    a = mdb.models[MODEL_NAME].rootAssembly
+    csys_name = '{}_csys'.format(transducer.name)
+    if csys_name not in a.features.keys():
+        a.DatumCsysByThreePoints(name=csys_name, coordSysType=CYLINDRICAL,
+                                 origin=(transducer.position_x, transducer.position_y, 0.0),
+                                 point1=(transducer.position_x + 1.0, transducer.position_y, 0.0),
+                                 point2=(transducer.position_x, transducer.position_y + 1.0, 0.0))
+    csys = a.datums[a.features[csys_name].id]
+
+    for set_name, radial_force_amplitude in zip(set_names, radial_force_amplitudes):
+        region = a.instances[PLATE_PART_NAME].sets[set_name]
+        n_nodes = max(len(region.nodes), 1)
         load_name = '{}_{}'.format(set_name, signal.__class__.__name__)
         mdb.models[MODEL_NAME].ConcentratedForce(name=load_name, createStepName=step_name, region=region,
-                                                 cf3=concentrated_force_z_amplitude,
+                                                 cf1=radial_force_amplitude / n_nodes,
                                                  amplitude=amplitude_name, distributionType=UNIFORM,
-                                                 field='', localCsys=None)
+                                                 field='', localCsys=csys)
+
+    return n_amplitude_points
+
+
+def add_symmetry_boundary_conditions(step_name, component):
+    """
+    Creates the boundary conditions on the symmetry planes of a symmetry-reduced model for one symmetry component:
+    symmetric (XSYMM / YSYMM) or antisymmetric (XASYMM / YASYMM) with respect to each plane. The planes have to be
+    stored in sets by :func:`cut_plate_to_symmetry_region`.
+
+    :param str step_name: Name of the step in which to create the boundary conditions.
+    :param dict component: Symmetry component by plane, ``+1`` for symmetric and ``-1`` for antisymmetric.
+    :return: None
+    """
+    m = mdb.models[MODEL_NAME]
+    a = m.rootAssembly
+    for plane, character in sorted(component.items()):
+        region = a.instances[PLATE_PART_NAME].sets['symmetry_plane_{}'.format(plane)]
+        name = '{}_{}_{}'.format('symmetry' if character > 0 else 'antisymmetry', plane, step_name)
+        if plane == 'x':
+            bc = m.XsymmBC if character > 0 else m.XasymmBC
+        else:
+            bc = m.YsymmBC if character > 0 else m.YasymmBC
+        bc(name=name, createStepName=step_name, region=region, localCsys=None)
 
 
 def write_input_file(job_name, output_directory):
@@ -756,7 +1237,8 @@ def write_input_file(job_name, output_directory):
     :return: None
     """
     original_directory = os.getcwd()
-    os.mkdir(output_directory)
+    if not os.path.exists(output_directory):
+        os.makedirs(output_directory)
     os.chdir(output_directory)
     mdb.Job(name=job_name, model=MODEL_NAME, description='', type=ANALYSIS,
             atTime=None, waitMinutes=0, waitHours=0, queue=None, memory=90,
@@ -768,6 +1250,60 @@ def write_input_file(job_name, output_directory):
     os.chdir(original_directory)
 
 
+def write_input_file_with_shared_include(job_name, output_directory, include_file_path):
+    """
+    Writes a lightweight input (.INP) file for the current model tree, containing only the amplitudes and steps. All
+    other model data (parts, mesh, sets, assembly, materials) is referenced by an ``*Include`` of a shared include file,
+    so that the model data is stored only once for all load cases.
+
+    If the include file does not exist yet, a complete input file is written by ABAQUS/CAE and split into the include
+    file and the load case input file. Otherwise, the amplitudes and steps are taken from the keyword blocks of the
+    model, which are synchronized without nodes and elements, so that the mesh is not written again.
+
+    :param str job_name: Name of the ABAQUS job and .INP file.
+    :param str output_directory: Name of the directory to which to write the output to (is created if it doesn't exist).
+    :param str include_file_path: Path to the shared include file.
+    :return: None
+    """
+    input_file_path = os.path.join(output_directory, job_name + '.inp')
+
+    if not os.path.exists(include_file_path):
+        write_input_file(job_name=job_name, output_directory=output_directory)
+        split_input_file(input_file_path=input_file_path, include_file_path=include_file_path)
+        return
+
+    m = mdb.models[MODEL_NAME]
+    m.keywordBlock.synchVersions(storeNodesAndElements=False)
+    lines = '\n'.join(m.keywordBlock.sieBlocks).splitlines()
+    heading, load_case_model_data, history = split_input_file_lines(lines)
+    if not os.path.exists(output_directory):
+        os.makedirs(output_directory)
+    write_load_case_input_file(input_file_path=input_file_path, include_file_path=include_file_path, heading=heading,
+                               load_case_model_data=load_case_model_data, history=history)
+
+
+def save_model_database(cae_file_path):
+    """
+    Saves the current model database (.CAE), e.g. as a checkpoint of the build.
+
+    :param str cae_file_path: Path of the .CAE file.
+    :return: None
+    """
+    mdb.saveAs(pathName=os.path.abspath(cae_file_path))
+
+
+def open_model_database(cae_file_path):
+    """
+    Opens a model database (.CAE) that was saved with save_model_database and makes it the current model database of
+    all helper functions.
+
+    :param str cae_file_path: Path of the .CAE file.
+    :return: None
+    """
+    global mdb
+    mdb = openMdb(pathName=os.path.abspath(cae_file_path))
+
+
 # INTERACTION MODULE HELPER FUNCTIONS ----------------------------------------------------------------------------------
 def assign_seam(crack):
     """
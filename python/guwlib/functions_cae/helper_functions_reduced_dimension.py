@@ -0,0 +1,110 @@
+"""
+Bottom-level helper-functions to automate the modelling of two-dimensional (axisymmetric or plane strain) plate models
+in ABAQUS/CAE using ABAQUS scripting interface. Material, step, load and job definitions are shared with the point
+force model (see :mod:`helper_functions_point_force`). Note that these functions are only available from the ABAQUS
+python interpreter.
+"""
+
+from guwlib import *
+from guwlib.functions_cae.helper_functions_point_force import *
+
+from abaqus import *
+from abaqusConstants import *
+
+import mesh
+import part
+import sketch
+
+
+# PART MODULE HELPER FUNCTIONS -----------------------------------------------------------------------------------------
+def create_reduced_dimension_plate_part(plate, section_length, transducer_positions, axisymmetric):
+    """
+    Creates the cross-section of the plate as a two-dimensional (axisymmetric or planar) ABAQUS part. The cross-section
+    is partitioned with a through-thickness line at each transducer position, so that nodes are placed at the exact
+    transducer positions on the top and bottom surface during meshing. The sketch x-axis corresponds to the radius (or
+    the position along the section), the sketch y-axis to the through-thickness direction of the plate.
+
+    :param IsotropicRectangularPlate plate: Plate instance to be modelled in ABAQUS.
+    :param float section_length: Radius (axisymmetric) or length (plane strain) of the cross-section.
+    :param list[(Transducer, float)] transducer_positions: Transducers that are part of the cross-section and their
+        position along the section.
+    :param bool axisymmetric: If True, an axisymmetric part is created (the axis of symmetry is the sketch y-axis).
+    :return: None
+    """
+    # rename the model
+    mdb.models.changeKey(fromName='Model-1', toName=MODEL_NAME)
+
+    # create the cross-section as a planar shell
+    s = mdb.models[MODEL_NAME].ConstrainedSketch(name='__profile__', sheetSize=2.0)
+    if axisymmetric:
+        s.ConstructionLine(point1=(0.0, -1.0), point2=(0.0, 1.0))
+    s.rectangle(point1=(0, 0), point2=(section_length, plate.thickness))
+    p = mdb.models[MODEL_NAME].Part(name=PLATE_PART_NAME, dimensionality=AXISYMMETRIC if axisymmetric else TWO_D_PLANAR,
+                                    type=DEFORMABLE_BODY)
+    p.BaseShell(sketch=s)
+    del s
+
+    # partition the cross-section at the transducer positions (positions on the section boundary are vertices already)
+    inner_positions = sorted(set(position for _, position in transducer_positions if 0 < position < section_length))
+    if inner_positions:
+        s = mdb.models[MODEL_NAME].ConstrainedSketch(name='__profile__', sheetSize=2.0)
+        for position in inner_positions:
+            s.Line(point1=(position, 0.0), point2=(position, plate.thickness))
+        p.PartitionFaceBySketch(faces=p.faces, sketch=s)
+        del s
+
+    # store the plate faces and top edges in sets
+    p.Set(faces=p.faces, name=plate.cell_set_name)
+    p.Set(faces=p.faces, name=plate.material_cell_set_name)
+    p.Set(edges=p.edges.getByBoundingBox(yMin=plate.thickness / 2), name=plate.top_surf_face_set_name)
+    p.Set(edges=p.edges.getByBoundingBox(yMin=plate.thickness / 2), name=plate.field_output_face_set_name)
+
+    # store the transducer vertices on the top and bottom surface in sets
+    for transducer, position in transducer_positions:
+        p.Set(name=transducer.on_plate_top_set_name, vertices=p.vertices.findAt(((position, plate.thickness, 0),)))
+        p.Set(name=transducer.on_plate_bottom_set_name, vertices=p.vertices.findAt(((position, 0, 0),)))
+
+
+# MESH MODULE HELPER FUNCTIONS -----------------------------------------------------------------------------------------
+def mesh_reduced_dimension_part(element_size_in_plane, element_size_thickness, axisymmetric):
+    """
+    Meshes the two-dimensional cross-section of the plate with a structured mesh of CAX4R (axisymmetric) or CPE4R
+    (plane strain) elements, with the desired in-plane and through-thickness element size.
+
+    :param float element_size_in_plane: Desired element size (in-plane).
+    :param float element_size_thickness: Desired element size (through-thickness).
+    :param bool axisymmetric: If True, axisymmetric elements are used.
+    :return: Number of nodes of the generated mesh.
+    :rtype: int
+    """
+    p = mdb.models[MODEL_NAME].parts[PLATE_PART_NAME]
+    p.setMeshControls(regions=p.faces, elemShape=QUAD, technique=STRUCTURED)
+
+    # seed the part with the in-plane element size and all vertical edges with the through-thickness element size
+    p.seedPart(size=element_size_in_plane, deviationFactor=0.1, minSizeFactor=0.1)
+    vertical_edge_indices = []
+    for edge in p.edges:
+        vertex_indices = edge.getVertices()
+        if len(vertex_indices) == 2:
+            x1 = p.vertices[vertex_indices[0]].pointOn[0][0]
+            x2 = p.vertices[vertex_indices[1]].pointOn[0][0]
+            if (x2 - x1) == 0:
+                vertical_edge_indices.append(edge.index)
+    if len(vertical_edge_indices) > 0:
+        p.seedEdgeBySize(edges=[p.edges[i] for i in vertical_edge_indices], size=element_size_thickness)
+
+    # set the element type for the whole model
+    if axisymmetric:
+        elemType1 = mesh.ElemType(elemCode=CAX4R, elemLibrary=EXPLICIT, secondOrderAccuracy=OFF,
+                                  hourglassControl=DEFAULT, distortionControl=DEFAULT)
+        elemType2 = mesh.ElemType(elemCode=CAX3, elemLibrary=EXPLICIT)
+    else:
+        elemType1 = mesh.ElemType(elemCode=CPE4R, elemLibrary=EXPLICIT, secondOrderAccuracy=OFF,
+                                  hourglassControl=DEFAULT, distortionControl=DEFAULT)
+        elemType2 = mesh.ElemType(elemCode=CPE3, elemLibrary=EXPLICIT)
+    p.setElementType(regions=(p.faces,), elemTypes=(elemType1, elemType2))
+
+    # generate the mesh
+    p.generateMesh()
+    mesh_stats = p.getMeshStats()
+    return mesh_stats.numNodes
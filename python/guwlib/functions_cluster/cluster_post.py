@@ -21,7 +21,9 @@ and parameters for the SLURM job. The required command line arguments of this sc
 
 Always make sure to run this script from the root directory of guwlib, otherwise the helper functions might not be
 located correctly. A summary text file with the paths to all created .NPZ files is written to enable convenient batch
-download of the processed files from the server to a client (``processed_odb_files.txt``).
+download of the processed files from the server to a client (``processed_odb_files.txt``). The results of load cases
+that were solved once for several models (see ``guwlib.functions_utility.deduplication``) are linked to the duplicates
+as soon as they are exported, i.e. in the next run of this script, and are listed in the summary file as well.
 
 Example usage:
 
@@ -40,6 +42,10 @@ import math
 import subprocess
 from datetime import datetime
 
+# the script is run from the root directory of guwlib
+sys.path.insert(0, os.getcwd())
+from guwlib.functions_utility.deduplication import link_deduplicated_results
+
 
 def find_unprocessed_odb_files(root_directory, filename_ending):
     """
@@ -142,6 +148,9 @@ if __name__ == "__main__":
         result = subprocess.run(command, shell=True, check=True, capture_output=True, text=True)
         last_job_id = result.stdout.split()[-1].strip()
 
+    # link the already exported results of deduplicated load cases to the duplicates -----------------------------------
+    npz_file_paths.extend(link_deduplicated_results(directories_to_scan=dirs_to_scan))
+
     # write out the file paths to the created .NPZ files to a text file ------------------------------------------------
     list_text_file = 'processed_odb_files.txt'
     archive_file(list_text_file)
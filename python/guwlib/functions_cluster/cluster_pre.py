@@ -3,15 +3,17 @@ This module handles automatic batch preprocessing and solving of guwlib model fi
 with ABAQUS/CAE and submitting them to the solver (ABAQUS/EXPLICIT or ABAQUS/STANDARD).
 
 The script is tailored as the server-side counterpart of ``guwlib.functions_batch.remote.build_and_solve()`` and is
-intended to be run on a LINUX machine with SLURM workload manager. It iterates through the user-defined list of .PY
-files and pipes each file through ABAQUS/CAE to create .INP files. After that, it writes a SLURM job for the ABAQUS
-solver run for each generated .INP file. The SLURM jobs are submitted in a pure sequential manner to ensure that not
-more than one model is solved at the same time.
+intended to be run on a LINUX machine with SLURM workload manager. It builds the user-defined list of .PY files in a
+single ABAQUS/CAE session (see ``guwlib.functions_cae.build_session``) to create .INP files. After that, it writes a
+SLURM job for the ABAQUS solver run for each generated .INP file, except for load cases that are identical to a load
+case of another model (see ``guwlib.functions_utility.deduplication``). The SLURM jobs are submitted in a pure
+sequential manner to ensure that not more than one model is solved at the same time.
 
 Call this script with arguments specifying the file paths to the model files (.PY) and parameters for the SLURM jobs
 of the ABAQUS solver runs. The required command line arguments of this script, in their order of appearance, are:
 
-    - list[str]: file paths to the model files (.PY) to be built and solved
+    - list[str]: file paths to the model files (.PY) or model specifications (.JSON / .YAML, see
+      ``guwlib.functions_utility.model_spec``) to be built and solved
     - int: specifies how many nodes should be used for each ABAQUS solver run (SLURM: --nodes)
     - int: specifies how many tasks (processes) should be used for each node (SLURM: --ntasks-per-node)
     - str: indicates which slurm partition to use (SLURM: --partition)
@@ -33,8 +35,31 @@ import sys
 import ast
 import subprocess
 
+# the script is run from the root directory of guwlib
+sys.path.insert(0, os.getcwd())
+from guwlib.functions_cae.build_session import run_build_session
+from guwlib.functions_utility.deduplication import deduplicate_input_files
+from guwlib.functions_utility.model_spec import get_model_names
 
-def find_inp_files_generate_job_script(directory_to_search, partition, n_nodes, n_tasks_per_node, max_time):
+
+def find_inp_files(directory_to_search):
+    """
+    Recursively scans the provided directory for .INP files.
+
+    :param str directory_to_search: Path to the directory used as a root for the recursive scan.
+    :return: Paths to all .INP files.
+    :rtype: list[str]
+    """
+    inp_file_paths = []
+    for root, dirs, files in os.walk(directory_to_search):
+        for file_name in files:
+            if file_name.lower().endswith(".inp"):
+                inp_file_paths.append(os.path.join(root, file_name))
+    return inp_file_paths
+
+
+def find_inp_files_generate_job_script(directory_to_search, partition, n_nodes, n_tasks_per_node, max_time,
+                                       inp_files_to_solve=None):
     """
     Recursively scans the provided directory for .INP files and generates a SLURM job file for each.
 
@@ -43,6 +68,8 @@ def find_inp_files_generate_job_script(directory_to_search, partition, n_nodes,
     :param int n_nodes: SLURM job parameter --nodes.
     :param int n_tasks_per_node: SLURM job parameter --ntasks-per-node.
     :param str max_time: SLURM job parameter --partition.
+    :param list[str] inp_files_to_solve: If given, job files are only generated for these .INP files (e.g. the unique
+        load cases after deduplication).
 
     :return: List of all generated job files.
     :rtype: list[str]
@@ -52,6 +79,8 @@ def find_inp_files_generate_job_script(directory_to_search, partition, n_nodes,
     for root, dirs, files in os.walk(directory_to_search):
         for file_name in files:
             if file_name.lower().endswith(".inp"):
+                if inp_files_to_solve is not None and os.path.join(root, file_name) not in inp_files_to_solve:
+                    continue
                 job_name = os.path.splitext(file_name)[0]
                 job_file_path = os.path.join(root, job_name + ".job")
 
@@ -83,24 +112,41 @@ if __name__ == "__main__":
     # evaluating the string representation of a list into a python list object
     model_file_paths = ast.literal_eval(model_file_paths_str)
 
-    # iterate through model_file_paths, run CAE to create *.INP files and generate SLURM jobs for each of them ---------
-    job_files = []
+    # run CAE on all model_file_paths in one session to create *.INP files (one for each load case) --------------------
+    print(f"Starting ABAQUS/CAE (*.INP file generation) on {len(model_file_paths)} model file(s) ...")
+    status_file_path = os.path.join('results', 'build_session_status.json')
+    if os.path.exists(status_file_path):
+        os.remove(status_file_path)
+    build_status = run_build_session(model_file_paths=model_file_paths, status_file_path=status_file_path)
+
+    # solve identical load cases of different models only once ---------------------------------------------------------
+    built_model_file_paths = []
     for model_file_path in model_file_paths:
-        # run ABAQUS/CAE on the model.py file to create *.INP files (one for each load case)
         model_file_name = os.path.splitext(os.path.basename(model_file_path))[0]
-        print(f"Starting ABAQUS/CAE (*.INP file generation) on {model_file_name} ...")
-        command = f"abaqus cae noGUI={model_file_path}"
-        proc = subprocess.Popen(command, shell=True)
-        proc.wait()
+        if build_status.get(model_file_path, {}).get('status') != 'done':
+            print(f"Skipped {model_file_name}, the .INP file generation did not succeed.")
+            continue
+        built_model_file_paths.append(model_file_path)
+    built_model_names = [model_name for model_file_path in built_model_file_paths
+                         for model_name in get_model_names(model_file_path)]
+    inp_files = []
+    for model_name in built_model_names:
+        inp_files.extend(find_inp_files(os.path.join('results', model_name)))
+    unique_inp_files = deduplicate_input_files(inp_files)
+
+    # generate SLURM jobs for each of the successfully built model files -----------------------------------------------
+    job_files = []
+    for model_name in built_model_names:
 
         # search for the *.INP files generated by ABAQUS/CAE and write a *.JOB file for each *.INP file
         # ABAQUS/CAE + GUWlib will write the *.INP files in the 'results' folder
-        inp_file_dir = os.path.join('results', model_file_name)
+        inp_file_dir = os.path.join('results', model_name)
         model_job_files = find_inp_files_generate_job_script(directory_to_search=inp_file_dir,
                                                              partition=solver_partition,
                                                              n_nodes=solver_n_nodes,
                                                              n_tasks_per_node=solver_n_tasks_per_node,
-                                                             max_time=solver_max_time)
+                                                             max_time=solver_max_time,
+                                                             inp_files_to_solve=unique_inp_files)
         job_files.extend(model_job_files)
 
     # submit all SLURM jobs sequentially -------------------------------------------------------------------------------
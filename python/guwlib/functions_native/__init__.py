@@ -0,0 +1,9 @@
+"""
+This package contains the native (ABAQUS-free) backend, which writes the ABAQUS input (.INP) files of simple models
+directly with NumPy instead of building the model in ABAQUS/CAE. It runs with any Python interpreter and is dispatched
+by guwlib.fe_model.FEModel for ``build_backend='native'``:
+
+    - build_native_model(model)
+
+and its helper modules for the structured mesh of the plate and the .INP file writer.
+"""
@@ -0,0 +1,208 @@
+import os
+import time
+
+from guwlib.guw_objects.defects import Crack, Hole
+from guwlib.guw_objects.transducer import CircularTransducer
+from guwlib.functions_utility.console_output import *
+from guwlib.functions_utility.amplitudes import get_amplitude_table
+from guwlib.functions_utility.build_telemetry import BuildTelemetry
+from guwlib.functions_utility.point_force_model import (get_concentrated_forces, get_field_output_node_set_definitions,
+                                                        get_field_output_size_estimate, check_field_output_interval)
+from guwlib.functions_native.structured_mesh import (create_structured_plate_mesh, place_nodes_at_transducers,
+                                                     get_field_output_node_labels)
+from guwlib.functions_native.crack_mesh import insert_cracks
+from guwlib.functions_native.hole_mesh import insert_circular_holes
+from guwlib.functions_native.inp_writer import (get_heading_lines, get_amplitude_lines, get_step_lines,
+                                                write_input_file, get_written_file_path, PLATE_PART_NAME)
+
+
+def build_native_model(model):
+    """
+    Writes the ABAQUS input (.INP) files of a plate with point-force transducers, holes and cracks directly, without
+    ABAQUS/CAE (``build_backend='native'``). The resulting input files correspond to the ones of the ``'point_force'``
+    model built in ABAQUS/CAE (see :func:`build_abaqus_model_point_force`), with the same set, amplitude and step names:
+
+    - Mesh the plate with a structured grid of C3D8R elements with the desired elements per wavelength / thickness.
+    - Move the nearest node of each transducer to its exact position and store the transducer nodes in sets.
+    - Align a grid line with each crack and duplicate the nodes on the crack faces (node separation).
+    - Replace the elements inside the bounding box of each hole by a structured O-grid around the hole.
+    - Create the node sets of load cases with restricted field output.
+    - Write an .INP file with the mesh, material, amplitudes, concentrated forces and output requests for each defined
+      load case. Optionally, the model data (mesh, sets, material) is written only once to a shared include file, and
+      the files are gzip-compressed. The mesh is streamed to the files in chunks, the write throughput is logged.
+
+    Since ABAQUS is not needed, the .INP files are always written, and the build telemetry is written to
+    ``<model_name>_build_telemetry.json`` in the output directory.
+
+    :param FEModel model: The FEModel instance to write the input files for.
+    :return: None
+    """
+
+    telemetry = BuildTelemetry(model.model_name)
+
+    # TIME AND SPACE DISCRETIZATION ------------------------------------------------------------------------------------
+    telemetry.start_phase('discretization')
+    element_size_in_plane = model.get_element_size_in_plane()
+    element_size_thickness = model.get_element_size_thickness()
+    max_time_increment = model.get_max_time_increment()
+
+    log_info("Element size, in-plane:          {:.2e} m (for {:.0f} elements per wavelength)\n"
+             "Element size, through-thickness: {:.2e} m (for {:.0f} elements per thickness)\n"
+             "Max. time increment:             {:.2e} s (for a Courant number of {:.2f})"
+             "".format(element_size_in_plane, model.elements_per_wavelength,
+                       element_size_thickness, model.elements_in_thickness_direction,
+                       max_time_increment, model.courant_number))
+
+    for i, defect in enumerate(model.defects):
+        if not isinstance(defect, (Hole, Crack)):
+            raise NotImplementedError("Defect of type {} not implemented.".format(type(defect)))
+        defect.set_identifiers(unique_id=i + 1)
+    for i, transducer in enumerate(model.transducers):
+        if not isinstance(transducer, CircularTransducer):
+            raise NotImplementedError("Transducer of type {} not implemented.".format(type(transducer)))
+        transducer.set_identifiers(unique_id=i + 1)
+
+    # MESH -------------------------------------------------------------------------------------------------------------
+    telemetry.start_phase('mesh')
+    mesh = create_structured_plate_mesh(plate=model.plate, element_size_in_plane=element_size_in_plane,
+                                        element_size_thickness=element_size_thickness)
+    place_nodes_at_transducers(mesh=mesh, plate=model.plate, transducers=model.transducers,
+                               element_size_in_plane=element_size_in_plane)
+    log_info("Meshed the plate ({}) with {} x {} x {} C3D8R elements.".format(model.plate.description, *mesh.shape))
+    cracks = [defect for defect in model.defects if isinstance(defect, Crack)]
+    holes = [defect for defect in model.defects if isinstance(defect, Hole)]
+    if cracks:
+        telemetry.start_phase('cracks')
+        num_duplicated_nodes = insert_cracks(mesh=mesh, plate=model.plate, cracks=cracks,
+                                             element_size_in_plane=element_size_in_plane)
+        log_info("Inserted {} crack(s) by node duplication ({} nodes).".format(len(cracks), num_duplicated_nodes))
+    if holes:
+        telemetry.start_phase('holes')
+        num_o_grid_elements = insert_circular_holes(mesh=mesh, plate=model.plate, holes=holes,
+                                                    element_size_in_plane=element_size_in_plane)
+        log_info("Meshed {} hole(s) with structured O-grids ({} elements).".format(len(holes), num_o_grid_elements))
+    log_info("The FE model has {} nodes.".format('{:,d}'.format(mesh.num_nodes).replace(',', ' ')))
+    telemetry.set_counter('defects', len(model.defects))
+    telemetry.set_counter('transducers', len(model.transducers))
+    telemetry.set_counter('nodes', mesh.num_nodes)
+
+    # FIELD OUTPUT NODE SETS -------------------------------------------------------------------------------------------
+    field_output_set_names, field_output_node_sets = __get_field_output_node_sets(model=model, mesh=mesh,
+                                                                                  telemetry=telemetry)
+
+    # LOAD CASES -------------------------------------------------------------------------------------------------------
+    include_file_path = None
+    if model.shared_mesh_include:
+        include_file_path = os.path.join(model.output_directory, '{}_mesh.inc'.format(model.model_name))
+    compress = model.compress_input_files
+
+    for i, step in enumerate(model.load_cases):
+        step_name = 'lc_{}_{}'.format(i, step.name)
+        output_directory = os.path.join(model.output_directory, step_name)
+        job_name = '{}_{}'.format(model.model_name, step_name)
+        telemetry.start_phase('{}/step_and_loads'.format(step_name))
+
+        if len(step.transducer_signals) != len(model.transducers):
+            log_warning("In loadcase {}, the number of specified transducer "
+                        "signals ({:d}) does not match the number of transducers ({:d}). "
+                        "Aborting.".format(step_name, len(step.transducer_signals), len(model.transducers)))
+            raise ValueError("Wrong size of loadcase transducer signals.")
+
+        # amplitudes and concentrated forces
+        amplitudes, loads = [], []
+        for transducer, signal in zip(model.transducers, step.transducer_signals):
+            if signal is None:
+                continue
+            amplitude_name = 'transducer_{}_{}'.format(transducer.name, signal.__class__.__name__)
+            time_data_table = get_amplitude_table(signal, max_time_increment)
+            amplitudes.extend(get_amplitude_lines(amplitude_name, time_data_table))
+            telemetry.count('amplitude_points', len(time_data_table))
+            for set_name, direction in get_concentrated_forces(transducer):
+                loads.append((amplitude_name, '{}.{}'.format(PLATE_PART_NAME, set_name), 3, direction))
+
+        # history output of the transducer nodes
+        history_output_interval = model.get_history_output_interval(step)
+        history_outputs = []
+        for j, transducer in enumerate(model.transducers):
+            for set_name, description in zip([transducer.on_plate_top_set_name, transducer.on_plate_bottom_set_name],
+                                             ['top', 'bottom']):
+                if not step.history_output_all_surfaces and transducer.position_z in ('top', 'bottom') and \
+                        description != transducer.position_z:
+                    continue
+                history_outputs.append(('history_transducer_{}_{}'.format(j + 1, description),
+                                        '{}.{}'.format(PLATE_PART_NAME, set_name), step.history_output_variables,
+                                        history_output_interval))
+        telemetry.count('history_node_sets', len(history_outputs))
+
+        # field output of the top surface
+        field_output = None
+        if step.output_request == 'field':
+            field_output_interval = model.get_field_output_interval(step)
+            if field_output_set_names[i] is None:
+                field_output = ('{}.{}'.format(PLATE_PART_NAME, model.plate.field_output_face_set_name),
+                                field_output_interval)
+                num_field_output_nodes = len(mesh.node_sets[model.plate.field_output_face_set_name])
+            else:
+                field_output = (field_output_set_names[i], field_output_interval)
+                num_field_output_nodes = len(field_output_node_sets[field_output_set_names[i]])
+            field_output_size = get_field_output_size_estimate(num_nodes=num_field_output_nodes,
+                                                               duration=step.duration,
+                                                               time_interval=field_output_interval)
+            telemetry.count('field_output_bytes_estimate', field_output_size)
+            log_info("Field output of {} nodes every {:.2e} s, estimated .ODB size: {:.1f} MB."
+                     "".format(num_field_output_nodes, field_output_interval, field_output_size / 1e6))
+            check_field_output_interval(step_name=step_name, time_interval=field_output_interval,
+                                        max_frequency=model.max_frequency)
+
+        history = get_step_lines(step_name=step_name, time_period=step.duration, max_increment=max_time_increment,
+                                 loads=loads, history_outputs=history_outputs, field_output=field_output)
+
+        # write ABAQUS input (.INP) file for this load case
+        telemetry.start_phase('{}/write_input'.format(step_name))
+        input_file_path = os.path.join(output_directory, job_name + '.inp')
+        write_start_time = time.time()
+        num_bytes = write_input_file(input_file_path=input_file_path, heading=get_heading_lines(job_name), mesh=mesh,
+                                     plate=model.plate, amplitudes=amplitudes, history=history,
+                                     assembly_node_sets=field_output_node_sets, include_file_path=include_file_path,
+                                     compress=compress)
+        write_time = time.time() - write_start_time
+        telemetry.count('inp_files')
+        telemetry.count('inp_bytes', os.path.getsize(get_written_file_path(input_file_path, compress)))
+        telemetry.count('inp_text_bytes', num_bytes)
+        log_info("Wrote {:.1f} MB of input file text in {:.1f} s ({:.1f} MB/s{})."
+                 "".format(num_bytes / 1e6, write_time, num_bytes / 1e6 / max(write_time, 1e-6),
+                           ', gzip-compressed' if compress else ''))
+        log_info("Created an ABAQUS job definition (.INP) file for the load case {} with {} output requested."
+                 "".format(step_name, step.output_request))
+
+    # TELEMETRY --------------------------------------------------------------------------------------------------------
+    telemetry.end_phase()
+    if include_file_path is not None and os.path.exists(get_written_file_path(include_file_path, compress)):
+        telemetry.count('inp_bytes', os.path.getsize(get_written_file_path(include_file_path, compress)))
+    telemetry_file_path = telemetry.save(model.output_directory)
+    log_info("Build telemetry written to {}. Slowest phases: {}".format(
+        telemetry_file_path, ', '.join(['{} ({:.1f} s)'.format(name, wall_time)
+                                        for name, wall_time in telemetry.get_slowest_phases()])))
+
+
+def __get_field_output_node_sets(model, mesh, telemetry):
+    """
+    (Helper) Selects the nodes of all load cases whose field output is restricted to a subset of the plate surface
+    nodes (see :class:`LoadCase`), with the same set names as the ABAQUS/CAE build. Load cases with the same
+    restriction share one set.
+
+    :param FEModel model: The FEModel instance.
+    :param PlateMesh mesh: Mesh of the plate.
+    :param BuildTelemetry telemetry: Telemetry of the build.
+    :return: Name of the field output node set of each load case (None for all plate surface nodes) and the node labels
+        of each set, by set name.
+    :rtype: tuple[list[str], dict[str, numpy.ndarray]]
+    """
+    set_names, set_definitions = get_field_output_node_set_definitions(model)
+    node_sets = {}
+    for set_name, node_spacing, regions in set_definitions:
+        telemetry.start_phase('field_output_sets')
+        node_sets[set_name] = get_field_output_node_labels(mesh=mesh, plate=model.plate, node_spacing=node_spacing,
+                                                           regions=regions)
+        log_info("Created the field output node set {} with {} nodes.".format(set_name, len(node_sets[set_name])))
+    return set_names, node_sets
@@ -0,0 +1,137 @@
+"""
+Through-thickness cracks in the structured plate mesh (see :mod:`guwlib.functions_native.structured_mesh`), realised by
+node duplication, without ABAQUS. The nodes of the grid line closest to the crack (along y for cracks with an angle up
+to 45 degrees from the y-axis, along x otherwise) are moved onto the crack, so that the crack is spanned by element
+faces. The displacement of the grid line decays linearly to zero at the snapped bounding box of the crack, so the grid
+outside the bounding box remains regular. The nodes on the crack (except the crack tips) are then duplicated for the
+elements on one side of the crack, which separates the crack faces like the seam assigned by the ABAQUS/CAE build.
+"""
+import numpy as np
+
+from guwlib.functions_utility.grid_snapping import get_snapped_bounding_box_coordinates
+from guwlib.functions_native.structured_mesh import get_bounding_box_element_labels
+
+
+def insert_cracks(mesh, plate, cracks, element_size_in_plane):
+    """
+    Inserts each crack into the structured mesh by aligning a grid line with the crack and duplicating the nodes on the
+    crack faces. The elements inside the bounding box of each crack are stored in the element set
+    ``crack.bounding_box_cell_set_name``, the nodes on both crack faces in the node set ``crack.seam_face_set_name``.
+    Has to be called on the structured mesh, after the transducer nodes are placed (see
+    :func:`place_nodes_at_transducers`) and before holes are inserted.
+
+    :param PlateMesh mesh: Structured mesh of the plate (see :func:`create_structured_plate_mesh`).
+    :param IsotropicRectangularPlate plate: Plate instance.
+    :param list[Crack] cracks: Cracks, with identifiers (set names) set.
+    :param float element_size_in_plane: Desired element size (in-plane), as used to create the mesh.
+    :return: Number of duplicated nodes.
+    :rtype: int
+    :raises ValueError: If a crack is shorter than two elements, if its tips are not inside its bounding box, if
+        aligning the grid with the crack would invert elements, if its bounding box overlaps with the bounding box of
+        another defect or if a node set (e.g. of a transducer) lies inside it.
+    """
+    nx, ny, nz = mesh.shape
+    spacings = np.array([float(plate.width) / nx, float(plate.length) / ny])
+    num_duplicated_nodes = 0
+
+    for crack in cracks:
+        x_left, x_right, y_lower, y_upper, _, _ = get_snapped_bounding_box_coordinates(
+            x=crack.position_x, y=crack.position_y, bounding_box_radius=crack.bounding_box_scale * crack.length * 0.5,
+            plate_width=plate.width, plate_length=plate.length, element_size=element_size_in_plane)
+        box_elements = get_bounding_box_element_labels(mesh, plate, crack.bounding_box_cell_set_name,
+                                                       int(round(x_left / spacings[0])),
+                                                       int(round(x_right / spacings[0])),
+                                                       int(round(y_lower / spacings[1])),
+                                                       int(round(y_upper / spacings[1])))
+
+        # crack tips, sorted along the axis of the grid lines that are aligned with the crack (as in the CAE build)
+        angle = crack.angle % np.pi
+        along = 0 if np.pi / 4 < angle < 3 * np.pi / 4 else 1
+        across = 1 - along
+        center = np.array([crack.position_x, crack.position_y])
+        half_crack = 0.5 * crack.length * np.array([-np.sin(angle), np.cos(angle)])
+        tips = sorted([center - half_crack, center + half_crack], key=lambda tip: tip[along])
+
+        # grid indices along (rows) and across (columns) the crack
+        box = np.array([[x_left, x_right], [y_lower, y_upper]])
+        row_min, row_max = [int(round(value / spacings[along])) for value in box[along]]
+        column_min, column_max = [int(round(value / spacings[across])) for value in box[across]]
+        row_a, row_b = [int(round(tip[along] / spacings[along])) for tip in tips]
+        column = min(max(int(round(center[across] / spacings[across])), column_min + 1), column_max - 1)
+        if row_b - row_a < 2:
+            raise ValueError("Crack {} is shorter than two elements, its faces can't be separated.".format(crack.id))
+        if not row_min < row_a or not row_b < row_max or not column_min < column < column_max:
+            raise ValueError("The tips of crack {} are not inside its bounding box, increase its bounding box scale."
+                             "".format(crack.id))
+
+        # grid view indexed by (layer, row, column), in-plane coordinates only
+        num_grid_nodes = (nx + 1) * (ny + 1) * (nz + 1)
+        grid = mesh.node_coordinates[:num_grid_nodes].reshape((nz + 1, ny + 1, nx + 1, 3))[:, :, :, :2]
+        if along == 0:
+            grid = grid.transpose((0, 2, 1, 3))
+
+        # displacement of the grid line onto the crack, decaying to zero at the bounding box
+        rows = np.arange(row_min, row_max + 1)
+        targets = tips[0] + np.outer((rows - row_a) / float(row_b - row_a), tips[1] - tips[0])
+        line_displacement = targets - grid[0, rows, column]
+        line_displacement[rows < row_a] = np.outer((rows[rows < row_a] - row_min) / float(row_a - row_min),
+                                                   line_displacement[rows == row_a][0])
+        line_displacement[rows > row_b] = np.outer((row_max - rows[rows > row_b]) / float(row_max - row_b),
+                                                   line_displacement[rows == row_b][0])
+        columns = np.arange(column_min, column_max + 1)
+        hat = np.where(columns <= column, (columns - column_min) / float(column - column_min),
+                       (column_max - columns) / float(column_max - column))
+        grid[:, row_min:row_max + 1, column_min:column_max + 1] += \
+            line_displacement[np.newaxis, :, np.newaxis, :] * hat[np.newaxis, np.newaxis, :, np.newaxis]
+        __check_element_orientation(mesh, box_elements, crack)
+
+        # duplicate the nodes on the crack (except the tips) for the elements on one side of the crack
+        crack_rows = np.arange(row_a, row_b + 1)
+        crack_nodes = np.array([__get_node_label(mesh, along, row, column, k) for k in range(nz + 1)
+                                for row in crack_rows])
+        inner_nodes = np.array([__get_node_label(mesh, along, row, column, k) for k in range(nz + 1)
+                                for row in crack_rows[1:-1]])
+        duplicated_nodes = mesh.add_nodes(mesh.node_coordinates[inner_nodes - 1])
+        top_layer = np.isclose(mesh.node_coordinates[inner_nodes - 1, 2], plate.thickness)
+        mesh.node_sets[plate.field_output_face_set_name] = np.concatenate(
+            (mesh.node_sets[plate.field_output_face_set_name], duplicated_nodes[top_layer]))
+
+        side_elements = np.array([__get_element_label(mesh, along, row, column, k) for k in range(nz)
+                                  for row in crack_rows[:-1]])
+        connectivity = mesh.element_connectivity[side_elements - 1]
+        duplicate_of = dict(zip(inner_nodes, duplicated_nodes))
+        mesh.element_connectivity[side_elements - 1] = np.vectorize(lambda label: duplicate_of.get(label, label),
+                                                                    otypes=[int])(connectivity)
+
+        mesh.element_sets[crack.bounding_box_cell_set_name] = box_elements
+        mesh.node_sets[crack.seam_face_set_name] = np.concatenate((crack_nodes, duplicated_nodes))
+        num_duplicated_nodes += len(duplicated_nodes)
+
+    return num_duplicated_nodes
+
+
+def __get_node_label(mesh, along, row, column, k):
+    """
+    (Helper) Returns the label of a grid node, indexed by row and column relative to the crack.
+    """
+    return mesh.get_node_label(row, column, k) if along == 0 else mesh.get_node_label(column, row, k)
+
+
+def __get_element_label(mesh, along, row, column, k):
+    """
+    (Helper) Returns the label of a grid element, indexed by row and column relative to the crack.
+    """
+    return mesh.get_element_label(row, column, k) if along == 0 else mesh.get_element_label(column, row, k)
+
+
+def __check_element_orientation(mesh, element_labels, crack):
+    """
+    (Helper) Raises a ValueError if an element of the bottom layer in the bounding box of a crack is inverted or
+    degenerated by aligning the grid with the crack.
+    """
+    corners = mesh.node_coordinates[mesh.element_connectivity[element_labels - 1, :4] - 1, :2]
+    for a, b, c in ((0, 1, 3), (1, 2, 0), (2, 3, 1), (3, 0, 2)):
+        edge_1, edge_2 = corners[:, b] - corners[:, a], corners[:, c] - corners[:, a]
+        if np.any(edge_1[:, 0] * edge_2[:, 1] - edge_1[:, 1] * edge_2[:, 0] <= 0):
+            raise ValueError("Aligning the mesh with crack {} inverts elements, increase its bounding box scale."
+                             "".format(crack.id))
@@ -0,0 +1,116 @@
+"""
+Structured O-grid meshing of circular through-thickness holes in the structured plate mesh (see
+:mod:`guwlib.functions_native.structured_mesh`), without ABAQUS. The elements inside the snapped bounding box of each
+hole are replaced by an O-grid: rings of hexahedral elements between the hole and the boundary of the bounding box. The
+nodes of the outermost ring are the existing grid nodes on the boundary of the bounding box, so the O-grid is conforming
+with the surrounding grid.
+
+Each node on the boundary of the bounding box is connected to the hole by a straight ray towards the hole center. The
+radial element size grows linearly along each ray, from the circumferential element size at the hole to the in-plane
+element size at the bounding box, so that the elements next to the hole have an aspect ratio close to one.
+"""
+import math
+
+import numpy as np
+
+from guwlib.functions_utility.grid_snapping import get_snapped_bounding_box_coordinates
+from guwlib.functions_native.structured_mesh import get_bounding_box_element_labels
+
+
+def insert_circular_holes(mesh, plate, holes, element_size_in_plane):
+    """
+    Replaces the elements inside the snapped bounding box of each hole by a structured O-grid around the hole. The
+    elements of each O-grid are stored in the element set ``hole.bounding_box_cell_set_name``, the new nodes on the
+    top surface are added to the field output node set. Has to be called on the structured mesh, after the transducer
+    nodes are placed (see :func:`place_nodes_at_transducers`). Nodes and elements are renumbered afterwards.
+
+    :param PlateMesh mesh: Structured mesh of the plate (see :func:`create_structured_plate_mesh`).
+    :param IsotropicRectangularPlate plate: Plate instance.
+    :param list[Hole] holes: Holes, with identifiers (set names) set.
+    :param float element_size_in_plane: Desired element size (in-plane), as used to create the mesh.
+    :return: Number of elements of all O-grids.
+    :rtype: int
+    :raises ValueError: If a hole is not inside its bounding box, if the bounding box of a hole overlaps with the
+        bounding box of another defect or if a node set (e.g. of a transducer) lies inside it.
+    """
+    nx, ny, _ = mesh.shape
+    dx, dy = float(plate.width) / nx, float(plate.length) / ny
+    removed_elements = np.zeros(mesh.num_elements, dtype=bool)
+    num_o_grid_elements = 0
+
+    for hole in holes:
+        x_left, x_right, y_lower, y_upper, _, _ = get_snapped_bounding_box_coordinates(
+            x=hole.position_x, y=hole.position_y, bounding_box_radius=hole.radius * hole.bounding_box_scale,
+            plate_width=plate.width, plate_length=plate.length, element_size=element_size_in_plane)
+        i_min, i_max = int(round(x_left / dx)), int(round(x_right / dx))
+        j_min, j_max = int(round(y_lower / dy)), int(round(y_upper / dy))
+        if min(hole.position_x - x_left, x_right - hole.position_x, hole.position_y - y_lower,
+               y_upper - hole.position_y) <= hole.radius:
+            raise ValueError("The bounding box of hole {} does not contain the hole, increase its bounding box scale."
+                             "".format(hole.id))
+
+        # the elements inside the bounding box are replaced by the O-grid, they must not belong to another hole
+        box_elements = get_bounding_box_element_labels(mesh, plate, hole.bounding_box_cell_set_name,
+                                                       i_min, i_max, j_min, j_max)
+        if np.any(removed_elements[box_elements - 1]):
+            raise ValueError("The bounding box of hole {} overlaps with the bounding box of another hole."
+                             "".format(hole.id))
+        removed_elements[box_elements - 1] = True
+
+        # grid indices of the nodes on the boundary of the bounding box, counter-clockwise
+        boundary = [(i, j_min) for i in range(i_min, i_max)] + [(i_max, j) for j in range(j_min, j_max)] + \
+                   [(i, j_max) for i in range(i_max, i_min, -1)] + [(i_min, j) for j in range(j_max, j_min, -1)]
+        num_o_grid_elements += __add_o_grid(mesh, plate, hole, boundary, element_size_in_plane)
+
+    mesh.remove_elements(np.flatnonzero(removed_elements) + 1)
+    return num_o_grid_elements
+
+
+def __add_o_grid(mesh, plate, hole, boundary, element_size_in_plane):
+    """
+    (Helper) Adds the nodes and elements of the O-grid between the hole and the given boundary nodes of its bounding
+    box (through the whole thickness).
+
+    :return: Number of elements of the O-grid.
+    :rtype: int
+    """
+    nz = mesh.shape[2]
+    n_boundary = len(boundary)
+    center = np.array([hole.position_x, hole.position_y])
+
+    # outer nodes (existing) and the corresponding points on the hole, on rays towards the hole center
+    outer_labels = np.array([[mesh.get_node_label(i, j, k) for i, j in boundary] for k in range(nz + 1)])
+    outer_points = mesh.node_coordinates[outer_labels[0] - 1, :2]
+    directions = outer_points - center
+    ray_lengths = np.hypot(directions[:, 0], directions[:, 1])
+    inner_points = center + hole.radius * directions / ray_lengths[:, np.newaxis]
+    ray_lengths = ray_lengths - hole.radius
+
+    # radial distribution: element size growing linearly from the circumferential size at the hole to the in-plane
+    # element size at the bounding box
+    size_at_hole = 2 * math.pi * hole.radius / n_boundary
+    n_rings = max(1, int(round(2 * np.mean(ray_lengths) / (size_at_hole + element_size_in_plane))))
+    sizes = np.linspace(size_at_hole, element_size_in_plane, n_rings) if n_rings > 1 else np.ones(1)
+    fractions = np.concatenate(([0.0], np.cumsum(sizes) / np.sum(sizes)))
+
+    # new nodes of the inner rings (ring 0 on the hole), all layers
+    labels = np.empty((nz + 1, n_rings + 1, n_boundary), dtype=int)
+    labels[:, n_rings, :] = outer_labels
+    ring_points = inner_points[np.newaxis, :, :] + fractions[:n_rings, np.newaxis, np.newaxis] * \
+        (outer_points - inner_points)[np.newaxis, :, :]
+    for k in range(nz + 1):
+        z = mesh.node_coordinates[outer_labels[k, 0] - 1, 2]
+        coordinates = np.column_stack((ring_points.reshape(-1, 2), np.full(n_rings * n_boundary, z)))
+        node_sets = (plate.field_output_face_set_name,) if k == nz else ()
+        labels[k, :n_rings, :] = mesh.add_nodes(coordinates, node_sets=node_sets).reshape(n_rings, n_boundary)
+
+    # hexahedral elements: radially outwards, then counter-clockwise (positive orientation)
+    m, p, k = np.meshgrid(np.arange(n_rings), np.arange(n_boundary), np.arange(nz), indexing='ij')
+    m, p, k = m.ravel(), p.ravel(), k.ravel()
+    q = (p + 1) % n_boundary
+    connectivity = np.column_stack((labels[k, m, p], labels[k, m + 1, p], labels[k, m + 1, q], labels[k, m, q],
+                                    labels[k + 1, m, p], labels[k + 1, m + 1, p], labels[k + 1, m + 1, q],
+                                    labels[k + 1, m, q]))
+    mesh.add_elements(connectivity, element_sets=(plate.cell_set_name, plate.material_cell_set_name,
+                                                  hole.bounding_box_cell_set_name))
+    return len(connectivity)
@@ -0,0 +1,281 @@
+"""
+Writer for ABAQUS input (.INP) files of a structured plate mesh (see :mod:`guwlib.functions_native.structured_mesh`).
+The keyword blocks mirror the input files written by ABAQUS/CAE for the ``'point_force'`` model: a part ``plate`` with
+the mesh, its sets and the solid section, an assembly with a single instance ``plate``, tabular amplitudes, the
+isotropic material and one dynamic/explicit step with concentrated forces and output requests. The model data (mesh,
+sets, assembly and material) can be written to a shared include file like the input files of the CAE build (see
+:mod:`guwlib.functions_utility.input_file_splitting`).
+
+Nodes, elements and set labels are formatted and written in chunks of a fixed number of rows, so the memory used for
+the text does not depend on the size of the mesh. Each chunk is formatted with a single string formatting operation,
+which is considerably faster than formatting line by line (e.g. with ``numpy.savetxt``). The files can optionally be
+compressed with gzip (e.g. to archive them or to transfer them to a cluster, ABAQUS reads uncompressed input files
+only).
+"""
+import gzip
+import os
+
+import numpy as np
+
+from guwlib.functions_utility.input_file_splitting import get_load_case_input_file_lines
+
+# name of the plate part and its instance, as in the ABAQUS/CAE build
+PLATE_PART_NAME = 'plate'
+
+# number of labels per data line of set definitions (at most 16 according to the ABAQUS documentation)
+SET_LABELS_PER_LINE = 16
+
+# number of (time, value) pairs per data line of amplitude definitions (at most 4)
+AMPLITUDE_PAIRS_PER_LINE = 4
+
+# number of nodes, elements or set lines that are formatted and written at once
+WRITE_CHUNK_SIZE = 65536
+
+# extension and compression level (fast) of gzip-compressed files
+COMPRESSED_FILE_EXTENSION = '.gz'
+GZIP_COMPRESSION_LEVEL = 1
+
+
+def get_heading_lines(job_name):
+    """
+    :param str job_name: Name of the ABAQUS job.
+    :return: Lines of the heading of the input file.
+    :rtype: list[str]
+    """
+    return ['*Heading',
+            '** Job name: {} Model name: guw_model'.format(job_name),
+            '** Generated by: GUWlib (native .INP writer)',
+            '*Preprint, echo=NO, model=NO, history=NO, contact=NO']
+
+
+def write_model_data(file, mesh, plate, assembly_node_sets=None):
+    """
+    Writes the shared model data: the plate part (nodes, C3D8R elements, sets and solid section), the assembly and the
+    material. The nodes, elements and sets are streamed in chunks (see :data:`WRITE_CHUNK_SIZE`).
+
+    :param file file: Open (text) file to write to.
+    :param PlateMesh mesh: Mesh of the plate.
+    :param IsotropicRectangularPlate plate: Plate instance.
+    :param dict[str, numpy.ndarray] assembly_node_sets: Node labels of additional assembly-level node sets of the plate
+        instance, by set name (e.g. the field output node sets).
+    :return: Number of characters (bytes) written.
+    :rtype: int
+    """
+    material = plate.material
+    num_bytes = 0
+
+    # PART
+    num_bytes += __write_text(file, '**\n** PARTS\n**\n*Part, name={}\n*Node\n'.format(PLATE_PART_NAME))
+    num_bytes += __write_labelled_rows(file, mesh.node_coordinates, '%7d, %.10g, %.10g, %.10g\n')
+    num_bytes += __write_text(file, '*Element, type=C3D8R\n')
+    num_bytes += __write_labelled_rows(file, mesh.element_connectivity, ', '.join(['%d'] * 9) + '\n')
+    for set_name in sorted(mesh.node_sets):
+        num_bytes += __write_set(file, 'Nset', set_name, mesh.node_sets[set_name])
+    for set_name in sorted(mesh.element_sets):
+        num_bytes += __write_set(file, 'Elset', set_name, mesh.element_sets[set_name])
+    num_bytes += __write_text(file, '** Section: {0}_section_homogenous_{1}\n'
+                                    '*Solid Section, elset={0}, material={1}\n,\n'
+                                    '*End Part\n'.format(plate.material_cell_set_name, material.name))
+
+    # ASSEMBLY
+    num_bytes += __write_text(file, '**\n**\n** ASSEMBLY\n**\n*Assembly, name=Assembly\n**\n')
+    num_bytes += __write_text(file, '*Instance, name={0}, part={0}\n*End Instance\n**\n'.format(PLATE_PART_NAME))
+    for set_name in sorted(assembly_node_sets or {}):
+        num_bytes += __write_set(file, 'Nset', set_name, assembly_node_sets[set_name], instance=PLATE_PART_NAME)
+    num_bytes += __write_text(file, '*End Assembly\n')
+
+    # MATERIAL
+    num_bytes += __write_text(file, '**\n** MATERIALS\n**\n*Material, name={}\n'.format(material.name))
+    num_bytes += __write_text(file, '*Density\n{!r},\n'.format(float(material.properties['density'])))
+    num_bytes += __write_text(file, '*Elastic\n{!r}, {!r}\n'.format(float(material.properties['youngs_modulus']),
+                                                                    float(material.properties['poissons_ratio'])))
+    return num_bytes
+
+
+def get_amplitude_lines(name, time_data_table):
+    """
+    :param str name: Name of the amplitude.
+    :param list[tuple[float, float]] time_data_table: Time and value of each data point of the amplitude.
+    :return: Lines of the tabular amplitude definition.
+    :rtype: list[str]
+    """
+    lines = ['*Amplitude, name={}'.format(name)]
+    for i in range(0, len(time_data_table), AMPLITUDE_PAIRS_PER_LINE):
+        lines.append(', '.join('{:.10g}, {:.10g}'.format(t, value)
+                               for t, value in time_data_table[i:i + AMPLITUDE_PAIRS_PER_LINE]))
+    return lines
+
+
+def get_step_lines(step_name, time_period, max_increment, loads, history_outputs, field_output=None):
+    """
+    Assembles the history data of a dynamic/explicit step.
+
+    :param str step_name: Name of the step.
+    :param float time_period: Step duration.
+    :param float max_increment: Maximum time increment of the time integration scheme.
+    :param list[tuple[str, str, int, float]] loads: Concentrated forces as (amplitude name, node set, force component,
+        magnitude).
+    :param list[tuple[str, str, tuple[str], float]] history_outputs: History output requests as (request name, node
+        set, variables, time interval). Output is written for every increment if the time interval is None, otherwise
+        with ABAQUS' anti-aliasing filter.
+    :param tuple[str, float] field_output: Field output request (``UT``) as (node set, time interval), or None.
+    :return: Lines of the step definition.
+    :rtype: list[str]
+    """
+    lines = ['** ----------------------------------------------------------------',
+             '**',
+             '** STEP: {}'.format(step_name),
+             '**',
+             '*Step, name={}, nlgeom=NO'.format(step_name),
+             '*Dynamic, Explicit',
+             ', {!r}, , {!r}'.format(float(time_period), float(max_increment)),
+             '*Bulk Viscosity',
+             '0.06, 1.2',
+             '**',
+             '** LOADS',
+             '**']
+    for amplitude_name, set_name, component, magnitude in loads:
+        lines.extend(['*Cload, amplitude={}'.format(amplitude_name),
+                      '{}, {:d}, {!r}'.format(set_name, component, float(magnitude))])
+
+    lines.extend(['**', '** OUTPUT REQUESTS', '**', '*Restart, write, number interval=1, time marks=NO'])
+    if field_output is not None:
+        set_name, time_interval = field_output
+        lines.extend(['**',
+                      '** FIELD OUTPUT: full_field_{}'.format(step_name),
+                      '**',
+                      '*Output, field, time interval={!r}'.format(float(time_interval)),
+                      '*Node Output, nset={}'.format(set_name),
+                      'UT,'])
+    for request_name, set_name, variables, time_interval in history_outputs:
+        if time_interval is None:
+            sampling = 'frequency=1'
+        else:
+            sampling = 'time interval={!r}, filter=ANTIALIASING'.format(float(time_interval))
+        lines.extend(['**',
+                      '** HISTORY OUTPUT: {}'.format(request_name),
+                      '**',
+                      '*Output, history, {}'.format(sampling),
+                      '*Node Output, nset={}'.format(set_name),
+                      ', '.join(variables) + ','])
+    lines.append('*End Step')
+    return lines
+
+
+def get_written_file_path(file_path, compress=False):
+    """
+    :param str file_path: Path of an input or include file.
+    :param bool compress: Whether the file is written gzip-compressed.
+    :return: Path of the file on disk (with the extension of compressed files, if compressed).
+    :rtype: str
+    """
+    return file_path + COMPRESSED_FILE_EXTENSION if compress else file_path
+
+
+def write_input_file(input_file_path, heading, mesh, plate, amplitudes, history, assembly_node_sets=None,
+                     include_file_path=None, compress=False):
+    """
+    Writes an input (.INP) file. If an include file path is given, the model data is written only once to the shared
+    include file (if it does not exist yet), and the input file only contains the heading, the amplitudes and the step.
+
+    :param str input_file_path: Path of the input file to write (the directory is created if it doesn't exist).
+    :param list[str] heading: Lines of the heading.
+    :param PlateMesh mesh: Mesh of the plate.
+    :param IsotropicRectangularPlate plate: Plate instance.
+    :param list[str] amplitudes: Lines of the amplitude definitions.
+    :param list[str] history: Lines of the step definition.
+    :param dict[str, numpy.ndarray] assembly_node_sets: Node labels of additional assembly-level node sets.
+    :param str include_file_path: Path to the shared include file, or None to write a complete input file.
+    :param bool compress: If True, the input file and the include file are gzip-compressed, and the extension
+        :data:`COMPRESSED_FILE_EXTENSION` is appended to their paths (see :func:`get_written_file_path`). The include
+        reference in the input file refers to the uncompressed include file.
+    :return: Number of characters (bytes) written, before compression.
+    :rtype: int
+    """
+    output_directory = os.path.dirname(input_file_path)
+    if output_directory and not os.path.exists(output_directory):
+        os.makedirs(output_directory)
+    num_bytes = 0
+
+    if include_file_path is not None:
+        if not os.path.exists(get_written_file_path(include_file_path, compress)):
+            with __open_output_file(get_written_file_path(include_file_path, compress)) as include_file:
+                num_bytes += write_model_data(include_file, mesh, plate, assembly_node_sets)
+        include_file_reference = os.path.relpath(os.path.abspath(include_file_path),
+                                                 os.path.dirname(os.path.abspath(input_file_path)))
+        lines = get_load_case_input_file_lines(heading, include_file_reference, amplitudes, history)
+        with __open_output_file(get_written_file_path(input_file_path, compress)) as input_file:
+            num_bytes += __write_text(input_file, '\n'.join(lines) + '\n')
+        return num_bytes
+
+    with __open_output_file(get_written_file_path(input_file_path, compress)) as input_file:
+        num_bytes += __write_text(input_file, '\n'.join(heading) + '\n')
+        num_bytes += write_model_data(input_file, mesh, plate, assembly_node_sets)
+        num_bytes += __write_text(input_file, '\n'.join(amplitudes + history) + '\n')
+    return num_bytes
+
+
+def __open_output_file(file_path):
+    """
+    (Helper) Opens a text file for writing, gzip-compressed if its path has the extension of compressed files.
+    """
+    if file_path.endswith(COMPRESSED_FILE_EXTENSION):
+        return gzip.open(file_path, 'wt', compresslevel=GZIP_COMPRESSION_LEVEL)
+    return open(file_path, 'w')
+
+
+def __write_text(file, text):
+    """
+    (Helper) Writes a string to a file.
+
+    :return: Number of characters written.
+    :rtype: int
+    """
+    file.write(text)
+    return len(text)
+
+
+def __write_labelled_rows(file, rows, line_format):
+    """
+    (Helper) Writes the rows of an array (node coordinates or element connectivity), each preceded by its label
+    (1, 2, ...), chunk by chunk. Each chunk is formatted at once with a format string repeated for each line.
+
+    :return: Number of characters written.
+    :rtype: int
+    """
+    num_bytes = 0
+    for start in range(0, len(rows), WRITE_CHUNK_SIZE):
+        chunk = rows[start:start + WRITE_CHUNK_SIZE]
+        values = np.empty((len(chunk), chunk.shape[1] + 1), dtype=chunk.dtype)
+        values[:, 0] = np.arange(start + 1, start + len(chunk) + 1)
+        values[:, 1:] = chunk
+        num_bytes += __write_text(file, (line_format * len(chunk)) % tuple(values.ravel().tolist()))
+    return num_bytes
+
+
+def __write_set(file, keyword, name, labels, instance=None):
+    """
+    (Helper) Writes a node or element set, with the ``generate`` option if the labels are consecutive, otherwise chunk
+    by chunk with :data:`SET_LABELS_PER_LINE` labels per line.
+
+    :return: Number of characters written.
+    :rtype: int
+    """
+    labels = np.asarray(labels)
+    options = ', instance={}'.format(instance) if instance is not None else ''
+    if len(labels) > 1 and np.all(np.diff(labels) == 1):
+        return __write_text(file, '*{0}, {1}={2}{3}, generate\n{4:d}, {5:d}, 1\n'.format(
+            keyword, keyword.lower(), name, options, labels[0], labels[-1]))
+
+    num_bytes = __write_text(file, '*{0}, {1}={2}{3}\n'.format(keyword, keyword.lower(), name, options))
+    line_format = ', '.join(['%d'] * SET_LABELS_PER_LINE) + ',\n'
+    labels_per_chunk = WRITE_CHUNK_SIZE * SET_LABELS_PER_LINE
+    for start in range(0, len(labels), labels_per_chunk):
+        chunk = labels[start:start + labels_per_chunk]
+        num_full_lines = len(chunk) // SET_LABELS_PER_LINE
+        text = (line_format * num_full_lines) % tuple(chunk[:num_full_lines * SET_LABELS_PER_LINE].tolist())
+        if len(chunk) % SET_LABELS_PER_LINE:
+            text += ', '.join(['%d'] * (len(chunk) % SET_LABELS_PER_LINE)) % \
+                tuple(chunk[num_full_lines * SET_LABELS_PER_LINE:].tolist()) + ',\n'
+        num_bytes += __write_text(file, text)
+    return num_bytes
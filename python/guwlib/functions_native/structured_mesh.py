@@ -0,0 +1,347 @@
+"""
+Generation of the structured hexahedral (C3D8R) mesh of a rectangular plate with NumPy, without ABAQUS. The mesh
+reproduces the mesh that ABAQUS/CAE generates for a pristine plate: a regular grid with the in-plane node spacing of the
+seeded plate edges (see :mod:`guwlib.functions_utility.grid_snapping`) and ``elements_in_thickness_direction`` layers.
+The transducers are snapped to the grid by moving the nearest grid node (through the whole thickness) to the exact
+transducer position. The displacement of the node is smoothly distributed over the snapped bounding box of the
+transducer, so that the grid outside the bounding boxes remains regular, like the structured mesh around the free meshed
+bounding boxes of the CAE model.
+
+Nodes are numbered ``1 + i + (nx + 1) * (j + (ny + 1) * k)`` for the grid indices ``i`` (x), ``j`` (y) and ``k`` (z),
+elements ``1 + i + nx * (j + ny * k)``. All nodes of a through-thickness layer thus have consecutive labels. Defects
+(see :mod:`guwlib.functions_native.hole_mesh`) replace elements of the grid, the nodes and elements are renumbered
+afterwards.
+"""
+import numpy as np
+
+from guwlib.functions_utility.grid_snapping import (get_number_of_elements_along_edge,
+                                                    get_snapped_bounding_box_coordinates)
+
+
+class PlateMesh(object):
+    """
+    Structured hexahedral mesh of a rectangular plate, with node and element sets.
+    """
+
+    def __init__(self, node_coordinates, element_connectivity, shape):
+        """
+        :param numpy.ndarray node_coordinates: Coordinates of the nodes, shape (number of nodes, 3), in label order.
+        :param numpy.ndarray element_connectivity: Node labels of the elements, shape (number of elements, 8), in label
+            order and in the node ordering of ABAQUS' hexahedral elements.
+        :param tuple[int, int, int] shape: Number of elements along x, y and z (nx, ny, nz).
+
+        :ivar numpy.ndarray node_coordinates: Coordinates of the nodes.
+        :ivar numpy.ndarray element_connectivity: Node labels of the elements.
+        :ivar tuple[int, int, int] shape: Number of elements along x, y and z.
+        :ivar dict[str, numpy.ndarray] node_sets: Node labels of each node set, by set name.
+        :ivar dict[str, numpy.ndarray] element_sets: Element labels of each element set, by set name.
+        """
+        self.node_coordinates = node_coordinates
+        self.element_connectivity = element_connectivity
+        self.shape = shape
+        self.node_sets = {}
+        self.element_sets = {}
+
+    @property
+    def num_nodes(self):
+        """
+        :return: Number of nodes of the mesh.
+        :rtype: int
+        """
+        return len(self.node_coordinates)
+
+    @property
+    def num_elements(self):
+        """
+        :return: Number of elements of the mesh.
+        :rtype: int
+        """
+        return len(self.element_connectivity)
+
+    def get_node_label(self, i, j, k):
+        """
+        Only valid for the structured grid, i.e. before elements are removed (see :meth:`remove_elements`).
+
+        :param int i: Grid index along x.
+        :param int j: Grid index along y.
+        :param int k: Grid index along z (0 on the bottom surface).
+        :return: Label of the node at the grid indices.
+        :rtype: int
+        """
+        nx, ny, _ = self.shape
+        return 1 + i + (nx + 1) * (j + (ny + 1) * k)
+
+    def get_element_label(self, i, j, k):
+        """
+        Only valid for the structured grid, i.e. before elements are removed (see :meth:`remove_elements`).
+
+        :param int i: Grid index along x.
+        :param int j: Grid index along y.
+        :param int k: Grid index along z (0 on the bottom layer).
+        :return: Label of the element at the grid indices.
+        :rtype: int
+        """
+        nx, ny, _ = self.shape
+        return 1 + i + nx * (j + ny * k)
+
+    def get_layer_node_labels(self, k):
+        """
+        Only valid for the structured grid, i.e. before elements are removed (see :meth:`remove_elements`).
+
+        :param int k: Grid index along z (0 on the bottom surface).
+        :return: Labels of all nodes of a through-thickness layer (consecutive).
+        :rtype: numpy.ndarray
+        """
+        nx, ny, _ = self.shape
+        first_label = self.get_node_label(0, 0, k)
+        return np.arange(first_label, first_label + (nx + 1) * (ny + 1))
+
+    def add_nodes(self, node_coordinates, node_sets=()):
+        """
+        :param numpy.ndarray node_coordinates: Coordinates of the new nodes, shape (number of nodes, 3).
+        :param tuple[str] node_sets: Names of existing node sets to add the new nodes to.
+        :return: Labels of the new nodes.
+        :rtype: numpy.ndarray
+        """
+        labels = np.arange(self.num_nodes + 1, self.num_nodes + len(node_coordinates) + 1)
+        self.node_coordinates = np.vstack((self.node_coordinates, node_coordinates))
+        for set_name in node_sets:
+            self.node_sets[set_name] = np.concatenate((self.node_sets[set_name], labels))
+        return labels
+
+    def add_elements(self, element_connectivity, element_sets=()):
+        """
+        :param numpy.ndarray element_connectivity: Node labels of the new elements, shape (number of elements, 8).
+        :param tuple[str] element_sets: Names of element sets to add the new elements to (created if they don't exist).
+        :return: Labels of the new elements.
+        :rtype: numpy.ndarray
+        """
+        labels = np.arange(self.num_elements + 1, self.num_elements + len(element_connectivity) + 1)
+        self.element_connectivity = np.vstack((self.element_connectivity, element_connectivity))
+        for set_name in element_sets:
+            self.element_sets[set_name] = np.concatenate((self.element_sets.get(set_name, np.array([], dtype=int)),
+                                                          labels))
+        return labels
+
+    def remove_elements(self, element_labels):
+        """
+        Removes elements and all nodes that are no longer used by any element. Elements and nodes are renumbered
+        consecutively and all sets are updated, so the structured grid indices are no longer valid afterwards.
+
+        :param numpy.ndarray element_labels: Labels of the elements to remove.
+        :return: None
+        """
+        keep_elements = np.ones(self.num_elements, dtype=bool)
+        keep_elements[np.asarray(element_labels, dtype=int) - 1] = False
+        self.element_connectivity = self.element_connectivity[keep_elements]
+        self.element_sets = self.__renumber_sets(self.element_sets, keep_elements)
+
+        keep_nodes = np.zeros(self.num_nodes, dtype=bool)
+        keep_nodes[self.element_connectivity.ravel() - 1] = True
+        new_node_labels = np.cumsum(keep_nodes)
+        self.node_coordinates = self.node_coordinates[keep_nodes]
+        self.element_connectivity = new_node_labels[self.element_connectivity - 1]
+        self.node_sets = self.__renumber_sets(self.node_sets, keep_nodes)
+
+    @staticmethod
+    def __renumber_sets(sets, keep):
+        """
+        (Helper) Removes the deleted labels from all sets and renumbers the remaining labels consecutively.
+        """
+        new_labels = np.cumsum(keep)
+        return dict((name, new_labels[labels[keep[labels - 1]] - 1]) for name, labels in sets.items())
+
+
+def create_structured_plate_mesh(plate, element_size_in_plane, element_size_thickness):
+    """
+    Creates the structured C3D8R mesh of a pristine rectangular plate. The plate spans
+    [0, width] x [0, length] x [0, thickness]. The element set ``plate.cell_set_name`` and
+    ``plate.material_cell_set_name`` contain all elements, the node set ``plate.field_output_face_set_name`` contains
+    all nodes of the top surface.
+
+    :param IsotropicRectangularPlate plate: Plate to mesh.
+    :param float element_size_in_plane: Desired element size (in-plane).
+    :param float element_size_thickness: Desired element size (through-thickness).
+    :return: Mesh of the plate.
+    :rtype: PlateMesh
+    """
+    nx = get_number_of_elements_along_edge(plate.width, element_size_in_plane)
+    ny = get_number_of_elements_along_edge(plate.length, element_size_in_plane)
+    nz = get_number_of_elements_along_edge(plate.thickness, element_size_thickness)
+
+    # node coordinates, x varies fastest
+    z, y, x = np.meshgrid(np.linspace(0, plate.thickness, nz + 1), np.linspace(0, plate.length, ny + 1),
+                          np.linspace(0, plate.width, nx + 1), indexing='ij')
+    node_coordinates = np.column_stack((x.ravel(), y.ravel(), z.ravel()))
+
+    # connectivity of the elements: nodes of the bottom face (counter-clockwise), then of the top face
+    k, j, i = np.meshgrid(np.arange(nz), np.arange(ny), np.arange(nx), indexing='ij')
+    n = 1 + i.ravel() + (nx + 1) * (j.ravel() + (ny + 1) * k.ravel())
+    dj, dk = nx + 1, (nx + 1) * (ny + 1)
+    element_connectivity = np.column_stack((n, n + 1, n + 1 + dj, n + dj,
+                                            n + dk, n + 1 + dk, n + 1 + dj + dk, n + dj + dk))
+
+    mesh = PlateMesh(node_coordinates=node_coordinates, element_connectivity=element_connectivity,
+                     shape=(nx, ny, nz))
+    all_elements = np.arange(1, mesh.num_elements + 1)
+    mesh.element_sets[plate.cell_set_name] = all_elements
+    mesh.element_sets[plate.material_cell_set_name] = all_elements
+    mesh.node_sets[plate.field_output_face_set_name] = mesh.get_layer_node_labels(nz)
+    return mesh
+
+
+def place_nodes_at_transducers(mesh, plate, transducers, element_size_in_plane):
+    """
+    Moves the nearest grid node of each transducer (through the whole thickness) to the exact transducer position and
+    stores the nodes on the top and bottom surface in the node sets ``transducer.on_plate_top_set_name`` and
+    ``transducer.on_plate_bottom_set_name``. The displacement of each node decays bilinearly to zero at the snapped
+    bounding box of the transducer. Where bounding boxes overlap, the displacements are superposed and solved for, so
+    that every transducer node still lies at its exact position.
+
+    :param PlateMesh mesh: Structured mesh of the plate (see :func:`create_structured_plate_mesh`).
+    :param IsotropicRectangularPlate plate: Plate instance.
+    :param list[CircularTransducer] transducers: Transducers, with identifiers (set names) set.
+    :param float element_size_in_plane: Desired element size (in-plane), as used to create the mesh.
+    :return: None
+    :raises ValueError: If two transducers are snapped to the same grid node.
+    """
+    nx, ny, nz = mesh.shape
+    dx, dy = float(plate.width) / nx, float(plate.length) / ny
+
+    # grid indices of the transducer nodes and hat functions along x and y over the snapped bounding boxes
+    centers, hats_x, hats_y = [], [], []
+    for transducer in transducers:
+        x_left, x_right, y_lower, y_upper, _, _ = get_snapped_bounding_box_coordinates(
+            x=transducer.position_x, y=transducer.position_y,
+            bounding_box_radius=transducer.radius * transducer.bounding_box_scale,
+            plate_width=plate.width, plate_length=plate.length, element_size=element_size_in_plane)
+        i_center, hat_x = __get_hat_function(transducer.position_x, x_left, x_right, dx, nx)
+        j_center, hat_y = __get_hat_function(transducer.position_y, y_lower, y_upper, dy, ny)
+        if (i_center, j_center) in centers:
+            raise ValueError("Transducer {} is snapped to the same node as another transducer, the distance between "
+                             "transducers has to be larger than the element size.".format(transducer.name))
+        centers.append((i_center, j_center))
+        hats_x.append(hat_x)
+        hats_y.append(hat_y)
+
+    if not transducers:
+        return
+
+    # solve for the amplitude of each displacement field, so that each transducer node is moved to its position
+    coupling = np.array([[hats_x[m][i] * hats_y[m][j] for m in range(len(transducers))] for i, j in centers])
+    offsets = np.array([(transducer.position_x - i * dx, transducer.position_y - j * dy)
+                        for transducer, (i, j) in zip(transducers, centers)])
+    amplitudes = np.linalg.solve(coupling, offsets)
+
+    # move the nodes of all layers
+    coordinates = mesh.node_coordinates.reshape((nz + 1, ny + 1, nx + 1, 3))
+    for hat_x, hat_y, amplitude in zip(hats_x, hats_y, amplitudes):
+        weights = np.outer(hat_y, hat_x)
+        coordinates[:, :, :, 0] += amplitude[0] * weights
+        coordinates[:, :, :, 1] += amplitude[1] * weights
+
+    for transducer, (i, j) in zip(transducers, centers):
+        mesh.node_sets[transducer.on_plate_top_set_name] = np.array([mesh.get_node_label(i, j, nz)])
+        mesh.node_sets[transducer.on_plate_bottom_set_name] = np.array([mesh.get_node_label(i, j, 0)])
+
+
+def get_bounding_box_element_labels(mesh, plate, name, i_min, i_max, j_min, j_max):
+    """
+    Returns the labels of the elements inside a bounding box of the structured grid (through the whole thickness),
+    e.g. to replace them by the mesh of a defect. The bounding box must not overlap with the bounding box of another
+    defect (stored in an element set), and no node set (e.g. of a transducer) may lie strictly inside it.
+
+    :param PlateMesh mesh: Structured mesh of the plate.
+    :param IsotropicRectangularPlate plate: Plate instance.
+    :param str name: Name of the bounding box (for error messages).
+    :param int i_min: Lower grid index of the bounding box along x.
+    :param int i_max: Upper grid index of the bounding box along x.
+    :param int j_min: Lower grid index of the bounding box along y.
+    :param int j_max: Upper grid index of the bounding box along y.
+    :return: Labels of the elements inside the bounding box.
+    :rtype: numpy.ndarray
+    :raises ValueError: If the bounding box overlaps with another bounding box or contains a node set.
+    """
+    nx, ny, nz = mesh.shape
+    k, j, i = np.meshgrid(np.arange(nz), np.arange(j_min, j_max), np.arange(i_min, i_max), indexing='ij')
+    element_labels = mesh.get_element_label(i.ravel(), j.ravel(), k.ravel())
+
+    for set_name, labels in mesh.element_sets.items():
+        if set_name in (plate.cell_set_name, plate.material_cell_set_name):
+            continue
+        if np.any(np.isin(element_labels, labels)):
+            raise ValueError("The bounding box {} overlaps with the bounding box {}.".format(name, set_name))
+
+    num_grid_nodes = (nx + 1) * (ny + 1) * (nz + 1)
+    for set_name, labels in mesh.node_sets.items():
+        if set_name == plate.field_output_face_set_name:
+            continue
+        grid_indices = labels[labels <= num_grid_nodes] - 1
+        i, j = grid_indices % (nx + 1), (grid_indices // (nx + 1)) % (ny + 1)
+        if np.any((i > i_min) & (i < i_max) & (j > j_min) & (j < j_max)):
+            raise ValueError("The node set {} lies inside the bounding box {}.".format(set_name, name))
+    return element_labels
+
+
+def get_field_output_node_labels(mesh, plate, node_spacing=None, regions=None):
+    """
+    Selects a subset of the nodes on the plates' top surface to restrict the field output to, like
+    :func:`guwlib.functions_cae.helper_functions_point_force.create_field_output_node_set`: the nodes inside the given
+    rectangles and, if a node spacing is given, only the node closest to each point of a square grid with this spacing.
+
+    :param PlateMesh mesh: Mesh of the plate.
+    :param IsotropicRectangularPlate plate: Plate instance.
+    :param float node_spacing: Spacing of the grid of output nodes. If None, all nodes (in the regions) are used.
+    :param list[tuple[float, float, float, float]] regions: Rectangles (x_min, y_min, x_max, y_max) to which the nodes
+        are restricted. If None, the whole plate surface is used.
+    :return: Sorted labels of the selected nodes.
+    :rtype: numpy.ndarray
+    :raises ValueError: If no node is selected.
+    """
+    labels = mesh.node_sets[plate.field_output_face_set_name]
+    x, y = mesh.node_coordinates[labels - 1, 0], mesh.node_coordinates[labels - 1, 1]
+
+    if regions is not None:
+        inside = np.zeros(len(labels), dtype=bool)
+        for x_min, y_min, x_max, y_max in regions:
+            inside |= (x_min <= x) & (x <= x_max) & (y_min <= y) & (y <= y_max)
+        labels, x, y = labels[inside], x[inside], y[inside]
+
+    if node_spacing is not None and len(labels) > 0:
+        # for each grid point, keep the closest node
+        grid_i, grid_j = np.round(x / node_spacing).astype(int), np.round(y / node_spacing).astype(int)
+        distances = np.hypot(x - grid_i * node_spacing, y - grid_j * node_spacing)
+        order = np.lexsort((distances, grid_j, grid_i))
+        grid_points = np.column_stack((grid_i[order], grid_j[order]))
+        first_of_grid_point = np.ones(len(order), dtype=bool)
+        first_of_grid_point[1:] = np.any(grid_points[1:] != grid_points[:-1], axis=1)
+        labels = labels[order[first_of_grid_point]]
+
+    if len(labels) == 0:
+        raise ValueError("No nodes of the plate surface are selected for the field output set.")
+    return np.unique(labels)
+
+
+def __get_hat_function(position, lower, upper, spacing, n_elements):
+    """
+    (Helper) Returns the grid index of the node nearest to a position and a hat function over the grid indices, which
+    is 1 at this node and decays linearly to 0 at the (snapped) bounds. The node is kept off the plate edges for
+    positions inside the plate, and at least one element is kept between the node and the bounds.
+    """
+    center = int(round(position / spacing))
+    if 0 < position < n_elements * spacing:
+        center = min(max(center, 1), n_elements - 1)
+    lower_index = min(int(round(lower / spacing)), max(center - 1, 0))
+    upper_index = max(int(round(upper / spacing)), min(center + 1, n_elements))
+
+    indices = np.arange(n_elements + 1, dtype=float)
+    hat = np.zeros(n_elements + 1)
+    if center > lower_index:
+        rising = (indices >= lower_index) & (indices <= center)
+        hat[rising] = (indices[rising] - lower_index) / (center - lower_index)
+    if upper_index > center:
+        falling = (indices >= center) & (indices <= upper_index)
+        hat[falling] = (upper_index - indices[falling]) / (upper_index - center)
+    hat[center] = 1.0
+    return center, hat
+
@@ -37,9 +37,10 @@ def write_field_data_to_file(odb_path):
     my_print('Reading in x, y, z node positions ...')
     frame = step.frames[0]
     displacement_values = frame.fieldOutputs['UT'].values
-    node_x_values = [instance.getNodeFromLabel(v.nodeLabel).coordinates[0] for v in displacement_values]
-    node_y_values = [instance.getNodeFromLabel(v.nodeLabel).coordinates[1] for v in displacement_values]
-    node_z_values = [instance.getNodeFromLabel(v.nodeLabel).coordinates[2] for v in displacement_values]
+    node_coordinates = [instance.getNodeFromLabel(v.nodeLabel).coordinates for v in displacement_values]
+    node_x_values = [coordinates[0] for coordinates in node_coordinates]
+    node_y_values = [coordinates[1] for coordinates in node_coordinates]
+    node_z_values = [coordinates[2] for coordinates in node_coordinates]
     my_print('Starting to extract displacement data from {} frames ...'.format(num_frames))
 
     # read all displacements for all frames into a matrix, also save the points in time for each frame
@@ -9,10 +9,19 @@ the data. Data from each node set is stored in one individual NumPy array, which
     arr[2, :]       # U2 displacements
     arr[3, :]       # U3 displacements
 
+For two-dimensional models (``'axisymmetric'`` or ``'plane_strain'`` model approach), the radial (or in-section) and
+through-thickness displacements are mapped to the U1, U2 and U3 displacements of the 3D model, using the transducer
+directions from the mapping file (``<job_name>_2d_mapping.json``) next to the .ODB file. The .NPZ file then has the same
+layout as for 3D models. Displacement components without history output (see ``LoadCase.history_output_variables``)
+are filled with NaN.
+
+Optionally, the history output is low-pass filtered (anti-aliasing) and resampled to a coarser time interval before it
+is written, which reduces the size of the .NPZ files of history output that was written at every increment.
+
 The .NPZ file is written to the same path as the ODB file. Call this script with one argument specifying
-the path to the .ODB file to be processed:
+the path to the .ODB file to be processed, and optionally the time interval to resample to:
 
-    ``abaqus cae noGUI=history_export_helper.py -- "odb_path"``
+    ``abaqus cae noGUI=history_export_helper.py -- [--time-interval=1e-7] "odb_path"``
 """
 
 from __future__ import print_function
@@ -24,19 +33,29 @@ from odbMaterial import *
 from odbSection import *
 
 import numpy as np
+import json
 import pickle
 import sys
 import os
 
+# cut-off frequency of the anti-aliasing filter, relative to the Nyquist frequency of the resampled signal
+ANTIALIASING_CUTOFF_RATIO = 0.8
+
+# length of the anti-aliasing filter (in periods of the cut-off frequency)
+ANTIALIASING_FILTER_PERIODS = 8
 
-def write_history_data_to_file(odb_path):
+
+def write_history_data_to_file(odb_path, time_interval=None):
     """
     Opens the specified output database (.ODB) file in ABAQUS. Extracts the displacement history output (if
     available) for each node set of the first instance of the model. The TIME, U1, U2 and U3 vectors are
     concatenated in one NumPy matrix for each node set, and the matrices are then stored in an .NPZ file. If
-    saving to .NPZ fails, pickle is used as a fallback (.PKL format).
+    saving to .NPZ fails, pickle is used as a fallback (.PKL format). The displacements of two-dimensional models are
+    mapped to 3D displacements (see module docstring).
 
     :param str odb_path: Path to the .ODB file.
+    :param float time_interval: If set, the data is low-pass filtered and resampled to this time interval (see
+        :func:`resample_with_antialiasing`).
     """
 
     # open the ODB file at the specified path
@@ -53,6 +72,14 @@ def write_history_data_to_file(odb_path):
     # retrieve available node set names
     node_sets = instance.nodeSets.keys()
 
+    # directions of the node sets of two-dimensional models (if any)
+    mapping_path = os.path.splitext(odb_path)[0] + '_2d_mapping.json'
+    node_set_directions = {}
+    if os.path.exists(mapping_path):
+        with open(mapping_path, 'r') as f:
+            node_set_directions = json.load(f)['node_sets']
+        print('Mapping the displacements of the 2D model with {}.'.format(mapping_path), file=sys.__stdout__)
+
     # create empty dictionary to store all data to be saved
     output_data = {}
     error_node_sets = []
@@ -64,11 +91,17 @@ def write_history_data_to_file(odb_path):
             region = step.getHistoryRegion(point=point)
 
             # np array is structured like this: [time, u1, u2, u3]
-            t = np.array(region.historyOutputs['U1'].data)[:, 0]
-            u1 = np.array(region.historyOutputs['U1'].data)[:, 1]
-            u2 = np.array(region.historyOutputs['U2'].data)[:, 1]
-            u3 = np.array(region.historyOutputs['U3'].data)[:, 1]
+            variables = [variable for variable in ('U1', 'U2', 'U3') if variable in region.historyOutputs.keys()]
+            t = np.array(region.historyOutputs[variables[0]].data)[:, 0]
+            u1, u2, u3 = [np.array(region.historyOutputs[variable].data)[:, 1] if variable in variables
+                          else np.full(len(t), np.nan) for variable in ('U1', 'U2', 'U3')]
+            if node_set.upper() in node_set_directions:
+                # 2D model: U1 is the radial / in-section, U2 the through-thickness displacement
+                direction_x, direction_y = node_set_directions[node_set.upper()]
+                u1, u2, u3 = u1 * direction_x, u1 * direction_y, u2
             data = np.vstack([t, u1, u2, u3])
+            if time_interval is not None:
+                data = resample_with_antialiasing(data, time_interval)
             output_data[node_set] = data
 
         except Exception as e:
@@ -96,7 +129,47 @@ def write_history_data_to_file(odb_path):
             pickle.dump(output_data, f)
 
 
+def resample_with_antialiasing(data, time_interval):
+    """
+    Resamples history data ([time, u1, u2, u3]) to a constant time interval. The data is interpolated to the (constant)
+    mean time increment first, then low-pass filtered with a windowed-sinc (Hamming) FIR filter at
+    :data:`ANTIALIASING_CUTOFF_RATIO` times the Nyquist frequency of the new time interval (zero phase), and finally
+    sampled at the new time interval. Data that is sampled more coarsely already is returned unchanged.
+
+    :param numpy.ndarray data: History data, the first row is the time vector.
+    :param float time_interval: Time interval of the resampled data.
+    :return: Resampled history data.
+    :rtype: numpy.ndarray
+    """
+    t = data[0, :]
+    if len(t) < 2:
+        return data
+    dt = (t[-1] - t[0]) / (len(t) - 1)
+    if dt <= 0 or dt >= time_interval:
+        return data
+
+    # interpolate to a constant time increment
+    t_uniform = t[0] + dt * np.arange(len(t))
+    values = np.array([np.interp(t_uniform, t, row) for row in data[1:, :]])
+
+    # windowed-sinc low-pass filter (odd length, symmetric: zero phase with mode='same')
+    cutoff_frequency = ANTIALIASING_CUTOFF_RATIO / (2.0 * time_interval)
+    half_length = min(int(np.ceil(ANTIALIASING_FILTER_PERIODS / (2.0 * cutoff_frequency * dt))), (len(t) - 1) // 2)
+    n = np.arange(-half_length, half_length + 1)
+    kernel = np.sinc(2.0 * cutoff_frequency * dt * n) * np.hamming(len(n))
+    kernel /= np.sum(kernel)
+    filtered = np.array([np.convolve(row, kernel, mode='same') for row in values])
+
+    # sample at the new time interval
+    t_resampled = np.arange(t[0], t[-1] + 0.5 * dt, time_interval)
+    resampled = [np.interp(t_resampled, t_uniform, row) for row in filtered]
+    return np.vstack([t_resampled] + resampled)
+
+
 # ----------------------------------------------------------------------------------------------------------------------
 if __name__ == "__main__":
     arguments = sys.argv[1:]
-    write_history_data_to_file(odb_path=arguments[-1])
+    time_interval_arguments = [argument for argument in arguments if argument.startswith('--time-interval=')]
+    write_history_data_to_file(odb_path=arguments[-1],
+                               time_interval=float(time_interval_arguments[-1].split('=')[1])
+                               if time_interval_arguments else None)
@@ -0,0 +1,32 @@
+"""
+Helper functions to sample the excitation signals of the transducers as tabular amplitudes. Shared by the ABAQUS/CAE
+build and the native .INP writer, so that both write exactly the same amplitude data. These functions do not depend on
+ABAQUS.
+"""
+import numpy as np
+
+from guwlib.guw_objects.signal import DiracImpulse
+
+
+def get_amplitude_table(signal, max_time_increment):
+    """
+    Samples a signal as tabular amplitude data with half of the maximum time increment.
+
+    :param Signal signal: Signal to be sampled.
+    :param float max_time_increment: Maximum time increment of the time integration scheme. Needed to ensure that the
+        amplitude data is written with sufficient sampling frequency.
+    :return: Time and value of each data point of the amplitude.
+    :rtype: list[tuple[float, float]]
+    """
+    if isinstance(signal, DiracImpulse):
+        # impulses are handled differently than other signals to ensure that the impulse is only
+        # nonzero for the very first ABAQUS/Explicit increment
+        return [(0, signal.magnitude), (max_time_increment * 1e-2, 0)]
+
+    # all other signals besides impulses can be sampled from the signal definition in their method 'get_value_at',
+    # scaled by the signal magnitude
+    time_data_table = []
+    for t in np.arange(start=signal.delta_t, stop=signal.delta_t + signal.get_duration() * 1.01,
+                       step=max_time_increment / 2):
+        time_data_table.append((t, signal.magnitude * signal.get_value_at(t=t)))
+    return time_data_table
@@ -0,0 +1,198 @@
+"""
+Helpers to reuse the .INP files of an unchanged model. The fully configured :class:`FEModel` (plate, material
+properties, defects, transducers, signals, load cases and discretization settings) is serialized to a canonical JSON
+representation and hashed together with the source files of guwlib (there is no version number, any change of the
+library invalidates the cache). After a successful build, the fingerprint and the written .INP files are stored in a
+manifest (.JSON) in the output directory. If the fingerprint of a rebuild matches the manifest and the .INP files are
+still present, the build (ABAQUS/CAE) is skipped and the existing .INP files are reused.
+
+The fingerprint is identical for the ABAQUS python interpreter and for plain python interpreters, so the batch
+functions can check for unchanged models before ABAQUS/CAE is started (see :func:`is_build_up_to_date`).
+"""
+import hashlib
+import json
+import os
+from datetime import datetime
+
+BUILD_MANIFEST_VERSION = 1
+BUILD_MANIFEST_FILE_SUFFIX = '_build_manifest.json'
+
+# FEModel attributes that don't affect the content of the .INP files
+EXCLUDED_MODEL_ATTRIBUTES = ('model_file_path', 'output_directory', 'no_gui_mode', 'build_cache', 'build_checkpoint')
+
+# extensions of the files that are reused (input files and shared include files, optionally compressed)
+INPUT_FILE_EXTENSIONS = ('.inp', '.inc', '.inp.gz', '.inc.gz')
+
+# extensions of the guwlib source files that are part of the fingerprint
+SOURCE_FILE_EXTENSIONS = ('.py', '.json', '.txt')
+
+try:
+    # python 2 (ABAQUS): strings from JSON files are unicode, large integers long
+    PRIMITIVE_TYPES = (bool, int, long, float, str, unicode)
+except NameError:
+    PRIMITIVE_TYPES = (bool, int, float, str)
+
+
+class BuildManifest(object):
+    """
+    Manifest of a completed build in the output directory of the model, with the fingerprint of the model and the
+    written .INP files.
+    """
+
+    def __init__(self, output_directory, model_name, fingerprint):
+        """
+        :param str output_directory: Output directory of the model.
+        :param str model_name: Name of the model.
+        :param str fingerprint: Fingerprint of the model (see :func:`get_model_fingerprint`).
+
+        :ivar str output_directory: Output directory of the model.
+        :ivar str manifest_file_path: Path to the manifest (.JSON).
+        :ivar str fingerprint: Fingerprint of the model.
+        :ivar dict[str, int] input_files: Size of the .INP files of the build, by path relative to the output
+            directory.
+        """
+        self.output_directory = output_directory
+        self.manifest_file_path = os.path.join(output_directory, model_name + BUILD_MANIFEST_FILE_SUFFIX)
+        self.fingerprint = fingerprint
+        self.input_files = {}
+
+    def is_valid(self):
+        """
+        Checks if the manifest of a previous build exists, has the same fingerprint and if all .INP files of that build
+        are unchanged (same size).
+
+        :return: True if the .INP files of the previous build can be reused.
+        :rtype: bool
+        """
+        if not os.path.exists(self.manifest_file_path):
+            return False
+        try:
+            with open(self.manifest_file_path, 'r') as file:
+                manifest = json.load(file)
+        except ValueError:
+            return False
+        if manifest.get('version') != BUILD_MANIFEST_VERSION or manifest.get('fingerprint') != self.fingerprint:
+            return False
+
+        input_files = manifest.get('input_files', {})
+        for relative_path, size in input_files.items():
+            file_path = os.path.join(self.output_directory, relative_path)
+            if not os.path.exists(file_path) or os.path.getsize(file_path) != size:
+                return False
+        self.input_files = input_files
+        return len(input_files) > 0
+
+    def write(self):
+        """
+        Scans the output directory for the .INP files of the build and writes the manifest. No manifest is written if
+        there are no .INP files.
+
+        :return: True if the manifest was written.
+        :rtype: bool
+        """
+        self.input_files = {}
+        for root, _, file_names in os.walk(self.output_directory):
+            for file_name in file_names:
+                if file_name.lower().endswith(INPUT_FILE_EXTENSIONS):
+                    file_path = os.path.join(root, file_name)
+                    relative_path = os.path.relpath(file_path, self.output_directory).replace('\\', '/')
+                    self.input_files[relative_path] = os.path.getsize(file_path)
+        if not self.input_files:
+            return False
+
+        manifest = {'version': BUILD_MANIFEST_VERSION,
+                    'created': datetime.now().isoformat(),
+                    'fingerprint': self.fingerprint,
+                    'input_files': self.input_files}
+        with open(self.manifest_file_path, 'w') as file:
+            json.dump(manifest, file, indent=2, sort_keys=True)
+        return True
+
+
+def get_model_fingerprint(model):
+    """
+    Computes the fingerprint of a fully configured model (after :meth:`FEModel.setup_parameters`, before the build).
+    All public attributes of the model and of the objects it contains (plate, material, defects, transducers, load
+    cases, signals) are part of the fingerprint, except the ones in :data:`EXCLUDED_MODEL_ATTRIBUTES`.
+
+    :param FEModel model: The model.
+    :return: SHA-256 hash (hexadecimal) of the canonical representation of the model and of the guwlib sources.
+    :rtype: str
+    """
+    state = __get_canonical_value(model)
+    for name in EXCLUDED_MODEL_ATTRIBUTES:
+        state.pop(name, None)
+    canonical_json = json.dumps({'model': state, 'guwlib_sources': get_guwlib_source_hash()}, sort_keys=True)
+    return hashlib.sha256(canonical_json.encode('utf-8')).hexdigest()
+
+
+def get_guwlib_source_hash():
+    """
+    Returns a hash of the source files of the guwlib package (python modules and material / dispersion data).
+
+    :return: SHA-256 hash (hexadecimal) of the relative paths and contents of the source files.
+    :rtype: str
+    """
+    package_directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    sha256 = hashlib.sha256()
+    source_files = []
+    for root, directories, file_names in os.walk(package_directory):
+        directories[:] = [directory for directory in directories if directory != '__pycache__']
+        source_files.extend(os.path.join(root, file_name) for file_name in file_names
+                            if file_name.lower().endswith(SOURCE_FILE_EXTENSIONS))
+    for file_path in sorted(source_files):
+        sha256.update(os.path.relpath(file_path, package_directory).replace('\\', '/').encode('utf-8'))
+        with open(file_path, 'rb') as file:
+            sha256.update(file.read())
+    return sha256.hexdigest()
+
+
+def is_build_up_to_date(model_file_path):
+    """
+    Checks if the .INP files of a model file can be reused, i.e. if the model is built with the build cache enabled
+    and the fingerprint matches the manifest in its output directory (``results/<model_name>``). The model file is
+    run (not as ``__main__``) to configure the model, so this works with any python interpreter that can import guwlib.
+    For a model specification, all of its variants have to be unchanged.
+
+    :param str model_file_path: Path to the model file (.PY) or model specification (.JSON / .YAML, see
+        ``guwlib.functions_utility.model_spec``).
+    :return: True if the model is unchanged since its last build. False if it changed, was not built yet, has the
+        build cache disabled or can't be configured outside ABAQUS.
+    :rtype: bool
+    """
+    from guwlib.functions_utility.model_spec import create_models_from_file
+
+    try:
+        models = create_models_from_file(model_file_path)
+        for model in models:
+            model.setup_parameters()
+    except Exception:
+        return False
+    for model in models:
+        if not model.build_cache:
+            return False
+        if not BuildManifest(model.output_directory, model.model_name, get_model_fingerprint(model)).is_valid():
+            return False
+    return True
+
+
+def __get_canonical_value(value):
+    """
+    (Helper) Converts a value to a JSON serializable representation that doesn't depend on object identities or on the
+    python version: objects are represented by their class name and their public attributes, NumPy arrays and scalars
+    by lists and python numbers.
+    """
+    if value is None or isinstance(value, PRIMITIVE_TYPES):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [__get_canonical_value(item) for item in value]
+    if isinstance(value, dict):
+        return dict((str(key), __get_canonical_value(item)) for key, item in value.items())
+    if hasattr(value, 'tolist'):
+        return __get_canonical_value(value.tolist())
+    if hasattr(value, '__dict__'):
+        state = dict((name, __get_canonical_value(item)) for name, item in vars(value).items()
+                     if not name.startswith('_') and not callable(item))
+        state['__class__'] = type(value).__name__
+        return state
+    return type(value).__name__
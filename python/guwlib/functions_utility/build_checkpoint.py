@@ -0,0 +1,96 @@
+"""
+Helper class to manage the checkpoint of a model build in ABAQUS/CAE. After meshing and assembly, the model database
+(.CAE) is saved to the output directory together with a manifest (.JSON). The manifest identifies the model the
+checkpoint was built from by its fingerprint (the configured model and the guwlib sources, see
+:func:`guwlib.functions_utility.build_cache.get_model_fingerprint`) and keeps track of the load cases whose .INP files
+were already written, so that a rerun of the build can skip geometry creation and meshing and only write the missing
+.INP files. A checkpoint with a different fingerprint is not resumed, its completed load cases are dropped.
+"""
+import json
+import os
+from datetime import datetime
+
+CHECKPOINT_MANIFEST_VERSION = 2
+
+
+class BuildCheckpoint(object):
+    """
+    Checkpoint (model database and manifest) of a model build in the output directory of the model.
+    """
+
+    def __init__(self, output_directory, model_name, fingerprint):
+        """
+        :param str output_directory: Output directory of the model.
+        :param str model_name: Name of the model.
+        :param str fingerprint: Fingerprint of the configured model (see ``FEModel.get_fingerprint``).
+
+        :ivar str cae_file_path: Path to the model database (.CAE) of the checkpoint.
+        :ivar str manifest_file_path: Path to the manifest (.JSON) of the checkpoint.
+        :ivar str fingerprint: Fingerprint of the configured model.
+        :ivar list[str] completed_load_cases: Names of the load cases (steps) whose .INP files were written.
+        :ivar dict counters: Build counters of the checkpointed build (see ``BuildTelemetry``).
+        """
+        self.cae_file_path = os.path.join(output_directory, '{}_checkpoint.cae'.format(model_name))
+        self.manifest_file_path = os.path.join(output_directory, '{}_checkpoint.json'.format(model_name))
+        self.fingerprint = fingerprint
+        self.completed_load_cases = []
+        self.counters = {}
+
+    def is_valid(self):
+        """
+        Checks if a checkpoint exists that was built from a model with the same fingerprint. If so, the completed load
+        cases and counters are loaded from its manifest, otherwise they are dropped.
+
+        :return: True if the checkpoint can be used to resume the build.
+        :rtype: bool
+        """
+        self.completed_load_cases = []
+        self.counters = {}
+        if not (os.path.exists(self.manifest_file_path) and os.path.exists(self.cae_file_path)):
+            return False
+        try:
+            with open(self.manifest_file_path, 'r') as file:
+                manifest = json.load(file)
+        except ValueError:
+            return False
+        if (manifest.get('version') != CHECKPOINT_MANIFEST_VERSION or
+                manifest.get('fingerprint') != self.fingerprint):
+            return False
+
+        self.completed_load_cases = manifest.get('completed_load_cases', [])
+        self.counters = manifest.get('counters', {})
+        return True
+
+    def is_load_case_completed(self, step_name, input_file_path):
+        """
+        Checks if the .INP file of a load case was already written (according to the manifest and the file system).
+
+        :param str step_name: Name of the load case (step).
+        :param str input_file_path: Path to the .INP file of the load case.
+        :rtype: bool
+        """
+        return step_name in self.completed_load_cases and os.path.exists(input_file_path)
+
+    def mark_load_case_completed(self, step_name):
+        """
+        Adds a load case to the completed load cases and updates the manifest.
+
+        :param str step_name: Name of the load case (step).
+        """
+        if step_name not in self.completed_load_cases:
+            self.completed_load_cases.append(step_name)
+        self.write_manifest()
+
+    def write_manifest(self):
+        """
+        Writes the manifest of the checkpoint.
+        """
+        manifest = {'version': CHECKPOINT_MANIFEST_VERSION,
+                    'created': datetime.now().isoformat(),
+                    'fingerprint': self.fingerprint,
+                    'cae_file': os.path.basename(self.cae_file_path),
+                    'completed_load_cases': self.completed_load_cases,
+                    'counters': self.counters}
+        with open(self.manifest_file_path, 'w') as file:
+            json.dump(manifest, file, indent=2)
+
@@ -0,0 +1,239 @@
+"""
+Helpers to record structured telemetry of the model build in ABAQUS/CAE: wall-clock and CPU time as well as peak memory
+per build phase, and counters (partitions, nodes, amplitude points, .INP file size, ...). The telemetry of a model is
+written to a .JSON file in the output directory of the model, next to the .INP files. The aggregator functions
+summarize the telemetry files of a whole results directory.
+"""
+from __future__ import print_function
+
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+TELEMETRY_FILE_SUFFIX = '_build_telemetry.json'
+
+
+class BuildTelemetry(object):
+    """
+    Records the duration and peak memory of consecutive build phases, and arbitrary counters.
+
+    Phases are started one after another with :meth:`start_phase`, starting a phase ends the previous one. Call
+    :meth:`end_phase` (or :meth:`save`) after the last phase.
+    """
+
+    def __init__(self, model_name):
+        """
+        :param str model_name: Name of the model.
+
+        :ivar str model_name: Name of the model.
+        :ivar list[dict] phases: Finished phases, with keys ``name``, ``wall_time``, ``cpu_time`` and
+            ``peak_memory_mb`` (peak memory of the process at the end of the phase).
+        :ivar dict counters: Counters, by name.
+        """
+        self.model_name = model_name
+        self.phases = []
+        self.counters = {}
+
+        self.__start_time = time.time()
+        self.__current_phase = None
+
+    def start_phase(self, name):
+        """
+        Ends the current phase (if any) and starts a new one.
+
+        :param str name: Name of the phase, e.g. ``'mesh'`` or ``'lc_0_burst/write_input'``.
+        """
+        self.end_phase()
+        self.__current_phase = (name, time.time(), get_cpu_time())
+
+    def end_phase(self):
+        """
+        Ends the current phase (if any).
+        """
+        if self.__current_phase is None:
+            return
+        name, wall_start, cpu_start = self.__current_phase
+        self.phases.append({'name': name,
+                            'wall_time': time.time() - wall_start,
+                            'cpu_time': get_cpu_time() - cpu_start,
+                            'peak_memory_mb': get_peak_memory_mb()})
+        self.__current_phase = None
+
+    def count(self, name, value=1):
+        """
+        Increases a counter.
+
+        :param str name: Name of the counter.
+        :param int value: Value to add to the counter.
+        """
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def set_counter(self, name, value):
+        """
+        Sets a counter to a value.
+
+        :param str name: Name of the counter.
+        :param value: Value of the counter.
+        """
+        self.counters[name] = value
+
+    def to_dict(self):
+        """
+        :return: The telemetry as a dictionary (JSON serializable).
+        :rtype: dict
+        """
+        return {'model_name': self.model_name,
+                'created': datetime.now().isoformat(),
+                'python_version': sys.version.split()[0],
+                'total_wall_time': time.time() - self.__start_time,
+                'peak_memory_mb': get_peak_memory_mb(),
+                'phases': self.phases,
+                'counters': self.counters}
+
+    def save(self, output_directory):
+        """
+        Ends the current phase and writes the telemetry to ``<model_name>_build_telemetry.json`` in the output
+        directory.
+
+        :param str output_directory: Directory to which to write the .JSON file.
+        :return: Path to the .JSON file.
+        :rtype: str
+        """
+        self.end_phase()
+        file_path = os.path.join(output_directory, self.model_name + TELEMETRY_FILE_SUFFIX)
+        with open(file_path, 'w') as file:
+            json.dump(self.to_dict(), file, indent=2)
+        return file_path
+
+    def get_slowest_phases(self, n=3):
+        """
+        :param int n: Number of phases to return.
+        :return: The n slowest finished phases (name and wall time in s), slowest first.
+        :rtype: list[tuple[str, float]]
+        """
+        phases = sorted(self.phases, key=lambda phase: phase['wall_time'], reverse=True)
+        return [(phase['name'], phase['wall_time']) for phase in phases[:n]]
+
+
+def get_cpu_time():
+    """
+    Returns the CPU time (user and system) of the current process.
+
+    :return: CPU time in s.
+    :rtype: float
+    """
+    times = os.times()
+    return times[0] + times[1]
+
+
+def get_peak_memory_mb():
+    """
+    Returns the peak memory (resident set size / working set) of the current process. Uses the ``resource`` module on
+    UNIX and the Windows API (via ``ctypes``) on Windows.
+
+    :return: Peak memory in MB, or None if it can't be determined.
+    :rtype: float
+    """
+    try:
+        import resource
+        peak_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is given in bytes on macOS and in kilobytes on Linux
+        return peak_memory / 1024.0 ** 2 if sys.platform == 'darwin' else peak_memory / 1024.0
+    except ImportError:
+        pass
+
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        class ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD),
+                        ('PeakWorkingSetSize', ctypes.c_size_t), ('WorkingSetSize', ctypes.c_size_t),
+                        ('QuotaPeakPagedPoolUsage', ctypes.c_size_t), ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                        ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t), ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                        ('PagefileUsage', ctypes.c_size_t), ('PeakPagefileUsage', ctypes.c_size_t)]
+
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return counters.PeakWorkingSetSize / 1024.0 ** 2
+    except (ImportError, AttributeError, OSError):
+        pass
+
+    return None
+
+
+def find_build_telemetry_files(directories_to_scan=('results', )):
+    """
+    Recursively scans directories for build telemetry files.
+
+    :param tuple[str] directories_to_scan: Directories to scan (including subdirectories).
+    :return: Paths to the telemetry files.
+    :rtype: list[str]
+    """
+    file_paths = []
+    for directory_to_scan in directories_to_scan:
+        for root, dirs, files in os.walk(directory_to_scan):
+            for file_name in files:
+                if file_name.endswith(TELEMETRY_FILE_SUFFIX):
+                    file_paths.append(os.path.join(root, file_name))
+    return sorted(file_paths)
+
+
+def summarize_build_telemetry(directories_to_scan=('results', ), verbose=True):
+    """
+    Summarizes the build telemetry files of a results directory tree: one row per model (total time, peak memory,
+    counters and slowest phase), and the total time per phase type over all models. Load case phases named
+    ``'<step_name>/<phase>'`` are grouped by ``<phase>``.
+
+    :param tuple[str] directories_to_scan: Directories to scan (including subdirectories).
+    :param bool verbose: If True, prints the summary as a table.
+
+    :return: Per-model rows and the total wall time per phase type.
+    :rtype: tuple[list[dict], dict]
+    """
+    rows = []
+    phase_totals = {}
+    for file_path in find_build_telemetry_files(directories_to_scan):
+        with open(file_path, 'r') as file:
+            telemetry = json.load(file)
+
+        slowest_phase = max(telemetry['phases'], key=lambda phase: phase['wall_time']) if telemetry['phases'] else None
+        row = {'model_name': telemetry['model_name'],
+               'file_path': file_path,
+               'total_wall_time': telemetry['total_wall_time'],
+               'peak_memory_mb': telemetry['peak_memory_mb'],
+               'slowest_phase': slowest_phase['name'] if slowest_phase else None,
+               'slowest_phase_wall_time': slowest_phase['wall_time'] if slowest_phase else None}
+        row.update(telemetry['counters'])
+        rows.append(row)
+
+        for phase in telemetry['phases']:
+            phase_type = phase['name'].split('/')[-1]
+            phase_totals[phase_type] = phase_totals.get(phase_type, 0.0) + phase['wall_time']
+
+    if verbose:
+        __print_summary(rows, phase_totals)
+    return rows, phase_totals
+
+
+def __print_summary(rows, phase_totals):
+    """
+    (Helper) Prints the summary of the build telemetry as a table.
+    """
+    print("{:<40s} {:>10s} {:>10s} {:>12s} {:>10s}  {}".format('model', 'time [s]', 'mem [MB]', 'nodes',
+                                                               'INP [MB]', 'slowest phase'))
+    for row in rows:
+        peak_memory = '{:10.0f}'.format(row['peak_memory_mb']) if row['peak_memory_mb'] is not None else ' ' * 10
+        print("{:<40s} {:10.1f} {} {:>12d} {:10.1f}  {} ({:.1f} s)".format(
+            row['model_name'][:40], row['total_wall_time'], peak_memory, row.get('nodes', 0),
+            row.get('inp_bytes', 0) / 1024.0 ** 2, row['slowest_phase'], row['slowest_phase_wall_time'] or 0))
+
+    total_time = sum(phase_totals.values())
+    print("\nTotal time per phase over {} model(s):".format(len(rows)))
+    for phase_type, wall_time in sorted(phase_totals.items(), key=lambda item: item[1], reverse=True):
+        print("  {:<30s} {:10.1f} s ({:5.1f} %)".format(phase_type, wall_time, 100.0 * wall_time / total_time
+                                                         if total_time > 0 else 0))
@@ -0,0 +1,174 @@
+"""
+Helpers to solve identical load cases of different models only once. Sweeps over defect variants often contain load
+cases that are identical in every model with the same plate and transducer layout (e.g. pristine baselines). The
+content of the .INP files is hashed without the names that differ between the models (comments, heading, step names;
+shared include files are hashed by their content instead of their path). Of all input files with the same hash, only the
+first one is solved. Each duplicate gets a reference file (``<job name>_reference.json``) next to its .INP file, which
+points to the input file that is solved instead. After the export, the exported results (.NPZ / .PKL) of the solved
+input file are linked (or copied, if links are not supported) into the directory of each duplicate, with the job name
+of the duplicate, so the results of all models are found at the usual place.
+"""
+from __future__ import print_function
+
+import hashlib
+import json
+import os
+import shutil
+
+REFERENCE_FILE_SUFFIX = '_reference.json'
+
+# extensions of the exported results that are linked into the directories of the duplicates
+EXPORTED_RESULT_EXTENSIONS = ('.npz', '.pkl')
+
+# keywords whose data lines and options are ignored when hashing the content of an input file
+IGNORED_DATA_KEYWORDS = ('*heading', )
+IGNORED_NAME_KEYWORDS = ('*step', )
+
+
+def get_input_file_hash(input_file_path, include_hashes=None):
+    """
+    Computes the hash of the content of an input file, ignoring comments, the heading and step names. Included files
+    are hashed by their content.
+
+    :param str input_file_path: Path to the input (.INP) or include file.
+    :param dict[str, str] include_hashes: Hashes of include files, by absolute path (updated, to hash shared include
+        files only once).
+    :return: SHA-256 hash (hexadecimal) of the normalized content.
+    :rtype: str
+    """
+    include_hashes = include_hashes if include_hashes is not None else {}
+    sha256 = hashlib.sha256()
+    ignore_data = False
+    with open(input_file_path, 'r') as file:
+        for line in file:
+            line = line.strip()
+            if not line or line.startswith('**'):
+                continue
+            if line.startswith('*'):
+                keyword = line.split(',')[0].strip().lower()
+                ignore_data = keyword in IGNORED_DATA_KEYWORDS
+                if keyword == '*include':
+                    include_path = os.path.abspath(os.path.join(os.path.dirname(input_file_path),
+                                                                __get_option(line, 'input')))
+                    if include_path not in include_hashes:
+                        include_hashes[include_path] = get_input_file_hash(include_path, include_hashes)
+                    line = '*include:' + include_hashes[include_path]
+                elif keyword in IGNORED_NAME_KEYWORDS:
+                    line = ','.join(option for option in line.split(',')
+                                    if not option.strip().lower().startswith('name='))
+            elif ignore_data:
+                continue
+            sha256.update(line.encode('utf-8') + b'\n')
+    return sha256.hexdigest()
+
+
+def deduplicate_input_files(input_file_paths, verbose=True):
+    """
+    Groups the input files by the hash of their content (see :func:`get_input_file_hash`) and writes a reference file
+    for each duplicate, which points to the first input file of its group. Outdated reference files of the input files
+    are removed.
+
+    :param list[str] input_file_paths: Paths to the input (.INP) files, e.g. of all load cases of a batch.
+    :param bool verbose: If True, prints the duplicates and the number of unique load cases.
+    :return: Paths to the input files that have to be solved (first input file of each group, in the given order).
+    :rtype: list[str]
+    """
+    include_hashes = {}
+    references = {}
+    unique_input_file_paths = []
+    for input_file_path in input_file_paths:
+        reference_file_path = get_reference_file_path(input_file_path)
+        if os.path.exists(reference_file_path):
+            os.remove(reference_file_path)
+
+        content_hash = get_input_file_hash(input_file_path, include_hashes)
+        if content_hash not in references:
+            references[content_hash] = input_file_path
+            unique_input_file_paths.append(input_file_path)
+            continue
+
+        reference_input_file_path = references[content_hash]
+        with open(reference_file_path, 'w') as file:
+            json.dump({'input_file_hash': content_hash,
+                       'reference_input_file': os.path.relpath(os.path.abspath(reference_input_file_path),
+                                                               os.path.dirname(os.path.abspath(input_file_path)))},
+                      file, indent=2)
+        if verbose:
+            print("{} is identical to {}, it is not solved again.".format(os.path.basename(input_file_path),
+                                                                         os.path.basename(reference_input_file_path)))
+    if verbose:
+        print("{} unique load case(s) in {} input file(s).".format(len(unique_input_file_paths),
+                                                                   len(input_file_paths)))
+    return unique_input_file_paths
+
+
+def get_reference_file_path(input_file_path):
+    """
+    :param str input_file_path: Path to an input (.INP) file.
+    :return: Path to the reference file of the input file (if it is a duplicate).
+    :rtype: str
+    """
+    return os.path.splitext(input_file_path)[0] + REFERENCE_FILE_SUFFIX
+
+
+def link_deduplicated_results(directories_to_scan=('results', ), verbose=True):
+    """
+    Links the exported results (.NPZ / .PKL) of the solved input files into the directories of their duplicates, renamed
+    to the job names of the duplicates (e.g. ``<reference job>_history.npz`` to ``<job>_history.npz``). Falls back to
+    copying if symbolic links are not supported. Existing results of the duplicates are not replaced.
+
+    :param tuple[str] directories_to_scan: Directories (including subdirectories) to scan for reference files.
+    :param bool verbose: If True, prints the linked files.
+    :return: Paths to the linked (or copied) files.
+    :rtype: list[str]
+    """
+    linked_files = []
+    for directory_to_scan in directories_to_scan:
+        for root, dirs, files in os.walk(directory_to_scan):
+            for file_name in files:
+                if not file_name.endswith(REFERENCE_FILE_SUFFIX):
+                    continue
+                with open(os.path.join(root, file_name), 'r') as file:
+                    reference = json.load(file)
+                job_name = file_name[:-len(REFERENCE_FILE_SUFFIX)]
+                reference_input_file_path = os.path.normpath(os.path.join(root, reference['reference_input_file']))
+                linked_files.extend(__link_results(os.path.dirname(reference_input_file_path),
+                                                   os.path.splitext(os.path.basename(reference_input_file_path))[0],
+                                                   root, job_name, verbose))
+    return linked_files
+
+
+def __link_results(reference_directory, reference_job_name, directory, job_name, verbose):
+    """
+    (Helper) Links the exported results of a reference job into the directory of a duplicate job.
+    """
+    linked_files = []
+    if not os.path.exists(reference_directory):
+        return linked_files
+    for file_name in sorted(os.listdir(reference_directory)):
+        if not (file_name.startswith(reference_job_name + '_') and
+                file_name.lower().endswith(EXPORTED_RESULT_EXTENSIONS)):
+            continue
+        source_path = os.path.join(reference_directory, file_name)
+        link_path = os.path.join(directory, job_name + file_name[len(reference_job_name):])
+        if os.path.lexists(link_path):
+            continue
+        try:
+            os.symlink(os.path.relpath(source_path, directory), link_path)
+        except (AttributeError, NotImplementedError, OSError):
+            shutil.copyfile(source_path, link_path)
+        linked_files.append(link_path)
+        if verbose:
+            print("Linked {} to {}.".format(link_path, source_path))
+    return linked_files
+
+
+def __get_option(keyword_line, option_name):
+    """
+    (Helper) Returns the value of an option of a keyword line (e.g. ``input`` of ``*Include, input=mesh.inc``).
+    """
+    for option in keyword_line.split(',')[1:]:
+        key, _, value = option.partition('=')
+        if key.strip().lower() == option_name:
+            return value.strip()
+    return None
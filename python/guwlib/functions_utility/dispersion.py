@@ -128,3 +128,59 @@ def find_min_between_limits(x, y, limits):
     else:
         return float('inf'), None
 
+
+def check_shell_approximation(material, thickness, max_frequency, min_wavelength_to_thickness_ratio=5.0):
+    """
+    Checks, based on the dispersion data of the material, whether a plate may be modelled with (continuum) shell
+    elements instead of solid elements in the frequency range [0, max_frequency]. This requires that only the
+    fundamental Lamb modes (A0, S0) can propagate, i.e. that the cut-off frequencies of all higher-order modes (A1, S1,
+    ...) lie above max_frequency, and that the shortest fundamental-mode wavelength is still large compared to the plate
+    thickness.
+
+    :param Material material: Material of the plate.
+    :param float thickness: The thickness of the plate in m.
+    :param float max_frequency: Maximum frequency of the excitation in Hz.
+    :param float min_wavelength_to_thickness_ratio: Minimal ratio of the shortest wavelength to the plate thickness.
+    :return: True if the shell approximation is valid, and a message explaining the decision.
+    :rtype: tuple[bool, str]
+    """
+    # read in the dispersion data
+    symmetric_txt_path, asymmetric_txt_path = get_lamb_dispersion_txt_files_path(material.name)
+    symmetric_modes_data = read_dispersion_data_from_txt_file(symmetric_txt_path, thickness)
+    asymmetric_modes_data = read_dispersion_data_from_txt_file(asymmetric_txt_path, thickness)
+
+    # the dispersion data must cover the whole frequency range
+    max_data_frequency = min(np.nanmax(dispersion_data[0]["frequency"])
+                             for dispersion_data in [symmetric_modes_data, asymmetric_modes_data])
+    if max_frequency > max_data_frequency:
+        return False, ("The dispersion data only covers frequencies up to {:.0f} kHz (max. frequency: {:.0f} kHz)."
+                       "".format(max_data_frequency / 1e3, max_frequency / 1e3))
+
+    # lowest cut-off frequency of the higher-order modes (A1, S1, A2, ...)
+    cut_off_frequency = float('inf')
+    for dispersion_data in [symmetric_modes_data, asymmetric_modes_data]:
+        for mode_order in range(1, len(dispersion_data)):
+            frequencies = dispersion_data[mode_order]["frequency"]
+            if np.any(~np.isnan(frequencies)):
+                cut_off_frequency = min(cut_off_frequency, np.nanmin(frequencies))
+    if cut_off_frequency <= max_frequency:
+        return False, ("Higher-order Lamb modes propagate above {:.0f} kHz (max. frequency: {:.0f} kHz)."
+                       "".format(cut_off_frequency / 1e3, max_frequency / 1e3))
+
+    # shortest wavelength of the fundamental modes (A0, S0)
+    minimal_wavelength = float('inf')
+    for dispersion_data in [symmetric_modes_data, asymmetric_modes_data]:
+        frequencies = dispersion_data[0]["frequency"]
+        wavelengths = dispersion_data[0]["wavelength"]
+        valid = np.logical_and(~np.isnan(frequencies), ~np.isnan(wavelengths))
+        wavelength_min, _ = find_min_between_limits(x=frequencies[valid], y=wavelengths[valid],
+                                                    limits=[0, max_frequency])
+        minimal_wavelength = min(minimal_wavelength, wavelength_min)
+    if minimal_wavelength < min_wavelength_to_thickness_ratio * thickness:
+        return False, ("The shortest wavelength ({:.2e} m) is less than {:.1f} times the plate thickness ({:.2e} m)."
+                       "".format(minimal_wavelength, min_wavelength_to_thickness_ratio, thickness))
+
+    return True, ("Only fundamental Lamb modes up to {:.0f} kHz (higher-order cut-off at {:.0f} kHz), shortest "
+                  "wavelength is {:.1f} times the plate thickness.".format(max_frequency / 1e3,
+                                                                           cut_off_frequency / 1e3,
+                                                                           minimal_wavelength / thickness))
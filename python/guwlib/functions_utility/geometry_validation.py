@@ -0,0 +1,282 @@
+"""
+Pre-flight validation of the geometry of a model, without ABAQUS. Defects and transducers that lie outside the plate,
+that don't fit into their bounding boxes, transducers on holes or cracks and overlapping bounding boxes otherwise only
+show up as failures of the ABAQUS/CAE build (e.g. of ``findAt``), possibly after a long build or after the queueing of
+a cluster job.
+
+The bounding boxes are snapped to the nodes of the structured mesh like in the build (see
+``guwlib.functions_utility.grid_snapping``). Pairs of objects that may conflict are found with a uniform grid
+(spatial hash) over their bounding boxes (see :class:`BoundingBoxGrid`), so that the validation of models with many
+defects and transducers doesn't compare all pairs. :func:`validate_model_files` validates all models of a batch (e.g.
+all variants of a sweep) before the first build is started.
+"""
+from __future__ import print_function
+
+import math
+
+from guwlib.functions_utility.grid_snapping import get_snapped_bounding_box_coordinates
+
+# minimal bounding box scale of the transducers for the pin-force representation
+PIN_FORCE_BOUNDING_BOX_SCALE = 1.5
+
+# model approaches that partition the plate into bounding boxes around defects and transducers
+BOUNDING_BOX_MODEL_APPROACHES = ('point_force', 'pin_force', 'continuum_shell', 'shell')
+
+
+class BoundingBoxGrid(object):
+    """
+    Uniform grid (spatial hash) over axis-aligned rectangles. Each rectangle is stored in the grid cells it covers, so
+    that only rectangles that share a grid cell have to be compared to find the overlapping pairs.
+    """
+
+    def __init__(self, cell_size):
+        """
+        :param float cell_size: Edge length of the grid cells, e.g. the typical size of the rectangles.
+
+        :ivar float cell_size: Edge length of the grid cells.
+        :ivar dict[tuple[int, int], list[int]] cells: Indices of the rectangles in each (occupied) grid cell.
+        """
+        self.cell_size = float(cell_size)
+        self.cells = {}
+
+    def insert(self, index, rectangle):
+        """
+        :param int index: Index of the rectangle.
+        :param tuple[float, float, float, float] rectangle: Rectangle (x_min, x_max, y_min, y_max).
+        :return: None
+        """
+        x_min, x_max, y_min, y_max = rectangle
+        for i in range(int(math.floor(x_min / self.cell_size)), int(math.floor(x_max / self.cell_size)) + 1):
+            for j in range(int(math.floor(y_min / self.cell_size)), int(math.floor(y_max / self.cell_size)) + 1):
+                self.cells.setdefault((i, j), []).append(index)
+
+    def get_candidate_pairs(self):
+        """
+        :return: Pairs of indices (i < j) of the rectangles that share at least one grid cell, sorted.
+        :rtype: list[tuple[int, int]]
+        """
+        pairs = set()
+        for indices in self.cells.values():
+            for a in range(len(indices)):
+                for b in range(a + 1, len(indices)):
+                    pairs.add((min(indices[a], indices[b]), max(indices[a], indices[b])))
+        return sorted(pairs)
+
+
+def get_geometry_conflicts(model, element_size=None):
+    """
+    Checks the geometry of a configured model (after :meth:`FEModel.setup_parameters`):
+
+    - holes, cracks and transducers have to lie on the plate and inside their (snapped) bounding boxes,
+    - transducers must not touch holes or cracks,
+    - the bounding boxes must not overlap (native backend: the bounding boxes of defects must not overlap, and the
+      center of a transducer must not lie inside the bounding box of a defect or on the node of another transducer).
+
+    The bounding box checks are only performed for the model approaches that partition the plate into bounding boxes.
+
+    :param FEModel model: The configured model.
+    :param float element_size: In-plane element size. If None, it is computed with
+        :meth:`FEModel.get_element_size_in_plane`.
+    :return: Description of each conflict (empty if the geometry is valid).
+    :rtype: list[str]
+    """
+    from guwlib.guw_objects.defects import Crack, Hole
+
+    plate = model.plate
+    if plate is None or getattr(plate, 'width', None) is None or getattr(plate, 'length', None) is None:
+        return []
+    check_bounding_boxes = model.model_approach in BOUNDING_BOX_MODEL_APPROACHES
+    if check_bounding_boxes and element_size is None:
+        element_size = model.get_element_size_in_plane()
+    tolerance = 1e-9 * max(plate.width, plate.length)
+
+    # name, kind, object extent (x_min, x_max, y_min, y_max) and snapped bounding box of each item
+    items = []
+    for i, defect in enumerate(model.defects):
+        name = '{} {} at ({:.4g}, {:.4g})'.format(type(defect).__name__.lower(), i + 1, defect.position_x,
+                                                  defect.position_y)
+        if isinstance(defect, Hole):
+            extent = __get_circle_extent(defect.position_x, defect.position_y, defect.radius)
+            bounding_box_radius = defect.radius * defect.bounding_box_scale
+        elif isinstance(defect, Crack):
+            tips = __get_crack_tips(defect)
+            extent = (min(tips[0][0], tips[1][0]), max(tips[0][0], tips[1][0]),
+                      min(tips[0][1], tips[1][1]), max(tips[0][1], tips[1][1]))
+            bounding_box_radius = defect.length * 0.5 * defect.bounding_box_scale
+        else:
+            continue
+        items.append((name, 'defect', defect, extent, bounding_box_radius))
+    for i, transducer in enumerate(model.transducers):
+        name = 'transducer {} at ({:.4g}, {:.4g})'.format(i + 1, transducer.position_x, transducer.position_y)
+        bounding_box_scale = transducer.bounding_box_scale
+        if model.model_approach == 'pin_force':
+            bounding_box_scale = max(bounding_box_scale, PIN_FORCE_BOUNDING_BOX_SCALE)
+        items.append((name, 'transducer', transducer,
+                      __get_circle_extent(transducer.position_x, transducer.position_y, transducer.radius),
+                      transducer.radius * bounding_box_scale))
+
+    conflicts = []
+    boxes = []
+    for name, kind, item, extent, bounding_box_radius in items:
+        if not (tolerance < extent[0] and extent[1] < plate.width - tolerance and
+                tolerance < extent[2] and extent[3] < plate.length - tolerance):
+            conflicts.append('The {} does not lie on the plate.'.format(name))
+        if not check_bounding_boxes:
+            boxes.append(extent)
+            continue
+
+        x_left, x_right, y_lower, y_upper, x_center, y_center = get_snapped_bounding_box_coordinates(
+            x=item.position_x, y=item.position_y, bounding_box_radius=bounding_box_radius, plate_width=plate.width,
+            plate_length=plate.length, element_size=element_size)
+        box = (x_left, x_right, y_lower, y_upper)
+        inner_extent = extent if kind == 'defect' or model.model_approach == 'pin_force' else \
+            (item.position_x, item.position_x, item.position_y, item.position_y)
+        if not (__contains(box, inner_extent[0], inner_extent[2], tolerance) and
+                __contains(box, inner_extent[1], inner_extent[3], tolerance)):
+            conflicts.append('The {} does not lie inside its bounding box ({:.4g} to {:.4g}, {:.4g} to {:.4g}), '
+                             'increase its bounding box scale or move it away from the plate edge.'
+                             ''.format(name, x_left, x_right, y_lower, y_upper))
+        boxes.append(box + (x_center, y_center))
+
+    # pairs of items whose bounding boxes or extents may overlap
+    hulls = [(min(box[0], extent[0]), max(box[1], extent[1]), min(box[2], extent[2]), max(box[3], extent[3]))
+             for box, (_, _, _, extent, _) in zip(boxes, items)]
+    sizes = sorted(max(hull[1] - hull[0], hull[3] - hull[2]) for hull in hulls)
+    grid = BoundingBoxGrid(cell_size=max(sizes[len(sizes) // 2], tolerance) if sizes else 1.0)
+    for index, hull in enumerate(hulls):
+        grid.insert(index, hull)
+
+    for a, b in grid.get_candidate_pairs():
+        (name_a, kind_a, item_a, _, _), (name_b, kind_b, item_b, _, _) = items[a], items[b]
+        if kind_a == 'defect' and kind_b == 'transducer' and __touches(item_b, item_a):
+            conflicts.append('The {} touches the {}.'.format(name_b, name_a))
+            continue
+        if not check_bounding_boxes:
+            continue
+
+        box_a, box_b = boxes[a], boxes[b]
+        if model.build_backend != 'native' or kind_a == kind_b == 'defect':
+            if __overlap(box_a, box_b, tolerance):
+                conflicts.append('The bounding box of the {} overlaps with the bounding box of the {}.'
+                                 ''.format(name_a, name_b))
+        elif kind_a == kind_b == 'transducer':
+            if abs(box_a[4] - box_b[4]) < tolerance and abs(box_a[5] - box_b[5]) < tolerance:
+                conflicts.append('The {} and the {} are snapped to the same node.'.format(name_a, name_b))
+        elif __contains(box_a, box_b[4], box_b[5], tolerance):
+            conflicts.append('The {} lies inside the bounding box of the {}.'.format(name_b, name_a))
+    return conflicts
+
+
+def check_model_geometry(model, element_size=None):
+    """
+    Raises a ValueError with all conflicts of the geometry of a configured model (see :func:`get_geometry_conflicts`).
+
+    :param FEModel model: The configured model.
+    :param float element_size: In-plane element size. If None, it is computed from the model.
+    :return: None
+    :raises ValueError: If the geometry of the model has conflicts.
+    """
+    conflicts = get_geometry_conflicts(model, element_size=element_size)
+    if conflicts:
+        raise ValueError("The geometry of model {} is invalid:\n  - {}".format(model.model_name,
+                                                                             '\n  - '.join(conflicts)))
+
+
+def validate_model_files(model_file_paths, verbose=True):
+    """
+    Validates the geometry of all models of the model files or model specifications of a batch (see
+    ``guwlib.functions_utility.model_spec``) before any model is built, e.g. all variants of a sweep. The element sizes
+    are computed once for each combination of material, thickness and discretization.
+
+    :param list[str] model_file_paths: Paths to the model files (.PY) or model specifications (.JSON / .YAML).
+    :param bool verbose: If True, prints the number of validated models and the model files that can't be configured
+        outside ABAQUS (they are validated when they are built).
+    :return: Number of validated models.
+    :rtype: int
+    :raises ValueError: With the conflicts of all models, if any model has conflicts or if a model specification
+        can't be expanded.
+    """
+    from guwlib.functions_utility.model_spec import create_models_from_file, is_model_spec_file
+
+    element_sizes = {}
+    conflicts = []
+    num_models = 0
+    for model_file_path in model_file_paths:
+        try:
+            models = create_models_from_file(model_file_path)
+            for model in models:
+                model.setup_parameters()
+        except Exception as e:
+            if is_model_spec_file(model_file_path):
+                conflicts.append('{}: {}: {}'.format(model_file_path, type(e).__name__, e))
+            elif verbose:
+                print("{} can't be configured outside ABAQUS, it is validated when it is built ({}: {})."
+                      "".format(model_file_path, type(e).__name__, e))
+            continue
+
+        for model in models:
+            element_size = None
+            if model.plate is not None and model.model_approach in BOUNDING_BOX_MODEL_APPROACHES:
+                key = (type(model.plate.material).__name__, getattr(model.plate.material, 'material_name', None),
+                       model.plate.thickness, model.max_frequency, model.elements_per_wavelength)
+                if key not in element_sizes:
+                    element_sizes[key] = model.get_element_size_in_plane()
+                element_size = element_sizes[key]
+            conflicts.extend('{}: {}'.format(model.model_name, conflict)
+                             for conflict in get_geometry_conflicts(model, element_size=element_size))
+            num_models += 1
+
+    if conflicts:
+        raise ValueError("The geometry validation failed:\n  - {}".format('\n  - '.join(conflicts)))
+    if verbose:
+        print("The geometry of {} model(s) is valid.".format(num_models))
+    return num_models
+
+
+def __get_circle_extent(x, y, radius):
+    """
+    (Helper) Returns the extent (x_min, x_max, y_min, y_max) of a circle.
+    """
+    return x - radius, x + radius, y - radius, y + radius
+
+
+def __get_crack_tips(crack):
+    """
+    (Helper) Returns the tips of a crack (the crack is oriented along the y-axis for an angle of 0).
+    """
+    dx, dy = -math.sin(crack.angle) * crack.length * 0.5, math.cos(crack.angle) * crack.length * 0.5
+    return (crack.position_x - dx, crack.position_y - dy), (crack.position_x + dx, crack.position_y + dy)
+
+
+def __touches(transducer, defect):
+    """
+    (Helper) Checks if a circular transducer touches a hole or crack.
+    """
+    from guwlib.guw_objects.defects import Hole
+
+    x, y = transducer.position_x, transducer.position_y
+    if isinstance(defect, Hole):
+        return math.hypot(x - defect.position_x, y - defect.position_y) <= transducer.radius + defect.radius
+
+    # distance of the transducer center to the crack (line segment)
+    (x_a, y_a), (x_b, y_b) = __get_crack_tips(defect)
+    length_squared = (x_b - x_a) ** 2 + (y_b - y_a) ** 2
+    t = 0.0 if length_squared == 0 else ((x - x_a) * (x_b - x_a) + (y - y_a) * (y_b - y_a)) / length_squared
+    t = min(max(t, 0.0), 1.0)
+    return math.hypot(x - (x_a + t * (x_b - x_a)), y - (y_a + t * (y_b - y_a))) <= transducer.radius
+
+
+def __overlap(box_a, box_b, tolerance):
+    """
+    (Helper) Checks if the interiors of two rectangles (x_min, x_max, y_min, y_max, ...) overlap. Rectangles that only
+    share an edge don't overlap.
+    """
+    return (box_a[0] < box_b[1] - tolerance and box_b[0] < box_a[1] - tolerance and
+            box_a[2] < box_b[3] - tolerance and box_b[2] < box_a[3] - tolerance)
+
+
+def __contains(box, x, y, tolerance):
+    """
+    (Helper) Checks if a point lies strictly inside a rectangle (x_min, x_max, y_min, y_max, ...).
+    """
+    return box[0] + tolerance < x < box[1] - tolerance and box[2] + tolerance < y < box[3] - tolerance
@@ -0,0 +1,67 @@
+"""
+Helper functions to snap coordinates to the nodes of a structured, rectangular mesh of the plate. The node positions are
+computed analytically from the plate dimensions and the in-plane element size, mimicking the seeding of ABAQUS/CAE
+(edges are divided into the integer number of elements that is closest to edge length / element size). Snapping the
+bounding boxes around defects and transducers to these nodes keeps the partitioned plate compatible with a structured
+mesh. These functions do not depend on ABAQUS and can be used (and tested) with any Python interpreter.
+"""
+
+
+def get_number_of_elements_along_edge(edge_length, element_size):
+    """
+    Returns the number of elements that a straight edge is divided into when it is seeded with the given element size.
+
+    :param float edge_length: Length of the edge.
+    :param float element_size: Desired element size.
+    :return: Number of elements along the edge (at least 1).
+    :rtype: int
+    """
+    return max(1, int(round(edge_length / element_size)))
+
+
+def snap_to_structured_grid(value, edge_length, element_size):
+    """
+    Snaps a coordinate to the nearest node of a structured mesh along an edge starting at 0. Coordinates outside the
+    edge are snapped to its end points.
+
+    :param float value: Coordinate to snap.
+    :param float edge_length: Length of the edge.
+    :param float element_size: Desired element size.
+    :return: Coordinate of the nearest node.
+    :rtype: float
+    """
+    n_elements = get_number_of_elements_along_edge(edge_length, element_size)
+    node_spacing = float(edge_length) / n_elements
+    node_index = min(max(int(round(value / node_spacing)), 0), n_elements)
+    # the end points are returned exactly, node_index * node_spacing may deviate from the edge length by rounding
+    if node_index == 0:
+        return 0.0
+    if node_index == n_elements:
+        return float(edge_length)
+    return node_index * node_spacing
+
+
+def get_snapped_bounding_box_coordinates(x, y, bounding_box_radius, plate_width, plate_length, element_size):
+    """
+    Returns corner- and edge-center-coordinates of a square bounding box, snapped to the nearest nodes of a structured
+    mesh of the plate. Since the nodes form a rectangular grid, the nearest node to a point is found independently for
+    both coordinate axes.
+
+    :param float x: X-coordinate of the center of the bounding box.
+    :param float y: Y-coordinate of the center of the bounding box.
+    :param float bounding_box_radius: Radius (half length and half width) of the bounding box.
+    :param float plate_width: Width (x) of the plate.
+    :param float plate_length: Length (y) of the plate.
+    :param float element_size: Desired element size (in-plane) of the mesh.
+
+    :return: Corner- and edge-center-coordinates that snap to the nearest nodes of the structured mesh.
+    :rtype: tuple[float, float, float, float, float, float]
+    """
+    x_left = snap_to_structured_grid(x - bounding_box_radius, plate_width, element_size)
+    x_right = snap_to_structured_grid(x + bounding_box_radius, plate_width, element_size)
+    y_lower = snap_to_structured_grid(y - bounding_box_radius, plate_length, element_size)
+    y_upper = snap_to_structured_grid(y + bounding_box_radius, plate_length, element_size)
+    x_center = snap_to_structured_grid(x, plate_width, element_size)
+    y_center = snap_to_structured_grid(y, plate_length, element_size)
+
+    return x_left, x_right, y_lower, y_upper, x_center, y_center
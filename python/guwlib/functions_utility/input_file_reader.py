@@ -0,0 +1,399 @@
+"""
+Reader for the mesh of ABAQUS input (.INP) files: nodes, elements, node sets and element sets of a part are loaded into
+NumPy arrays, e.g. to plot the exported field output on the element faces or to compute gradients, which is not
+possible with the exported .NPZ files alone (they don't contain the connectivity). The reader works on plain text and
+does not depend on ABAQUS. It follows ``*Include`` keywords (e.g. the shared include files, see
+:mod:`guwlib.functions_utility.input_file_splitting`) and reads gzip-compressed files (``.inp.gz``).
+
+The data lines of each keyword block are converted to NumPy arrays in chunks of lines, with a single conversion per
+chunk. The arrays are cached as .NPY files next to the input file, so that subsequent reads only map the cached files
+into memory (``numpy.load`` with ``mmap_mode='r'``) instead of parsing the input file again.
+"""
+import gzip
+import json
+import os
+
+import numpy as np
+
+# directory suffix and manifest file name of the .NPY cache of an input file
+CACHE_DIRECTORY_SUFFIX = '_mesh_cache'
+CACHE_MANIFEST_FILE_NAME = 'manifest.json'
+
+# number of data lines that are converted to a NumPy array at once
+READ_CHUNK_LINES = 65536
+
+# number of elements for which the edge lengths are evaluated at once
+STATISTICS_CHUNK_SIZE = 262144
+
+# edges (pairs of corner node indices) of the element shapes, the element shape is derived from the element type
+ELEMENT_EDGES = {'hexahedron': ((0, 1), (1, 2), (2, 3), (3, 0), (4, 5), (5, 6), (6, 7), (7, 4),
+                                (0, 4), (1, 5), (2, 6), (3, 7)),
+                 'wedge': ((0, 1), (1, 2), (2, 0), (3, 4), (4, 5), (5, 3), (0, 3), (1, 4), (2, 5)),
+                 'tetrahedron': ((0, 1), (1, 2), (2, 0), (0, 3), (1, 3), (2, 3)),
+                 'quadrilateral': ((0, 1), (1, 2), (2, 3), (3, 0)),
+                 'triangle': ((0, 1), (1, 2), (2, 0))}
+
+
+class InputFileMesh(object):
+    """
+    Mesh of a part of an ABAQUS input file: node coordinates, element connectivity by element type and the node and
+    element sets.
+    """
+
+    def __init__(self, node_labels, node_coordinates, elements, node_sets=None, element_sets=None):
+        """
+        :param numpy.ndarray node_labels: Node labels, shape (num_nodes, ).
+        :param numpy.ndarray node_coordinates: Node coordinates, shape (num_nodes, 3).
+        :param dict[str, tuple[numpy.ndarray, numpy.ndarray]] elements: Element labels (shape (n, )) and connectivity
+            (node labels, shape (n, nodes per element)) by element type.
+        :param dict[str, numpy.ndarray] node_sets: Node labels, by set name.
+        :param dict[str, numpy.ndarray] element_sets: Element labels, by set name.
+
+        :ivar numpy.ndarray node_labels: Node labels.
+        :ivar numpy.ndarray node_coordinates: Node coordinates (x, y, z).
+        :ivar dict[str, tuple[numpy.ndarray, numpy.ndarray]] elements: Element labels and connectivity by element type.
+        :ivar dict[str, numpy.ndarray] node_sets: Node labels, by set name.
+        :ivar dict[str, numpy.ndarray] element_sets: Element labels, by set name.
+        """
+        self.node_labels = node_labels
+        self.node_coordinates = node_coordinates
+        self.elements = elements
+        self.node_sets = node_sets if node_sets is not None else {}
+        self.element_sets = element_sets if element_sets is not None else {}
+
+        self.__node_label_order = None
+        self.__consecutive_labels = False
+
+    @property
+    def num_nodes(self):
+        return len(self.node_labels)
+
+    @property
+    def num_elements(self):
+        return sum(len(labels) for labels, _ in self.elements.values())
+
+    def get_node_indices(self, node_labels):
+        """
+        Returns the indices (rows of ``node_coordinates``) of the given node labels.
+
+        :param numpy.ndarray node_labels: Node labels (any shape).
+        :return: Indices of the nodes, same shape as the node labels.
+        :rtype: numpy.ndarray
+        :raises KeyError: If a node label is not defined.
+        """
+        node_labels = np.asarray(node_labels)
+        if self.__node_label_order is None:
+            self.__node_label_order = np.argsort(self.node_labels, kind='stable')
+            self.__consecutive_labels = np.array_equal(self.node_labels, np.arange(1, self.num_nodes + 1))
+        if self.__consecutive_labels:
+            indices = node_labels - 1
+        else:
+            positions = np.searchsorted(self.node_labels, node_labels, sorter=self.__node_label_order)
+            indices = self.__node_label_order[np.minimum(positions, self.num_nodes - 1)]
+        if node_labels.size and (np.any(indices < 0) or np.any(indices >= self.num_nodes) or
+                                 np.any(self.node_labels[indices] != node_labels)):
+            raise KeyError("Undefined node label(s) in the connectivity or the node sets.")
+        return indices
+
+    def get_statistics(self):
+        """
+        Evaluates the number of nodes and elements (by element type) and the edge lengths of the elements. The edge
+        lengths and aspect ratios (longest / shortest edge of an element) are evaluated for the corner nodes of
+        solid, continuum shell, shell and plane elements (hexahedra, wedges, tetrahedra, quadrilaterals and triangles),
+        other element types are only counted.
+
+        :return: Statistics with the keys ``num_nodes``, ``num_elements``, ``elements_by_type``, ``min_edge_length``,
+            ``max_edge_length``, ``max_aspect_ratio`` and ``mean_aspect_ratio`` (None if no edges were evaluated).
+        :rtype: dict
+        """
+        statistics = {'num_nodes': self.num_nodes,
+                      'num_elements': self.num_elements,
+                      'elements_by_type': dict((element_type, len(labels))
+                                               for element_type, (labels, _) in self.elements.items()),
+                      'min_edge_length': None,
+                      'max_edge_length': None,
+                      'max_aspect_ratio': None,
+                      'mean_aspect_ratio': None}
+        num_evaluated, aspect_ratio_sum = 0, 0.0
+        for element_type, (_, connectivity) in self.elements.items():
+            edges = ELEMENT_EDGES.get(InputFileMesh.__get_element_shape(element_type, connectivity.shape[1]))
+            if edges is None:
+                continue
+            edges = np.array(edges)
+            for start in range(0, len(connectivity), STATISTICS_CHUNK_SIZE):
+                chunk = connectivity[start:start + STATISTICS_CHUNK_SIZE]
+                corners = self.node_coordinates[self.get_node_indices(chunk)]
+                edge_vectors = corners[:, edges[:, 1]] - corners[:, edges[:, 0]]
+                edge_lengths = np.sqrt(np.sum(edge_vectors ** 2, axis=2))
+                min_lengths, max_lengths = np.min(edge_lengths, axis=1), np.max(edge_lengths, axis=1)
+                aspect_ratios = max_lengths / np.maximum(min_lengths, np.finfo(float).tiny)
+                statistics['min_edge_length'] = InputFileMesh.__update(min, statistics['min_edge_length'],
+                                                                       np.min(min_lengths))
+                statistics['max_edge_length'] = InputFileMesh.__update(max, statistics['max_edge_length'],
+                                                                       np.max(max_lengths))
+                statistics['max_aspect_ratio'] = InputFileMesh.__update(max, statistics['max_aspect_ratio'],
+                                                                        np.max(aspect_ratios))
+                num_evaluated += len(aspect_ratios)
+                aspect_ratio_sum += float(np.sum(aspect_ratios))
+        if num_evaluated:
+            statistics['mean_aspect_ratio'] = aspect_ratio_sum / num_evaluated
+        return statistics
+
+    @staticmethod
+    def __get_element_shape(element_type, num_nodes):
+        """
+        (Helper) Derives the shape of an element from its type (solid and continuum shell elements start with ``C3D``
+        or ``SC``) and its number of nodes. Only the corner nodes of second-order elements are considered.
+        """
+        if element_type.upper().startswith(('C3D', 'SC')):
+            shapes = {8: 'hexahedron', 20: 'hexahedron', 6: 'wedge', 15: 'wedge', 4: 'tetrahedron', 10: 'tetrahedron'}
+        else:
+            shapes = {4: 'quadrilateral', 8: 'quadrilateral', 3: 'triangle', 6: 'triangle'}
+        return shapes.get(num_nodes)
+
+    @staticmethod
+    def __update(function, value, new_value):
+        """
+        (Helper) Applies min or max to a value that might not be set yet.
+        """
+        return float(new_value) if value is None else function(value, float(new_value))
+
+
+def read_input_file_mesh(input_file_path, part_name=None, use_cache=True):
+    """
+    Reads the mesh (nodes, elements, node sets and element sets) of a part from an ABAQUS input file. Node and element
+    sets of the assembly that refer to an instance of the part are read as well. If ``use_cache`` is True, the arrays
+    are cached as .NPY files in the directory ``<input file name>_mesh_cache`` next to the input file, and read as
+    memory maps (read-only) from the cache as long as the input file (and its include files) are unchanged.
+
+    :param str input_file_path: Path to the input (.INP) file, optionally gzip-compressed (``.inp.gz``).
+    :param str part_name: Name of the part to read, the first part if None. For input files without parts, all nodes
+        and elements are read.
+    :param bool use_cache: Whether to read from and write to the .NPY cache.
+    :return: The mesh of the part.
+    :rtype: InputFileMesh
+    :raises ValueError: If the part is not defined in the input file.
+    """
+    cache_directory = __get_cache_directory(input_file_path)
+    if use_cache:
+        mesh = __read_cache(cache_directory, part_name)
+        if mesh is not None:
+            return mesh
+
+    blocks, source_files = __read_keyword_blocks(input_file_path, part_name)
+    mesh = __assemble_mesh(blocks)
+
+    if use_cache:
+        __write_cache(cache_directory, mesh, part_name, source_files)
+    return mesh
+
+
+def __read_keyword_blocks(input_file_path, part_name):
+    """
+    (Helper) Parses the input file (and its include files) and collects the data of the keyword blocks of the mesh.
+
+    :return: Blocks as (keyword, options, data), with the data converted to flat arrays, and the paths of all files
+        that were read.
+    :rtype: tuple[list[tuple[str, dict, numpy.ndarray]], list[str]]
+    """
+    blocks = []
+    source_files = []
+    state = {'part': None, 'selected_part': part_name, 'found_part': False, 'instances': {}}
+    __parse_file(input_file_path, blocks, source_files, state)
+    if part_name is not None and not state['found_part']:
+        raise ValueError("The part {} is not defined in {}.".format(part_name, input_file_path))
+    return blocks, source_files
+
+
+def __parse_file(file_path, blocks, source_files, state):
+    """
+    (Helper) Parses the lines of one input or include file, recursively for included files.
+    """
+    if not os.path.exists(file_path) and os.path.exists(file_path + '.gz'):
+        file_path = file_path + '.gz'
+    source_files.append(os.path.abspath(file_path))
+    keyword, options, data_lines = None, {}, []
+
+    with (gzip.open(file_path, 'rt') if file_path.endswith('.gz') else open(file_path, 'r')) as file:
+        for line in file:
+            if line.startswith('**'):
+                continue
+            if not line.startswith('*'):
+                if keyword is not None and line.strip():
+                    data_lines.append(line)
+                    if len(data_lines) >= READ_CHUNK_LINES and not line.rstrip().endswith(','):
+                        __add_block_data(blocks, keyword, options, data_lines)
+                        data_lines = []
+                continue
+
+            # keyword line: finish the data of the previous block
+            if keyword is not None:
+                __add_block_data(blocks, keyword, options, data_lines)
+            keyword, options, data_lines = None, {}, []
+            name, line_options = __parse_keyword_line(line)
+
+            if name == '*include':
+                include_path = os.path.join(os.path.dirname(file_path), line_options['input'])
+                __parse_file(include_path, blocks, source_files, state)
+            elif name == '*part':
+                state['part'] = line_options.get('name')
+                if state['selected_part'] is None and not state['found_part']:
+                    state['selected_part'] = state['part']
+                state['found_part'] = state['found_part'] or state['part'] == state['selected_part']
+            elif name == '*end part':
+                state['part'] = None
+            elif name == '*instance':
+                state['instances'][line_options.get('name')] = line_options.get('part')
+            elif name in ('*node', '*element', '*nset', '*elset'):
+                in_selected_part = state['part'] is not None and state['part'] == state['selected_part']
+                in_file_without_parts = state['part'] is None and state['selected_part'] is None and \
+                    'instance' not in line_options
+                of_selected_instance = state['part'] is None and \
+                    state['instances'].get(line_options.get('instance')) == state['selected_part'] and \
+                    state['selected_part'] is not None
+                if in_selected_part or in_file_without_parts or of_selected_instance:
+                    keyword, options = name, line_options
+
+        if keyword is not None:
+            __add_block_data(blocks, keyword, options, data_lines)
+
+
+def __parse_keyword_line(line):
+    """
+    (Helper) Splits a keyword line into the lowercase keyword and its options (lowercase keys).
+
+    :return: Keyword (e.g. ``'*nset'``) and options (e.g. ``{'nset': 'top', 'generate': None}``).
+    :rtype: tuple[str, dict]
+    """
+    parts = [part.strip() for part in line.strip().split(',')]
+    options = {}
+    for part in parts[1:]:
+        if not part:
+            continue
+        key, _, value = part.partition('=')
+        options[key.strip().lower()] = value.strip() if value else None
+    return parts[0].lower(), options
+
+
+def __add_block_data(blocks, keyword, options, data_lines):
+    """
+    (Helper) Converts the data lines of a keyword block to a flat array (one conversion for all lines) and appends it to
+    the blocks. For elements, the number of values per element is derived from the number of element records (data
+    lines ending with a comma are continued on the next line).
+    """
+    if not data_lines:
+        return
+    text = ''.join(data_lines)
+    dtype = float if keyword == '*node' else np.int64
+    values = np.fromstring(text.replace(',', ' '), sep=' ', dtype=dtype)
+    if keyword == '*node':
+        values = values.reshape(len(data_lines), -1)
+    elif keyword == '*element':
+        num_records = sum(1 for line in data_lines if not line.rstrip().endswith(','))
+        values = values.reshape(num_records, -1)
+    blocks.append((keyword, options, values))
+
+
+def __assemble_mesh(blocks):
+    """
+    (Helper) Assembles the mesh from the data of the keyword blocks.
+
+    :rtype: InputFileMesh
+    """
+    nodes, elements, node_sets, element_sets = [], {}, {}, {}
+    for keyword, options, values in blocks:
+        if keyword == '*node':
+            nodes.append(values)
+        elif keyword == '*element':
+            elements.setdefault(options.get('type'), []).append(values)
+        else:
+            labels = values
+            if 'generate' in options:
+                labels = np.concatenate([np.arange(start, stop + 1, step)
+                                         for start, stop, step in values.reshape(-1, 3)])
+            sets = node_sets if keyword == '*nset' else element_sets
+            sets.setdefault(options.get(keyword[1:]), []).append(labels)
+
+    nodes = np.concatenate(nodes) if nodes else np.zeros((0, 4))
+    node_coordinates = np.zeros((len(nodes), 3))
+    node_coordinates[:, :nodes.shape[1] - 1] = nodes[:, 1:4]
+    for element_type in elements:
+        element_data = np.concatenate(elements[element_type])
+        elements[element_type] = (element_data[:, 0], element_data[:, 1:])
+    return InputFileMesh(node_labels=nodes[:, 0].astype(np.int64), node_coordinates=node_coordinates,
+                         elements=elements,
+                         node_sets=dict((name, np.concatenate(labels)) for name, labels in node_sets.items()),
+                         element_sets=dict((name, np.concatenate(labels)) for name, labels in element_sets.items()))
+
+
+def __get_cache_directory(input_file_path):
+    """
+    (Helper) Returns the path of the .NPY cache directory of an input file.
+    """
+    base_path = input_file_path[:-len('.gz')] if input_file_path.endswith('.gz') else input_file_path
+    return os.path.splitext(base_path)[0] + CACHE_DIRECTORY_SUFFIX
+
+
+def __get_file_signature(file_path):
+    """
+    (Helper) Returns the size and modification time of a file, to detect changes of cached input files.
+    """
+    return [os.path.getsize(file_path), os.path.getmtime(file_path)]
+
+
+def __write_cache(cache_directory, mesh, part_name, source_files):
+    """
+    (Helper) Writes the arrays of the mesh as .NPY files and a manifest to the cache directory.
+    """
+    if not os.path.exists(cache_directory):
+        os.makedirs(cache_directory)
+    arrays = [('node_labels', mesh.node_labels), ('node_coordinates', mesh.node_coordinates)]
+    manifest = {'part_name': part_name,
+                'source_files': dict((path, __get_file_signature(path)) for path in source_files),
+                'element_types': sorted(mesh.elements),
+                'node_sets': sorted(mesh.node_sets),
+                'element_sets': sorted(mesh.element_sets)}
+    for i, element_type in enumerate(manifest['element_types']):
+        arrays.extend([('element_labels_{}'.format(i), mesh.elements[element_type][0]),
+                       ('element_connectivity_{}'.format(i), mesh.elements[element_type][1])])
+    for i, set_name in enumerate(manifest['node_sets']):
+        arrays.append(('node_set_{}'.format(i), mesh.node_sets[set_name]))
+    for i, set_name in enumerate(manifest['element_sets']):
+        arrays.append(('element_set_{}'.format(i), mesh.element_sets[set_name]))
+
+    for name, array in arrays:
+        np.save(os.path.join(cache_directory, name + '.npy'), np.asarray(array))
+    with open(os.path.join(cache_directory, CACHE_MANIFEST_FILE_NAME), 'w') as file:
+        json.dump(manifest, file, indent=2)
+
+
+def __read_cache(cache_directory, part_name):
+    """
+    (Helper) Reads the mesh from the cache directory (as memory maps), if the cache is valid for the part and the input
+    files are unchanged.
+
+    :return: The mesh, or None if there is no valid cache.
+    :rtype: InputFileMesh
+    """
+    manifest_file_path = os.path.join(cache_directory, CACHE_MANIFEST_FILE_NAME)
+    if not os.path.exists(manifest_file_path):
+        return None
+    with open(manifest_file_path, 'r') as file:
+        manifest = json.load(file)
+    if manifest['part_name'] != part_name:
+        return None
+    for path, signature in manifest['source_files'].items():
+        if not os.path.exists(path) or __get_file_signature(path) != signature:
+            return None
+
+    def load(name):
+        return np.load(os.path.join(cache_directory, name + '.npy'), mmap_mode='r')
+
+    elements = dict((element_type, (load('element_labels_{}'.format(i)), load('element_connectivity_{}'.format(i))))
+                    for i, element_type in enumerate(manifest['element_types']))
+    return InputFileMesh(node_labels=load('node_labels'), node_coordinates=load('node_coordinates'),
+                         elements=elements,
+                         node_sets=dict((name, load('node_set_{}'.format(i)))
+                                        for i, name in enumerate(manifest['node_sets'])),
+                         element_sets=dict((name, load('element_set_{}'.format(i)))
+                                           for i, name in enumerate(manifest['element_sets'])))
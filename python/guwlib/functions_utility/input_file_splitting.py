@@ -0,0 +1,121 @@
+"""
+Helper functions to split ABAQUS input (.INP) files into model data that can be shared by several load cases (parts,
+mesh, sets, assembly, materials, ...) and the data that is specific for a load case (amplitudes and step history).
+The shared model data is written to an include file once, the load case input files only reference it with an
+``*Include`` keyword. These functions work on plain text and do not depend on ABAQUS.
+"""
+import os
+
+# keywords that belong to the heading of the input file
+HEADING_KEYWORDS = ('*heading', '*preprint')
+
+# keywords of model data that is specific for a load case
+LOAD_CASE_MODEL_KEYWORDS = ('*amplitude', )
+
+
+def split_input_file_lines(lines, model_data_file=None):
+    """
+    Splits the lines of an ABAQUS input file into heading, shared model data, load case specific model data
+    (amplitudes) and history data (steps). Since the shared model data contains the mesh and might be very large, it is
+    not returned but written (line by line) to a file object instead.
+
+    :param iterable[str] lines: Lines of the input file (with or without trailing line breaks), e.g. an open file.
+    :param file model_data_file: Open file to which the shared model data is written. The model data is discarded if
+        ``None``.
+
+    :return: Lines of the heading, the load case specific model data and the history data (without line breaks).
+    :rtype: tuple[list[str], list[str], list[str]]
+    """
+    heading, load_case_model_data, history = [], [], []
+    pending_comments = []
+    section = 'heading'
+    destination = heading
+
+    for line in lines:
+        line = line.rstrip('\r\n')
+
+        # comment lines are assigned to the next keyword block
+        if line.startswith('**'):
+            pending_comments.append(line)
+            continue
+
+        # keyword lines determine the destination of all following lines
+        if line.startswith('*'):
+            keyword = line.split(',')[0].strip().lower()
+            if section == 'heading' and keyword not in HEADING_KEYWORDS:
+                section = 'model'
+            if section == 'model' and keyword == '*step':
+                section = 'history'
+
+            if section == 'heading':
+                destination = heading
+            elif section == 'history':
+                destination = history
+            elif keyword in LOAD_CASE_MODEL_KEYWORDS:
+                destination = load_case_model_data
+            else:
+                destination = None
+
+        for pending_line in pending_comments + [line]:
+            if destination is not None:
+                destination.append(pending_line)
+            elif model_data_file is not None:
+                model_data_file.write(pending_line + '\n')
+        pending_comments = []
+
+    # trailing comments belong to the history data
+    history.extend(pending_comments)
+
+    return heading, load_case_model_data, history
+
+
+def get_load_case_input_file_lines(heading, include_file_reference, load_case_model_data, history):
+    """
+    Assembles the lines of a lightweight load case input file, which includes the shared model data.
+
+    :param list[str] heading: Lines of the heading.
+    :param str include_file_reference: Path to the include file with the shared model data, relative to the directory
+        of the load case input file (which is the working directory of the ABAQUS job).
+    :param list[str] load_case_model_data: Lines of the load case specific model data (amplitudes).
+    :param list[str] history: Lines of the history data (steps).
+
+    :return: Lines of the load case input file (without line breaks).
+    :rtype: list[str]
+    """
+    include = ['**',
+               '** SHARED MODEL DATA (PARTS, ASSEMBLY, MATERIALS)',
+               '**',
+               '*Include, input={}'.format(include_file_reference.replace('\\', '/'))]
+    return heading + include + load_case_model_data + history
+
+
+def split_input_file(input_file_path, include_file_path):
+    """
+    Splits a (complete) ABAQUS input file written by ABAQUS/CAE in place. The shared model data is written to the
+    include file and the input file is replaced by a lightweight load case input file that includes it.
+
+    :param str input_file_path: Path to the input (.INP) file.
+    :param str include_file_path: Path of the include file to write.
+    :return: None
+    """
+    with open(input_file_path, 'r') as input_file, open(include_file_path, 'w') as include_file:
+        heading, load_case_model_data, history = split_input_file_lines(input_file, model_data_file=include_file)
+    write_load_case_input_file(input_file_path, include_file_path, heading, load_case_model_data, history)
+
+
+def write_load_case_input_file(input_file_path, include_file_path, heading, load_case_model_data, history):
+    """
+    Writes a lightweight load case input file that includes the shared model data.
+
+    :param str input_file_path: Path to the load case input (.INP) file to write.
+    :param str include_file_path: Path to the include file with the shared model data.
+    :param list[str] heading: Lines of the heading.
+    :param list[str] load_case_model_data: Lines of the load case specific model data (amplitudes).
+    :param list[str] history: Lines of the history data (steps).
+    :return: None
+    """
+    include_file_reference = os.path.relpath(os.path.abspath(include_file_path),
+                                             os.path.dirname(os.path.abspath(input_file_path)))
+    lines = get_load_case_input_file_lines(heading, include_file_reference, load_case_model_data, history)
+    with open(input_file_path, 'w') as input_file:
+        input_file.write('\n'.join(lines) + '\n')
@@ -0,0 +1,329 @@
+"""
+Declarative model specifications and parametric sweeps, to define many model variants without one model file (.PY) per
+variant. A model specification is a dictionary, stored as .JSON file (or as .YAML file, if PyYAML is installed):
+
+    ``{"name": "hole_{index:03d}",``
+    `` "sweep": {"grid": {"diameter": [5e-3, 10e-3]},``
+    ``           "random": {"samples": 20, "seed": 1, "distributions": {"angle": {"uniform": [0, 360]}}}},``
+    `` "parameters": {"hole_x": "$0.5 + 0.22 * cos(radians(angle))", "hole_y": "$0.5 + 0.22 * sin(radians(angle))"},``
+    `` "model": {"max_frequency": 300e3,``
+    ``           "plate": {"type": "IsotropicRectangularPlate", "thickness": 3e-3, "width": 1.0, "length": 1.0,``
+    ``                     "material": {"type": "IsotropicMaterial", "material_name": "AluminumAlloy1100"}},``
+    ``           "defects": [{"type": "Hole", "position_x": "$hole_x", "position_y": "$hole_y",``
+    ``                        "diameter": "$diameter"}], ...}}``
+
+- ``sweep``: The ``grid`` is expanded to the cartesian product of its parameter values. For each grid point,
+  ``samples`` random values are drawn from the ``distributions`` (``uniform: [low, high]``, ``normal: [mean, std]`` or
+  ``choice: [values]``) with a seeded generator, so the expansion is the same in every python interpreter.
+- ``parameters``: Derived (or constant) parameters of each variant, evaluated in the given order.
+- ``model``: Attributes of the :class:`FEModel`. Dictionaries with a ``type`` are instantiated as guwlib objects of that
+  class (e.g. ``Hole``, ``Burst``, ``LoadCase``), with the remaining items as keyword arguments.
+- ``name``: Name of each variant (output directory ``results/<name>``), formatted with its parameters and its
+  ``index``. Defaults to the name of the specification file, with the index appended if there are several variants.
+- ``template``: Optional model file (.PY, relative to the specification) with a single :class:`FEModel` subclass, which
+  is instantiated instead of a plain :class:`FEModel`. The parameters of each variant are available as
+  ``self.parameters`` in its ``setup_parameters`` method, the attributes of ``model`` are set before it is called.
+
+Strings that start with ``$`` are python expressions of the parameters (with the functions of the ``math`` module).
+
+Each variant expands to a specification without sweep and expressions, which is JSON serializable (see
+:func:`write_model_specs`), e.g. to ship single variants to a cluster. Specification files can be passed to the batch
+functions like model files; all variants of a specification file are built in the same ABAQUS/CAE session.
+"""
+import itertools
+import json
+import math
+import os
+import runpy
+from collections import OrderedDict
+
+import numpy as np
+
+MODEL_SPEC_FILE_EXTENSIONS = ('.json', '.yaml', '.yml')
+MODEL_FILE_RUN_NAME = 'guwlib_model_file'
+EXPRESSION_PREFIX = '$'
+
+# names available in expressions, besides the parameters
+EXPRESSION_NAMESPACE = dict((name, getattr(math, name)) for name in dir(math) if not name.startswith('_'))
+EXPRESSION_NAMESPACE.update({'abs': abs, 'min': min, 'max': max, 'round': round, 'int': int, 'float': float,
+                             'len': len, 'range': range, 'sum': sum})
+
+try:
+    # python 2 (ABAQUS): strings from JSON files are unicode
+    STRING_TYPES = (str, unicode)
+except NameError:
+    STRING_TYPES = (str, )
+
+
+def is_model_spec_file(model_file_path):
+    """
+    :param str model_file_path: Path to a model file (.PY) or model specification (.JSON / .YAML).
+    :return: True if the file is a model specification.
+    :rtype: bool
+    """
+    return model_file_path.lower().endswith(MODEL_SPEC_FILE_EXTENSIONS)
+
+
+def load_model_spec(spec_file_path):
+    """
+    Loads a model specification from a .JSON or .YAML file.
+
+    :param str spec_file_path: Path to the model specification.
+    :return: The model specification.
+    :rtype: dict
+    :raises ImportError: If a .YAML file is loaded and PyYAML is not installed.
+    """
+    with open(spec_file_path, 'r') as file:
+        if spec_file_path.lower().endswith('.json'):
+            return json.load(file, object_pairs_hook=OrderedDict)
+        try:
+            import yaml
+        except ImportError:
+            raise ImportError("PyYAML is required to load {}, install it or use a .JSON file.".format(spec_file_path))
+        return yaml.safe_load(file)
+
+
+def get_sweep_samples(grid=None, random=None):
+    """
+    Expands a parameter grid and random samples to the parameter values of each variant. The grid is expanded to the
+    cartesian product of its values (in the given order of the parameters); for each grid point, ``random['samples']``
+    values are drawn from ``random['distributions']`` with a generator seeded with ``random['seed']`` (default: 0).
+
+    :param dict[str, list] grid: Values of each grid parameter.
+    :param dict random: Random samples, with the keys ``samples``, ``seed`` and ``distributions`` (by parameter, e.g.
+        ``{'uniform': [0, 1]}``, ``{'normal': [0, 1]}`` or ``{'choice': [1, 2, 3]}``).
+    :return: Parameter values of each variant (a single variant without parameters if both are None).
+    :rtype: list[dict]
+    :raises ValueError: If a distribution is unknown.
+    """
+    grid = grid if grid is not None else {}
+    grid_names = list(grid.keys())
+    grid_points = [OrderedDict(zip(grid_names, values)) for values in itertools.product(*[grid[name]
+                                                                                           for name in grid_names])]
+    if not random:
+        return grid_points
+
+    generator = np.random.RandomState(random.get('seed', 0))
+    distributions = random.get('distributions', {})
+    samples = []
+    for grid_point in grid_points:
+        for _ in range(int(random.get('samples', 1))):
+            sample = OrderedDict(grid_point)
+            for name in sorted(distributions):
+                sample[name] = __draw(generator, name, distributions[name])
+            samples.append(sample)
+    return samples
+
+
+def expand_model_spec(spec, default_name='model'):
+    """
+    Expands a model specification to the specifications of its variants, without sweep and expressions.
+
+    :param dict spec: Model specification.
+    :param str default_name: Name of the variants if the specification has no ``name`` (the index is appended if
+        there are several variants).
+    :return: Specifications of the variants (JSON serializable), with the keys ``name``, ``parameters``, ``model``
+        and (if given) ``template``.
+    :rtype: list[dict]
+    :raises ValueError: If an expression can't be evaluated or the names of the variants aren't unique.
+    """
+    sweep = spec.get('sweep', {})
+    samples = get_sweep_samples(grid=sweep.get('grid'), random=sweep.get('random'))
+    name_format = spec.get('name', default_name if len(samples) == 1 else default_name + '_{index:03d}')
+
+    variants = []
+    for index, sample in enumerate(samples):
+        parameters = OrderedDict(sample)
+        for name, value in spec.get('parameters', {}).items():
+            parameters[name] = __resolve(value, parameters)
+        variant = OrderedDict([('name', str(name_format.format(index=index, **parameters))),
+                               ('parameters', __to_builtin(parameters)),
+                               ('model', __to_builtin(__resolve(spec.get('model', {}), parameters)))])
+        if 'template' in spec:
+            variant['template'] = spec['template']
+        variants.append(variant)
+
+    names = [variant['name'] for variant in variants]
+    if len(set(names)) != len(names):
+        raise ValueError("The names of the variants are not unique, add a parameter or the index to the name "
+                         "'{}'.".format(name_format))
+    return variants
+
+
+def write_model_specs(spec, output_directory, spec_directory='', default_name='model'):
+    """
+    Expands a model specification and writes the specification of each variant to ``<name>.json`` in the output
+    directory, e.g. to build or ship the variants separately.
+
+    :param dict spec: Model specification.
+    :param str output_directory: Directory of the written specifications (created if necessary).
+    :param str spec_directory: Directory that the path of the ``template`` is relative to.
+    :param str default_name: Name of the variants if the specification has no ``name``.
+    :return: Paths to the written specifications.
+    :rtype: list[str]
+    """
+    if not os.path.exists(output_directory):
+        os.makedirs(output_directory)
+    spec_file_paths = []
+    for variant in expand_model_spec(spec, default_name=default_name):
+        if 'template' in variant:
+            variant['template'] = os.path.relpath(os.path.join(spec_directory, variant['template']),
+                                                  output_directory).replace('\\', '/')
+        spec_file_path = os.path.join(output_directory, variant['name'] + '.json')
+        with open(spec_file_path, 'w') as file:
+            json.dump(variant, file, indent=2)
+        spec_file_paths.append(spec_file_path)
+    return spec_file_paths
+
+
+def create_models(spec, spec_file_path=None, default_name='model'):
+    """
+    Expands a model specification and creates the :class:`FEModel` of each variant. The models are configured when
+    :meth:`FEModel.setup_in_abaqus` is called (``setup_parameters`` of the template, if any).
+
+    :param dict spec: Model specification.
+    :param str spec_file_path: Path to the specification file. The ``template`` is relative to its directory, and it
+        is copied to the output directory of each model (like a model file).
+    :param str default_name: Name of the variants if the specification has no ``name``.
+    :return: The models, in the order of the variants.
+    :rtype: list[FEModel]
+    """
+    from guwlib.guw_objects.fe_model import FEModel
+
+    spec_directory = os.path.dirname(spec_file_path) if spec_file_path is not None else ''
+    model_classes = {}
+    models = []
+    for variant in expand_model_spec(spec, default_name=default_name):
+        model_class = FEModel
+        model_file_path = spec_file_path
+        if 'template' in variant:
+            template_path = os.path.join(spec_directory, variant['template'])
+            if template_path not in model_classes:
+                model_classes[template_path] = get_model_class(template_path)
+            model_class = model_classes[template_path]
+            model_file_path = model_file_path if model_file_path is not None else template_path
+
+        model = model_class(model_name=variant['name'], model_file_path=model_file_path)
+        model.parameters = variant['parameters']
+        for name, value in variant['model'].items():
+            if not hasattr(model, name) or name.startswith('_'):
+                raise ValueError("{} is not an attribute of FEModel (variant {}).".format(name, variant['name']))
+            setattr(model, str(name), __create_object(value))
+        models.append(model)
+    return models
+
+
+def create_models_from_file(model_file_path):
+    """
+    Creates the (unconfigured) models defined by a model file (.PY, with a single :class:`FEModel` subclass, named
+    after the file) or by a model specification (.JSON / .YAML, named after its variants).
+
+    :param str model_file_path: Path to the model file or model specification.
+    :return: The models.
+    :rtype: list[FEModel]
+    :raises ValueError: If a model file doesn't define exactly one subclass of :class:`FEModel`.
+    """
+    if is_model_spec_file(model_file_path):
+        return create_models(load_model_spec(model_file_path), spec_file_path=model_file_path,
+                             default_name=os.path.splitext(os.path.basename(model_file_path))[0])
+    model_class = get_model_class(model_file_path)
+    return [model_class(model_name=os.path.splitext(os.path.basename(model_file_path))[0],
+                        model_file_path=model_file_path)]
+
+
+def get_model_names(model_file_path):
+    """
+    :param str model_file_path: Path to a model file (.PY) or model specification (.JSON / .YAML).
+    :return: Names of the models the file defines (their output directories are ``results/<name>``).
+    :rtype: list[str]
+    """
+    if is_model_spec_file(model_file_path):
+        return [variant['name'] for variant in expand_model_spec(
+            load_model_spec(model_file_path), default_name=os.path.splitext(os.path.basename(model_file_path))[0])]
+    return [os.path.splitext(os.path.basename(model_file_path))[0]]
+
+
+def get_model_class(model_file_path):
+    """
+    Runs a model file (not as ``__main__``) and returns the subclass of :class:`FEModel` it defines.
+
+    :param str model_file_path: Path to the model file (.PY).
+    :return: The model class.
+    :rtype: type
+    :raises ValueError: If the model file doesn't define exactly one subclass of :class:`FEModel`.
+    """
+    from guwlib.guw_objects.fe_model import FEModel
+
+    namespace = runpy.run_path(model_file_path, run_name=MODEL_FILE_RUN_NAME)
+    model_classes = [value for value in namespace.values() if isinstance(value, type) and
+                     issubclass(value, FEModel) and value.__module__ == MODEL_FILE_RUN_NAME]
+    if len(model_classes) != 1:
+        raise ValueError("{} defines {} subclasses of FEModel, expected one.".format(model_file_path,
+                                                                                   len(model_classes)))
+    return model_classes[0]
+
+
+def __draw(generator, name, distribution):
+    """
+    (Helper) Draws a random value from a distribution of a sweep parameter.
+    """
+    (kind, arguments), = distribution.items()
+    if kind == 'uniform':
+        return float(generator.uniform(arguments[0], arguments[1]))
+    if kind == 'normal':
+        return float(generator.normal(arguments[0], arguments[1]))
+    if kind == 'choice':
+        return arguments[generator.randint(len(arguments))]
+    raise ValueError("Unknown distribution '{}' of the sweep parameter {}, use 'uniform', 'normal' or 'choice'."
+                     "".format(kind, name))
+
+
+def __resolve(value, parameters):
+    """
+    (Helper) Evaluates the expressions in a (nested) value of a model specification.
+    """
+    if isinstance(value, STRING_TYPES) and value.startswith(EXPRESSION_PREFIX):
+        namespace = dict(EXPRESSION_NAMESPACE)
+        namespace.update(parameters)
+        try:
+            return eval(value[len(EXPRESSION_PREFIX):], {'__builtins__': {}}, namespace)
+        except Exception as e:
+            raise ValueError("Can't evaluate the expression '{}': {}".format(value, e))
+    if isinstance(value, (list, tuple)):
+        return [__resolve(item, parameters) for item in value]
+    if isinstance(value, dict):
+        return OrderedDict((key, __resolve(item, parameters)) for key, item in value.items())
+    return value
+
+
+def __to_builtin(value):
+    """
+    (Helper) Converts NumPy arrays and scalars in a (nested) value to python lists and numbers.
+    """
+    if isinstance(value, (list, tuple)):
+        return [__to_builtin(item) for item in value]
+    if isinstance(value, dict):
+        return OrderedDict((str(key), __to_builtin(item)) for key, item in value.items())
+    if hasattr(value, 'tolist'):
+        return __to_builtin(value.tolist())
+    return value
+
+
+def __create_object(value):
+    """
+    (Helper) Instantiates the guwlib objects (dictionaries with a ``type``) in a (nested) value of a model
+    specification.
+    """
+    if isinstance(value, list):
+        return [__create_object(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+    if 'type' not in value:
+        return dict((str(key), __create_object(item)) for key, item in value.items())
+
+    import guwlib.guw_objects as guw_objects
+    arguments = dict((str(key), __create_object(item)) for key, item in value.items() if key != 'type')
+    object_class = getattr(guw_objects, str(value['type']), None)
+    if not isinstance(object_class, type):
+        raise ValueError("Unknown guwlib object type '{}'.".format(value['type']))
+    return object_class(**arguments)
@@ -0,0 +1,304 @@
+"""
+Benchmark harness for the rectilinear partitioning algorithm (``guwlib.functions_utility.rectilinear_partitioning``).
+
+The harness generates reproducible (seeded) cut-out layouts of different types and sizes, runs a partitioning function
+on each layout, and records runtime, peak memory (Python allocations traced by ``tracemalloc``), number of created
+partitions and worst aspect ratio. Runtime is measured without
+memory tracing, since ``tracemalloc`` slows the algorithm down by about one order of magnitude; the peak memory is
+measured in a second, traced run. Results can be saved as a baseline .JSON file and compared against later runs, e.g.
+to detect performance regressions or to objectively compare a replacement of the partitioning algorithm.
+
+Three types of layouts are available:
+
+    - ``'random'``: square cut-outs of random size, uniformly distributed over the plate.
+    - ``'clustered'``: square cut-outs of random size, grouped in a few clusters.
+    - ``'ring'``: equally-sized square cut-outs on concentric rings around the plate center (like the bounding boxes
+      of the transducers in the phased-array models).
+
+All cut-out coordinates are snapped to a regular grid (like the bounding boxes in the actual model, which are snapped
+to the nodes of a structured mesh) and cut-outs never overlap. This module is not needed to build models and is meant
+to be run with a standard Python 3 interpreter (see ``benchmark_partitioning.py``).
+"""
+import json
+import math
+import os
+import platform
+import random
+import time
+import tracemalloc
+from datetime import datetime
+
+from guwlib.functions_utility.rectilinear_partitioning import (partition_rectangle_with_rectilinear_cutouts,
+                                                               get_partition_quality)
+
+LAYOUT_TYPES = ('random', 'clustered', 'ring')
+DEFAULT_SIZES = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+
+def generate_cut_out_layout(layout_type, n_cut_outs, seed=0, plate_width=1.0, plate_length=1.0, cut_out_size=16e-3,
+                            grid_size=1e-3, max_attempts=100000):
+    """
+    Generates a reproducible layout of non-overlapping, square cut-outs on a rectangular plate.
+
+    :param str layout_type: Type of the layout, either ``'random'``, ``'clustered'`` or ``'ring'``.
+    :param int n_cut_outs: Number of cut-outs to generate.
+    :param int seed: Seed of the random number generator.
+    :param float plate_width: Width (x) of the plate.
+    :param float plate_length: Length (y) of the plate.
+    :param float cut_out_size: (Mean) edge length of the cut-outs.
+    :param float grid_size: Spacing of the grid that all coordinates are snapped to (``None`` to disable snapping).
+    :param int max_attempts: Maximum number of candidate cut-outs to draw before giving up.
+
+    :return: A list of the cut-outs, defined by their lower-left and upper-right diagonal corners
+        ([left, bottom, right, top]).
+    :rtype: list[list[float, float, float, float]]
+    :raises ValueError: If the layout type is unknown or if the cut-outs do not fit on the plate.
+    """
+    if layout_type not in LAYOUT_TYPES:
+        raise ValueError("Invalid layout type. Accepted values are: {}".format(LAYOUT_TYPES))
+
+    rng = random.Random(seed)
+    cut_outs = []
+
+    if layout_type == 'ring':
+        candidates = __ring_candidates(n_cut_outs, plate_width, plate_length, cut_out_size)
+    elif layout_type == 'clustered':
+        candidates = __clustered_candidates(rng, n_cut_outs, plate_width, plate_length, cut_out_size, max_attempts)
+    else:
+        candidates = __random_candidates(rng, plate_width, plate_length, cut_out_size, max_attempts)
+
+    for x, y, size in candidates:
+        cut_out = [x - size / 2, y - size / 2, x + size / 2, y + size / 2]
+        if grid_size:
+            cut_out = [round(coordinate / grid_size) * grid_size for coordinate in cut_out]
+        if __fits_on_plate(cut_out, plate_width, plate_length) and not __overlaps_any(cut_out, cut_outs):
+            cut_outs.append(cut_out)
+        if len(cut_outs) == n_cut_outs:
+            return cut_outs
+
+    raise ValueError("Could only place {} of {} cut-outs for layout '{}'.".format(len(cut_outs), n_cut_outs,
+                                                                                  layout_type))
+
+
+def run_partitioning_benchmark(layout_types=LAYOUT_TYPES, sizes=DEFAULT_SIZES, seeds=(0,), time_limit=300.0,
+                               partition_function=partition_rectangle_with_rectilinear_cutouts, plate_width=1.0,
+                               plate_length=1.0, memory_time_limit=10.0, verbose=True):
+    """
+    Runs the partitioning function on all combinations of layout types, sizes and seeds, and records the results.
+
+    The layouts are processed by increasing size. As soon as a single run of a layout type exceeds ``time_limit``, the
+    remaining (bigger) sizes of this layout type are skipped and recorded with status ``'skipped'``, since the runtime
+    of the brute-force algorithm grows quickly with the number of cut-outs. A running case is never interrupted.
+
+    :param tuple[str] layout_types: Layout types to benchmark.
+    :param tuple[int] sizes: Numbers of cut-outs to benchmark.
+    :param tuple[int] seeds: Seeds for the layout generation (one run per seed).
+    :param float time_limit: Runtime in seconds above which bigger layouts of the same type are skipped.
+    :param callable partition_function: Function to benchmark, with the signature of
+        :func:`partition_rectangle_with_rectilinear_cutouts`.
+    :param float plate_width: Width (x) of the plate.
+    :param float plate_length: Length (y) of the plate.
+    :param float memory_time_limit: Runtime in seconds above which the (slow) traced run for the peak memory is
+        omitted (``peak_memory_mb`` is ``None`` then). Use ``0`` to disable the memory measurement.
+    :param bool verbose: If ``True``, prints one line per run.
+
+    :return: One result dictionary per run (keys: ``layout``, ``n_cut_outs``, ``seed``, ``status``, ``runtime``,
+        ``peak_memory_mb``, ``n_partitions``, ``worst_aspect_ratio``, ``mean_aspect_ratio``, ``area_error``).
+    :rtype: list[dict]
+    """
+    results = []
+    for layout_type in layout_types:
+        skip = False
+        for n_cut_outs in sorted(sizes):
+            for seed in seeds:
+                result = {'layout': layout_type, 'n_cut_outs': n_cut_outs, 'seed': seed, 'status': 'skipped',
+                          'runtime': None, 'peak_memory_mb': None, 'n_partitions': None,
+                          'worst_aspect_ratio': None, 'mean_aspect_ratio': None, 'area_error': None}
+                if not skip:
+                    cut_outs = generate_cut_out_layout(layout_type, n_cut_outs, seed=seed, plate_width=plate_width,
+                                                       plate_length=plate_length)
+                    result.update(__run_single_case(partition_function, plate_width, plate_length, cut_outs,
+                                                    memory_time_limit))
+                    skip = result['runtime'] > time_limit
+                results.append(result)
+                if verbose:
+                    print(__format_result(result))
+    return results
+
+
+def save_benchmark_results(results, file_path, partition_function=partition_rectangle_with_rectilinear_cutouts):
+    """
+    Saves benchmark results together with some information on the environment to a .JSON file.
+
+    :param list[dict] results: Results as returned by :func:`run_partitioning_benchmark`.
+    :param str file_path: Path to the .JSON file.
+    :param callable partition_function: The benchmarked function (only its name is stored).
+    :return: None
+    """
+    data = {'meta': {'created': datetime.now().isoformat(),
+                     'partition_function': '{}.{}'.format(partition_function.__module__,
+                                                          partition_function.__name__),
+                     'python_version': platform.python_version(),
+                     'platform': platform.platform(),
+                     'processor': platform.processor()},
+            'results': results}
+
+    directory = os.path.dirname(file_path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    with open(file_path, 'w') as file:
+        json.dump(data, file, indent=2)
+
+
+def load_benchmark_results(file_path):
+    """
+    Loads benchmark results from a .JSON file written by :func:`save_benchmark_results`.
+
+    :param str file_path: Path to the .JSON file.
+    :return: The list of result dictionaries.
+    :rtype: list[dict]
+    """
+    with open(file_path, 'r') as file:
+        return json.load(file)['results']
+
+
+def compare_benchmark_results(baseline, results, runtime_tolerance=0.25, min_runtime=0.05):
+    """
+    Compares benchmark results against a baseline and reports regressions. A case regressed if it needs more
+    partitions, has a worse worst-case aspect ratio, or is slower by more than the relative ``runtime_tolerance``
+    (runs shorter than ``min_runtime`` seconds are too noisy and are not compared by runtime). Cases that ran in the
+    baseline but were skipped now are reported as well.
+
+    :param list[dict] baseline: Baseline results.
+    :param list[dict] results: New results.
+    :param float runtime_tolerance: Accepted relative runtime increase.
+    :param float min_runtime: Minimum baseline runtime in seconds for the runtime comparison.
+
+    :return: One human-readable message per regression (empty if there are no regressions).
+    :rtype: list[str]
+    """
+    baseline_by_case = dict(((r['layout'], r['n_cut_outs'], r['seed']), r) for r in baseline)
+    regressions = []
+
+    for result in results:
+        case = (result['layout'], result['n_cut_outs'], result['seed'])
+        reference = baseline_by_case.get(case)
+        if reference is None or reference['status'] != 'ok':
+            continue
+
+        name = "{} layout with {} cut-outs (seed {})".format(*case)
+        if result['status'] != 'ok':
+            regressions.append("{}: skipped, but finished in the baseline.".format(name))
+            continue
+        if result['n_partitions'] > reference['n_partitions']:
+            regressions.append("{}: {} partitions instead of {}.".format(name, result['n_partitions'],
+                                                                        reference['n_partitions']))
+        if result['worst_aspect_ratio'] > reference['worst_aspect_ratio'] * (1 + 1e-9):
+            regressions.append("{}: worst aspect ratio {:.2f} instead of {:.2f}.".format(
+                name, result['worst_aspect_ratio'], reference['worst_aspect_ratio']))
+        if (reference['runtime'] >= min_runtime and
+                result['runtime'] > reference['runtime'] * (1 + runtime_tolerance)):
+            regressions.append("{}: runtime {:.3f} s instead of {:.3f} s.".format(name, result['runtime'],
+                                                                                reference['runtime']))
+    return regressions
+
+
+def __run_single_case(partition_function, plate_width, plate_length, cut_outs, memory_time_limit):
+    """
+    (Helper) Runs the partitioning function and measures runtime, partition quality and (in a second, traced run)
+    peak memory.
+
+    :return: Partial result dictionary.
+    :rtype: dict
+    """
+    start_time = time.perf_counter()
+    cells = partition_function(plate_width, plate_length, cut_outs)
+    runtime = time.perf_counter() - start_time
+
+    peak_memory_mb = None
+    if runtime <= memory_time_limit:
+        tracemalloc.start()
+        partition_function(plate_width, plate_length, cut_outs)
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peak_memory_mb = peak_memory / 1024 ** 2
+
+    n_partitions, worst_aspect_ratio, mean_aspect_ratio = get_partition_quality(cells)
+
+    # the partitions and cut-outs must cover the whole plate
+    area = sum((c[2] - c[0]) * (c[3] - c[1]) for c in cells) + sum((c[2] - c[0]) * (c[3] - c[1]) for c in cut_outs)
+    area_error = abs(area - plate_width * plate_length) / (plate_width * plate_length)
+
+    return {'status': 'ok', 'runtime': runtime, 'peak_memory_mb': peak_memory_mb,
+            'n_partitions': n_partitions, 'worst_aspect_ratio': worst_aspect_ratio,
+            'mean_aspect_ratio': mean_aspect_ratio, 'area_error': area_error}
+
+
+def __format_result(result):
+    """
+    (Helper) Formats one result dictionary as a single line of text.
+    """
+    case = "{:<10s}{:>5d} cut-outs, seed {:<3d}".format(result['layout'], result['n_cut_outs'], result['seed'])
+    if result['status'] != 'ok':
+        return "{}  skipped".format(case)
+    memory = '     n/a' if result['peak_memory_mb'] is None else '{:8.1f}'.format(result['peak_memory_mb'])
+    return "{}  {:9.3f} s  {} MB  {:6d} partitions  worst AR {:8.2f}".format(
+        case, result['runtime'], memory, result['n_partitions'], result['worst_aspect_ratio'])
+
+
+def __random_candidates(rng, plate_width, plate_length, cut_out_size, max_attempts):
+    """
+    (Helper) Yields uniformly distributed candidate cut-outs (center x, center y, size).
+    """
+    for _ in range(max_attempts):
+        size = rng.uniform(0.5, 1.5) * cut_out_size
+        yield rng.uniform(0, plate_width), rng.uniform(0, plate_length), size
+
+
+def __clustered_candidates(rng, n_cut_outs, plate_width, plate_length, cut_out_size, max_attempts):
+    """
+    (Helper) Yields candidate cut-outs (center x, center y, size) that are normally distributed around a few cluster
+    centers.
+    """
+    n_clusters = max(1, int(round(math.sqrt(n_cut_outs) / 2)))
+    spread = max(2 * cut_out_size, 0.5 * math.sqrt(n_cut_outs / float(n_clusters)) * 2 * cut_out_size)
+    centers = [(rng.uniform(0.2, 0.8) * plate_width, rng.uniform(0.2, 0.8) * plate_length) for _ in range(n_clusters)]
+    for i in range(max_attempts):
+        center_x, center_y = centers[i % n_clusters]
+        size = rng.uniform(0.5, 1.5) * cut_out_size
+        yield rng.gauss(center_x, spread), rng.gauss(center_y, spread), size
+
+
+def __ring_candidates(n_cut_outs, plate_width, plate_length, cut_out_size):
+    """
+    (Helper) Yields candidate cut-outs (center x, center y, size) on concentric rings around the plate center. The
+    first ring resembles the phased arrays of the ``alu3a`` models (9 elements), further rings are added outwards with
+    a constant pitch until enough candidates are available.
+    """
+    pitch = 2.5 * cut_out_size
+    radius = 9 * pitch / (2 * math.pi)
+    n_placed = 0
+    while n_placed < n_cut_outs and radius < max(plate_width, plate_length):
+        n_on_ring = max(1, int(2 * math.pi * radius / pitch))
+        for k in range(n_on_ring):
+            phi = 2 * math.pi * k / n_on_ring
+            yield plate_width / 2 + radius * math.cos(phi), plate_length / 2 + radius * math.sin(phi), cut_out_size
+            n_placed += 1
+        radius += pitch
+
+
+def __fits_on_plate(cut_out, plate_width, plate_length):
+    """
+    (Helper) Checks if the cut-out lies completely inside the plate (without touching the plate border).
+    """
+    return cut_out[0] > 0 and cut_out[1] > 0 and cut_out[2] < plate_width and cut_out[3] < plate_length
+
+
+def __overlaps_any(cut_out, cut_outs):
+    """
+    (Helper) Checks if the cut-out overlaps or touches any of the given cut-outs.
+    """
+    for other in cut_outs:
+        if cut_out[0] <= other[2] and other[0] <= cut_out[2] and cut_out[1] <= other[3] and other[1] <= cut_out[3]:
+            return True
+    return False
@@ -0,0 +1,90 @@
+"""
+Helper functions for the parts of the point force model that do not depend on ABAQUS: the concentrated forces of the
+transducers, the grouping of the load cases into field output node sets and the size estimate of the field output.
+Shared by the ABAQUS/CAE build and the native .INP writer, so that both build the same loads, sets and output requests.
+"""
+from guwlib.functions_utility.console_output import log_warning
+
+# bytes per node and frame of the field output in the .ODB file (UT in single precision and the node label)
+FIELD_OUTPUT_BYTES_PER_NODE = 16
+
+# concentrated force (plate surface, force direction normal to the plate) for each transducer excitation mode
+CONCENTRATED_FORCE_DIRECTIONS = {'top': (('top', 1.0),),
+                                 'bottom': (('bottom', -1.0),),
+                                 'symmetric': (('top', 1.0), ('bottom', -1.0)),
+                                 'asymmetric': (('top', 1.0), ('bottom', 1.0))}
+
+
+def get_concentrated_forces(transducer):
+    """
+    Returns the node sets of a transducer that are loaded by a concentrated force and the direction of each force,
+    depending on whether the transducer is in top, bottom, symmetric or asymmetric excitation mode.
+
+    :param CircularTransducer transducer: Transducer to be excited.
+    :return: Name of the node set and force direction (+1 or -1, normal to the plate surface) of each force.
+    :rtype: list[tuple[str, float]]
+    """
+    set_names = {'top': transducer.on_plate_top_set_name, 'bottom': transducer.on_plate_bottom_set_name}
+    return [(set_names[surface], direction)
+            for surface, direction in CONCENTRATED_FORCE_DIRECTIONS[transducer.position_z]]
+
+
+def get_field_output_node_set_definitions(model):
+    """
+    Groups the load cases whose field output is restricted to a subset of the plate surface nodes (see
+    :class:`LoadCase`) by their restriction. Load cases with the same restriction share one node set, the sets are named
+    after the field output face set of the plate.
+
+    :param FEModel model: The FEModel instance.
+    :return: Name of the field output node set of each load case (None for all plate surface nodes), and the name,
+        node spacing and regions of each node set to be created, in order of creation.
+    :rtype: tuple[list[str], list[tuple[str, float, tuple]]]
+    """
+    set_names = []
+    set_definitions = []
+    created_sets = {}
+    for step in model.load_cases:
+        if step.output_request != 'field' or not step.has_reduced_field_output():
+            set_names.append(None)
+            continue
+        regions = tuple(tuple(region) for region in step.field_output_regions) \
+            if step.field_output_regions is not None else None
+        key = (step.field_output_node_spacing, regions)
+        if key not in created_sets:
+            set_name = '{}-{}'.format(model.plate.field_output_face_set_name, len(created_sets) + 1)
+            set_definitions.append((set_name, step.field_output_node_spacing, regions))
+            created_sets[key] = set_name
+        set_names.append(created_sets[key])
+    return set_names, set_definitions
+
+
+def get_field_output_size_estimate(num_nodes, duration, time_interval):
+    """
+    Estimates the size of the field output (``UT`` in single precision and the node label) in the .ODB file.
+
+    :param int num_nodes: Number of nodes with field output.
+    :param float duration: Duration of the step.
+    :param float time_interval: Time interval of the field output.
+    :return: Estimated size in bytes.
+    :rtype: int
+    """
+    num_frames = int(duration / time_interval) + 1
+    return num_frames * num_nodes * FIELD_OUTPUT_BYTES_PER_NODE
+
+
+def check_field_output_interval(step_name, time_interval, max_frequency):
+    """
+    Logs a warning if the field output interval of a load case is above the Nyquist limit of the maximum frequency of
+    the model, i.e. if the field output is aliased.
+
+    :param str step_name: Name of the load case.
+    :param float time_interval: Time interval of the field output.
+    :param float max_frequency: Maximum frequency of the model (see ``FEModel.max_frequency``).
+    :return: True if the field output interval is below the Nyquist limit.
+    :rtype: bool
+    """
+    if time_interval > 1.0 / (2.0 * max_frequency):
+        log_warning("The field output interval of load case {} is above the Nyquist limit of the maximum "
+                    "frequency, the field output is aliased.".format(step_name))
+        return False
+    return True
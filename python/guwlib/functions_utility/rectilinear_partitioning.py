@@ -18,11 +18,24 @@ depicted in (b). These cells can then be iteratively merged into bigger cells.::
 
 """
 import heapq
+import random
+import time
+import multiprocessing
 
+# weight of the aspect ratio penalty in the merge objective (deterministic variant)
+ASPECT_RATIO_WEIGHT = 0.1
 
-def partition_rectangle_with_rectilinear_cutouts(rectangle_width, rectangle_length, cut_outs):
+# settings of the randomized variant: number of best (distinct) merge steps to choose from, probability to deviate from
+# the best step in each iteration, and range from which the aspect ratio weight is drawn for each run
+RANDOMIZED_CANDIDATES = 3
+RANDOMIZED_DEVIATION_PROBABILITY = 0.1
+RANDOMIZED_ASPECT_RATIO_WEIGHT_RANGE = (0.02, 0.4)
+
+
+def partition_rectangle_with_rectilinear_cutouts(rectangle_width, rectangle_length, cut_outs, seed=None):
     """
-    Partitions a rectangle with cut-out rectangular regions into simple, pure rectilinear regions (deterministic).
+    Partitions a rectangle with cut-out rectangular regions into simple, pure rectilinear regions (deterministic,
+    unless a ``seed`` is provided).
 
     This is useful to create partitions in ABAQUS that can be meshed with structured meshes. Note that the
     implementation is rather brute-force and might take a while to compute if >20 cut-outs need to be considered.
@@ -31,11 +44,17 @@ def partition_rectangle_with_rectilinear_cutouts(rectangle_width, rectangle_leng
     :param float rectangle_length: Length (y) of the outer rectangle.
     :param list[list[float, float, float, float]] cut_outs: A list of the cut-outs, defined by their lower-left and
     upper-right diagonal corners ([left, bottom, right, top]).
+    :param int seed: If provided, a randomized variant of the greedy algorithm is used: the aspect ratio weight of the
+    merge objective is drawn at random, the best merge step is occasionally replaced by one of the next-best steps, and
+    ties are broken randomly. The result is reproducible for a given seed. If ``None`` (default), the algorithm is
+    deterministic.
 
     :return: A list of the created rectilinear partitions, defined by their lower-left and upper-right diagonal corners
     ([left, bottom, right, top]).
     :rtype: list[list[float, float, float, float]]
     """
+    rng = random.Random(seed) if seed is not None else None
+    aspect_ratio_weight = ASPECT_RATIO_WEIGHT if rng is None else rng.uniform(*RANDOMIZED_ASPECT_RATIO_WEIGHT_RANGE)
 
     # generate the primitive partition into elementary cells
     cells, n_cells_x, n_cells_y = __generate_cell_array(rectangle_width, rectangle_length, cut_outs)
@@ -49,7 +68,8 @@ def partition_rectangle_with_rectilinear_cutouts(rectangle_width, rectangle_leng
         all_possible_steps = []
         for cell_id in range(number_of_cells):
             if cells[cell_id][4]:
-                all_possible_steps.extend(__get_best_merge_options_for_given_cell(cell_id, cells, n_cells_x, n_cells_y, area_total))
+                all_possible_steps.extend(__get_best_merge_options_for_given_cell(cell_id, cells, n_cells_x, n_cells_y,
+                                                                                  area_total, aspect_ratio_weight))
 
         # column 7 of all_possible_steps contains the optimization objective (prioritize merging cells into big
         # partitions with good aspect ratio)
@@ -62,13 +82,175 @@ def partition_rectangle_with_rectilinear_cutouts(rectangle_width, rectangle_leng
                 unique_possible_steps.append(row)
 
         # merge cells by updating the cells list
-        __carry_out_step(unique_possible_steps[0], cells, n_cells_x)
+        if rng is None:
+            __carry_out_step(unique_possible_steps[0], cells, n_cells_x)
+        else:
+            __carry_out_step(__pick_randomized_step(unique_possible_steps, all_possible_steps, rng), cells, n_cells_x)
 
     # return the results, the merged cells (partitions) are at the end of the cells list
     cells = [cell[0:4] for cell in cells[number_of_cells:]]
     return cells
 
 
+def partition_rectangle_with_rectilinear_cutouts_multi_start(rectangle_width, rectangle_length, cut_outs,
+                                                             n_starts=16, time_budget=60.0, n_processes=None, seed=0):
+    """
+    Runs the partitioning algorithm several times and returns the best partitioning found, rated by
+    :func:`get_partition_quality` (fewest partitions first, then best aspect ratios).
+
+    The first run is always the deterministic one, so the result is never worse than the one of
+    :func:`partition_rectangle_with_rectilinear_cutouts`. The remaining ``n_starts - 1`` runs use randomized
+    tie-breaking (seeds ``seed + 1``, ``seed + 2``, ...) and are distributed on a ``multiprocessing`` pool. Runs that
+    have not finished when the wall-clock budget is exhausted are discarded.
+
+    :param float rectangle_width: Width (x) of the outer rectangle.
+    :param float rectangle_length: Length (y) of the outer rectangle.
+    :param list[list[float, float, float, float]] cut_outs: A list of the cut-outs, defined by their lower-left and
+    upper-right diagonal corners ([left, bottom, right, top]).
+    :param int n_starts: Total number of runs, including the deterministic one.
+    :param float time_budget: Wall-clock budget in seconds for all runs.
+    :param int n_processes: Number of worker processes (default: number of CPUs). If set to ``1``, the randomized runs
+    are carried out sequentially in the calling process, without a pool.
+    :param int seed: Base seed of the randomized runs.
+
+    :return: The best partitioning found, in the same format as returned by
+    :func:`partition_rectangle_with_rectilinear_cutouts`.
+    :rtype: list[list[float, float, float, float]]
+    """
+    start_time = time.time()
+    best_cells = partition_rectangle_with_rectilinear_cutouts(rectangle_width, rectangle_length, cut_outs)
+    best_quality = get_partition_quality(best_cells)
+
+    worker_args = [(rectangle_width, rectangle_length, cut_outs, seed + i) for i in range(1, n_starts)]
+    if not worker_args:
+        return best_cells
+
+    if n_processes == 1:
+        for args in worker_args:
+            if time.time() - start_time > time_budget:
+                break
+            cells = __partition_worker(args)
+            quality = get_partition_quality(cells)
+            if quality < best_quality:
+                best_cells, best_quality = cells, quality
+        return best_cells
+
+    pool = multiprocessing.Pool(processes=n_processes)
+    try:
+        results = pool.imap_unordered(__partition_worker, worker_args)
+        for _ in worker_args:
+            remaining_time = time_budget - (time.time() - start_time)
+            if remaining_time <= 0:
+                break
+            try:
+                cells = results.next(timeout=remaining_time)
+            except multiprocessing.TimeoutError:
+                break
+            quality = get_partition_quality(cells)
+            if quality < best_quality:
+                best_cells, best_quality = cells, quality
+    finally:
+        # discard all runs that are still pending
+        pool.terminate()
+        pool.join()
+
+    return best_cells
+
+
+def get_partition_quality(cells):
+    """
+    Rates a partitioning. The returned tuple can be compared directly, smaller is better: the number of partitions is
+    decisive, the worst and the mean aspect ratio of the partitions are used as tie-breakers.
+
+    :param list[list[float, float, float, float]] cells: The partitions, defined by their lower-left and upper-right
+    diagonal corners ([left, bottom, right, top]).
+
+    :return: Number of partitions, worst aspect ratio and mean aspect ratio.
+    :rtype: tuple[int, float, float]
+    """
+    if not cells:
+        return 0, 1.0, 1.0
+
+    aspect_ratios = []
+    for cell in cells:
+        w = cell[2] - cell[0]
+        h = cell[3] - cell[1]
+        short_side, long_side = (w, h) if w < h else (h, w)
+        aspect_ratios.append(long_side / short_side if short_side > 0 else float('inf'))
+
+    return len(cells), max(aspect_ratios), sum(aspect_ratios) / len(aspect_ratios)
+
+
+def get_partition_lines(rectangle_width, rectangle_length, cells):
+    """
+    Returns the straight lines that separate the given partitions from each other, i.e. the lines that have to be drawn
+    onto the rectangle to create all partitions at once. Lines on the border of the rectangle and on the border of the
+    cut-outs are omitted (they already exist), collinear segments that touch each other are merged into a single line.
+
+    :param float rectangle_width: Width (x) of the rectangle.
+    :param float rectangle_length: Length (y) of the rectangle.
+    :param list[list[float, float, float, float]] cells: The partitions, defined by their lower-left and upper-right
+    diagonal corners ([left, bottom, right, top]).
+
+    :return: The partition lines, defined by their start and end points ([x1, y1, x2, y2]).
+    :rtype: list[list[float, float, float, float]]
+    """
+    x_coordinates = sorted(set([0, rectangle_width] + [c[0] for c in cells] + [c[2] for c in cells]))
+    y_coordinates = sorted(set([0, rectangle_length] + [c[1] for c in cells] + [c[3] for c in cells]))
+    x_index = dict((x, i) for i, x in enumerate(x_coordinates))
+    y_index = dict((y, j) for j, y in enumerate(y_coordinates))
+    n_x = len(x_coordinates) - 1
+    n_y = len(y_coordinates) - 1
+
+    # map each elementary grid cell to the partition it belongs to (-1 for cut-outs)
+    owner = [[-1] * n_y for _ in range(n_x)]
+    for k, cell in enumerate(cells):
+        for i in range(x_index[cell[0]], x_index[cell[2]]):
+            for j in range(y_index[cell[1]], y_index[cell[3]]):
+                owner[i][j] = k
+
+    def separates_partitions(a, b):
+        return a != -1 and b != -1 and a != b
+
+    lines = []
+
+    # vertical lines, the grid cells (i-1, j) and (i, j) are left and right of the elementary segment
+    for i in range(1, n_x):
+        start = None
+        for j in range(n_y + 1):
+            is_segment = j < n_y and separates_partitions(owner[i - 1][j], owner[i][j])
+            if is_segment and start is None:
+                start = j
+            elif not is_segment and start is not None:
+                lines.append([x_coordinates[i], y_coordinates[start], x_coordinates[i], y_coordinates[j]])
+                start = None
+
+    # horizontal lines, the grid cells (i, j-1) and (i, j) are below and above the elementary segment
+    for j in range(1, n_y):
+        start = None
+        for i in range(n_x + 1):
+            is_segment = i < n_x and separates_partitions(owner[i][j - 1], owner[i][j])
+            if is_segment and start is None:
+                start = i
+            elif not is_segment and start is not None:
+                lines.append([x_coordinates[start], y_coordinates[j], x_coordinates[i], y_coordinates[j]])
+                start = None
+
+    return lines
+
+
+def __partition_worker(args):
+    """
+    (Helper) Runs one randomized partitioning in a worker process of the pool.
+
+    :param tuple args: Rectangle width, rectangle length, cut-outs and seed.
+    :return: The created rectilinear partitions.
+    :rtype: list[list[float, float, float, float]]
+    """
+    rectangle_width, rectangle_length, cut_outs, seed = args
+    return partition_rectangle_with_rectilinear_cutouts(rectangle_width, rectangle_length, cut_outs, seed=seed)
+
+
 def __generate_cell_array(rectangle_width, rectangle_length, cut_outs):
     """
     Returns a list of elementary rectangular cells that partition the plate with cutout rectangles into a grid of simple
@@ -172,7 +354,8 @@ def __get_possible_cell_expansions(cell_id, cells, n_cells_x, n_cells_y):
     return all_expand_data
 
 
-def __get_best_merge_options_for_given_cell(cell_id, cells, n_cells_x, n_cells_y, area_total):
+def __get_best_merge_options_for_given_cell(cell_id, cells, n_cells_x, n_cells_y, area_total,
+                                            aspect_ratio_weight=ASPECT_RATIO_WEIGHT):
     """
     For a given cell and the list of all cells, this function computes all possible combinations the given cell could
     be expanded in vertical and horizontal direction by merging with its neighbour cells. The combinations are rated
@@ -183,6 +366,7 @@ def __get_best_merge_options_for_given_cell(cell_id, cells, n_cells_x, n_cells_y
     :param int n_cells_x: Number of grid elementary cells in horizontal direction.
     :param int n_cells_y: Number of grid elementary cells in vertical direction.
     :param float area_total: Total outer rectangle area.
+    :param float aspect_ratio_weight: Weight of the aspect ratio penalty in the objective.
     :return: The 5 top options to merge the cell with its neighbours, defined by [cell_id, x_min, x_max,
     y_min, y_max, area, aspect_ratio, objective], where x and y min and max define the dimensions of the merged cell.
     :rtype: list[list[int, int, int, int, int, float, float, float]]
@@ -206,7 +390,7 @@ def __get_best_merge_options_for_given_cell(cell_id, cells, n_cells_x, n_cells_y
                     area = w * h
                     short_side, long_side = (w, h) if w < h else (h, w)
                     aspect_ratio = long_side / short_side
-                    objective = 1 - (1 / (0.1 * (aspect_ratio - 1) + 1)) * area / area_total
+                    objective = 1 - (1 / (aspect_ratio_weight * (aspect_ratio - 1) + 1)) * area / area_total
                     possible_steps_list.append([cell_id, this_x_min, this_x_max, -this_y_min, this_y_max, area,
                                                 aspect_ratio, objective])
 
@@ -214,6 +398,28 @@ def __get_best_merge_options_for_given_cell(cell_id, cells, n_cells_x, n_cells_y
     return top_entries
 
 
+def __pick_randomized_step(unique_possible_steps, all_possible_steps, rng):
+    """
+    Picks one of the best ``RANDOMIZED_CANDIDATES`` merge steps at random. With a probability of
+    ``RANDOMIZED_DEVIATION_PROBABILITY``, the next-best step is picked instead of the best one (repeatedly). If several
+    steps share the picked objective value, one of them is chosen at random (random tie-breaking).
+
+    :param list unique_possible_steps: Merge steps with distinct objective values, sorted by objective.
+    :param list all_possible_steps: All merge steps, sorted by objective.
+    :param random.Random rng: Random number generator.
+    :return: The picked merge step.
+    :rtype: list
+    """
+    n_candidates = min(RANDOMIZED_CANDIDATES, len(unique_possible_steps))
+    rank = 0
+    while rank < n_candidates - 1 and rng.random() < RANDOMIZED_DEVIATION_PROBABILITY:
+        rank += 1
+
+    objective = unique_possible_steps[rank][7]
+    tied_steps = [row for row in all_possible_steps if row[7] == objective]
+    return tied_steps[rng.randrange(len(tied_steps))]
+
+
 def __carry_out_step(step_definition, cells, n_cells_x):
     """
     Executes a step definition, i.e. merging the given cell with its neighbouring cells by deactivating all primary
@@ -0,0 +1,124 @@
+"""
+Helper functions to map a three-dimensional FEModel (plate, transducers, load cases) to a two-dimensional model for the
+``'axisymmetric'`` and ``'plane_strain'`` model approaches:
+
+- axisymmetric: the (single) transmitter lies on the axis of symmetry, the receivers are placed at their distance from
+  the transmitter. The radius of the model is the distance from the transmitter to the farthest plate corner.
+- plane strain: the model is a cross-section through the transmitter and one receiver, extending over the whole plate
+  along that line. All transducers within their radius of the line are placed at their projection onto the line.
+
+The direction of each transducer, seen from the transmitter, is stored in a mapping file next to the .INP file, so that
+the history export can map the two-dimensional displacements back to the x-, y- and z-displacements of the 3D model.
+"""
+import json
+import math
+
+REDUCED_DIMENSION_MAPPING_FILE_SUFFIX = '_2d_mapping.json'
+
+
+def get_transmitter_index(load_cases):
+    """
+    Finds the transmitter of a model with reduced dimension, i.e. the only transducer that is excited in the load cases.
+
+    :param list[LoadCase] load_cases: Load cases of the model.
+    :return: Index of the transmitter in the transducer list.
+    :rtype: int
+    :raises ValueError: If not exactly one transducer is excited in all load cases.
+    """
+    excited_indices = set()
+    for load_case in load_cases:
+        excited_indices.update(i for i, signal in enumerate(load_case.transducer_signals) if signal is not None)
+    if len(excited_indices) != 1:
+        raise ValueError("Models with reduced dimension need exactly one excited transducer in all load cases, "
+                         "found {}.".format(len(excited_indices)))
+    return excited_indices.pop()
+
+
+def get_axisymmetric_section(plate, transducers, transmitter_index):
+    """
+    Computes the radius of an axisymmetric model with the transmitter on its axis and the radial positions of all
+    transducers.
+
+    :param IsotropicRectangularPlate plate: Plate of the 3D model.
+    :param list[Transducer] transducers: Transducers of the 3D model.
+    :param int transmitter_index: Index of the transmitter in the transducer list.
+    :return: Radius of the model, and a list with the radial position and the direction (angle in rad, seen from the
+        transmitter) of each transducer.
+    :rtype: tuple[float, list[tuple[float, float]]]
+    """
+    transmitter = transducers[transmitter_index]
+    corners = [(0, 0), (plate.width, 0), (0, plate.length), (plate.width, plate.length)]
+    radius = max(math.hypot(x - transmitter.position_x, y - transmitter.position_y) for x, y in corners)
+
+    positions = []
+    for transducer in transducers:
+        dx = transducer.position_x - transmitter.position_x
+        dy = transducer.position_y - transmitter.position_y
+        positions.append((math.hypot(dx, dy), math.atan2(dy, dx)))
+    return radius, positions
+
+
+def get_plane_strain_section(plate, transducers, transmitter_index, receiver_index=None):
+    """
+    Computes the length of a plane-strain cross-section through the transmitter and a receiver, and the positions of
+    all transducers along the section. The section starts and ends at the plate edges. Transducers that are farther
+    from the line than their radius are not part of the section.
+
+    :param IsotropicRectangularPlate plate: Plate of the 3D model.
+    :param list[Transducer] transducers: Transducers of the 3D model.
+    :param int transmitter_index: Index of the transmitter in the transducer list.
+    :param int receiver_index: Index of the receiver that defines the section. If None, the first transducer other
+        than the transmitter is used.
+    :return: Length of the section, the direction of the section (angle in rad), and a list with the position along the
+        section of each transducer (None if the transducer is not part of the section).
+    :rtype: tuple[float, float, list[float]]
+    :raises ValueError: If no receiver is available or if the receiver coincides with the transmitter.
+    """
+    if receiver_index is None:
+        receiver_indices = [i for i in range(len(transducers)) if i != transmitter_index]
+        if not receiver_indices:
+            raise ValueError("The plane strain model approach needs at least one receiver.")
+        receiver_index = receiver_indices[0]
+
+    transmitter = transducers[transmitter_index]
+    receiver = transducers[receiver_index]
+    dx = receiver.position_x - transmitter.position_x
+    dy = receiver.position_y - transmitter.position_y
+    distance = math.hypot(dx, dy)
+    if distance == 0:
+        raise ValueError("Transmitter and receiver of the plane strain section coincide.")
+    direction_x, direction_y = dx / distance, dy / distance
+
+    # clip the line through the transmitter to the plate (parameter t along the line, t = 0 at the transmitter)
+    t_min, t_max = -float('inf'), float('inf')
+    for origin, direction, size in [(transmitter.position_x, direction_x, plate.width),
+                                    (transmitter.position_y, direction_y, plate.length)]:
+        if direction != 0:
+            t_1, t_2 = (0 - origin) / direction, (size - origin) / direction
+            t_min, t_max = max(t_min, min(t_1, t_2)), min(t_max, max(t_1, t_2))
+
+    positions = []
+    for transducer in transducers:
+        px = transducer.position_x - transmitter.position_x
+        py = transducer.position_y - transmitter.position_y
+        distance_to_line = abs(px * direction_y - py * direction_x)
+        positions.append(px * direction_x + py * direction_y - t_min if distance_to_line <= transducer.radius
+                         else None)
+    return t_max - t_min, math.atan2(direction_y, direction_x), positions
+
+
+def write_reduced_dimension_mapping(file_path, model_approach, node_set_directions):
+    """
+    Writes the mapping file of a model with reduced dimension, which is used by the history export to map the 2D
+    displacements (U1: radial / along the section, U2: through-thickness) to the x-, y- and z-displacements of the 3D
+    model.
+
+    :param str file_path: Path to the mapping file (.JSON).
+    :param str model_approach: Model approach, ``'axisymmetric'`` or ``'plane_strain'``.
+    :param dict node_set_directions: Direction (angle in rad, seen from the transmitter) by ABAQUS node set name.
+    """
+    mapping = {'model_approach': model_approach,
+               'node_sets': dict((name.upper(), [math.cos(angle), math.sin(angle)])
+                                 for name, angle in node_set_directions.items())}
+    with open(file_path, 'w') as file:
+        json.dump(mapping, file, indent=2)
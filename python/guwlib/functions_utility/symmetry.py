@@ -0,0 +1,453 @@
+"""
+Helper functions for symmetry-reduced (half and quarter) models.
+
+A model is mirror-symmetric with respect to the plane ``x = plate.width / 2`` (plane ``'x'``) or
+``y = plate.length / 2`` (plane ``'y'``), if every defect and transducer is mapped onto an equal defect or transducer by
+the mirroring. Only the part of the plate with ``x <= width / 2`` and ``y <= length / 2`` is modelled then. Loads are
+decomposed into symmetric and antisymmetric components with respect to each plane, and each component that is not zero
+is solved as a separate load case of the reduced model with symmetric (``XSYMM`` / ``YSYMM``) or antisymmetric
+(``XASYMM`` / ``YASYMM``) boundary conditions on the symmetry planes. Since the model is linear, the response of the
+full model is the superposition of the (mirrored) responses of the components. Loads that are symmetric already (e.g. a
+transducer on the symmetry plane) only need one component, so a half model costs half and a quarter model a quarter of
+the full model. Components that are equal (or opposite) for different load cases, e.g. for the excitation of mirrored
+transducers, are only solved once.
+
+The build writes a mapping file (``<model_name>_symmetry.json``) to the output directory, which is used by
+:func:`mirror_symmetry_reduced_history` to assemble the history output of the full transducer set from the history
+output (.NPZ) of the components.
+"""
+from __future__ import print_function
+
+import copy
+import itertools
+import json
+import math
+import os
+
+import numpy as np
+
+from guwlib.functions_utility.console_output import log_warning
+from guwlib.guw_objects.defects import Crack, Hole
+
+SYMMETRY_MAPPING_FILE_SUFFIX = '_symmetry.json'
+SYMMETRY_PLANES = ('x', 'y')
+
+
+class SymmetryReduction(object):
+    """
+    Symmetry reduction of a model: the symmetry planes, the retained defects and transducers, and the load cases of the
+    reduced model (one per distinct non-zero symmetry component of the original load cases).
+    """
+
+    def __init__(self, planes, defects, transducers, load_cases, components, superpositions):
+        """
+        :param list[str] planes: Symmetry planes (``'x'`` and / or ``'y'``).
+        :param list[Defect] defects: Defects of the reduced model.
+        :param list[Transducer] transducers: Transducers of the reduced model.
+        :param list[LoadCase] load_cases: Load cases of the reduced model.
+        :param list[dict] components: For each load case of the reduced model, the symmetry component (``+1``:
+            symmetric, ``-1``: antisymmetric, by plane).
+        :param list[list[tuple[int, float]]] superpositions: For each original load case, the indices of the load cases
+            of the reduced model and the factors to superpose them with.
+
+        :ivar list[str] planes: Symmetry planes.
+        :ivar list[Defect] defects: Defects of the reduced model.
+        :ivar list[Transducer] transducers: Transducers of the reduced model.
+        :ivar list[LoadCase] load_cases: Load cases of the reduced model.
+        :ivar list[dict] components: Symmetry component of each load case of the reduced model.
+        :ivar list[list[tuple[int, float]]] superpositions: Load cases of the reduced model and factors by original
+            load case.
+        """
+        self.planes = planes
+        self.defects = defects
+        self.transducers = transducers
+        self.load_cases = load_cases
+        self.components = components
+        self.superpositions = superpositions
+
+
+def get_symmetry_reduction(plate, defects, transducers, load_cases):
+    """
+    Finds the largest symmetry reduction of a model: both symmetry planes (quarter model) if possible, otherwise one
+    plane (half model). A plane is only used if the geometry is symmetric with respect to it, and if the loads of all
+    load cases can be decomposed into symmetry components (at most one signal per group of mirrored transducers).
+
+    The identifiers of the defects and transducers have to be set beforehand.
+
+    :param IsotropicRectangularPlate plate: Plate of the model.
+    :param list[Defect] defects: Defects of the model.
+    :param list[Transducer] transducers: Transducers of the model.
+    :param list[LoadCase] load_cases: Load cases of the model.
+    :return: The symmetry reduction, or None if the model is not symmetric.
+    :rtype: SymmetryReduction
+    """
+    candidate_planes = [plane for plane in SYMMETRY_PLANES
+                        if is_geometry_symmetric(plate, defects, transducers, plane)]
+    candidate_plane_sets = [candidate_planes] + [[plane] for plane in candidate_planes] if len(candidate_planes) > 1 \
+        else [[plane] for plane in candidate_planes]
+
+    for planes in candidate_plane_sets:
+        try:
+            return __reduce_model(plate, defects, transducers, load_cases, planes)
+        except ValueError as e:
+            log_warning("No symmetry reduction at the {} plane(s): {}".format(' and '.join(planes), e))
+    return None
+
+
+def is_geometry_symmetric(plate, defects, transducers, plane):
+    """
+    Checks whether the defects and transducers of a model are mirror-symmetric with respect to a plane.
+
+    :param IsotropicRectangularPlate plate: Plate of the model.
+    :param list[Defect] defects: Defects of the model.
+    :param list[Transducer] transducers: Transducers of the model.
+    :param str plane: Symmetry plane, ``'x'`` or ``'y'``.
+    :rtype: bool
+    """
+    tolerance = __get_tolerance(plate)
+    for item in list(defects) + list(transducers):
+        if __get_mirror_index(plate, list(defects) + list(transducers), item, [plane]) is None:
+            return False
+        # cracks must not cross the symmetry plane
+        if isinstance(item, Crack):
+            distance = abs(item.position_x - plate.width / 2) if plane == 'x' else \
+                abs(item.position_y - plate.length / 2)
+            if distance < item.length * item.bounding_box_scale / 2 + tolerance:
+                return False
+    return True
+
+
+def mirror_position(plate, x, y, planes):
+    """
+    Mirrors a position with respect to the symmetry planes.
+
+    :param IsotropicRectangularPlate plate: Plate of the model.
+    :param float x: x-position.
+    :param float y: y-position.
+    :param list[str] planes: Symmetry planes to mirror at.
+    :return: The mirrored position.
+    :rtype: tuple[float, float]
+    """
+    if 'x' in planes:
+        x = plate.width - x
+    if 'y' in planes:
+        y = plate.length - y
+    return x, y
+
+
+def is_in_reduced_region(plate, x, y, planes):
+    """
+    Checks whether a position lies in the modelled part of a symmetry-reduced plate (including the symmetry planes).
+
+    :param IsotropicRectangularPlate plate: Plate of the model.
+    :param float x: x-position.
+    :param float y: y-position.
+    :param list[str] planes: Symmetry planes.
+    :rtype: bool
+    """
+    tolerance = __get_tolerance(plate)
+    return (('x' not in planes or x <= plate.width / 2 + tolerance) and
+            ('y' not in planes or y <= plate.length / 2 + tolerance))
+
+
+def get_component_label(component):
+    """
+    :param dict component: Symmetry component (``+1``: symmetric, ``-1``: antisymmetric, by plane).
+    :return: A label for the component, e.g. ``'sym_x_asym_y'``.
+    :rtype: str
+    """
+    return '_'.join('{}_{}'.format('sym' if component[plane] > 0 else 'asym', plane) for plane in sorted(component))
+
+
+def write_symmetry_mapping(file_path, model_name, plate, reduction, all_transducers, original_load_cases):
+    """
+    Writes the mapping file of a symmetry-reduced model, which is used by :func:`mirror_symmetry_reduced_history`.
+    For each transducer of the full model, the mapping contains the transducer of the reduced model and the planes at
+    which it is mirrored onto it.
+
+    :param str file_path: Path to the mapping file (.JSON).
+    :param str model_name: Name of the model.
+    :param IsotropicRectangularPlate plate: Plate of the model.
+    :param SymmetryReduction reduction: The symmetry reduction.
+    :param list[Transducer] all_transducers: All transducers of the full model (with identifiers).
+    :param list[LoadCase] original_load_cases: Load cases of the full model.
+    """
+    transducer_sources = {}
+    for transducer in all_transducers:
+        for mirror_planes in __get_group(reduction.planes):
+            source_index = __get_mirror_index(plate, reduction.transducers, transducer, mirror_planes)
+            if source_index is not None:
+                transducer_sources[transducer.name] = {'source': reduction.transducers[source_index].name,
+                                                       'mirror_planes': mirror_planes}
+                break
+
+    load_cases = []
+    for i, load_case in enumerate(original_load_cases):
+        components = [{'step_name': 'lc_{}_{}'.format(j, reduction.load_cases[j].name),
+                       'component': reduction.components[j], 'factor': factor}
+                      for j, factor in reduction.superpositions[i]]
+        load_cases.append({'step_name': 'lc_{}_{}'.format(i, load_case.name), 'components': components})
+
+    mapping = {'model_name': model_name,
+               'planes': reduction.planes,
+               'transducers': transducer_sources,
+               'load_cases': load_cases}
+    with open(file_path, 'w') as file:
+        json.dump(mapping, file, indent=2)
+
+
+def mirror_symmetry_reduced_history(directories_to_scan=('results', ), verbose=True):
+    """
+    Assembles the history output of the full transducer set of symmetry-reduced models from the history output of
+    their symmetry components. For each original load case, an .NPZ file in the same layout as for a full model
+    (``lc_<i>_<name>/<model_name>_lc_<i>_<name>_history.npz``) is written to the output directory of the model. Load
+    cases whose components are not (all) exported yet are skipped.
+
+    :param tuple[str] directories_to_scan: Directories (including subdirectories) to scan for mapping files.
+    :param bool verbose: If True, prints the paths of the written files.
+    :return: Paths to the written .NPZ files.
+    :rtype: list[str]
+    :raises ValueError: If the history output of a transducer is missing in (some of) the exported components.
+    """
+    written_files = []
+    for directory_to_scan in directories_to_scan:
+        for root, dirs, files in os.walk(directory_to_scan):
+            for file_name in files:
+                if file_name.endswith(SYMMETRY_MAPPING_FILE_SUFFIX):
+                    written_files.extend(__mirror_model_history(root, os.path.join(root, file_name), verbose))
+    return written_files
+
+
+def __mirror_model_history(output_directory, mapping_file_path, verbose):
+    """
+    (Helper) Assembles the history output of all load cases of one symmetry-reduced model.
+    """
+    with open(mapping_file_path, 'r') as file:
+        mapping = json.load(file)
+    model_name = mapping['model_name']
+
+    written_files = []
+    for load_case in mapping['load_cases']:
+        component_data = []
+        for component in load_case['components']:
+            npz_file_path = os.path.join(output_directory, component['step_name'], '{}_{}_history.npz'.format(
+                model_name, component['step_name']))
+            if not os.path.exists(npz_file_path):
+                break
+            with np.load(npz_file_path) as npz:
+                component_data.append((component['component'], component['factor'], dict(npz)))
+        if not component_data or len(component_data) < len(load_case['components']):
+            if verbose:
+                print("Skipped {}, not all symmetry components are exported yet.".format(load_case['step_name']))
+            continue
+
+        output_data = {}
+        time = component_data[0][2][list(component_data[0][2].keys())[0]][0, :]
+        for name, transducer in mapping['transducers'].items():
+            num_exported_sides = 0
+            for side in ('TOP', 'BOTTOM'):
+                source_key = '{}_{}'.format(transducer['source'], side).upper()
+                # a surface without history output (see LoadCase.history_output_all_surfaces) is missing in all
+                # components, like in the full model
+                exported = [source_key in data for _, _, data in component_data]
+                if not any(exported):
+                    continue
+                if not all(exported):
+                    raise ValueError("The history output {} of transducer {} (mirrored to {}) is missing in some "
+                                     "symmetry components of load case {}.".format(source_key, transducer['source'],
+                                                                                  name, load_case['step_name']))
+                displacements = np.zeros((3, len(time)))
+                for component, factor, data in component_data:
+                    character = np.prod([component[plane] for plane in transducer['mirror_planes']])
+                    source = np.array([np.interp(time, data[source_key][0, :], data[source_key][i, :])
+                                       for i in (1, 2, 3)])
+                    # mirroring flips the displacement normal to the symmetry plane
+                    for plane in transducer['mirror_planes']:
+                        source[0 if plane == 'x' else 1, :] *= -1
+                    displacements += factor * character * source
+                output_data['{}_{}'.format(name, side).upper()] = np.vstack([time, displacements])
+                num_exported_sides += 1
+            if num_exported_sides == 0:
+                raise ValueError("No history output of transducer {} (mirrored to {}) in the symmetry components of "
+                                 "load case {}.".format(transducer['source'], name, load_case['step_name']))
+
+        load_case_directory = os.path.join(output_directory, load_case['step_name'])
+        if not os.path.exists(load_case_directory):
+            os.makedirs(load_case_directory)
+        npz_file_path = os.path.join(load_case_directory, '{}_{}_history.npz'.format(model_name,
+                                                                                     load_case['step_name']))
+        np.savez_compressed(npz_file_path, **output_data)
+        written_files.append(npz_file_path)
+        if verbose:
+            print("Mirrored the history output of {} symmetry component(s) to {}.".format(len(component_data),
+                                                                                       npz_file_path))
+    return written_files
+
+
+def __reduce_model(plate, defects, transducers, load_cases, planes):
+    """
+    (Helper) Builds the symmetry reduction of a model for a set of symmetry planes.
+
+    :raises ValueError: If a load case can't be decomposed into symmetry components.
+    """
+    group = __get_group(planes)
+    retained_defects = [defect for defect in defects
+                        if is_in_reduced_region(plate, defect.position_x, defect.position_y, planes)]
+    retained_indices = [i for i, transducer in enumerate(transducers)
+                        if is_in_reduced_region(plate, transducer.position_x, transducer.position_y, planes)]
+
+    # mirror images of the retained transducers for each group element
+    images = {}
+    for i in retained_indices:
+        images[i] = [__get_mirror_index(plate, transducers, transducers[i], mirror_planes)
+                     for mirror_planes in group]
+
+    reduced_load_cases = []
+    components = []
+    superpositions = []
+    for load_case in load_cases:
+        superposition = []
+        for characters in itertools.product((1, -1), repeat=len(planes)):
+            component = dict(zip(planes, characters))
+            signals = []
+            for i in retained_indices:
+                # projection of the load onto the component, f_c(r) = 1/|G| sum_g c(g) f(g r), scaled by the share
+                # |orbit(r)| / |G| of the load that acts on the reduced model
+                orbit_size = len(set(images[i]))
+                contributions = []
+                for mirror_planes, image in zip(group, images[i]):
+                    signal = load_case.transducer_signals[image]
+                    if signal is not None:
+                        character = 1
+                        for plane in mirror_planes:
+                            character *= component[plane]
+                        contributions.append((signal, character * orbit_size / float(len(group) ** 2)))
+                signals.append(__combine_contributions(contributions))
+
+            if all(signal is None for signal in signals):
+                continue
+
+            # reuse an equal (or opposite) component of a previous load case
+            for j, (reduced_load_case, other_component) in enumerate(zip(reduced_load_cases, components)):
+                if other_component == component and __have_same_output(reduced_load_case, load_case):
+                    ratio = __get_load_ratio(signals, reduced_load_case.transducer_signals)
+                    if ratio is not None:
+                        superposition.append((j, ratio))
+                        break
+            else:
+                reduced_load_case = copy.copy(load_case)
+                reduced_load_case.name = '{}_{}'.format(load_case.name, get_component_label(component))
+                reduced_load_case.transducer_signals = signals
+                reduced_load_cases.append(reduced_load_case)
+                components.append(component)
+                superposition.append((len(reduced_load_cases) - 1, 1.0))
+        superpositions.append(superposition)
+
+    return SymmetryReduction(planes=list(planes), defects=retained_defects,
+                             transducers=[transducers[i] for i in retained_indices],
+                             load_cases=reduced_load_cases, components=components, superpositions=superpositions)
+
+
+def __combine_contributions(contributions):
+    """
+    (Helper) Combines the contributions (signal, factor) of mirrored transducers to the load of a retained transducer
+    into one scaled signal. Signals are equal if they have the same class and attributes (except the magnitude), so
+    that separately constructed signals (e.g. ``Burst(...)`` for each transducer) can be combined.
+
+    :return: The scaled signal, or None if there is no load.
+    :raises ValueError: If different signals contribute to the load.
+    """
+    if not contributions:
+        return None
+    signal = contributions[0][0]
+    if any(not __have_same_shape(signal, other) for other, _ in contributions):
+        raise ValueError("Different signals on mirrored transducers can't be decomposed into symmetry components.")
+    magnitude = sum(other.magnitude * factor for other, factor in contributions)
+    if abs(magnitude) < 1e-12 * max(abs(other.magnitude) for other, _ in contributions):
+        return None
+    scaled_signal = copy.copy(signal)
+    scaled_signal.magnitude = magnitude
+    return scaled_signal
+
+
+def __have_same_shape(signal, other):
+    """
+    (Helper) Compares the class and the attributes (except the magnitude) of two signals.
+    """
+    attributes = dict((key, value) for key, value in vars(signal).items() if key != 'magnitude')
+    other_attributes = dict((key, value) for key, value in vars(other).items() if key != 'magnitude')
+    return type(signal) is type(other) and attributes == other_attributes
+
+
+def __have_same_output(load_case, other):
+    """
+    (Helper) Compares the duration and output settings of two load cases.
+    """
+    return all(getattr(load_case, name) == getattr(other, name)
+               for name in ('duration', 'output_request', 'field_output_interval', 'field_output_oversampling',
+                            'field_output_node_spacing', 'field_output_regions', 'history_output_interval',
+                            'history_output_variables', 'history_output_all_surfaces'))
+
+
+def __get_load_ratio(signals, other_signals):
+    """
+    (Helper) Compares the loads of two load cases of the reduced model.
+
+    :return: The ratio (``1.0`` or ``-1.0``) of the loads if they are equal or opposite, otherwise None.
+    """
+    ratio = None
+    for signal, other in zip(signals, other_signals):
+        if signal is None or other is None:
+            if signal is not other:
+                return None
+            continue
+        if not __have_same_shape(signal, other) or other.magnitude == 0:
+            return None
+        signal_ratio = signal.magnitude / float(other.magnitude)
+        if abs(abs(signal_ratio) - 1) > 1e-9 or (ratio is not None and abs(signal_ratio - ratio) > 1e-9):
+            return None
+        ratio = 1.0 if signal_ratio > 0 else -1.0
+    return ratio
+
+
+def __get_group(planes):
+    """
+    (Helper) Returns the symmetry group of a set of planes, as a list of the planes to mirror at for each element.
+    """
+    return [list(mirror_planes) for n in range(len(planes) + 1) for mirror_planes in itertools.combinations(planes, n)]
+
+
+def __get_mirror_index(plate, items, item, planes):
+    """
+    (Helper) Returns the index of the item in the list that is the mirror image of an item, or None.
+    """
+    tolerance = __get_tolerance(plate)
+    x, y = mirror_position(plate, item.position_x, item.position_y, planes)
+    for i, other in enumerate(items):
+        if (type(other) is type(item) and abs(other.position_x - x) < tolerance and
+                abs(other.position_y - y) < tolerance and __are_mirror_images(item, other, planes)):
+            return i
+    return None
+
+
+def __are_mirror_images(item, other, planes):
+    """
+    (Helper) Compares the size and orientation of two defects or transducers of the same type.
+    """
+    if isinstance(item, Hole):
+        return abs(item.radius - other.radius) < 1e-12
+    if isinstance(item, Crack):
+        angle = item.angle
+        for plane in planes:
+            angle = math.pi - angle if plane == 'x' else -angle
+        return abs(item.length - other.length) < 1e-12 and abs(math.sin(angle - other.angle)) < 1e-9
+    # transducers
+    return (abs(item.radius - other.radius) < 1e-12 and item.position_z == other.position_z and
+            item.bounding_box_scale == other.bounding_box_scale)
+
+
+def __get_tolerance(plate):
+    """
+    (Helper) Returns the geometric tolerance for the symmetry checks.
+    """
+    return 1e-6 * max(plate.width, plate.length)
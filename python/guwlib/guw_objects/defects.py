@@ -44,9 +44,12 @@ class Hole(Defect):
         :param float diameter: Diameter of the hole.
 
         :ivar float radius: Radius of the hole.
+        :ivar float bounding_box_scale: Half edge length of the rectangular partition around the hole, relative to
+            the hole radius (default: 2.5).
         """
         super(Hole, self).__init__(position_x, position_y)
         self.radius = diameter / 2
+        self.bounding_box_scale = 2.5
 
 
 class Crack(Defect):
@@ -64,10 +67,13 @@ class Crack(Defect):
         :ivar float length: Length of the crack.
         :ivar float angle: Rotation angle of the crack, in radians (counterclockwise rotation).
         :ivar str seam_face_set_name: Name for the ABAQUS face set containing the crack edge faces.
+        :ivar float bounding_box_scale: Half edge length of the rectangular partition around the crack, relative to
+            half the crack length (default: 1.5).
         """
         super(Crack, self).__init__(position_x, position_y)
         self.length = length
         self.angle = angle_degrees * math.pi / 180.0
+        self.bounding_box_scale = 1.5
         self.seam_face_set_name = None
 
     def set_identifiers(self, unique_id):
@@ -4,6 +4,15 @@ import os
 import shutil
 from datetime import datetime
 
+from guwlib.functions_utility.build_cache import BuildManifest, get_model_fingerprint
+from guwlib.functions_utility.build_checkpoint import BuildCheckpoint
+from guwlib.functions_utility.console_output import log_info
+from guwlib.functions_utility.geometry_validation import check_model_geometry
+from guwlib.guw_objects.defects import Crack
+
+# samples per period of the highest excitation frequency for automatic history output intervals (5 x Nyquist rate)
+HISTORY_OUTPUT_SAMPLES_PER_PERIOD = 10
+
 
 class FEModel:
     """
@@ -17,8 +26,15 @@ class FEModel:
     model up in ABAQUS/CAE, call its :meth:`setup_in_abaqus` method. See ``models/examples/`` for reference.
     """
 
-    def __init__(self):
+    def __init__(self, model_name=None, model_file_path=None):
         """
+        :param str model_name: Name of the model, its output directory is ``results/<model_name>``. If None, the model
+            is named after the python file that instantiates it, e.g. to create many named variants from one script
+            (see ``guwlib.functions_utility.model_spec``) (default: None).
+        :param str model_file_path: Path to the file that defines the model, which is copied to the output directory.
+            If None and ``model_name`` is None, the python file that instantiates the model. If None and
+            ``model_name`` is set, no file is copied (default: None).
+
         :ivar Plate plate: Plate of the FE model.
         :ivar list[Transducer] transducers: A list with the transducers applied to the plate.
         :ivar list[Defect] defects: A list with the defects (cracks, holes, ...) of the plate.
@@ -33,7 +49,59 @@ class FEModel:
         :ivar float courant_number: Used for the computation of the maximum time increment of the explicit solver,
             according to CFL condition (default: 0.5).
         :ivar str model_approach: Specifies which script to use to build the FE model in ABAQUS/CAE, either
-            ``'point_force'`` or ``'piezo_electric'`` (default: ``'point_force'``).
+            ``'point_force'``, ``'pin_force'``, ``'continuum_shell'``, ``'shell'``, ``'axisymmetric'``,
+            ``'plane_strain'`` or ``'piezo_electric'`` (default: ``'point_force'``). ``'pin_force'`` applies radial
+            forces along the circumference of each transducer instead of a single point force, which captures the
+            frequency-dependent directivity and mode tuning of the transducer size at nearly the same cost.
+            ``'continuum_shell'`` and ``'shell'`` build the same point-force model as ``'point_force'``, but mesh the
+            plate with a single layer of continuum shell elements (SC8R) or with conventional shell elements (S4R) on
+            the mid-surface instead of ``elements_in_thickness_direction`` layers of solid elements (C3D8R). They are
+            only accepted if the shell approximation is valid according to the dispersion data of the plate material.
+            ``'axisymmetric'`` and ``'plane_strain'`` build a two-dimensional model of a pristine plate with a single
+            transmitter, either axisymmetric with the transmitter on the axis, or as a cross-section through the
+            transmitter and a receiver (see ``plane_strain_receiver_index``).
+        :ivar int partitioning_starts: Number of runs of the rectilinear partitioning algorithm. If greater than 1, the
+            deterministic run is complemented by randomized runs on a process pool, and the partitioning with the
+            fewest partitions (and best aspect ratios) is used (default: 1).
+        :ivar float partitioning_time_budget: Wall-clock budget in seconds for all runs of the rectilinear partitioning
+            algorithm, only relevant if ``partitioning_starts`` is greater than 1 (default: 60).
+        :ivar bool batched_partitioning: If True, all rectangular partitions of the plate are created at once from a
+            single sketch instead of one by one, which is considerably faster for models with many partitions (default:
+            False).
+        :ivar bool batched_geometry: If True, all holes and transducers are added to the plate with a fixed number of
+            geometry features (one cut extrude, one partition per feature type) instead of one by one, which is
+            considerably faster for models with many holes and transducers (default: False).
+        :ivar bool shared_mesh_include: If True, the mesh, sets and material are written only once to a shared include
+            file (``<model_name>_mesh.inc`` in the output directory), and the .INP file of each load case only contains
+            the amplitudes, loads and output requests of its step. Not available for the ``'pin_force'`` approach
+            (default: False).
+        :ivar bool build_checkpoint: If True, the meshed and assembled model is saved as a checkpoint (.CAE and .JSON
+            manifest) in the output directory. A rerun of an interrupted build of an unchanged model (same fingerprint,
+            see ``build_cache``) resumes from the checkpoint and only writes the missing .INP files, instead of
+            archiving the output directory and rebuilding the model (default: False).
+        :ivar bool build_cache: If True, the fingerprint of the configured model (all parameters, plate, material,
+            defects, transducers, load cases and the guwlib sources) is stored in a manifest in the output directory
+            after the build. If a rebuild has the same fingerprint and the .INP files are unchanged, the build is
+            skipped and the existing output directory and .INP files are reused (default: True).
+        :ivar float shell_min_wavelength_to_thickness_ratio: Minimal ratio of the shortest wavelength to the plate
+            thickness for which the ``'continuum_shell'`` and ``'shell'`` approaches are accepted (default: 5).
+        :ivar int plane_strain_receiver_index: Index of the transducer in ``transducers`` that defines the
+            cross-section of the ``'plane_strain'`` approach together with the transmitter. If None, the first
+            transducer other than the transmitter is used (default: None).
+        :ivar bool symmetry_reduction: If True, only a half or quarter of the plate is modelled if the geometry is
+            symmetric with respect to the x- and / or y-mid-plane of the plate. Each load case is decomposed into
+            symmetric and antisymmetric components, which are modelled with the corresponding symmetry boundary
+            conditions. The history export assembles the signals of all transducers for the original load cases
+            (``'point_force'`` and ``'continuum_shell'`` approaches only, default: False).
+        :ivar str build_backend: Specifies how the .INP files are generated, either ``'cae'`` (the model is built in
+            ABAQUS/CAE) or ``'native'`` (the .INP files are written directly with NumPy by any Python interpreter,
+            without ABAQUS). The native backend is only available for the ``'point_force'`` approach, and always
+            writes the .INP files (default: ``'cae'``).
+        :ivar bool compress_input_files: If True, the native backend writes the .INP files (and the shared include
+            file) gzip-compressed (``.inp.gz``), e.g. to archive them or to transfer them to a cluster. They have to be
+            decompressed before they are submitted to ABAQUS (native backend only, default: False).
+        :ivar dict parameters: Parameters of the model variant, if the model is created from a model specification
+            (see ``guwlib.functions_utility.model_spec``), for use in :meth:`setup_parameters` (default: empty).
         """
 
         self.plate = None
@@ -47,14 +115,30 @@ class FEModel:
         self.elements_in_thickness_direction = 8
         self.courant_number = 0.5
         self.model_approach = 'point_force'
+        self.partitioning_starts = 1
+        self.partitioning_time_budget = 60.0
+        self.batched_partitioning = False
+        self.batched_geometry = False
+        self.shared_mesh_include = False
+        self.build_checkpoint = False
+        self.build_cache = True
+        self.shell_min_wavelength_to_thickness_ratio = 5.0
+        self.plane_strain_receiver_index = None
+        self.symmetry_reduction = False
+        self.build_backend = 'cae'
+        self.compress_input_files = False
+        self.parameters = {}
 
         # other parameters ... undocumented!
-        model_file_path = inspect.getouterframes(inspect.currentframe())[1][1]
-        model_file_name = os.path.basename(model_file_path)
-        self.model_name = os.path.splitext(model_file_name)[0]  # rename, risk of confusion (.INP file)
+        if model_name is None:
+            # only the calling frame is inspected, collecting the whole stack (with source lines) is expensive
+            model_file_path = inspect.currentframe().f_back.f_code.co_filename
+            model_name = os.path.splitext(os.path.basename(model_file_path))[0]
+        self.model_name = model_name  # rename, risk of confusion (.INP file)
         self.model_file_path = model_file_path
         self.output_directory = os.path.join('results', self.model_name)
         self.no_gui_mode = any(arg == "-noGUI" for arg in sys.argv)
+        self.__fingerprint = None
 
     # @abstractmethod
     def setup_parameters(self):
@@ -72,24 +156,60 @@ class FEModel:
         self.setup_parameters()
         self.__check_model()
 
-        if self.no_gui_mode:
+        build_manifest = None
+        if self.no_gui_mode or self.build_backend == 'native':
+            # the fingerprint is taken before the build sets the identifiers of defects and transducers
+            self.__fingerprint = get_model_fingerprint(self)
+            if self.build_cache:
+                build_manifest = BuildManifest(output_directory=self.output_directory, model_name=self.model_name,
+                                               fingerprint=self.__fingerprint)
+                if build_manifest.is_valid():
+                    log_info("The model {} is unchanged since its last build, the existing {} .INP file(s) in {} are "
+                             "reused.".format(self.model_name, len(build_manifest.input_files), self.output_directory))
+                    return
             self.__make_output_directory()
 
-        if self.model_approach == 'piezo_electric':
+        if self.build_backend == 'native':
+            from guwlib.functions_native.build_native_model import build_native_model
+            build_native_model(model=self)
+
+        elif self.model_approach == 'piezo_electric':
             # unreachable
             from guwlib.functions_cae.build_abaqus_model_piezo_electric import build_abaqus_model_piezo_electric
             build_abaqus_model_piezo_electric(model=self)
 
-        if self.model_approach == 'point_force':
+        elif self.model_approach in ('point_force', 'pin_force', 'continuum_shell', 'shell'):
             from guwlib.functions_cae.build_abaqus_model_point_force import build_abaqus_model_point_force
             build_abaqus_model_point_force(model=self)
 
+        elif self.model_approach in ('axisymmetric', 'plane_strain'):
+            from guwlib.functions_cae.build_abaqus_model_reduced_dimension import build_abaqus_model_reduced_dimension
+            build_abaqus_model_reduced_dimension(model=self)
+
+        if build_manifest is not None:
+            build_manifest.write()
+
+    def get_fingerprint(self):
+        """
+        Returns the fingerprint of the configured model (see ``guwlib.functions_utility.build_cache``), as computed
+        before the build in :meth:`setup_in_abaqus`, so that it does not change when the build sets the identifiers
+        of defects and transducers.
+
+        :return: (str) Fingerprint of the model.
+        """
+        if self.__fingerprint is None:
+            self.__fingerprint = get_model_fingerprint(self)
+        return self.__fingerprint
+
     def get_element_size_thickness(self):
         """
         Compute the required element size in thickness direction of the plate.
 
         :return: (float) Element size used for in-thickness discretization of the plate.
         """
+        if self.model_approach in ('continuum_shell', 'shell'):
+            # a single (continuum) shell element spans the whole thickness
+            return self.plate.thickness
         element_size_thickness = self.plate.thickness / self.elements_in_thickness_direction
         return element_size_thickness
 
@@ -118,22 +238,115 @@ class FEModel:
         max_time_increment = self.courant_number / (self.elements_per_wavelength * self.max_frequency)
         return max_time_increment
 
+    def get_field_output_interval(self, load_case):
+        """
+        Computes the time interval of the field output of a load case, either as specified, from the Nyquist rate of
+        :attr:`max_frequency` or as 10 times the maximum time increment (see :class:`LoadCase`).
+
+        :param LoadCase load_case: Load case with field output.
+        :return: (float) Time interval of the field output.
+        """
+        if load_case.field_output_interval is not None:
+            return load_case.field_output_interval
+        if load_case.field_output_oversampling is not None:
+            return 1.0 / (2.0 * load_case.field_output_oversampling * self.max_frequency)
+        return self.get_max_time_increment() * 10
+
+    def get_history_output_interval(self, load_case):
+        """
+        Computes the time interval of the history output of a load case. For ``history_output_interval='auto'``, the
+        history output is sampled with :data:`HISTORY_OUTPUT_SAMPLES_PER_PERIOD` samples per period of the highest
+        frequency of the excitation signals of the load case (limited to :attr:`max_frequency`, which is also used for
+        broadband signals like impulses).
+
+        :param LoadCase load_case: Load case.
+        :return: (float) Time interval of the history output, or None for output at every increment.
+        """
+        if load_case.history_output_interval != 'auto':
+            return load_case.history_output_interval
+        signal_frequencies = [signal.get_max_frequency() for signal in load_case.transducer_signals
+                              if signal is not None]
+        if signal_frequencies and None not in signal_frequencies:
+            max_frequency = min(max(signal_frequencies), self.max_frequency)
+        else:
+            max_frequency = self.max_frequency
+        return 1.0 / (HISTORY_OUTPUT_SAMPLES_PER_PERIOD * max_frequency)
+
     def __check_model(self):
         """
-        Performs a basic check if the model parameters are consistent.
+        Performs a basic check if the model parameters are consistent and if the geometry is valid (see
+        ``guwlib.functions_utility.geometry_validation``).
         """
         if self.courant_number <= 0 or self.courant_number > 1.0:
             self.courant_number = 0.5
 
-        if not self.model_approach == 'point_force':
-            raise NotImplementedError("Only 'point_force' modelling approach is implemented.")
+        if self.model_approach not in ('point_force', 'pin_force', 'continuum_shell', 'shell', 'axisymmetric',
+                                       'plane_strain'):
+            raise NotImplementedError("Only 'point_force', 'pin_force', 'continuum_shell', 'shell', 'axisymmetric' "
+                                      "and 'plane_strain' modelling approaches are implemented.")
+
+        if self.model_approach in ('axisymmetric', 'plane_strain') and self.defects:
+            raise NotImplementedError("Defects are not implemented for the '{}' modelling approach."
+                                      "".format(self.model_approach))
+
+        if self.model_approach in ('continuum_shell', 'shell'):
+            from guwlib.functions_utility.dispersion import check_shell_approximation
+            is_valid, message = check_shell_approximation(
+                material=self.plate.material, thickness=self.plate.thickness, max_frequency=self.max_frequency,
+                min_wavelength_to_thickness_ratio=self.shell_min_wavelength_to_thickness_ratio)
+            if not is_valid:
+                raise ValueError("The '{}' modelling approach is not valid for this plate: {}"
+                                 "".format(self.model_approach, message))
+
+        if self.model_approach == 'shell':
+            # conventional shells only have mid-surface nodes
+            if any(transducer.position_z == 'symmetric' for transducer in self.transducers):
+                raise ValueError("Symmetric transducer excitation can't be modelled with conventional shell elements, "
+                                 "use the 'continuum_shell' modelling approach instead.")
+            if any(isinstance(defect, Crack) for defect in self.defects):
+                raise NotImplementedError("Cracks are not implemented for the 'shell' modelling approach, use the "
+                                          "'continuum_shell' modelling approach instead.")
+
+        if self.shared_mesh_include and self.model_approach == 'pin_force':
+            # the cylindrical coordinate systems of the pin forces (*Transform) are written with the model data of the
+            # load case that uses them, they would be missing from the shared include for the other load cases
+            raise NotImplementedError("The shared mesh include is not implemented for the 'pin_force' modelling "
+                                      "approach.")
+
+        if self.symmetry_reduction and self.model_approach not in ('point_force', 'continuum_shell'):
+            raise NotImplementedError("Symmetry reduction is only implemented for the 'point_force' and "
+                                      "'continuum_shell' modelling approaches.")
+
+        if self.build_backend not in ('cae', 'native'):
+            raise ValueError("Invalid value for build_backend. Accepted values are: ['cae', 'native']")
+
+        if self.build_backend == 'native':
+            if self.model_approach != 'point_force':
+                raise NotImplementedError("The native build backend is only implemented for the 'point_force' "
+                                          "modelling approach.")
+            if self.symmetry_reduction:
+                raise NotImplementedError("Symmetry reduction is not implemented for the native build backend.")
+        elif self.compress_input_files:
+            raise NotImplementedError("Compressed input files are only implemented for the native build backend.")
+
+        # defects and transducers on the plate, inside their bounding boxes and without overlapping bounding boxes
+        check_model_geometry(self)
 
     def __make_output_directory(self):
         """
         Creates a directory for the simulation results, named after the python file that instantiated this
-        :class:`FEModel` object. If the output directory already exists, the existing one is archived first. A copy of
-        the calling python file is placed in the output directory.
+        :class:`FEModel` object. If the output directory already exists, the existing one is archived first, unless it
+        contains a valid build checkpoint of this model (see ``build_checkpoint``). A copy of the model file (if any)
+        is placed in the output directory.
         """
+        if self.build_checkpoint and os.path.exists(self.output_directory):
+            checkpoint = BuildCheckpoint(output_directory=self.output_directory, model_name=self.model_name,
+                                         fingerprint=self.get_fingerprint())
+            if checkpoint.is_valid():
+                if self.model_file_path is not None:
+                    shutil.copy(self.model_file_path, os.path.join(self.output_directory, self.model_name + '.mdl'))
+                return
+
         if os.path.exists(self.output_directory):
             # Archive the existing directory by renaming it with a timestamp
             timestamp = datetime.now().strftime("%d_%m_%y_%H-%M")
@@ -144,6 +357,7 @@ class FEModel:
         os.makedirs(self.output_directory)
 
         # Copy the model file to the output directory
-        src = self.model_file_path
-        dst = os.path.join(self.output_directory, self.model_name + '.mdl')
-        shutil.copy(src, dst)
+        if self.model_file_path is not None:
+            src = self.model_file_path
+            dst = os.path.join(self.output_directory, self.model_name + '.mdl')
+            shutil.copy(src, dst)
@@ -8,7 +8,10 @@ class LoadCase:
     Each load case represents one independent ABAQUS simulation. Multiple load cases can be defined for one GUWlib
     model. A ``LoadCase`` instance contains the excitation signals applied to each transducer.
     """
-    def __init__(self, name, duration, transducer_signals, output_request='history'):
+    def __init__(self, name, duration, transducer_signals, output_request='history', field_output_interval=None,
+                 field_output_oversampling=None, field_output_node_spacing=None, field_output_regions=None,
+                 history_output_interval=None, history_output_variables=('U1', 'U2', 'U3'),
+                 history_output_all_surfaces=True):
         """
         :param str name: Name of this load case.
         :param float duration: Total ABAQUS simulation duration for this load case.
@@ -20,20 +23,79 @@ class LoadCase:
         :param str output_request: The output to be requested in ABAQUS for this load case. If set to
             ``history``, history output is requested for all transducer signals. If set to ``field``, an additional
             field output is requested for the nodes contained in the  plates' field output set (i.e. the plates top
-            surface) in time intervals of 10 * ``FEModel.get_max_time_increment()``.
+            surface) in time intervals of 10 * ``FEModel.get_max_time_increment()`` (see the ``field_output_*``
+            parameters to reduce the size of the field output).
+        :param float field_output_interval: Time interval of the field output. If None, the interval is derived from
+            ``field_output_oversampling`` or, if that is None too, 10 * ``FEModel.get_max_time_increment()`` is used.
+        :param float field_output_oversampling: If set, the field output is written at ``field_output_oversampling``
+            times the Nyquist rate of ``FEModel.max_frequency``, i.e. in time intervals of
+            1 / (2 * ``field_output_oversampling`` * ``FEModel.max_frequency``). Must be at least 1.
+        :param float field_output_node_spacing: If set, field output is only written for the nodes closest to the
+            points of a square grid with this spacing (in m) on the plates' top surface, instead of for all nodes.
+        :param list[tuple[float, float, float, float]] field_output_regions: If set, field output is only written for
+            the nodes inside these rectangles on the plates' top surface, each given as (x_min, y_min, x_max, y_max).
+        :param float | str history_output_interval: Time interval of the history output. If None, history output is
+            written at every increment. If ``'auto'``, the interval is derived from the highest frequency of the
+            excitation signals (see ``FEModel.get_history_output_interval()``). If set, ABAQUS' anti-aliasing filter
+            is applied to the history output.
+        :param tuple[str] history_output_variables: Displacement components to request as history output.
+        :param bool history_output_all_surfaces: If False, history output is only requested on the plate surface(s)
+            on which each transducer is placed (see ``Transducer.position_z``), instead of on the top and bottom
+            surface.
 
         :ivar str name: Name of this load case.
         :ivar float duration: Total ABAQUS simulation duration for this load case.
         :ivar list[Signal] transducer_signals: A list, containing the excitation signal for each transducer.
         :ivar str output_request: The output to be requested in ABAQUS for this load case.
+        :ivar float field_output_interval: Time interval of the field output.
+        :ivar float field_output_oversampling: Sampling rate of the field output, relative to the Nyquist rate.
+        :ivar float field_output_node_spacing: Spacing of the grid of field output nodes.
+        :ivar list[tuple[float, float, float, float]] field_output_regions: Rectangles to restrict the field output to.
+        :ivar float | str history_output_interval: Time interval of the history output.
+        :ivar tuple[str] history_output_variables: Displacement components to request as history output.
+        :ivar bool history_output_all_surfaces: If False, history output is only requested on the transducer surfaces.
         """
         self.name = name
         self.duration = duration
         self.transducer_signals = transducer_signals
         self.output_request = output_request
+        self.field_output_interval = field_output_interval
+        self.field_output_oversampling = field_output_oversampling
+        self.field_output_node_spacing = field_output_node_spacing
+        self.field_output_regions = field_output_regions
+        self.history_output_interval = history_output_interval
+        self.history_output_variables = tuple(history_output_variables)
+        self.history_output_all_surfaces = history_output_all_surfaces
 
         valid_output_requests = ['history', 'field']
         if output_request not in valid_output_requests:
             raise ValueError("Invalid value for output_request. "
                              "Accepted values are: {}".format(valid_output_requests))
 
+        if field_output_interval is not None and field_output_oversampling is not None:
+            raise ValueError("Specify either field_output_interval or field_output_oversampling, not both.")
+        if field_output_interval is not None and field_output_interval <= 0:
+            raise ValueError("field_output_interval must be positive.")
+        if field_output_oversampling is not None and field_output_oversampling < 1:
+            raise ValueError("field_output_oversampling must be at least 1, lower sampling rates violate the Nyquist "
+                             "criterion.")
+        if field_output_node_spacing is not None and field_output_node_spacing <= 0:
+            raise ValueError("field_output_node_spacing must be positive.")
+        if field_output_regions is not None:
+            for region in field_output_regions:
+                if len(region) != 4 or region[0] >= region[2] or region[1] >= region[3]:
+                    raise ValueError("Invalid field output region {}, expected (x_min, y_min, x_max, y_max)."
+                                     "".format(region))
+        if history_output_interval is not None and history_output_interval != 'auto' and history_output_interval <= 0:
+            raise ValueError("history_output_interval must be positive or 'auto'.")
+        if not self.history_output_variables or \
+                any(variable not in ('U1', 'U2', 'U3') for variable in self.history_output_variables):
+            raise ValueError("Invalid history_output_variables {}, accepted values are: U1, U2, U3."
+                             "".format(history_output_variables))
+
+    def has_reduced_field_output(self):
+        """
+        :return: True if the field output of this load case is restricted to a subset of the top surface nodes.
+        :rtype: bool
+        """
+        return self.field_output_node_spacing is not None or self.field_output_regions is not None
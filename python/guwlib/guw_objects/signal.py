@@ -32,6 +32,14 @@ class Signal(object):
         """
         pass
 
+    def get_max_frequency(self):
+        """
+        Returns the upper limit of the frequency band of the signal.
+
+        :return: (float) Upper frequency limit, or None if the signal is broadband (e.g. an impulse).
+        """
+        return None
+
 
 # BURST ----------------------------------------------------------------------------------------------------------------
 class Burst(Signal):
@@ -108,6 +116,15 @@ class Burst(Signal):
         """
         return self.n_cycles * (1/self.center_frequency)
 
+    def get_max_frequency(self):
+        """
+        Returns the upper limit of the main lobe of the burst spectrum, i.e. the first zero of the spectrum of a
+        Hanning-windowed burst above the center frequency.
+
+        :return: (float) Upper frequency limit.
+        """
+        return self.center_frequency * (1 + 2.0 / self.n_cycles)
+
 
 # DIRAC IMPULSE --------------------------------------------------------------------------------------------------------
 class DiracImpulse(Signal):
@@ -18,9 +18,9 @@ class CircularTransducer(Transducer):
     """
     Represents a circular (piezoelectric) transducer.
 
-    The transducer may be realised in the FE model as a concentrated force or as a piezoelectric patch with an electric
-    potential applied to its surfaces, depending on whether ``model_approach`` is set to ``point_force`` or
-    ``piezo_electric``, respectively.
+    The transducer may be realised in the FE model as a concentrated force, as radial pin forces along its circumference
+    or as a piezoelectric patch with an electric potential applied to its surfaces, depending on whether
+    ``model_approach`` is set to ``point_force``, ``pin_force`` or ``piezo_electric``, respectively.
     """
 
     def __init__(self, position_x, position_y, diameter, position_z='top', thickness=None, material=None,
@@ -57,6 +57,12 @@ class CircularTransducer(Transducer):
         :ivar str on_plate_bottom_set_name: Name for the ABAQUS set containing the transducer which is applied to the
             top surface of the plate.
         :ivar str bounding_box_cell_set_name: Name for the ABAQUS set containing the transducers bounding box.
+        :ivar str circumference_top_set_name: Name for the ABAQUS set containing the circumference of the transducer on
+            the top surface of the plate (only if ``FEModel.model_approach`` is set to ``pin_force``).
+        :ivar str circumference_bottom_set_name: Name for the ABAQUS set containing the circumference of the transducer
+            on the bottom surface of the plate (only if ``FEModel.model_approach`` is set to ``pin_force``).
+        :ivar float bounding_box_scale: Half edge length of the rectangular partition around the transducer, relative
+            to the transducer radius (default: 1.0).
         """
 
         # instance variables for modes 'point_force' and 'piezo_electric'
@@ -78,12 +84,17 @@ class CircularTransducer(Transducer):
         self.electrode_thickness = electrode_thickness
         self.electrode_material = electrode_material
 
+        # instance variables for partitioning
+        self.bounding_box_scale = 1.0
+
         # instance variables to store ABAQUS cell set names
         self.id = None
         self.name = None
         self.on_plate_top_set_name = None
         self.on_plate_bottom_set_name = None
         self.bounding_box_cell_set_name = None
+        self.circumference_top_set_name = None
+        self.circumference_bottom_set_name = None
 
     def set_identifiers(self, unique_id):
         """
@@ -96,6 +107,8 @@ class CircularTransducer(Transducer):
         self.on_plate_top_set_name = "{}_top".format(self.name)
         self.on_plate_bottom_set_name = "{}_bottom".format(self.name)
         self.bounding_box_cell_set_name = "{}_bound_box".format(self.name)
+        self.circumference_top_set_name = "{}_circumference_top".format(self.name)
+        self.circumference_bottom_set_name = "{}_circumference_bottom".format(self.name)
 
         # # this will need some rework since top, bot, sym, asym were introduced ...
         # self.piezo_material_cell_set_name = "{}_piezo_material".format(self.name)
@@ -0,0 +1,7 @@
+"""
+Makes guwlib importable for the tests without installing it, independent of the directory pytest is run from.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,133 @@
+"""
+Tests of the number of ABAQUS/CAE operations of the model build, counted with the recording ABAQUS stand-in (see
+:mod:`guwlib.functions_cae.abaqus_stand_in`). The geometry operations have to scale with the number of defects and
+transducers as intended (one feature per object, or a fixed number of features for the batched geometry), and no
+operation may be repeated.
+"""
+import collections
+
+import pytest
+
+from guwlib import *
+from guwlib.functions_cae.abaqus_stand_in import install_abaqus_stand_in, uninstall_abaqus_stand_in
+
+# geometry features of the plate, counted per build
+GEOMETRY_FEATURES = ('CutExtrude', 'PartitionFaceBySketch', 'PartitionFaceBySketchThruAll',
+                     'PartitionCellByExtrudeEdge')
+
+
+class TransducersAndHoles(FEModel):
+    """
+    Plate with a row of transducers and a row of holes, the first transducer is excited.
+    """
+
+    def __init__(self, n_transducers, n_holes, batched_geometry, model_approach):
+        super(TransducersAndHoles, self).__init__(model_name='transducers_and_holes')
+        self.__n_transducers = n_transducers
+        self.__n_holes = n_holes
+        self.__batched_geometry = batched_geometry
+        self.__model_approach = model_approach
+
+    def setup_parameters(self):
+        self.max_frequency = 100e3
+        self.elements_per_wavelength = 6
+        self.elements_in_thickness_direction = 2
+        self.build_cache = False
+        self.batched_geometry = self.__batched_geometry
+        self.model_approach = self.__model_approach
+        self.plate = IsotropicRectangularPlate(material=IsotropicMaterial(material_name='AluminumAlloy1100'),
+                                               thickness=2e-3, width=100e-3, length=80e-3)
+        self.transducers = [CircularTransducer(position_x=15e-3 + 20e-3 * i, position_y=20e-3, diameter=5e-3)
+                            for i in range(self.__n_transducers)]
+        self.defects = [Hole(position_x=15e-3 + 20e-3 * i, position_y=60e-3, diameter=4e-3)
+                        for i in range(self.__n_holes)]
+        self.load_cases = [LoadCase(name='burst', duration=2e-5,
+                                    transducer_signals=[Burst(center_frequency=100e3, n_cycles=2)] +
+                                    [None] * (self.__n_transducers - 1))]
+
+
+@pytest.fixture
+def build(tmp_path, monkeypatch):
+    """
+    Returns a function that builds the model in ABAQUS/CAE, with the recording stand-in instead of ABAQUS (GUI mode, no
+    files are written), and returns the recorder of the ABAQUS scripting interface calls.
+    """
+    monkeypatch.chdir(tmp_path)
+
+    def build_model(n_transducers, n_holes=0, batched_geometry=False, model_approach='point_force'):
+        recorder = install_abaqus_stand_in()
+        try:
+            TransducersAndHoles(n_transducers, n_holes, batched_geometry, model_approach).setup_in_abaqus()
+        finally:
+            uninstall_abaqus_stand_in()
+        return recorder
+    return build_model
+
+
+@pytest.mark.parametrize('batched_geometry', [False, True])
+def test_plate_meshed_once(build, batched_geometry):
+    recorder = build(n_transducers=3, n_holes=2, batched_geometry=batched_geometry)
+    assert recorder.counts['seedPart'] == 1
+    assert recorder.counts['generateMesh'] == 1
+
+
+def test_one_feature_per_object(build):
+    recorder = build(n_transducers=3, n_holes=2)
+    assert recorder.counts['CutExtrude'] == 2
+    assert recorder.counts['PartitionFaceBySketchThruAll'] == 3
+
+
+@pytest.mark.parametrize('n_holes', [0, 1])
+def test_features_scale_linearly_with_transducers(build, n_holes):
+    counts = [__get_feature_counts(build(n_transducers=n, n_holes=n_holes)) for n in (1, 2, 3)]
+    for name in GEOMETRY_FEATURES + ('findAt', ):
+        assert counts[2][name] - counts[1][name] == counts[1][name] - counts[0][name], name
+
+
+def test_batched_geometry_features_independent_of_number_of_objects(build):
+    # all holes and transducers are added with a fixed number of features, only the rectilinear partitioning of the
+    # remaining plate depends on the positions of the objects
+    few = __get_feature_counts(build(n_transducers=1, n_holes=1, batched_geometry=True))
+    many = __get_feature_counts(build(n_transducers=3, n_holes=2, batched_geometry=True))
+    for name in ('CutExtrude', 'PartitionFaceBySketchThruAll'):
+        assert few[name] == many[name] == 1, name
+
+
+@pytest.mark.parametrize('batched_geometry', [False, True])
+def test_no_repeated_operations(build, batched_geometry):
+    recorder = build(n_transducers=3, n_holes=2, batched_geometry=batched_geometry)
+
+    # the sets of the plate are updated after each partition, the sets of the objects are created once
+    set_names = collections.Counter(call.kwargs['name'] for call in recorder.get_calls('Set'))
+    plate_set_names = ('plate', 'plate-material', 'plate-top-surface', 'plate-field-output')
+    assert [name for name, count in set_names.items() if count > 1 and name not in plate_set_names] == []
+    for i in range(1, 4):
+        for suffix in ('bound_box', 'top', 'bottom'):
+            assert set_names['transducer_{:02d}_{}'.format(i, suffix)] == 1
+
+    # one load per loaded set, one history output request per transducer surface, one step per load case
+    assert len(recorder.get_calls('ConcentratedForce')) == 1
+    assert len(recorder.get_calls('HistoryOutputRequest')) == 6
+    assert len(recorder.get_calls('ExplicitDynamicsStep')) == 1
+    assert len(recorder.get_calls('TabularAmplitude')) == 1
+
+
+@pytest.mark.parametrize('model_approach, technique', [('point_force', None), ('pin_force', 'SWEEP')])
+def test_transducer_mesh_controls(build, model_approach, technique):
+    # the bounding boxes of the pin-force transducers contain their circumference and are swept through the thickness
+    recorder = build(n_transducers=2, n_holes=1, model_approach=model_approach)
+    for i in range(1, 3):
+        calls = [call for call in recorder.get_calls('setMeshControls')
+                 if "sets['transducer_{:02d}_bound_box']".format(i) in call.kwargs['regions']._path]
+        assert len(calls) == 1
+        assert getattr(calls[0].kwargs.get('technique'), 'name', None) == technique
+        assert calls[0].kwargs['algorithm'].name == 'MEDIAL_AXIS'
+
+
+def __get_feature_counts(recorder):
+    """
+    (Helper) Returns the number of geometry features and ``findAt`` lookups of a build.
+
+    :rtype: dict[str, int]
+    """
+    return dict((name, recorder.counts[name]) for name in GEOMETRY_FEATURES + ('findAt', ))
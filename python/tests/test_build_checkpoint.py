@@ -0,0 +1,120 @@
+"""
+Tests of the build checkpoint (see :mod:`guwlib.functions_utility.build_checkpoint`): a checkpoint is only resumed if
+the fingerprint of the model is unchanged, also if the model file stays the same while the template of a model
+specification or the guwlib sources change.
+"""
+import glob
+import json
+import os
+
+import pytest
+
+from guwlib.functions_utility import build_cache
+from guwlib.functions_utility.build_checkpoint import BuildCheckpoint
+from guwlib.functions_utility.model_spec import create_models_from_file
+
+TEMPLATE = """
+from guwlib import *
+
+
+class Template(FEModel):
+    def setup_parameters(self):
+        self.max_frequency = 100e3
+        self.elements_per_wavelength = {elements_per_wavelength}
+        self.elements_in_thickness_direction = 2
+        self.build_backend = 'native'
+        self.build_cache = False
+        self.build_checkpoint = True
+        self.plate = IsotropicRectangularPlate(material=IsotropicMaterial(material_name='AluminumAlloy1100'),
+                                               thickness=2e-3, width=50e-3, length=40e-3)
+        self.transducers = [CircularTransducer(position_x=self.parameters['x'], position_y=20e-3, diameter=5e-3)]
+        self.load_cases = [LoadCase(name='burst', duration=2e-5,
+                                    transducer_signals=[Burst(center_frequency=100e3, n_cycles=2)])]
+"""
+
+SPEC = {'name': 'plate', 'template': 'template.py', 'parameters': {'x': 25e-3}}
+
+
+@pytest.fixture
+def spec_file_path(tmp_path, monkeypatch):
+    """
+    Writes a model specification with a template to a temporary working directory.
+
+    :return: Path to the specification file.
+    """
+    monkeypatch.chdir(tmp_path)
+    __write_template(elements_per_wavelength=6)
+    with open('plate.json', 'w') as file:
+        json.dump(SPEC, file)
+    return os.path.abspath('plate.json')
+
+
+def test_checkpoint_resumed_for_unchanged_model(spec_file_path):
+    fingerprint = __build_with_checkpoint(spec_file_path)
+
+    model = __build(spec_file_path)
+    assert model.get_fingerprint() == fingerprint
+    assert not glob.glob('results/plate_archived_*')
+    checkpoint = BuildCheckpoint(output_directory=model.output_directory, model_name='plate', fingerprint=fingerprint)
+    assert checkpoint.is_valid()
+    assert checkpoint.completed_load_cases == ['lc_0_burst']
+
+
+def test_checkpoint_dropped_if_template_changes(spec_file_path):
+    fingerprint = __build_with_checkpoint(spec_file_path)
+
+    # the model file (specification) is unchanged, only its template
+    __write_template(elements_per_wavelength=8)
+    model = __build(spec_file_path)
+    assert model.get_fingerprint() != fingerprint
+    assert len(glob.glob('results/plate_archived_*')) == 1
+    checkpoint = BuildCheckpoint(output_directory=glob.glob('results/plate_archived_*')[0], model_name='plate',
+                                 fingerprint=model.get_fingerprint())
+    assert not checkpoint.is_valid()
+    assert checkpoint.completed_load_cases == []
+
+
+def test_checkpoint_dropped_if_guwlib_sources_change(spec_file_path, monkeypatch):
+    fingerprint = __build_with_checkpoint(spec_file_path)
+
+    source_hash = build_cache.get_guwlib_source_hash()
+    monkeypatch.setattr(build_cache, 'get_guwlib_source_hash', lambda: source_hash[::-1])
+    model = __build(spec_file_path)
+    assert model.get_fingerprint() != fingerprint
+    assert len(glob.glob('results/plate_archived_*')) == 1
+
+
+def __write_template(elements_per_wavelength):
+    """
+    (Helper) Writes the template of the model specification to the working directory.
+    """
+    with open('template.py', 'w') as file:
+        file.write(TEMPLATE.format(elements_per_wavelength=elements_per_wavelength))
+
+
+def __build(spec_file_path):
+    """
+    (Helper) Builds the (single) model of the specification file.
+
+    :return: The model.
+    :rtype: FEModel
+    """
+    model, = create_models_from_file(spec_file_path)
+    model.setup_in_abaqus()
+    return model
+
+
+def __build_with_checkpoint(spec_file_path):
+    """
+    (Helper) Builds the model of the specification file and writes a checkpoint (with a placeholder model database)
+    with its load case completed, like an interrupted ABAQUS/CAE build.
+
+    :return: Fingerprint of the model.
+    :rtype: str
+    """
+    model = __build(spec_file_path)
+    checkpoint = BuildCheckpoint(output_directory=model.output_directory, model_name=model.model_name,
+                                 fingerprint=model.get_fingerprint())
+    open(checkpoint.cae_file_path, 'w').close()
+    checkpoint.mark_load_case_completed('lc_0_burst')
+    return model.get_fingerprint()
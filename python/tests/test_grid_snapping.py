@@ -0,0 +1,56 @@
+"""
+Tests of the snapping of coordinates to the nodes of a structured mesh (see
+:mod:`guwlib.functions_utility.grid_snapping`).
+"""
+import pytest
+
+from guwlib.functions_utility.grid_snapping import (get_number_of_elements_along_edge, snap_to_structured_grid,
+                                                    get_snapped_bounding_box_coordinates)
+
+
+@pytest.mark.parametrize('edge_length, element_size, expected', [
+    (50e-3, 1e-3, 50),
+    (0.3, 0.1, 3),      # 0.3 / 0.1 = 2.9999999999999996, truncating would give 2
+    (0.7, 0.1, 7),      # 0.7 / 0.1 = 6.999999999999999
+    (2.4e-3, 1e-3, 2),  # closest integer, rounded down
+    (2.6e-3, 1e-3, 3),  # closest integer, rounded up
+    (0.3e-3, 1e-3, 1),  # edges shorter than half an element get one element
+])
+def test_number_of_elements_is_closest_integer(edge_length, element_size, expected):
+    assert get_number_of_elements_along_edge(edge_length, element_size) == expected
+
+
+@pytest.mark.parametrize('edge_length, element_size', [(0.05, 1.3e-3), (0.7, 1e-3), (0.7, 2.1e-3), (0.11, 1.3e-3)])
+def test_end_points_are_exact(edge_length, element_size):
+    # the number of elements times the node spacing deviates from the edge length by rounding for these edges
+    n_elements = get_number_of_elements_along_edge(edge_length, element_size)
+    assert n_elements * (edge_length / n_elements) != edge_length
+
+    assert snap_to_structured_grid(edge_length, edge_length, element_size) == edge_length
+    assert snap_to_structured_grid(edge_length - 0.1 * element_size, edge_length, element_size) == edge_length
+    assert snap_to_structured_grid(0.0, edge_length, element_size) == 0.0
+    assert snap_to_structured_grid(0.1 * element_size, edge_length, element_size) == 0.0
+
+
+def test_positions_outside_edge_snapped_to_end_points():
+    assert snap_to_structured_grid(-3e-3, 50e-3, 1e-3) == 0.0
+    assert snap_to_structured_grid(53e-3, 50e-3, 1e-3) == 50e-3
+
+
+@pytest.mark.parametrize('value, node_index', [(12.3e-3, 10), (13.7e-3, 11), (20.4e-3, 16)])
+def test_off_grid_positions_snapped_to_nearest_node(value, node_index):
+    # 40 mm edge with 1.3 mm elements: 31 elements with a node spacing of 40 / 31 mm = 1.29 mm
+    node_spacing = 40e-3 / 31
+    snapped = snap_to_structured_grid(value, 40e-3, 1.3e-3)
+    assert snapped == pytest.approx(node_index * node_spacing, rel=1e-12)
+    assert abs(snapped - value) < node_spacing / 2
+
+
+def test_bounding_box_snapped_and_clamped_to_plate():
+    # transducer close to the left plate edge, off the grid (1 mm nodes)
+    x_left, x_right, y_lower, y_upper, x_center, y_center = \
+        get_snapped_bounding_box_coordinates(x=1.2e-3, y=20.4e-3, bounding_box_radius=3e-3, plate_width=50e-3,
+                                             plate_length=40e-3, element_size=1e-3)
+    assert x_left == 0.0
+    assert (x_right, x_center) == pytest.approx((4e-3, 1e-3), rel=1e-12)
+    assert (y_lower, y_upper, y_center) == pytest.approx((17e-3, 23e-3, 20e-3), rel=1e-12)
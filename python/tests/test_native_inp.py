@@ -0,0 +1,251 @@
+"""
+Tests of the native .INP writer (``build_backend='native'``). A small pristine plate is written with the native backend
+and compared with the ABAQUS/CAE build of the same model, which is run with the recording ABAQUS stand-in (see
+:mod:`guwlib.functions_cae.abaqus_stand_in`). Its keyword structure is compared with the hand-written expectation
+``fixtures/pristine_plate_expected_keywords.inp`` (not an export of ABAQUS/CAE).
+"""
+import collections
+import os
+import re
+
+import numpy as np
+import pytest
+
+from guwlib import *
+from guwlib.functions_cae.abaqus_stand_in import install_abaqus_stand_in, uninstall_abaqus_stand_in
+from guwlib.functions_utility.grid_snapping import get_number_of_elements_along_edge
+from guwlib.functions_utility.input_file_reader import read_input_file_mesh
+
+# expected keyword structure of the input file (written by hand, keyword and comment lines only)
+EXPECTED_KEYWORDS_FILE_PATH = os.path.join(os.path.dirname(__file__), 'fixtures',
+                                           'pristine_plate_expected_keywords.inp')
+
+# keywords that open or close a block of the input file, their order has to match the expectation
+BLOCK_KEYWORDS = ('*part', '*end part', '*assembly', '*instance', '*end instance', '*end assembly', '*material',
+                  '*step', '*end step')
+
+# options of the keyword lines that hold names, the other options (e.g. time intervals) are not compared
+NAME_OPTIONS = ('name', 'nset', 'elset', 'type', 'part', 'material', 'amplitude')
+
+# natural coordinates of the corner nodes of a C3D8R element
+NATURAL_COORDINATES = np.array([(-1, -1, -1), (1, -1, -1), (1, 1, -1), (-1, 1, -1),
+                                (-1, -1, 1), (1, -1, 1), (1, 1, 1), (-1, 1, 1)], dtype=float)
+
+
+class PristinePlate(FEModel):
+    """
+    Small pristine plate with a transducer in symmetric excitation mode and a (not excited) transducer on the top
+    surface, both off the grid of the structured mesh.
+    """
+
+    def __init__(self, build_backend):
+        super(PristinePlate, self).__init__(model_name='pristine_plate')
+        self.__build_backend = build_backend
+
+    def setup_parameters(self):
+        self.max_frequency = 100e3
+        self.elements_per_wavelength = 6
+        self.elements_in_thickness_direction = 2
+        self.build_backend = self.__build_backend
+        self.build_cache = False
+
+        aluminum = IsotropicMaterial(material_name='AluminumAlloy1100')
+        self.plate = IsotropicRectangularPlate(material=aluminum, thickness=2e-3, width=50e-3, length=40e-3)
+        self.transducers = [CircularTransducer(position_x=12.3e-3, position_y=17.1e-3, diameter=5e-3,
+                                               position_z='symmetric'),
+                            CircularTransducer(position_x=37.7e-3, position_y=22.9e-3, diameter=5e-3,
+                                               position_z='top')]
+        self.load_cases = [LoadCase(name='burst', duration=2e-5,
+                                    transducer_signals=[Burst(center_frequency=100e3, n_cycles=2), None])]
+
+
+@pytest.fixture(scope='module')
+def native_build(tmp_path_factory):
+    """
+    Writes the input file of the pristine plate with the native backend.
+
+    :return: The model and the path to the input file of its load case.
+    """
+    working_directory = os.getcwd()
+    os.chdir(str(tmp_path_factory.mktemp('native')))
+    try:
+        model = PristinePlate(build_backend='native')
+        model.setup_in_abaqus()
+        input_file_path = os.path.abspath(os.path.join(model.output_directory, 'lc_0_burst',
+                                                       'pristine_plate_lc_0_burst.inp'))
+    finally:
+        os.chdir(working_directory)
+    return model, input_file_path
+
+
+@pytest.fixture(scope='module')
+def cae_build(tmp_path_factory):
+    """
+    Builds the pristine plate in ABAQUS/CAE, with the recording stand-in instead of ABAQUS (GUI mode, no files are
+    written).
+
+    :return: The recorder of the ABAQUS scripting interface calls.
+    """
+    working_directory = os.getcwd()
+    os.chdir(str(tmp_path_factory.mktemp('cae')))
+    recorder = install_abaqus_stand_in()
+    try:
+        PristinePlate(build_backend='cae').setup_in_abaqus()
+    finally:
+        uninstall_abaqus_stand_in()
+        os.chdir(working_directory)
+    return recorder
+
+
+def test_node_and_element_counts_match_cae_seeding(native_build, cae_build):
+    model, input_file_path = native_build
+    seed_calls = cae_build.get_calls('seedPart')
+    assert len(seed_calls) == 1
+    element_size_in_plane = seed_calls[0].kwargs['size']
+
+    nx = get_number_of_elements_along_edge(model.plate.width, element_size_in_plane)
+    ny = get_number_of_elements_along_edge(model.plate.length, element_size_in_plane)
+    nz = get_number_of_elements_along_edge(model.plate.thickness, model.get_element_size_thickness())
+
+    mesh = read_input_file_mesh(input_file_path, part_name='plate', use_cache=False)
+    assert list(mesh.elements.keys()) == ['C3D8R']
+    assert mesh.num_elements == nx * ny * nz
+    assert mesh.num_nodes == (nx + 1) * (ny + 1) * (nz + 1)
+    assert len(mesh.node_sets[model.plate.field_output_face_set_name]) == (nx + 1) * (ny + 1)
+
+
+def test_names_match_cae_build(native_build, cae_build):
+    _, input_file_path = native_build
+    blocks = __read_keyword_blocks(input_file_path)
+
+    cae_set_names = set(call.kwargs['name'] for call in cae_build.get_calls('Set'))
+    native_set_names = set(options['nset'] for keyword, options, _ in blocks if keyword == '*nset')
+    native_set_names |= set(options['elset'] for keyword, options, _ in blocks if keyword == '*elset')
+    assert native_set_names <= cae_set_names
+
+    cae_amplitude_names = [call.kwargs['name'] for call in cae_build.get_calls('TabularAmplitude')]
+    assert [options['name'] for keyword, options, _ in blocks if keyword == '*amplitude'] == cae_amplitude_names
+
+    cae_step_names = [call.kwargs['name'] for call in cae_build.get_calls('ExplicitDynamicsStep')]
+    assert [options['name'] for keyword, options, _ in blocks if keyword == '*step'] == cae_step_names
+
+    cae_loads = sorted((call.kwargs['amplitude'], __get_set_name(call.kwargs['region']), call.kwargs['cf3'])
+                       for call in cae_build.get_calls('ConcentratedForce'))
+    native_loads = []
+    for keyword, options, data_lines in blocks:
+        if keyword == '*cload':
+            for line in data_lines:
+                region, dof, magnitude = [value.strip() for value in line.split(',')]
+                assert int(dof) == 3
+                native_loads.append((options['amplitude'], region.split('.')[-1], float(magnitude)))
+    assert sorted(native_loads) == cae_loads
+    assert sorted(native_loads) == [('transducer_transducer_01_Burst', 'transducer_01_bottom', -1.0),
+                                    ('transducer_transducer_01_Burst', 'transducer_01_top', 1.0)]
+
+    cae_history_sets = sorted(__get_set_name(call.kwargs['region'])
+                              for call in cae_build.get_calls('HistoryOutputRequest'))
+    native_history_sets = sorted(options['nset'].split('.')[-1] for keyword, options, _ in blocks
+                                 if keyword == '*node output')
+    assert native_history_sets == cae_history_sets
+
+
+def test_transducer_nodes_at_exact_positions(native_build):
+    model, input_file_path = native_build
+    mesh = read_input_file_mesh(input_file_path, part_name='plate', use_cache=False)
+    for transducer in model.transducers:
+        for set_name, z in [(transducer.on_plate_top_set_name, model.plate.thickness),
+                            (transducer.on_plate_bottom_set_name, 0.0)]:
+            node_labels = mesh.node_sets[set_name]
+            assert len(node_labels) == 1
+            coordinates = mesh.node_coordinates[mesh.get_node_indices(node_labels)[0]]
+            np.testing.assert_allclose(coordinates, (transducer.position_x, transducer.position_y, z),
+                                       rtol=0, atol=1e-12)
+
+
+def test_element_jacobians_positive(native_build):
+    _, input_file_path = native_build
+    mesh = read_input_file_mesh(input_file_path, part_name='plate', use_cache=False)
+    _, connectivity = mesh.elements['C3D8R']
+    corners = mesh.node_coordinates[mesh.get_node_indices(connectivity)]
+    for point in np.vstack((np.zeros((1, 3)), NATURAL_COORDINATES)):
+        assert np.all(__get_jacobian_determinants(corners, point) > 0)
+
+
+def test_keyword_structure_matches_expectation(native_build):
+    _, input_file_path = native_build
+    native_keywords = [(keyword, __get_names(options))
+                       for keyword, options, _ in __read_keyword_blocks(input_file_path)]
+    expected_keywords = [(keyword, __get_names(options))
+                         for keyword, options, _ in __read_keyword_blocks(EXPECTED_KEYWORDS_FILE_PATH)]
+
+    # same blocks in the same order
+    assert [item for item in native_keywords if item[0] in BLOCK_KEYWORDS] == \
+        [item for item in expected_keywords if item[0] in BLOCK_KEYWORDS]
+
+    # the model data is a subset of the expectation (the CAE build creates additional sets of the geometry)
+    step_start = [keyword for keyword, _ in native_keywords].index('*step')
+    expected_step_start = [keyword for keyword, _ in expected_keywords].index('*step')
+    assert set(native_keywords[:step_start]) <= set(expected_keywords[:expected_step_start])
+    assert set(keyword for keyword, _ in native_keywords[:step_start]) == \
+        set(keyword for keyword, _ in expected_keywords[:expected_step_start])
+
+    # the history data is the same, regardless of the order of the loads and output requests
+    assert collections.Counter(native_keywords[step_start:]) == \
+        collections.Counter(expected_keywords[expected_step_start:])
+
+
+def __read_keyword_blocks(input_file_path):
+    """
+    (Helper) Reads the keyword lines of an input file, with their options and data lines. Comment lines are skipped.
+
+    :param str input_file_path: Path to the input file.
+    :return: Keyword (lower case), options (lower case names) and data lines of each keyword line.
+    :rtype: list[tuple[str, dict[str, str], list[str]]]
+    """
+    blocks = []
+    with open(input_file_path) as file:
+        for line in file:
+            line = line.strip()
+            if not line or line.startswith('**'):
+                continue
+            if line.startswith('*'):
+                parts = [part.strip() for part in line.split(',')]
+                options = dict((part.split('=', 1)[0].lower(), part.split('=', 1)[1]) if '=' in part
+                               else (part.lower(), None) for part in parts[1:])
+                blocks.append((parts[0].lower(), options, []))
+            elif blocks:
+                blocks[-1][2].append(line)
+    return blocks
+
+
+def __get_names(options):
+    """
+    (Helper) Returns the options of a keyword line that hold names (see :data:`NAME_OPTIONS`), as a hashable tuple.
+    """
+    return tuple(sorted((name, value) for name, value in options.items() if name in NAME_OPTIONS))
+
+
+def __get_set_name(region):
+    """
+    (Helper) Returns the name of the set of a region of the ABAQUS stand-in, e.g. ``transducer_01_top`` for
+    ``mdb.models['guw_model'].rootAssembly.instances['plate'].sets['transducer_01_top']``.
+    """
+    return re.search(r"sets\['(.+)'\]$", region._path).group(1)
+
+
+def __get_jacobian_determinants(corners, point):
+    """
+    (Helper) Evaluates the determinant of the Jacobian of the trilinear mapping of 8-node hexahedra at a point.
+
+    :param numpy.ndarray corners: Coordinates of the corner nodes of the elements, shape (num_elements, 8, 3).
+    :param numpy.ndarray point: Natural coordinates of the point, shape (3, ).
+    :return: Determinant of the Jacobian of each element.
+    :rtype: numpy.ndarray
+    """
+    factors = 1 + NATURAL_COORDINATES * point
+    shape_function_derivatives = np.column_stack(
+        (NATURAL_COORDINATES[:, 0] * factors[:, 1] * factors[:, 2],
+         factors[:, 0] * NATURAL_COORDINATES[:, 1] * factors[:, 2],
+         factors[:, 0] * factors[:, 1] * NATURAL_COORDINATES[:, 2])) / 8
+    jacobians = np.einsum('enx,nk->exk', corners, shape_function_derivatives)
+    return np.linalg.det(jacobians)
@@ -0,0 +1,119 @@
+"""
+Tests of the symmetry reduction (see :mod:`guwlib.functions_utility.symmetry`). The ABAQUS/CAE build is run with the
+recording ABAQUS stand-in (see :mod:`guwlib.functions_cae.abaqus_stand_in`).
+"""
+import json
+import os
+
+import numpy as np
+import pytest
+
+from guwlib import *
+from guwlib.functions_cae.abaqus_stand_in import install_abaqus_stand_in, uninstall_abaqus_stand_in
+from guwlib.functions_utility.symmetry import mirror_symmetry_reduced_history, SYMMETRY_MAPPING_FILE_SUFFIX
+
+# mapping of a half model (x-plane) with the transducer 1 mirrored onto transducer 2, and one load case that is
+# superposed from its symmetric and antisymmetric component
+MAPPING = {'model_name': 'half',
+           'planes': ['x'],
+           'transducers': {'transducer_01': {'source': 'transducer_01', 'mirror_planes': []},
+                           'transducer_02': {'source': 'transducer_01', 'mirror_planes': ['x']}},
+           'load_cases': [{'step_name': 'lc_0_left',
+                           'components': [{'step_name': 'lc_0_left_sym_x', 'component': {'x': 1}, 'factor': 1.0},
+                                          {'step_name': 'lc_1_left_asym_x', 'component': {'x': -1}, 'factor': 1.0}]}]}
+
+
+class MirroredTransmitters(FEModel):
+    """
+    Pristine plate with two transducers that are mirror images with respect to the x-mid-plane, each one excited in a
+    separate load case with a separately created (equal) signal.
+    """
+
+    def __init__(self):
+        super(MirroredTransmitters, self).__init__(model_name='mirrored_transmitters')
+
+    def setup_parameters(self):
+        self.max_frequency = 100e3
+        self.elements_per_wavelength = 6
+        self.elements_in_thickness_direction = 2
+        self.symmetry_reduction = True
+        self.plate = IsotropicRectangularPlate(material=IsotropicMaterial(material_name='AluminumAlloy1100'),
+                                               thickness=2e-3, width=50e-3, length=40e-3)
+        self.transducers = [CircularTransducer(position_x=15e-3, position_y=20e-3, diameter=5e-3),
+                            CircularTransducer(position_x=35e-3, position_y=20e-3, diameter=5e-3)]
+        self.load_cases = [LoadCase(name='left', duration=2e-5,
+                                    transducer_signals=[Burst(center_frequency=100e3, n_cycles=2), None]),
+                           LoadCase(name='right', duration=2e-5,
+                                    transducer_signals=[None, Burst(center_frequency=100e3, n_cycles=2)])]
+
+
+@pytest.fixture
+def cae_build(tmp_path, monkeypatch):
+    """
+    Builds the model in ABAQUS/CAE, with the recording stand-in instead of ABAQUS (GUI mode, no files are written).
+
+    :return: The model and the recorder of the ABAQUS scripting interface calls.
+    """
+    monkeypatch.chdir(tmp_path)
+    model = MirroredTransmitters()
+    recorder = install_abaqus_stand_in()
+    try:
+        model.setup_in_abaqus()
+    finally:
+        uninstall_abaqus_stand_in()
+    return model, recorder
+
+
+def test_reduced_model_built(cae_build):
+    _, recorder = cae_build
+    step_names = [call.kwargs['name'] for call in recorder.get_calls('ExplicitDynamicsStep')]
+    assert step_names == ['lc_0_left_sym_x_sym_y', 'lc_1_left_asym_x_sym_y']
+
+
+def test_model_definition_unchanged(cae_build):
+    model, _ = cae_build
+    assert [(transducer.position_x, transducer.position_y) for transducer in model.transducers] == \
+        [(15e-3, 20e-3), (35e-3, 20e-3)]
+    assert [load_case.name for load_case in model.load_cases] == ['left', 'right']
+
+
+def test_mirrored_history_assembled(tmp_path):
+    __write_component_history(tmp_path, {'lc_0_left_sym_x': ('TOP', 'BOTTOM'), 'lc_1_left_asym_x': ('TOP', 'BOTTOM')})
+    npz_file_path, = mirror_symmetry_reduced_history(directories_to_scan=(str(tmp_path), ), verbose=False)
+    with np.load(npz_file_path) as npz:
+        assert sorted(npz.keys()) == ['TRANSDUCER_01_BOTTOM', 'TRANSDUCER_01_TOP', 'TRANSDUCER_02_BOTTOM',
+                                      'TRANSDUCER_02_TOP']
+        # sum of the components at the source, difference (and flipped U1) at the mirrored transducer
+        np.testing.assert_allclose(npz['TRANSDUCER_01_TOP'][1:, :], 3 * np.ones((3, 4)))
+        np.testing.assert_allclose(npz['TRANSDUCER_02_TOP'][1:, :], [[-1] * 4, [1] * 4, [1] * 4])
+
+
+def test_surface_without_history_output_skipped(tmp_path):
+    __write_component_history(tmp_path, {'lc_0_left_sym_x': ('TOP', ), 'lc_1_left_asym_x': ('TOP', )})
+    npz_file_path, = mirror_symmetry_reduced_history(directories_to_scan=(str(tmp_path), ), verbose=False)
+    with np.load(npz_file_path) as npz:
+        assert sorted(npz.keys()) == ['TRANSDUCER_01_TOP', 'TRANSDUCER_02_TOP']
+
+
+def test_missing_source_history_raises(tmp_path):
+    __write_component_history(tmp_path, {'lc_0_left_sym_x': ('TOP', 'BOTTOM'), 'lc_1_left_asym_x': ('TOP', )})
+    with pytest.raises(ValueError, match='TRANSDUCER_01_BOTTOM.*lc_0_left'):
+        mirror_symmetry_reduced_history(directories_to_scan=(str(tmp_path), ), verbose=False)
+
+
+def __write_component_history(output_directory, exported_sides):
+    """
+    (Helper) Writes the mapping file and the history output (.NPZ) of the symmetry components. The displacements of the
+    symmetric component are 2, the ones of the antisymmetric component 1.
+
+    :param output_directory: Output directory of the model.
+    :param dict[str, tuple[str]] exported_sides: Surfaces of transducer 1 with history output, by component.
+    """
+    with open(os.path.join(str(output_directory), 'half' + SYMMETRY_MAPPING_FILE_SUFFIX), 'w') as file:
+        json.dump(MAPPING, file)
+    time = np.linspace(0, 1e-5, 4)
+    for step_name, sides in exported_sides.items():
+        value = 2.0 if 'asym' not in step_name else 1.0
+        os.makedirs(os.path.join(str(output_directory), step_name))
+        history = dict(('TRANSDUCER_01_{}'.format(side), np.vstack([time, value * np.ones((3, 4))])) for side in sides)
+        np.savez(os.path.join(str(output_directory), step_name, 'half_{}_history.npz'.format(step_name)), **history)